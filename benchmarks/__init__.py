@@ -0,0 +1,8 @@
+"""Benchmark suites for the Local Language Assistant.
+
+Run all suites against a seeded synthetic catalogue and write
+machine-readable results, then compare two runs:
+
+    python -m benchmarks run --schemes 10000 --out benchmarks/results/HEAD.json
+    python -m benchmarks compare benchmarks/results/base.json benchmarks/results/HEAD.json
+"""
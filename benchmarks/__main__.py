@@ -0,0 +1,78 @@
+"""Command line entry point: ``python -m benchmarks {run,compare}``."""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from benchmarks.harness import Benchmark, Context, compare, metadata, write_results
+from benchmarks.suites import SUITES
+from benchmarks.synthetic import generate_queries, generate_schemes
+
+
+def run(args) -> int:
+    schemes = generate_schemes(args.schemes, args.seed)
+    queries = generate_queries(args.queries, args.seed)
+    ctx = Context(schemes=schemes, queries=queries, seed=args.seed)
+
+    results = {}
+    for name, fn in SUITES.items():
+        if args.only and name not in args.only:
+            continue
+        bench = Benchmark(rounds=args.rounds, warmup=args.warmup)
+        try:
+            fn(bench, ctx)
+        except ImportError as e:
+            # e.g. the /ask suite without the web framework installed
+            results[name] = {"skipped": str(e)}
+            print(f"{name:<28}skipped: {e}")
+            continue
+        results[name] = bench.stats()
+        s = results[name]
+        print(f"{name:<28}median {s['median_us']:>10.1f} us   p95 {s['p95_us']:>10.1f} us")
+
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    meta = metadata(
+        seed=args.seed, schemes=args.schemes, queries=args.queries, rounds=args.rounds,
+    )
+    write_results(out, meta, results)
+    print(f"results written to {out}")
+    return 0
+
+
+def compare_cmd(args) -> int:
+    with open(args.base, encoding="utf-8") as f:
+        base = json.load(f)
+    with open(args.new, encoding="utf-8") as f:
+        new = json.load(f)
+    regressions = compare(base, new, args.threshold)
+    return 1 if regressions else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("run", help="run suites and write JSON results")
+    p.add_argument("--schemes", type=int, default=10_000)
+    p.add_argument("--queries", type=int, default=2_000)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--rounds", type=int, default=200)
+    p.add_argument("--warmup", type=int, default=10)
+    p.add_argument("--only", nargs="*", choices=sorted(SUITES), help="suites to run")
+    p.add_argument("--out", default="benchmarks/results/latest.json")
+    p.set_defaults(func=run)
+
+    p = sub.add_parser("compare", help="compare two result files")
+    p.add_argument("base")
+    p.add_argument("new")
+    p.add_argument("--threshold", type=float, default=0.10, help="allowed median slowdown")
+    p.set_defaults(func=compare_cmd)
+
+    args = parser.parse_args()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
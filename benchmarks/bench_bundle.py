@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Offline bundle and delta sizes under catalogue churn.
+
+Each round edits ``--edit`` of the records (a new benefit amount), adds
+``--add`` new schemes and removes ``--remove``. The round's delta is
+compared with the full bundle a client without delta sync would download.
+
+    python benchmarks/bench_bundle.py [--schemes 5000] [--rounds 4]
+"""
+
+import argparse
+import copy
+import gzip
+import json
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.synthetic import LANGUAGES, generate_schemes  # noqa: E402
+from src.bundle import BundleStore, apply_delta  # noqa: E402
+
+
+def churn(schemes, rng, edit, add, remove, next_id):
+    schemes = copy.deepcopy(schemes)
+    for s in rng.sample(schemes, int(len(schemes) * edit)):
+        amount = rng.choice([3000, 7000, 12000])
+        for lang in LANGUAGES:
+            s[f"benefits_{lang}"] = f"₹{amount} " + s[f"benefits_{lang}"].split(" ", 1)[1]
+    for s in rng.sample(schemes, int(len(schemes) * remove)):
+        schemes.remove(s)
+    extra = generate_schemes(int(len(schemes) * add) or 1, seed=next_id)
+    for i, s in enumerate(extra):
+        s["id"] = f"new_{next_id}_{i}"
+    return schemes + extra
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--schemes", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=4)
+    parser.add_argument("--edit", type=float, default=0.02, help="fraction edited per round")
+    parser.add_argument("--add", type=float, default=0.005, help="fraction added per round")
+    parser.add_argument("--remove", type=float, default=0.002, help="fraction removed per round")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    store = BundleStore(history=args.rounds + 1)
+    schemes = generate_schemes(args.schemes, args.seed)
+
+    print("full bundle (gzip / raw bytes):")
+    for lang in LANGUAGES:
+        _, body = store.encoded(schemes, lang)
+        print(f"  {lang}  {len(body):>9,} / {len(gzip.decompress(body)):>10,}")
+
+    client = json.loads(gzip.decompress(store.encoded(schemes, "hi")[1]))
+    print(f"\nchurn per round: edit {args.edit:.1%}, add {args.add:.1%}, remove {args.remove:.1%}")
+    print(f"{'round':<7}{'schemes':>9}{'delta gz':>10}{'full gz':>10}{'ratio':>8}"
+          f"{'upsert':>8}{'delete':>8}")
+    for r in range(1, args.rounds + 1):
+        schemes = churn(schemes, rng, args.edit, args.add, args.remove, r)
+        _, delta_body = store.encoded(schemes, "hi", since=client["v"])
+        _, full_body = store.encoded(schemes, "hi")
+        delta = json.loads(gzip.decompress(delta_body))
+        client = apply_delta(client, delta)
+        assert len(client["schemes"]) == len(schemes)
+        ratio = len(delta_body) / len(full_body)
+        print(f"{r:<7}{len(schemes):>9}{len(delta_body):>10,}{len(full_body):>10,}{ratio:>8.1%}"
+              f"{len(delta['upsert']):>8}{len(delta['delete']):>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Client-side latency: connection per request vs pooled keep-alive vs pipelining.
+
+"urlopen" is what chat.py used to do (a new connection per query, no
+timeout); "pooled" is SchemeClient.ask() over a kept-alive connection;
+"pipelined" is SchemeClient.ask_many(), which writes a batch of requests
+before reading the responses.
+
+    python benchmarks/bench_client.py --start-server
+    python benchmarks/bench_client.py --port 8001 --requests 1000
+"""
+
+import argparse
+import json
+import sys
+import time
+import urllib.request
+from pathlib import Path
+from urllib.parse import quote
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.loadtest import LOCAL_HOSTS, start_server  # noqa: E402
+from benchmarks.synthetic import generate_queries  # noqa: E402
+from src.client import SchemeClient  # noqa: E402
+
+
+def per_request(args, queries):
+    latencies = []
+    for q in queries:
+        start = time.perf_counter()
+        url = f"http://{args.host}:{args.port}/ask?q={quote(q)}&lang=hi"
+        with urllib.request.urlopen(url) as resp:
+            json.loads(resp.read().decode("utf-8"))
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def pooled(args, queries):
+    latencies = []
+    with SchemeClient(args.host, args.port) as client:
+        for q in queries:
+            start = time.perf_counter()
+            client.ask(q)
+            latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def pipelined(args, queries):
+    with SchemeClient(args.host, args.port) as client:
+        start = time.perf_counter()
+        client.ask_many(queries, depth=args.depth)
+        elapsed = time.perf_counter() - start
+    # Only the batch total is observable; report it as a per-query mean
+    return [elapsed / len(queries)] * len(queries)
+
+
+def report(name, latencies):
+    lat = sorted(x * 1000 for x in latencies)
+    p50 = lat[len(lat) // 2]
+    p99 = lat[min(int(len(lat) * 0.99), len(lat) - 1)]
+    total = sum(lat)
+    print(f"{name:<11}total {total:>9.1f} ms   p50 {p50:>7.3f} ms   p99 {p99:>7.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--depth", type=int, default=16, help="pipelining depth")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--start-server", action="store_true", help="spawn uvicorn locally")
+    args = parser.parse_args()
+
+    if args.host not in LOCAL_HOSTS:
+        parser.error("benchmarks only run against localhost")
+
+    queries = generate_queries(args.requests, args.seed)
+    server = start_server(args) if args.start_server else None
+    try:
+        for name, run in (("urlopen", per_request), ("pooled", pooled), ("pipelined", pipelined)):
+            report(name, run(args, queries))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
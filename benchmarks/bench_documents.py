@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Document queries over a whole catalogue: DocumentIndex vs a per-scheme scan.
+
+Attaches random required documents to a synthetic catalogue, then
+answers "which schemes need nothing beyond the documents I have" for
+random document sets, once with ``DocumentIndex.requiring_only`` and
+once by checking every scheme's list. Both must agree. Also reports the
+cost of building the per-language action steps at load.
+
+    python benchmarks/bench_documents.py [--schemes 100000] [--queries 200]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.synthetic import DOCUMENTS, add_documents, generate_schemes  # noqa: E402
+from src.config import config  # noqa: E402
+from src.documents import (  # noqa: E402
+    DOCUMENTS_KEY,
+    DocumentIndex,
+    DocumentRegistry,
+    load_documents,
+)
+from src.eligibility import positions  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--schemes", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    schemes = add_documents(generate_schemes(args.schemes, args.seed), args.seed)
+    rng = random.Random(args.seed)
+    queries = [rng.sample(DOCUMENTS, rng.randint(1, 4)) for _ in range(args.queries)]
+
+    start = time.perf_counter()
+    index = DocumentIndex(schemes, DocumentRegistry(load_documents(config.DOCUMENTS_PATH)))
+    build_ms = (time.perf_counter() - start) * 1000
+    print(f"build: {build_ms:.0f} ms for {len(schemes):,} schemes, "
+          f"{len(index.by_set):,} distinct document sets, {len(index.steps):,} step lists")
+
+    start = time.perf_counter()
+    indexed = [positions(index.requiring_only(index.ids(q))) for q in queries]
+    indexed_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+    start = time.perf_counter()
+    scanned = [
+        [
+            pos for pos, s in enumerate(schemes)
+            if s[DOCUMENTS_KEY] and set(s[DOCUMENTS_KEY]) <= set(q)
+        ]
+        for q in queries
+    ]
+    scan_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+    assert indexed == scanned, "document index disagrees with the per-scheme scan"
+    mean = sum(map(len, indexed)) / len(indexed)
+    print(f"matching schemes per query: {mean:,.0f} on average")
+    print(f"{'per-scheme scan':<20}{scan_ms:>10.2f} ms/query")
+    print(f"{'document index':<20}{indexed_ms:>10.2f} ms/query ({scan_ms / indexed_ms:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Eligibility over a whole catalogue: compiled bitsets vs per-scheme rules.
+
+Attaches random structured rules to a synthetic catalogue, then answers
+"which schemes does this user qualify for" for random user profiles,
+once with ``EligibilityIndex`` and once by calling ``rule_matches`` on
+every scheme. Both must agree.
+
+    python benchmarks/bench_eligibility.py [--schemes 100000] [--users 200]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.synthetic import (  # noqa: E402
+    add_eligibility_rules,
+    generate_schemes,
+    random_profile,
+)
+from src.eligibility import RULES_KEY, EligibilityIndex, rule_matches  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--schemes", type=int, default=100_000)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    schemes = add_eligibility_rules(generate_schemes(args.schemes, args.seed), args.seed)
+    rng = random.Random(args.seed)
+    users = [random_profile(rng) for _ in range(args.users)]
+
+    start = time.perf_counter()
+    index = EligibilityIndex(schemes)
+    print(f"compile: {(time.perf_counter() - start) * 1000:.0f} ms for {len(schemes)} schemes")
+
+    start = time.perf_counter()
+    for u in users:
+        index.evaluate(u)
+    bitset_ms = (time.perf_counter() - start) * 1000 / len(users)
+
+    start = time.perf_counter()
+    compiled = [index.eligible(u) for u in users]
+    compiled_ms = (time.perf_counter() - start) * 1000 / len(users)
+
+    start = time.perf_counter()
+    per_scheme = [
+        [pos for pos, s in enumerate(schemes) if rule_matches(s.get(RULES_KEY), u)]
+        for u in users
+    ]
+    per_scheme_ms = (time.perf_counter() - start) * 1000 / len(users)
+
+    assert compiled == per_scheme, "compiled rules disagree with per-scheme evaluation"
+    mean = sum(map(len, compiled)) / len(compiled)
+    print(f"eligible per user: {mean:,.0f} of {len(schemes):,} on average")
+    print(f"{'per-scheme rules':<20}{per_scheme_ms:>10.2f} ms/user")
+    print(f"{'compiled, positions':<20}{compiled_ms:>10.2f} ms/user "
+          f"({per_scheme_ms / compiled_ms:.0f}x)")
+    print(f"{'compiled, bitset':<20}{bitset_ms:>10.3f} ms/user "
+          f"({per_scheme_ms / bitset_ms:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
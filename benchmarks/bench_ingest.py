@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""Bulk ingest throughput by worker count.
+
+Splits a synthetic catalogue across ``--feeds`` source files (with a
+share of records republished by a second feed, to exercise dedupe) and
+runs the ingest pipeline once per worker count.
+
+    python benchmarks/bench_ingest.py [--schemes 20000] [--feeds 16] [--workers 1 2 4]
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.synthetic import generate_schemes  # noqa: E402
+from src.ingest import run_ingest  # noqa: E402
+
+
+def write_feeds(directory: Path, schemes, feeds: int, overlap: float) -> None:
+    for i in range(feeds):
+        part = schemes[i::feeds]
+        # Republish some of the previous feed's records under the same IDs
+        part += schemes[(i - 1) % feeds::feeds][: int(len(part) * overlap)]
+        with open(directory / f"feed_{i:03d}.json", "w", encoding="utf-8") as f:
+            json.dump(part, f, ensure_ascii=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--schemes", type=int, default=20000)
+    parser.add_argument("--feeds", type=int, default=16)
+    parser.add_argument("--overlap", type=float, default=0.05, help="republished fraction")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        feeds = Path(tmp) / "feeds"
+        feeds.mkdir()
+        write_feeds(feeds, generate_schemes(args.schemes, args.seed), args.feeds, args.overlap)
+
+        print(f"{'workers':<9}{'parse':>9}{'dedupe':>9}{'index':>9}{'write':>9}"
+              f"{'total':>9}{'rec/s':>10}{'MB/s':>7}")
+        for workers in args.workers:
+            r = run_ingest([str(feeds)], str(Path(tmp) / f"out_{workers}"), workers)
+            ms = {k: v * 1000 for k, v in r["seconds"].items()}
+            print(f"{r['workers']:<9}{ms['parse']:>9.0f}{ms['dedupe']:>9.0f}{ms['index']:>9.0f}"
+                  f"{ms['write']:>9.0f}{r['total_seconds'] * 1000:>9.0f}"
+                  f"{r['records_per_second']:>10,}{r['mb_per_second']:>7}")
+        print(f"\n{r['records_valid']} records -> {r['schemes']} schemes "
+              f"({r['duplicate_ids']} overridden IDs)")
+
+
+if __name__ == "__main__":
+    main()
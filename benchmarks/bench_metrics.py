@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""Per-request overhead of the instrumentation layer.
+
+A request records four stages (parse, match, build, serialize) plus its
+total, so the per-request cost is roughly five observe() calls.
+
+    python benchmarks/bench_metrics.py [--calls 1000000]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from time import perf_counter_ns
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.metrics import Metrics  # noqa: E402
+
+STAGES = ("parse", "match", "build", "serialize", "ask")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    m = Metrics()
+    requests = args.calls // len(STAGES)
+
+    start = perf_counter_ns()
+    for _ in range(requests):
+        t0 = t = perf_counter_ns()
+        t = m.observe("parse", t)
+        t = m.observe("match", t)
+        t = m.observe("build", t)
+        m.observe("serialize", t)
+        m.observe("ask", t0)
+    instrumented = perf_counter_ns() - start
+
+    start = perf_counter_ns()
+    for _ in range(requests):
+        perf_counter_ns()
+    baseline = perf_counter_ns() - start
+
+    per_request = (instrumented - baseline) / requests
+    print(f"observe(): {per_request / len(STAGES):.0f} ns/call")
+    print(f"per request ({len(STAGES)} spans): {per_request / 1000:.2f} us")
+
+    start = perf_counter_ns()
+    text = m.render()
+    print(f"render(): {(perf_counter_ns() - start) / 1e6:.2f} ms, {len(text)} bytes")
+
+
+if __name__ == "__main__":
+    main()
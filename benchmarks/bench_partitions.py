@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""Per-state partitions vs one monolithic catalogue: latency and memory.
+
+Writes a synthetic catalogue with ``--central-share`` of its schemes
+central and the rest spread over ten states (larger states get more),
+both as one file and split into partitions. Each mode then runs in a
+fresh process, so resident memory is comparable: load, then answer
+``--queries`` Zipfian queries, each from a user of a random state, with
+the search cache off. The monolithic catalogue scores every scheme; the
+partitioned one scores central plus the user's state, with at most
+``--max-loaded`` state partitions loaded.
+
+    python benchmarks/bench_partitions.py [--schemes 100000] [--max-loaded 4]
+"""
+
+import argparse
+import json
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.synthetic import (  # noqa: E402
+    STATES,
+    add_states,
+    generate_queries,
+    generate_schemes,
+)
+from src.catalogue import Catalogue  # noqa: E402
+from src.config import config  # noqa: E402
+from src.partitions import PartitionedCatalogue, write_partitions  # noqa: E402
+
+
+def rss_mb() -> float:
+    with open("/proc/self/status", encoding="ascii") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def worker(args) -> dict:
+    """One mode in this process; returns its measurements."""
+    directory = Path(args.dir)
+    before = rss_mb()
+    start = time.perf_counter()
+    if args.worker == "monolithic":
+        cat = Catalogue(
+            str(directory / "schemes.json"), config.SYNONYMS_PATH, cache_size=0,
+            semantic=False, related=False,
+        )
+        cat.load()
+
+        def search(q, state):
+            return cat.search(q, config.response.MAX_SCHEME_RESULTS)
+    else:
+        cat = PartitionedCatalogue(
+            str(directory / "partitions"), config.SYNONYMS_PATH, args.max_loaded, cache_size=0,
+        )
+        cat.central.load()
+
+        def search(q, state):
+            return cat.search(q, config.response.MAX_SCHEME_RESULTS, state)
+    load = time.perf_counter() - start
+    loaded = rss_mb()
+
+    rng = random.Random(args.seed)
+    weights = [1 / (i + 1) for i in range(len(STATES))]
+    queries = generate_queries(args.queries, args.seed)
+    states = rng.choices(STATES, weights, k=len(queries))
+    stats = getattr(cat, "stats", {"loads": 0, "evictions": 0})
+    warm, cold = [], []  # cold: the query loaded a state partition first
+    for q, state in zip(queries, states):
+        loads = stats["loads"]
+        t = time.perf_counter()
+        search(q, state)
+        (warm if stats["loads"] == loads else cold).append(time.perf_counter() - t)
+    warm.sort()
+    return {
+        "load_s": load,
+        "rss_loaded_mb": loaded - before,
+        "rss_end_mb": rss_mb() - before,
+        "peak_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "p50_ms": warm[len(warm) // 2] * 1000,
+        "p95_ms": warm[int(len(warm) * 0.95)] * 1000,
+        "cold": len(cold),
+        "cold_ms": sum(cold) / len(cold) * 1000 if cold else 0.0,
+        "evictions": stats["evictions"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--schemes", type=int, default=100_000)
+    parser.add_argument("--central-share", type=float, default=0.2)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--max-loaded", type=int, default=config.partitions.MAX_LOADED)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--worker", choices=["monolithic", "partitioned"], help=argparse.SUPPRESS)
+    parser.add_argument("--dir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(worker(args)))
+        return
+
+    schemes = add_states(generate_schemes(args.schemes, args.seed), args.central_share, args.seed)
+    with tempfile.TemporaryDirectory() as directory:
+        with open(Path(directory) / "schemes.json", "w", encoding="utf-8") as f:
+            json.dump(schemes, f, ensure_ascii=False)
+        counts = write_partitions(schemes, str(Path(directory) / "partitions"))
+        print(f"{len(schemes):,} schemes: central {counts['central']:,}, states "
+              + ", ".join(f"{k} {n:,}" for k, n in counts.items() if k != "central"))
+
+        # p50/p95 over queries whose partitions were loaded; "cold" queries
+        # loaded a state partition first (mean time given)
+        print(f"{'mode':<12} {'load s':>7} {'RSS MB':>7} {'end MB':>7} {'peak MB':>8} "
+              f"{'p50 ms':>7} {'p95 ms':>7} {'cold':>5} {'cold ms':>8} {'evicted':>8}")
+        for mode in ("monolithic", "partitioned"):
+            out = subprocess.run(
+                [sys.executable, __file__, "--worker", mode, "--dir", directory,
+                 "--queries", str(args.queries), "--max-loaded", str(args.max_loaded),
+                 "--seed", str(args.seed)],
+                check=True, capture_output=True, text=True,
+            ).stdout
+            r = json.loads(out.splitlines()[-1])
+            print(f"{mode:<12} {r['load_s']:>7.2f} {r['rss_loaded_mb']:>7.0f} "
+                  f"{r['rss_end_mb']:>7.0f} {r['peak_mb']:>8.0f} {r['p50_ms']:>7.2f} "
+                  f"{r['p95_ms']:>7.2f} {r['cold']:>5} {r['cold_ms']:>8.1f} "
+                  f"{r['evictions']:>8}")
+
+
+if __name__ == "__main__":
+    main()
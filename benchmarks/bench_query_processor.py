@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""Cost of adversarial long queries with and without the validation stage.
+
+Raw: the query text goes straight into match_schemes(), which scans
+every whitespace-separated word against every scheme. Processed:
+process_query() caps and deduplicates first and the ranker uses its
+tokens.
+
+    python benchmarks/bench_query_processor.py [--schemes 1000]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.synthetic import adversarial_queries, generate_schemes  # noqa: E402
+from src.matcher import match_schemes  # noqa: E402
+from src.query_processor import process_query  # noqa: E402
+
+SHAPES = ["repeated word", "giant word", "mixed scripts", "punctuation", "distinct words"]
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--schemes", type=int, default=1000)
+    args = parser.parse_args()
+
+    schemes = generate_schemes(args.schemes)
+    print(f"{'input':<16}{'bytes':>9}{'raw ms':>12}{'process ms':>12}{'processed ms':>14}")
+    for shape, text in zip(SHAPES, adversarial_queries(len(SHAPES))):
+        raw = timed(lambda: match_schemes(text, schemes, 3))
+        front = timed(lambda: process_query(text))
+        query = process_query(text)
+        total = front + timed(lambda: match_schemes(query, schemes, 3))
+        size = len(text.encode("utf-8"))
+        print(f"{shape:<16}{size:>9}{raw:>12.1f}{front:>12.3f}{total:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
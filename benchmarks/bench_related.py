@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Related-schemes graph: build time, memory and lookup latency.
+
+Builds ``RelatedGraph`` over a synthetic catalogue and times lookups of
+random schemes' neighbours. Synthetic schemes only differ by topic words,
+so ``--rare-words`` appends that many words drawn from a vocabulary of
+one word per five schemes, giving every scheme its own feature set.
+``--verify`` checks the graph's similarities against a brute-force
+dense ``X @ X.T`` on a smaller catalogue (needs n^2 floats).
+
+    python benchmarks/bench_related.py [--schemes 100000] [--rare-words 8] [--verify 3000]
+"""
+
+import argparse
+import math
+import random
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np  # noqa: E402
+
+from benchmarks.synthetic import generate_schemes  # noqa: E402
+from src.config import config  # noqa: E402
+from src.related import RelatedGraph, scheme_features  # noqa: E402
+
+
+def catalogue(n: int, rare_words: int, seed: int):
+    schemes = generate_schemes(n, seed)
+    rng = random.Random(seed)
+    vocabulary = [f"w{i}" for i in range(max(1, n // 5))]
+    if not rare_words:
+        return schemes
+    for s in schemes:
+        s["description_en"] += " " + " ".join(rng.choices(vocabulary, k=rare_words))
+    return schemes
+
+
+def brute_force(schemes, k: int) -> np.ndarray:
+    """Each scheme's k best cosines with any other scheme, from the dense product."""
+    cfg = config.related
+    n = len(schemes)
+    rows = [scheme_features(s) for s in schemes]
+    df = Counter(f for row in rows for f in row)
+    max_df = max(2, n * cfg.MAX_FEATURE_RATIO)
+    kept = {f: i for i, f in enumerate(f for f, c in df.items() if 1 < c <= max_df)}
+    x = np.zeros((n, len(kept)), dtype=np.float32)
+    for pos, row in enumerate(rows):
+        for f in row:
+            if f in kept:
+                weight = cfg.TAG_WEIGHT if f.startswith("t:") else 1.0
+                x[pos, kept[f]] = math.log(n / df[f]) * weight
+    x /= np.maximum(np.linalg.norm(x, axis=1), 1e-12)[:, None]
+    sims = x @ x.T
+    np.fill_diagonal(sims, 0)
+    return -np.sort(-sims, axis=1)[:, :k]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--schemes", type=int, default=100_000)
+    parser.add_argument("--rare-words", type=int, default=8)
+    parser.add_argument("--lookups", type=int, default=10_000)
+    parser.add_argument("--verify", type=int, default=3000, help="0 to skip")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    schemes = catalogue(args.schemes, args.rare_words, args.seed)
+    graph = RelatedGraph(schemes)
+    print(f"build: {graph.build_seconds:.1f} s for {len(schemes):,} schemes "
+          f"({graph.distinct:,} distinct feature sets)")
+    print(f"memory: {graph.nbytes / 2**20:.1f} MB "
+          f"({graph.nbytes / len(schemes):.0f} bytes/scheme, k={graph.k})")
+
+    rng = random.Random(args.seed)
+    picks = [rng.randrange(len(schemes)) for _ in range(args.lookups)]
+    start = time.perf_counter()
+    for pos in picks:
+        graph.related(pos, config.related.MAX_RESULTS)
+    lookup_us = (time.perf_counter() - start) * 1e6 / len(picks)
+    found = np.count_nonzero(graph.adjacency >= 0, axis=1).mean()
+    print(f"lookup: {lookup_us:.1f} us, {found:.1f} neighbours per scheme on average")
+
+    if args.verify:
+        small = catalogue(args.verify, args.rare_words, args.seed)
+        error = np.abs(RelatedGraph(small).scores - brute_force(small, graph.k)).max()
+        print(f"verify: max similarity error vs brute force at {args.verify:,}: {error:.1e}")
+        assert error < 1e-4, "related graph disagrees with brute force"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Formatting throughput of ResponseGenerator per language.
+
+Compares on-the-fly formatting (text simplified on every call) against a
+generator whose catalogue text was precomputed with prepare().
+
+    python benchmarks/bench_response_generator.py [--schemes 1000] [--rounds 2000]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from response_generator import ResponseGenerator  # noqa: E402
+
+FIELDS = ("name", "description", "eligibility", "benefits")
+
+
+def build_catalogue(size: int) -> list:
+    """Replicate data/schemes.json to ``size`` records with text in every language."""
+    with open(ROOT / "data" / "schemes.json", encoding="utf-8") as f:
+        base = json.load(f)
+
+    catalogue = []
+    for i in range(size):
+        scheme = dict(base[i % len(base)])
+        scheme["id"] = f"{scheme['id']}_{i}"
+        for lang in ResponseGenerator.LABELS:
+            for field in FIELDS:
+                source = scheme.get(f"{field}_hi") if lang in ("hi", "mr") else None
+                scheme.setdefault(f"{field}_{lang}", source or scheme.get(f"{field}_en", ""))
+        catalogue.append(scheme)
+    return catalogue
+
+
+def run(generator: ResponseGenerator, catalogue: list, lang: str, rounds: int) -> float:
+    """Return responses per second for 3-scheme answers."""
+    n = len(catalogue)
+    start = time.perf_counter()
+    for i in range(rounds):
+        j = (i * 3) % (n - 2)
+        generator.generate(catalogue[j:j + 3], lang)
+    return rounds / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--schemes", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=2000)
+    args = parser.parse_args()
+
+    catalogue = build_catalogue(args.schemes)
+    cold = ResponseGenerator()
+
+    start = time.perf_counter()
+    warm = ResponseGenerator(catalogue)
+    prepare_ms = (time.perf_counter() - start) * 1000
+
+    print(f"prepare(): {prepare_ms:.1f} ms for {len(catalogue)} schemes")
+    print(f"{'lang':<6}{'on-the-fly/s':>14}{'prepared/s':>14}{'speedup':>10}")
+    for lang in ResponseGenerator.LABELS:
+        cold_rate = run(cold, catalogue, lang, args.rounds)
+        warm_rate = run(warm, catalogue, lang, args.rounds)
+        print(f"{lang:<6}{cold_rate:>14.0f}{warm_rate:>14.0f}{warm_rate / cold_rate:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
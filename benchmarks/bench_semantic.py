@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Dense-vector retrieval: IVF recall@3 and latency against brute force.
+
+Builds the semantic index over a synthetic catalogue (100k schemes by
+default), then runs the same queries through the exhaustive index and
+the IVF index for each ``--probe`` value. Recall@3 is the share of IVF
+results that score at least the exhaustive third-best similarity (the
+synthetic catalogue has many exact ties, so comparing IDs would count
+an equally good scheme as a miss). Latency is per query, one query
+at a time; "batch" is per query when all queries go through one call.
+
+    python benchmarks/bench_semantic.py [--schemes 100000] [--queries 500] [--probe 4 8 16]
+
+Needs numpy.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import numpy as np  # noqa: E402
+
+from benchmarks.synthetic import generate_queries, generate_schemes  # noqa: E402
+from src.query_processor import process_query  # noqa: E402
+from src.semantic import FlatIndex, IVFIndex, SemanticIndex  # noqa: E402
+from src.synonyms import load_synonyms  # noqa: E402
+
+K = 3
+
+
+def timed(index, queries):
+    """Per-query latencies (ms, one call each), batched ms/query and the results."""
+    latencies = []
+    results = []
+    for q in queries:
+        start = time.perf_counter()
+        results.extend(index.search(q[None, :], K))
+        latencies.append((time.perf_counter() - start) * 1000)
+    start = time.perf_counter()
+    index.search(queries, K)
+    batch = (time.perf_counter() - start) * 1000 / len(queries)
+    return np.array(latencies), batch, [sims for _, sims in results]
+
+
+def report(name, latencies, batch, recall):
+    print(f"{name:<16}{recall:>9.1%}{np.percentile(latencies, 50):>9.3f}"
+          f"{np.percentile(latencies, 95):>9.3f}{batch:>9.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--schemes", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--probe", type=int, nargs="+", default=[4, 8, 16])
+    parser.add_argument("--lists", type=int, default=0, help="IVF lists; 0 = sqrt(schemes)")
+    args = parser.parse_args()
+
+    schemes = generate_schemes(args.schemes)
+    groups = load_synonyms(str(ROOT / "data" / "synonyms.json"))
+
+    start = time.perf_counter()
+    semantic = SemanticIndex(schemes, groups, ivf_min_schemes=len(schemes) + 1)
+    embed_s = time.perf_counter() - start
+    start = time.perf_counter()
+    ivf = IVFIndex(semantic.vectors, args.lists)
+    print(f"{len(schemes)} schemes: embed {embed_s:.1f}s, IVF build "
+          f"{time.perf_counter() - start:.1f}s ({len(ivf.centroids)} lists), "
+          f"matrix {semantic.vectors.nbytes / 1e6:.0f} MB float32")
+
+    tokens = [process_query(q).tokens for q in generate_queries(args.queries, seed=1)]
+    queries = semantic.embedder.embed(tokens)
+
+    print(f"\n{'index':<16}{'recall@3':>9}{'p50 ms':>9}{'p95 ms':>9}{'batch':>9}")
+    latencies, batch, exact = timed(FlatIndex(semantic.vectors), queries)
+    report("brute force", latencies, batch, 1.0)
+    for probe in args.probe:
+        ivf.n_probe = min(probe, len(ivf.centroids))
+        latencies, batch, found = timed(ivf, queries)
+        hits = sum(int((f >= e[-1] - 1e-6).sum()) for e, f in zip(exact, found) if len(e))
+        recall = hits / sum(len(e) for e in exact)
+        report(f"ivf probe={ivf.n_probe}", latencies, batch, recall)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Recall and latency of compiled synonyms vs query-time expansion.
+
+Queries use colloquial words that never occur literally in the
+catalogue ("kheti", "padhai", "naukri"). A query counts as a hit when
+one of its top 3 results carries the topic's tag.
+
+    python benchmarks/bench_synonyms.py [--schemes 10000] [--rounds 3]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.synthetic import generate_schemes  # noqa: E402
+from src.matcher import match_schemes  # noqa: E402
+from src.synonyms import SynonymIndex, load_synonyms  # noqa: E402
+
+# colloquial query -> tag that relevant synthetic schemes carry
+QUERIES = {
+    "kheti": "kisan", "krishi sahayata": "kisan", "padhai": "shiksha",
+    "vidyarthi": "student", "ilaj": "health", "bima": "insurance",
+    "budhapa": "pension", "mahila": "women", "karz": "loan",
+    "ghar": "awas", "naukri": "rozgar", "vazifa": "scholarship",
+}
+
+
+def run(name, search, schemes, rounds):
+    hits = 0
+    start = time.perf_counter()
+    for _ in range(rounds):
+        hits = 0
+        for query, tag in QUERIES.items():
+            if any(tag in s["tags"] for s in search(query)):
+                hits += 1
+    per_query = (time.perf_counter() - start) / (rounds * len(QUERIES)) * 1000
+    print(f"{name:<22}recall@3 {hits / len(QUERIES):>6.0%}   {per_query:>8.2f} ms/query")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--schemes", type=int, default=10_000)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    schemes = generate_schemes(args.schemes)
+    groups = load_synonyms(str(ROOT / "data" / "synonyms.json"))
+
+    start = time.perf_counter()
+    index = SynonymIndex(schemes, groups)
+    print(f"compile: {(time.perf_counter() - start) * 1000:.0f} ms for {len(schemes)} schemes")
+
+    def literal(q):
+        return match_schemes(q, schemes, 3)
+
+    def query_time(q):
+        expanded = " ".join(t for w in q.split() for t in index.expand(w) if " " not in t)
+        return match_schemes(expanded, schemes, 3)
+
+    def compiled(q):
+        return match_schemes(q, schemes, 3, index)
+
+    run("literal", literal, schemes, args.rounds)
+    run("query-time expansion", query_time, schemes, args.rounds)
+    run("compiled postings", compiled, schemes, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
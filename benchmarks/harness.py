@@ -0,0 +1,105 @@
+"""Minimal timing harness with a pytest-benchmark-like ``benchmark`` callable."""
+
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from time import perf_counter_ns
+from typing import Callable, Dict, List, Optional
+
+
+@dataclass
+class Context:
+    """Shared inputs handed to every suite."""
+
+    schemes: List[dict]
+    queries: List[str]
+    seed: int
+
+
+@dataclass
+class Benchmark:
+    """
+    Times a callable: ``benchmark(fn, *args)`` runs ``warmup`` untimed
+    calls, then ``rounds`` timed calls, and returns the last result.
+    """
+
+    rounds: int = 200
+    warmup: int = 10
+    samples: List[int] = field(default_factory=list)
+
+    def __call__(self, fn: Callable, *args, **kwargs):
+        result = None
+        for _ in range(self.warmup):
+            result = fn(*args, **kwargs)
+        samples = []
+        for _ in range(self.rounds):
+            start = perf_counter_ns()
+            result = fn(*args, **kwargs)
+            samples.append(perf_counter_ns() - start)
+        self.samples = samples
+        return result
+
+    def stats(self) -> Dict[str, float]:
+        ordered = sorted(self.samples)
+        n = len(ordered)
+        mean = statistics.fmean(ordered)
+        return {
+            "rounds": n,
+            "min_us": ordered[0] / 1000,
+            "median_us": statistics.median(ordered) / 1000,
+            "mean_us": mean / 1000,
+            "p95_us": ordered[min(int(n * 0.95), n - 1)] / 1000,
+            "stddev_us": (statistics.pstdev(ordered) / 1000) if n > 1 else 0.0,
+            "ops": 1e9 / mean if mean else 0.0,
+        }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        )
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def metadata(**extra) -> dict:
+    return {
+        "commit": git_commit(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        **extra,
+    }
+
+
+def write_results(path, meta: dict, results: dict) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"meta": meta, "benchmarks": results}, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+
+def compare(base: dict, new: dict, threshold: float) -> List[str]:
+    """Return the names of benchmarks whose median slowed by more than ``threshold``."""
+    regressions = []
+    print(f"{'benchmark':<28}{'base us':>12}{'new us':>12}{'change':>10}")
+    for name, new_stats in new["benchmarks"].items():
+        base_stats = base["benchmarks"].get(name)
+        if not base_stats or "median_us" not in base_stats or "median_us" not in new_stats:
+            print(f"{name:<28}{'-':>12}{new_stats.get('median_us', '-')!s:>12}{'n/a':>10}")
+            continue
+        change = new_stats["median_us"] / base_stats["median_us"] - 1
+        flag = "  REGRESSION" if change > threshold else ""
+        print(
+            f"{name:<28}{base_stats['median_us']:>12.1f}{new_stats['median_us']:>12.1f}"
+            f"{change:>+9.1%}{flag}"
+        )
+        if flag:
+            regressions.append(name)
+    return regressions
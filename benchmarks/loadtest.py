@@ -0,0 +1,443 @@
+#!/usr/bin/env python3
+"""Replayable load test for /ask and /ws against a local server.
+
+Traffic comes from a JSONL log (one object per line with at least "q",
+optionally "lang", "sid" and "ts" in seconds) or is synthesized with the
+seeded Zipfian workload from benchmarks.synthetic. Lines without "q" are
+skipped, so unrelated JSONL files simply yield no traffic.
+
+Closed-loop concurrency sweep (find the saturation point of one worker,
+by accepted throughput; requests shed with 429/503 do not count):
+
+    python -m benchmarks.loadtest --start-server --concurrency 1,4,16,64
+
+Workers send from as many loopback addresses as there are workers
+(``--clients``), and a server started here runs without the per-client
+rate limit (``--keep-rate-limit`` keeps it), so the sweep measures
+matching rather than 429s.
+
+Open-loop at a fixed arrival rate, replaying a log with connection reuse off:
+
+    python -m benchmarks.loadtest --log access.jsonl --rate 200 --no-reuse
+
+Overload: drive arrivals well past the saturation point from many
+loopback client addresses (127.0.0.1 ... 127.0.0.N, so the per-client
+rate limit of an already running server does not reject everything) and
+check that requests the server accepts keep a bounded p99 while the
+excess is shed:
+
+    python -m benchmarks.loadtest --start-server --rate 2000 --max-inflight 256 --clients 256
+
+Latency in open-loop mode is measured from each request's scheduled
+arrival time, so queueing inside the client counts against the server
+instead of being hidden (no coordinated omission).
+"""
+
+import argparse
+import asyncio
+import http.client
+import json
+import queue
+import random
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional
+from urllib.parse import quote
+
+from benchmarks.synthetic import generate_queries
+
+LOCAL_HOSTS = {"127.0.0.1", "localhost", "::1"}
+
+
+@dataclass
+class Sample:
+    latency: float
+    ok: bool
+    nbytes: int
+    shed: bool = False  # rejected with a "busy" answer (429/503)
+
+
+@dataclass
+class Result:
+    label: str
+    duration: float
+    samples: List[Sample] = field(default_factory=list)
+
+    def summary(self) -> dict:
+        lat = sorted(s.latency * 1000 for s in self.samples)
+        accepted = sorted(s.latency * 1000 for s in self.samples if s.ok)
+        sizes = sorted(s.nbytes for s in self.samples if s.ok)
+        errors = sum(1 for s in self.samples if not s.ok and not s.shed)
+        shed = sum(1 for s in self.samples if s.shed)
+        n = len(lat)
+
+        def pct(values, p):
+            return values[min(int(len(values) * p), len(values) - 1)] if values else 0
+
+        return {
+            "label": self.label,
+            "requests": n,
+            "throughput_rps": n / self.duration if self.duration else 0.0,
+            "accepted_rps": len(accepted) / self.duration if self.duration else 0.0,
+            "error_rate": errors / n if n else 0.0,
+            "shed_rate": shed / n if n else 0.0,
+            "latency_ms": {p: pct(lat, q) for p, q in
+                           (("p50", 0.5), ("p90", 0.9), ("p99", 0.99), ("max", 1.0))},
+            "accepted_latency_ms": {p: pct(accepted, q) for p, q in (("p50", 0.5), ("p99", 0.99))},
+            "bytes": {p: pct(sizes, q) for p, q in (("p50", 0.5), ("p95", 0.95), ("max", 1.0))},
+        }
+
+
+# -----------------------------
+# Traffic
+# -----------------------------
+
+def load_log(path: str) -> List[dict]:
+    requests = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(record, dict) and record.get("q"):
+                requests.append(record)
+    return requests
+
+
+def synthesize(n: int, seed: int) -> List[dict]:
+    langs = ["hi", "en", "ta", "te", "bn", "mr"]
+    rng = random.Random(seed)
+    return [{"q": q, "lang": rng.choice(langs)} for q in generate_queries(n, seed)]
+
+
+def arrival_offsets(requests: List[dict], rate: float, replay: bool, speed: float, seed: int):
+    """Seconds from start at which each request is sent (open-loop)."""
+    if replay and all("ts" in r for r in requests):
+        t0 = requests[0]["ts"]
+        return [(r["ts"] - t0) / speed for r in requests]
+    # Poisson arrivals at ``rate`` requests per second
+    rng = random.Random(seed)
+    t, offsets = 0.0, []
+    for _ in requests:
+        offsets.append(t)
+        t += rng.expovariate(rate)
+    return offsets
+
+
+def client_address(args, i: int) -> Optional[str]:
+    """Source address of the i-th simulated client; all of 127/8 is loopback."""
+    if args.clients <= 1 or args.host != "127.0.0.1":
+        return None
+    return f"127.0.{(i % args.clients) // 254}.{(i % args.clients) % 254 + 1}"
+
+
+# -----------------------------
+# HTTP /ask
+# -----------------------------
+
+class HttpClient:
+    """One client per worker thread; keeps its connection open when reusing."""
+
+    def __init__(self, host: str, port: int, reuse: bool, timeout: float, source: str = None):
+        self.host, self.port, self.reuse, self.timeout = host, port, reuse, timeout
+        self.source_address = (source, 0) if source else None
+        self.conn: Optional[http.client.HTTPConnection] = None
+
+    def ask(self, record: dict) -> Sample:
+        path = f"/ask?q={quote(record['q'])}&lang={record.get('lang', 'hi')}"
+        if record.get("sid"):
+            path += f"&sid={quote(record['sid'])}"
+        start = time.perf_counter()
+        try:
+            if self.conn is None or not self.reuse:
+                self.conn = http.client.HTTPConnection(
+                    self.host, self.port, timeout=self.timeout, source_address=self.source_address
+                )
+            self.conn.request("GET", path)
+            resp = self.conn.getresponse()
+            body = resp.read()
+            ok = resp.status == 200
+            if not self.reuse:
+                self.conn.close()
+            return Sample(time.perf_counter() - start, ok, len(body), resp.status in (429, 503))
+        except (OSError, http.client.HTTPException):
+            if self.conn is not None:
+                self.conn.close()
+            self.conn = None
+            return Sample(time.perf_counter() - start, False, 0)
+
+
+def http_closed_loop(args, requests: List[dict], concurrency: int) -> Result:
+    work = queue.Queue()
+    for r in requests:
+        work.put(r)
+    samples, lock = [], threading.Lock()
+
+    def worker(i):
+        client = HttpClient(
+            args.host, args.port, not args.no_reuse, args.timeout, client_address(args, i)
+        )
+        local = []
+        while True:
+            try:
+                record = work.get_nowait()
+            except queue.Empty:
+                break
+            local.append(client.ask(record))
+        with lock:
+            samples.extend(local)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return Result(f"http c={concurrency}", time.perf_counter() - start, samples)
+
+
+def http_open_loop(args, requests: List[dict], offsets: List[float]) -> Result:
+    work = queue.Queue()
+    samples, lock = [], threading.Lock()
+    start = time.perf_counter()
+
+    def worker(i):
+        client = HttpClient(
+            args.host, args.port, not args.no_reuse, args.timeout, client_address(args, i)
+        )
+        local = []
+        while True:
+            item = work.get()
+            if item is None:
+                break
+            scheduled, record = item
+            delay = start + scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            sample = client.ask(record)
+            # Charge the time spent waiting for a free worker to the request
+            sample.latency = time.perf_counter() - (start + scheduled)
+            local.append(sample)
+        with lock:
+            samples.extend(local)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(args.max_inflight)]
+    for t in threads:
+        t.start()
+    for offset, record in zip(offsets, requests):
+        work.put((offset, record))
+    for _ in threads:
+        work.put(None)
+    for t in threads:
+        t.join()
+    return Result(f"http rate={args.rate:g}/s", time.perf_counter() - start, samples)
+
+
+# -----------------------------
+# WebSocket /ws
+# -----------------------------
+
+async def _ws_turn(ws, record: dict) -> Sample:
+    start = time.perf_counter()
+    try:
+        await ws.send(json.dumps({k: record[k] for k in ("q", "lang", "sid") if k in record}))
+        frame = await ws.recv()
+        data = json.loads(frame)
+        nbytes = len(frame.encode("utf-8") if isinstance(frame, str) else frame)
+        return Sample(
+            time.perf_counter() - start, "error" not in data, nbytes, data.get("error") == "busy"
+        )
+    except Exception:
+        return Sample(time.perf_counter() - start, False, 0)
+
+
+async def ws_closed_loop(args, requests: List[dict], concurrency: int) -> Result:
+    import websockets
+
+    uri = f"ws://{args.host}:{args.port}/ws"
+    work = asyncio.Queue()
+    for r in requests:
+        work.put_nowait(r)
+    samples = []
+
+    async def worker(i):
+        source = client_address(args, i)
+        async with websockets.connect(uri, local_addr=(source, 0) if source else None) as ws:
+            while not work.empty():
+                samples.append(await _ws_turn(ws, work.get_nowait()))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    return Result(f"ws c={concurrency}", time.perf_counter() - start, samples)
+
+
+async def ws_open_loop(args, requests: List[dict], offsets: List[float]) -> Result:
+    import websockets
+
+    uri = f"ws://{args.host}:{args.port}/ws"
+    idle = asyncio.Queue()
+    conns = []
+    for i in range(args.max_inflight):
+        source = client_address(args, i)
+        conns.append(await websockets.connect(uri, local_addr=(source, 0) if source else None))
+    for ws in conns:
+        idle.put_nowait(ws)
+    samples = []
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+
+    async def fire(offset, record):
+        await asyncio.sleep(max(0.0, start + offset - loop.time()))
+        ws = await idle.get()
+        sample = await _ws_turn(ws, record)
+        sample.latency = loop.time() - (start + offset)
+        samples.append(sample)
+        idle.put_nowait(ws)
+
+    await asyncio.gather(*(fire(o, r) for o, r in zip(offsets, requests)))
+    for ws in conns:
+        await ws.close()
+    return Result(f"ws rate={args.rate:g}/s", loop.time() - start, samples)
+
+
+# -----------------------------
+# Server and reporting
+# -----------------------------
+
+# Run by the spawned server. The repo root holds the fastapi test stub, so
+# the installed fastapi is imported before the root goes on sys.path.
+_SERVER = """
+import os, sys
+root = os.getcwd()
+sys.path[:] = [p for p in sys.path if p not in ("", root)]
+import fastapi, uvicorn
+sys.path.insert(0, root)
+from src.config import config
+if {no_rate_limit}:
+    config.admission.RATE_LIMIT_PER_SECOND = 0
+uvicorn.run("src.main:app", host={host!r}, port={port}, log_level="warning")
+"""
+
+
+def start_server(args) -> subprocess.Popen:
+    proc = subprocess.Popen([
+        sys.executable, "-c",
+        _SERVER.format(no_rate_limit=not args.keep_rate_limit, host=args.host, port=args.port),
+    ])
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection(args.host, args.port, timeout=1)
+            conn.request("GET", "/ping")
+            if conn.getresponse().status == 200:
+                return proc
+        except OSError:
+            time.sleep(0.2)
+    proc.terminate()
+    raise SystemExit("server did not become ready within 30s")
+
+
+def print_summary(s: dict):
+    lat, size = s["latency_ms"], s["bytes"]
+    print(
+        f"{s['label']:<18}{s['throughput_rps']:>9.0f} rps ({s['accepted_rps']:.0f} ok)  "
+        f"p50 {lat['p50']:>7.2f}  p90 {lat['p90']:>7.2f}  p99 {lat['p99']:>8.2f}  "
+        f"max {lat['max']:>8.2f} ms  err {s['error_rate']:>6.2%}  shed {s['shed_rate']:>6.2%}  "
+        f"accepted p99 {s['accepted_latency_ms']['p99']:>8.2f} ms  "
+        f"bytes p50/p95/max {size['p50']}/{size['p95']}/{size['max']}"
+    )
+
+
+def saturation(summaries: List[dict]) -> Optional[dict]:
+    """
+    First sweep step after which accepted (2xx) throughput grows by less
+    than 5%; fast 429/503 answers would otherwise look like capacity.
+    """
+    for prev, cur in zip(summaries, summaries[1:]):
+        if cur["accepted_rps"] < prev["accepted_rps"] * 1.05:
+            return prev
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--protocol", choices=["http", "ws"], default="http")
+    parser.add_argument("--log", help="JSONL traffic log to replay (default: synthesize)")
+    parser.add_argument("--requests", type=int, default=2000, help="synthesized request count")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--concurrency", default="1,4,16,64", help="closed-loop sweep levels")
+    parser.add_argument("--rate", type=float, help="open-loop arrival rate (requests/s)")
+    parser.add_argument("--replay-timing", action="store_true",
+                        help="open-loop using the log's own 'ts' gaps")
+    parser.add_argument("--speed", type=float, default=1.0, help="replay speed-up factor")
+    parser.add_argument("--max-inflight", type=int, default=64, help="open-loop client slots")
+    parser.add_argument("--no-reuse", action="store_true", help="new HTTP connection per request")
+    parser.add_argument("--clients", type=int,
+                        help="spread workers over this many loopback source addresses "
+                             "(default: one per worker)")
+    parser.add_argument("--timeout", type=float, default=5.0)
+    parser.add_argument("--start-server", action="store_true", help="spawn uvicorn locally")
+    parser.add_argument("--keep-rate-limit", action="store_true",
+                        help="spawned server keeps the per-client rate limit")
+    parser.add_argument("--json", help="also write summaries to this file")
+    args = parser.parse_args()
+
+    if args.host not in LOCAL_HOSTS:
+        parser.error("load tests only run against localhost")
+
+    open_loop = bool(args.rate or args.replay_timing)
+    levels = [int(c) for c in args.concurrency.split(",")]
+    if args.clients is None:
+        args.clients = args.max_inflight if open_loop else max(levels)
+
+    requests = load_log(args.log) if args.log else synthesize(args.requests, args.seed)
+    if not requests:
+        parser.error(f"no replayable requests (objects with a 'q' field) in {args.log}")
+
+    server = start_server(args) if args.start_server else None
+    summaries = []
+    try:
+        if open_loop:
+            offsets = arrival_offsets(
+                requests, args.rate or 1.0, args.replay_timing, args.speed, args.seed
+            )
+            if args.protocol == "http":
+                result = http_open_loop(args, requests, offsets)
+            else:
+                result = asyncio.run(ws_open_loop(args, requests, offsets))
+            summaries.append(result.summary())
+            print_summary(summaries[-1])
+        else:
+            for level in levels:
+                if args.protocol == "http":
+                    result = http_closed_loop(args, requests, level)
+                else:
+                    result = asyncio.run(ws_closed_loop(args, requests, level))
+                summaries.append(result.summary())
+                print_summary(summaries[-1])
+            knee = saturation(summaries)
+            if knee:
+                print(f"saturation near {knee['label']} "
+                      f"({knee['accepted_rps']:.0f} accepted rps, "
+                      f"p99 {knee['latency_ms']['p99']:.2f} ms)")
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(summaries, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Benchmark suites. Each suite receives a Benchmark and the shared Context."""
+
+import itertools
+import json
+import os
+import random
+import tempfile
+from typing import Callable, Dict
+
+from benchmarks.harness import Benchmark, Context
+
+SUITES: Dict[str, Callable[[Benchmark, Context], None]] = {}
+
+
+def suite(name: str):
+    def register(fn):
+        SUITES[name] = fn
+        return fn
+
+    return register
+
+
+@suite("match_schemes")
+def bench_match_schemes(benchmark: Benchmark, ctx: Context):
+    from src.matcher import match_schemes
+
+    queries = itertools.cycle(ctx.queries)
+    benchmark(lambda: match_schemes(next(queries), ctx.schemes, 3))
+
+
+@suite("process_query")
+def bench_process_query(benchmark: Benchmark, ctx: Context):
+    """Front stage on normal queries mixed with adversarial long inputs."""
+    from benchmarks.synthetic import adversarial_queries
+    from src.query_processor import process_query
+
+    queries = itertools.cycle(ctx.queries[:900] + adversarial_queries(100, ctx.seed))
+    benchmark(lambda: process_query(next(queries)))
+
+
+@suite("retriever_search")
+def bench_retriever_search(benchmark: Benchmark, ctx: Context):
+    from scheme_database import SchemeDatabase
+    from scheme_retriever import SchemeRetriever
+
+    retriever = SchemeRetriever(SchemeDatabase.from_records(ctx.schemes))
+    queries = itertools.cycle(ctx.queries)
+    benchmark(lambda: retriever.search(next(queries)))
+
+
+@suite("database_get_by_id")
+def bench_get_by_id(benchmark: Benchmark, ctx: Context):
+    from scheme_database import SchemeDatabase
+
+    db = SchemeDatabase.from_records(ctx.schemes)
+    rng = random.Random(ctx.seed)
+    ids = itertools.cycle([rng.choice(ctx.schemes)["id"] for _ in range(1000)])
+    benchmark(lambda: db.get_by_id(next(ids)))
+
+
+@suite("response_generate")
+def bench_response_generate(benchmark: Benchmark, ctx: Context):
+    from benchmarks.synthetic import LANGUAGES
+    from response_generator import ResponseGenerator
+
+    generator = ResponseGenerator(ctx.schemes)
+    rng = random.Random(ctx.seed)
+    calls = itertools.cycle([
+        (rng.sample(ctx.schemes, 3), LANGUAGES[i % len(LANGUAGES)]) for i in range(600)
+    ])
+    benchmark(lambda: generator.generate(*next(calls)))
+
+
+@suite("ask")
+def bench_ask(benchmark: Benchmark, ctx: Context):
+    """Full /ask path through the test client, on the synthetic catalogue."""
+    from urllib.parse import quote
+
+    from src.config import config
+
+    # The catalogue path is bound when src.main is first imported; load it
+    # before the temporary file goes away
+    fd, path = tempfile.mkstemp(suffix=".json")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(ctx.schemes, f, ensure_ascii=False)
+    config.SCHEME_DATA_PATH = path
+    try:
+        from fastapi.testclient import TestClient
+        from src.main import app, catalogue
+        catalogue.load()
+    finally:
+        os.unlink(path)
+
+    client = TestClient(app)
+    langs = itertools.cycle(["hi", "en", "ta", "te", "bn", "mr"])
+    urls = itertools.cycle([f"/ask?q={quote(q)}&lang={next(langs)}" for q in ctx.queries])
+    benchmark(lambda: client.get(next(urls)))
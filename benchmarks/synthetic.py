@@ -0,0 +1,237 @@
+"""Seeded synthetic scheme catalogues and query workloads.
+
+Records follow the layout of ``data/schemes.json`` (see
+``scheme_schema.json``): an ``id``, a ``category``, per-language
+``name_*``/``description_*``/``eligibility_*``/``benefits_*`` fields,
+a ``source`` and romanized ``tags``. The same seed always yields the
+same catalogue and workload, so results are comparable across commits.
+"""
+
+import itertools
+import random
+from typing import Dict, List
+
+LANGUAGES = ("hi", "en", "ta", "te", "bn", "mr")
+
+# topic -> (category, romanized tag, word per language)
+TOPICS = {
+    "farmer": ("financial_aid", "kisan", {
+        "hi": "किसान", "en": "farmer", "ta": "விவசாயி", "te": "రైతు", "bn": "কৃষক", "mr": "शेतकरी",
+    }),
+    "student": ("education", "student", {
+        "hi": "छात्र", "en": "student", "ta": "மாணவர்", "te": "విద్యార్థి", "bn": "ছাত্র", "mr": "विद्यार्थी",
+    }),
+    "women": ("welfare", "women", {
+        "hi": "महिला", "en": "women", "ta": "பெண்கள்", "te": "మహిళలు", "bn": "মহিলা", "mr": "महिला",
+    }),
+    "health": ("healthcare", "health", {
+        "hi": "स्वास्थ्य", "en": "health", "ta": "சுகாதாரம்", "te": "ఆరోగ్యం", "bn": "স্বাস্থ্য",
+        "mr": "आरोग्य",
+    }),
+    "insurance": ("healthcare", "insurance", {
+        "hi": "बीमा", "en": "insurance", "ta": "காப்பீடு", "te": "బీమా", "bn": "বিমা", "mr": "विमा",
+    }),
+    "pension": ("financial_aid", "pension", {
+        "hi": "पेंशन", "en": "pension", "ta": "ஓய்வூதியம்", "te": "పెన్షన్", "bn": "পেনশন",
+        "mr": "निवृत्तीवेतन",
+    }),
+    "housing": ("housing", "awas", {
+        "hi": "आवास", "en": "housing", "ta": "வீட்டுவசதி", "te": "గృహ", "bn": "আবাসন", "mr": "घरकुल",
+    }),
+    "education": ("education", "shiksha", {
+        "hi": "शिक्षा", "en": "education", "ta": "கல்வி", "te": "విద్య", "bn": "শিক্ষা", "mr": "शिक्षण",
+    }),
+    "loan": ("financial_aid", "loan", {
+        "hi": "ऋण", "en": "loan", "ta": "கடன்", "te": "రుణం", "bn": "ঋণ", "mr": "कर्ज",
+    }),
+    "scholarship": ("education", "scholarship", {
+        "hi": "छात्रवृत्ति", "en": "scholarship", "ta": "உதவித்தொகை", "te": "ఉపకార వేతనం",
+        "bn": "বৃত্তি", "mr": "शिष्यवृत्ती",
+    }),
+    "employment": ("employment", "rozgar", {
+        "hi": "रोजगार", "en": "employment", "ta": "வேலைவாய்ப்பு", "te": "ఉపాధి", "bn": "কর্মসংস্থান",
+        "mr": "रोजगार",
+    }),
+    "senior": ("welfare", "senior", {
+        "hi": "वरिष्ठ नागरिक", "en": "senior citizen", "ta": "மூத்த குடிமக்கள்", "te": "వృద్ధులు",
+        "bn": "প্রবীণ নাগরিক", "mr": "ज्येष्ठ नागरिक",
+    }),
+}
+
+PREFIXES = {
+    "hi": ["प्रधानमंत्री", "राष्ट्रीय", "मुख्यमंत्री", "ग्रामीण", "राज्य"],
+    "en": ["Pradhan Mantri", "National", "Chief Minister", "Rural", "State"],
+    "ta": ["பிரதமர்", "தேசிய", "முதலமைச்சர்", "கிராமப்புற", "மாநில"],
+    "te": ["ప్రధానమంత్రి", "జాతీయ", "ముఖ్యమంత్రి", "గ్రామీణ", "రాష్ట్ర"],
+    "bn": ["প্রধানমন্ত্রী", "জাতীয়", "মুখ্যমন্ত্রী", "গ্রামীণ", "রাজ্য"],
+    "mr": ["प्रधानमंत्री", "राष्ट्रीय", "मुख्यमंत्री", "ग्रामीण", "राज्य"],
+}
+
+SCHEME_WORD = {
+    "hi": "योजना", "en": "Scheme", "ta": "திட்டம்", "te": "పథకం", "bn": "প্রকল্প", "mr": "योजना",
+}
+
+SUPPORT_WORD = {
+    "hi": "सहायता", "en": "support", "ta": "உதவி", "te": "సహాయం", "bn": "সহায়তা", "mr": "मदत",
+}
+
+ELIGIBLE_WORD = {
+    "hi": "पात्र", "en": "eligible", "ta": "தகுதியான", "te": "అర్హత గల", "bn": "যোগ্য",
+    "mr": "पात्र",
+}
+
+SOURCES = [
+    "Ministry of Finance", "Ministry of Education", "Ministry of Agriculture",
+    "Ministry of Health and Family Welfare", "Ministry of Rural Development",
+]
+
+
+def generate_schemes(n: int, seed: int = 0) -> List[Dict]:
+    """Generate ``n`` scheme records deterministically from ``seed``."""
+    rng = random.Random(seed)
+    topics = list(TOPICS)
+    schemes = []
+    for i in range(n):
+        picked = rng.sample(topics, rng.randint(1, 3))
+        category = TOPICS[picked[0]][0]
+        prefix = rng.randrange(len(PREFIXES["en"]))
+        amount = rng.choice([1000, 2000, 5000, 6000, 10000, 50000, 500000])
+
+        scheme = {"id": f"{category[:4]}_{i:06d}", "category": category}
+        for lang in LANGUAGES:
+            words = [TOPICS[t][2][lang] for t in picked]
+            topic_text = " ".join(words)
+            scheme[f"name_{lang}"] = (
+                f"{PREFIXES[lang][prefix]} {topic_text} {SCHEME_WORD[lang]} {i}"
+            )
+            scheme[f"description_{lang}"] = (
+                f"{topic_text} {SUPPORT_WORD[lang]} {SCHEME_WORD[lang]}. " * rng.randint(1, 4)
+            ).strip()
+            scheme[f"eligibility_{lang}"] = f"{ELIGIBLE_WORD[lang]} {words[-1]}"
+            scheme[f"benefits_{lang}"] = f"₹{amount} {SUPPORT_WORD[lang]}"
+        scheme["source"] = rng.choice(SOURCES)
+        scheme["tags"] = [TOPICS[t][1] for t in picked]
+        schemes.append(scheme)
+    return schemes
+
+
+def query_pool(seed: int = 0, size: int = 500) -> List[str]:
+    """Distinct queries mixing Indic script, English and romanized tags."""
+    rng = random.Random(seed)
+    vocab = {lang: [TOPICS[t][2][lang] for t in TOPICS] for lang in LANGUAGES}
+    vocab["romanized"] = [TOPICS[t][1] for t in TOPICS]
+
+    pool = []
+    seen = set()
+    for lang in itertools.cycle(list(vocab)):
+        if len(pool) >= size:
+            break
+        words = rng.sample(vocab[lang], rng.randint(1, 3))
+        if rng.random() < 0.5 and lang in SCHEME_WORD:
+            words.append(SCHEME_WORD[lang].lower())
+        query = " ".join(words)
+        if query not in seen:
+            seen.add(query)
+            pool.append(query)
+        elif len(seen) > size * 10:
+            break
+    return pool
+
+
+def generate_queries(n: int, seed: int = 0, pool_size: int = 500, s: float = 1.1) -> List[str]:
+    """
+    Draw ``n`` queries with Zipfian repetition: the query of rank k is
+    picked with probability proportional to 1 / k**s.
+    """
+    pool = query_pool(seed, pool_size)
+    weights = [1 / (k ** s) for k in range(1, len(pool) + 1)]
+    return random.Random(seed + 1).choices(pool, weights=weights, k=n)
+
+
+def adversarial_queries(n: int, seed: int = 0) -> List[str]:
+    """
+    Oversized inputs of ~100K characters: repeated words, one giant word, mixed
+    scripts, punctuation runs and long lists of distinct words.
+    """
+    rng = random.Random(seed)
+    vocab = [word for t in TOPICS.values() for word in t[2].values()]
+    shapes = [
+        lambda: " ".join([rng.choice(vocab)] * 20_000),
+        lambda: "a" * 100_000,
+        lambda: " ".join(rng.choice(vocab) for _ in range(15_000)),
+        lambda: "!?,. " * 20_000,
+        lambda: " ".join(f"w{i}" for i in range(20_000)),
+    ]
+    return [shapes[i % len(shapes)]() for i in range(n)]
+
+
+OCCUPATIONS = ["farmer", "student", "labourer", "artisan", "fisher", "vendor"]
+STATES = ["up", "mh", "bh", "wb", "tn", "ap", "rj", "mp", "ka", "gj"]
+
+
+def random_profile(rng: random.Random) -> Dict:
+    """A user attribute set as sent to /eligible; each attribute may be missing."""
+    profile = {
+        "age": rng.randint(10, 80),
+        "income": rng.choice([0, 50_000, 120_000, 250_000, 600_000, 1_500_000]),
+        "occupation": rng.choice(OCCUPATIONS),
+        "gender": rng.choice(["female", "male"]),
+        "state": rng.choice(STATES),
+    }
+    return {k: v for k, v in profile.items() if rng.random() < 0.8}
+
+
+def add_eligibility_rules(schemes: List[Dict], seed: int = 0) -> List[Dict]:
+    """Attach random ``eligibility_rules`` (see ``src.eligibility``) in place."""
+    rng = random.Random(seed)
+    for scheme in schemes:
+        rules = {}
+        if rng.random() < 0.5:
+            rules["min_age"] = rng.choice([14, 18, 21, 40, 60])
+        if rng.random() < 0.3:
+            rules["max_age"] = rng.choice([25, 30, 40, 59])
+        if rng.random() < 0.4:
+            rules["max_income"] = rng.choice([100_000, 250_000, 800_000])
+        if rng.random() < 0.4:
+            rules["occupation"] = rng.sample(OCCUPATIONS, rng.randint(1, 2))
+        if rng.random() < 0.2:
+            rules["gender"] = ["female"]
+        if rng.random() < 0.5:
+            rules["state"] = rng.sample(STATES, rng.randint(1, 3))
+        if rules:
+            scheme["eligibility_rules"] = rules
+    return schemes
+
+
+DOCUMENTS = [
+    "aadhaar", "bank_passbook", "income_certificate", "land_records", "marksheet",
+    "photo", "ration_card", "caste_certificate", "domicile_certificate", "voter_id",
+]
+
+
+def add_documents(schemes: List[Dict], seed: int = 0) -> List[Dict]:
+    """Attach random ``required_documents`` and ``application_steps`` in place."""
+    rng = random.Random(seed)
+    for scheme in schemes:
+        # Aadhaar is nearly universal; the rest are drawn from a short list
+        docs = ["aadhaar"] if rng.random() < 0.9 else []
+        docs += rng.sample(DOCUMENTS[1:], rng.choice([0, 1, 1, 2, 2, 3, 4]))
+        scheme["required_documents"] = docs
+        scheme["application_steps"] = [
+            {"hi": f"चरण {i} पूरा करें", "en": f"Complete step {i}"}
+            for i in range(1, rng.randint(2, 6))
+        ]
+    return schemes
+
+
+def add_states(schemes: List[Dict], central_share: float = 0.2, seed: int = 0) -> List[Dict]:
+    """
+    Assign each scheme a ``state`` in place, leaving ``central_share`` of
+    them central (no state); larger states get more schemes.
+    """
+    rng = random.Random(seed)
+    weights = [1 / (i + 1) for i in range(len(STATES))]
+    for scheme in schemes:
+        if rng.random() >= central_share:
+            scheme["state"] = rng.choices(STATES, weights)[0]
+    return schemes
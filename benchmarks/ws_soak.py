@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""Soak test: many mostly idle /ws connections against one local worker.
+
+Opens ``--connections`` sockets, keeps them alive with ``{"t": "ping"}``
+heartbeats, and meanwhile runs closed-loop queries on ``--active`` of
+them. Reports the server's memory per open connection (resident set
+growth, read from /proc, so Linux only) and query latency under that
+connection load, and checks that no connection was dropped.
+
+    python -m benchmarks.ws_soak --start-server --connections 10000 --seconds 120
+
+Each socket is a file descriptor on both sides, so the soft open-file
+limit is raised to the hard limit; raise the hard limit (``ulimit -Hn``)
+if it is below twice the connection count. Connections are spread over
+many loopback source addresses, as in ``benchmarks.loadtest``, so the
+per-client rate limit only applies per simulated client.
+"""
+
+import argparse
+import asyncio
+import http.client
+import json
+import random
+import time
+
+from benchmarks.loadtest import (
+    LOCAL_HOSTS,
+    Result,
+    Sample,
+    client_address,
+    print_summary,
+    start_server,
+    synthesize,
+)
+
+
+def raise_open_files_limit() -> int:
+    import resource
+
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+    return hard
+
+
+def rss_bytes(pid: int) -> int:
+    with open(f"/proc/{pid}/status", encoding="ascii") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024
+    return 0
+
+
+def server_gauge(args, name: str) -> float:
+    conn = http.client.HTTPConnection(args.host, args.port, timeout=5)
+    conn.request("GET", "/metrics")
+    for line in conn.getresponse().read().decode("utf-8").splitlines():
+        if line.startswith(name + " ") or line.startswith(name + "{"):
+            return float(line.rsplit(" ", 1)[1])
+    return 0.0
+
+
+async def open_connections(args, n: int) -> list:
+    import websockets
+
+    uri = f"ws://{args.host}:{args.port}/ws"
+    gate = asyncio.Semaphore(args.open_concurrency)
+
+    async def one(i):
+        source = client_address(args, i)
+        async with gate:
+            try:
+                # The server's heartbeat is the {"t": "ping"} below; no protocol pings
+                return await websockets.connect(
+                    uri, local_addr=(source, 0) if source else None, ping_interval=None,
+                )
+            except Exception:
+                return None
+
+    return await asyncio.gather(*(one(i) for i in range(n)))
+
+
+async def heartbeats(conns: list, interval: float, stop: asyncio.Event) -> None:
+    """Ping every connection once per ``interval``, spread evenly over it."""
+    ping = json.dumps({"t": "ping"})
+    while not stop.is_set():
+        started = time.perf_counter()
+        for i, ws in enumerate(conns):
+            if stop.is_set():
+                return
+            try:
+                await ws.send(ping)
+            except Exception:
+                pass  # counted as dropped at the end
+            if i % 100 == 99:
+                await asyncio.sleep(interval * 100 / len(conns))
+        await asyncio.sleep(max(0.0, interval - (time.perf_counter() - started)))
+
+
+async def active_client(ws, requests: list, samples: list, stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        record = random.choice(requests)
+        start = time.perf_counter()
+        try:
+            await ws.send(json.dumps({"q": record["q"], "lang": record["lang"]}))
+            frame = await ws.recv()
+            data = json.loads(frame)
+            samples.append(Sample(
+                time.perf_counter() - start, "error" not in data, len(frame.encode("utf-8")),
+                data.get("error") == "busy",
+            ))
+        except Exception:
+            samples.append(Sample(time.perf_counter() - start, False, 0))
+            return
+
+
+async def soak(args, pid: int) -> None:
+    before = rss_bytes(pid) if pid else 0
+    start = time.perf_counter()
+    conns = await open_connections(args, args.connections)
+    opened = [ws for ws in conns if ws is not None]
+    print(f"opened {len(opened):,} of {args.connections:,} connections "
+          f"in {time.perf_counter() - start:.1f} s")
+    if pid:
+        await asyncio.sleep(1.0)  # let the server finish the handshakes
+        grown = rss_bytes(pid) - before
+        print(f"server RSS {before / 2**20:.0f} MB -> {(before + grown) / 2**20:.0f} MB: "
+              f"{grown / max(1, len(opened)) / 1024:.1f} KB per connection")
+
+    stop = asyncio.Event()
+    samples = []
+    requests = synthesize(2000, args.seed)
+    active, idle = opened[:args.active], opened[args.active:]
+    tasks = [asyncio.ensure_future(heartbeats(idle, args.heartbeat, stop))]
+    tasks += [asyncio.ensure_future(active_client(ws, requests, samples, stop)) for ws in active]
+    await asyncio.sleep(args.seconds)
+    stop.set()
+    await asyncio.gather(*tasks)
+
+    result = Result(f"ws soak n={len(opened)}", args.seconds, samples)
+    print_summary(result.summary())
+    still_open = server_gauge(args, "ws_connections")
+    print(f"server reports {still_open:,.0f} open connections after {args.seconds:.0f} s "
+          f"({len(opened) - still_open:,.0f} dropped)")
+    if pid:
+        print(f"server RSS at the end: {rss_bytes(pid) / 2**20:.0f} MB")
+    await asyncio.gather(*(ws.close() for ws in opened), return_exceptions=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--connections", type=int, default=10_000)
+    parser.add_argument("--active", type=int, default=20, help="connections sending queries")
+    parser.add_argument("--seconds", type=float, default=120.0, help="soak duration")
+    parser.add_argument("--heartbeat", type=float, default=30.0, help="seconds between pings")
+    parser.add_argument("--open-concurrency", type=int, default=200)
+    parser.add_argument("--clients", type=int, default=1000,
+                        help="spread connections over this many loopback source addresses")
+    parser.add_argument("--pid", type=int, help="server PID for RSS (implied by --start-server)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--start-server", action="store_true", help="spawn uvicorn locally")
+    args = parser.parse_args()
+
+    if args.host not in LOCAL_HOSTS:
+        parser.error("soak tests only run against localhost")
+    limit = raise_open_files_limit()
+    if limit < args.connections + 100:
+        parser.error(f"open-file limit {limit} is too low for {args.connections} connections")
+
+    server = start_server(args) if args.start_server else None
+    try:
+        asyncio.run(soak(args, server.pid if server else args.pid))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
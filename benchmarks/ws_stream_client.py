@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Time-to-first-byte and bytes on the wire for streamed vs one-shot /ws turns.
+
+Start the server first:
+
+    python -m uvicorn src.main:app --host 127.0.0.1 --port 8001
+    python benchmarks/ws_stream_client.py --clients 20 --turns 50
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+import websockets
+
+QUERIES = ["health insurance", "kisan", "scholarship student", "pension", "education women"]
+
+
+async def one_client(uri: str, turns: int, stream: bool, results: list):
+    async with websockets.connect(uri) as ws:
+        for i in range(turns):
+            payload = {"q": QUERIES[i % len(QUERIES)], "lang": "hi"}
+            if stream:
+                payload["stream"] = True
+
+            start = time.perf_counter()
+            await ws.send(json.dumps(payload))
+            first = None
+            total_bytes = 0
+            while True:
+                frame = await ws.recv()
+                if first is None:
+                    first = time.perf_counter() - start
+                total_bytes += len(frame.encode("utf-8") if isinstance(frame, str) else frame)
+                # One-shot turns are a single frame; streamed turns end on "final"
+                if not stream or json.loads(frame).get("t") == "final":
+                    break
+            results.append((first, time.perf_counter() - start, total_bytes))
+
+
+def pct(values: list, p: float) -> float:
+    values = sorted(values)
+    return values[min(int(len(values) * p), len(values) - 1)]
+
+
+async def run(uri: str, clients: int, turns: int, stream: bool) -> list:
+    results = []
+    await asyncio.gather(*(one_client(uri, turns, stream, results) for _ in range(clients)))
+    return results
+
+
+def report(label: str, results: list):
+    ttfb = [r[0] * 1000 for r in results]
+    total = [r[1] * 1000 for r in results]
+    sizes = [r[2] for r in results]
+    print(
+        f"{label:<9} ttfb p50={pct(ttfb, 0.5):.2f}ms p95={pct(ttfb, 0.95):.2f}ms  "
+        f"done p50={pct(total, 0.5):.2f}ms p95={pct(total, 0.95):.2f}ms  "
+        f"bytes/turn={statistics.mean(sizes):.0f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--uri", default="ws://127.0.0.1:8001/ws")
+    parser.add_argument("--clients", type=int, default=10)
+    parser.add_argument("--turns", type=int, default=50)
+    args = parser.parse_args()
+
+    for stream in (False, True):
+        results = asyncio.run(run(args.uri, args.clients, args.turns, stream))
+        report("stream" if stream else "one-shot", results)
+
+
+if __name__ == "__main__":
+    main()
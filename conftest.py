@@ -0,0 +1,20 @@
+"""Hypothesis profiles for the property tests.
+
+Pick one with ``HYPOTHESIS_PROFILE`` (or ``--hypothesis-profile``):
+``ci`` (default) keeps the suite quick, ``dev`` and ``thorough`` run more
+examples per property.
+"""
+
+import os
+
+try:
+    from hypothesis import settings
+except ImportError:  # the property tests skip themselves
+    settings = None
+
+if settings is not None:
+    # Catalogue builds vary a lot in time on shared machines; no per-example deadline
+    settings.register_profile("ci", max_examples=30, deadline=None)
+    settings.register_profile("dev", max_examples=100, deadline=None)
+    settings.register_profile("thorough", max_examples=2000, deadline=None)
+    settings.load_profile(os.getenv("HYPOTHESIS_PROFILE", "ci"))
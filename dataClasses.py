@@ -8,10 +8,9 @@ optimized for low-bandwidth operation and multi-language support.
 from __future__ import annotations
 
 from dataclasses import dataclass, field
+from datetime import datetime
 from enum import Enum
 from typing import Any, Dict, List, Optional
-from datetime import datetime
-
 
 # -----------------------------
 # Query Processing Models
@@ -36,6 +35,7 @@ class ProcessedQuery:
     status: QueryStatus
     detected_language: Optional[str]
     character_count: int
+    tokens: List[str] = field(default_factory=list)  # Deduplicated, in query order
 
 
 # -----------------------------
@@ -134,11 +134,11 @@ class SessionRecord:
     created_at: datetime
     last_activity: datetime
     language: str
-    
+
     # Context (no personal information)
     mentioned_scheme_ids: List[str]
     user_category: Optional[str]  # e.g., "farmer", "student"
     conversation_turns: int
-    
+
     # Compressed history (last N turns only)
     recent_intents: List[str]
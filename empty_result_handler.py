@@ -1,50 +1,111 @@
+from itertools import product
+
+
 class EmptyResultHandler:
     """
     Handles cases where no schemes match the user's query.
+
+    Every fallback (language x which entities are known) is built once in
+    __init__, so handle() is a dictionary lookup.
     """
 
     CATEGORY_SUGGESTIONS = {
         "education": {
             "hi": "शिक्षा से जुड़ी योजनाएँ",
-            "en": "education-related schemes"
+            "en": "education-related schemes",
+            "ta": "கல்வி தொடர்பான திட்டங்கள்",
+            "te": "విద్యకు సంబంధించిన పథకాలు",
+            "bn": "শিক্ষা সম্পর্কিত প্রকল্প",
+            "mr": "शिक्षणाशी संबंधित योजना"
         },
         "healthcare": {
             "hi": "स्वास्थ्य से जुड़ी योजनाएँ",
-            "en": "healthcare-related schemes"
+            "en": "healthcare-related schemes",
+            "ta": "சுகாதாரம் தொடர்பான திட்டங்கள்",
+            "te": "ఆరోగ్యానికి సంబంధించిన పథకాలు",
+            "bn": "স্বাস্থ্য সম্পর্কিত প্রকল্প",
+            "mr": "आरोग्याशी संबंधित योजना"
         },
         "financial_aid": {
             "hi": "वित्तीय सहायता योजनाएँ",
-            "en": "financial aid schemes"
+            "en": "financial aid schemes",
+            "ta": "நிதி உதவித் திட்டங்கள்",
+            "te": "ఆర్థిక సహాయ పథకాలు",
+            "bn": "আর্থিক সহায়তা প্রকল্প",
+            "mr": "आर्थिक सहाय्य योजना"
         }
     }
 
     CLARIFYING_QUESTIONS = {
         "category": {
             "hi": "क्या आप शिक्षा, स्वास्थ्य या वित्तीय सहायता से जुड़ी योजना ढूंढ रहे हैं?",
-            "en": "Are you looking for education, healthcare, or financial aid schemes?"
+            "en": "Are you looking for education, healthcare, or financial aid schemes?",
+            "ta": "நீங்கள் கல்வி, சுகாதாரம் அல்லது நிதி உதவி தொடர்பான திட்டத்தைத் தேடுகிறீர்களா?",
+            "te": "మీరు విద్య, ఆరోగ్యం లేదా ఆర్థిక సహాయానికి సంబంధించిన పథకం కోసం చూస్తున్నారా?",
+            "bn": "আপনি কি শিক্ষা, স্বাস্থ্য বা আর্থিক সহায়তা সম্পর্কিত প্রকল্প খুঁজছেন?",
+            "mr": "तुम्ही शिक्षण, आरोग्य किंवा आर्थिक सहाय्याशी संबंधित योजना शोधत आहात का?"
         },
         "demographic": {
             "hi": "यह योजना किसके लिए है? (छात्र, किसान, महिला, वरिष्ठ नागरिक)",
-            "en": "Who is this scheme for? (student, farmer, women, senior citizen)"
+            "en": "Who is this scheme for? (student, farmer, women, senior citizen)",
+            "ta": "இந்தத் திட்டம் யாருக்காக? (மாணவர், விவசாயி, பெண்கள், மூத்த குடிமக்கள்)",
+            "te": "ఈ పథకం ఎవరి కోసం? (విద్యార్థి, రైతు, మహిళలు, వృద్ధులు)",
+            "bn": "এই প্রকল্পটি কার জন্য? (ছাত্র, কৃষক, মহিলা, প্রবীণ নাগরিক)",
+            "mr": "ही योजना कोणासाठी आहे? (विद्यार्थी, शेतकरी, महिला, ज्येष्ठ नागरिक)"
         }
     }
 
+    INTRO = {
+        "hi": ("माफ़ कीजिए, आपकी खोज से कोई योजना नहीं मिली।",
+               "आप इन श्रेणियों की योजनाएँ देख सकते हैं:"),
+        "en": ("Sorry, no schemes matched your query.",
+               "You may explore schemes in these categories:"),
+        "ta": ("மன்னிக்கவும், உங்கள் தேடலுக்கு எந்தத் திட்டமும் கிடைக்கவில்லை.",
+               "இந்த வகைகளில் உள்ள திட்டங்களைப் பார்க்கலாம்:"),
+        "te": ("క్షమించండి, మీ శోధనకు ఏ పథకమూ దొరకలేదు.",
+               "మీరు ఈ వర్గాల పథకాలను చూడవచ్చు:"),
+        "bn": ("দুঃখিত, আপনার অনুসন্ধানে কোনো প্রকল্প পাওয়া যায়নি।",
+               "আপনি এই বিভাগগুলির প্রকল্প দেখতে পারেন:"),
+        "mr": ("माफ करा, तुमच्या शोधाशी जुळणारी कोणतीही योजना सापडली नाही.",
+               "तुम्ही या श्रेणींमधील योजना पाहू शकता:"),
+    }
+
+    DEFAULT_LANGUAGE = "hi"
+
+    def __init__(self):
+        # (lang, has_category, has_demographic) -> fallback response
+        self._responses = {
+            (lang, has_category, has_demographic): self._build(lang, has_category, has_demographic)
+            for lang, has_category, has_demographic
+            in product(self.INTRO, (False, True), (False, True))
+        }
+
     def handle(self, entities: dict = None, lang: str = "hi") -> dict:
         """
         Generate fallback response when no schemes are found.
         """
         entities = entities or {}
+        if lang not in self.INTRO:
+            lang = self.DEFAULT_LANGUAGE
+
+        response = self._responses[
+            (lang, bool(entities.get("category")), bool(entities.get("demographic")))
+        ]
+        return {
+            "message": response["message"],
+            "suggested_categories": list(response["suggested_categories"]),
+            "clarifying_questions": list(response["clarifying_questions"])
+        }
 
-        suggestions = []
-        for key, value in self.CATEGORY_SUGGESTIONS.items():
-            suggestions.append(value[lang])
+    def _build(self, lang: str, has_category: bool, has_demographic: bool) -> dict:
+        suggestions = [value[lang] for value in self.CATEGORY_SUGGESTIONS.values()]
 
         questions = []
 
-        if not entities.get("category"):
+        if not has_category:
             questions.append(self.CLARIFYING_QUESTIONS["category"][lang])
 
-        if not entities.get("demographic"):
+        if not has_demographic:
             questions.append(self.CLARIFYING_QUESTIONS["demographic"][lang])
 
         return {
@@ -54,19 +115,11 @@ class EmptyResultHandler:
         }
 
     def _build_message(self, suggestions, questions, lang):
-        if lang == "hi":
-            msg = "माफ़ कीजिए, आपकी खोज से कोई योजना नहीं मिली।\n"
-            msg += "आप इन श्रेणियों की योजनाएँ देख सकते हैं:\n"
-        else:
-            msg = "Sorry, no schemes matched your query.\n"
-            msg += "You may explore schemes in these categories:\n"
-
-        for s in suggestions:
-            msg += f"- {s}\n"
+        lines = list(self.INTRO[lang])
+        lines.extend(f"- {s}" for s in suggestions)
 
         if questions:
-            msg += "\n"
-            for q in questions:
-                msg += f"{q}\n"
+            lines.append("")
+            lines.extend(questions)
 
-        return msg.strip()
+        return "\n".join(lines).strip()
@@ -1,17 +1,79 @@
+import asyncio
+import inspect
+import json
+import queue
 from urllib.parse import parse_qs, urlparse
 
 
 class Response:
-    def __init__(self, content=b"", media_type="application/json", status_code=200):
+    def __init__(self, content=b"", media_type="application/json", status_code=200, headers=None):
         self.content = content if isinstance(content, bytes) else str(content).encode("utf-8")
         self.media_type = media_type
         self.status_code = status_code
+        self.headers = dict(headers or {})
+
+
+class Address:
+    def __init__(self, host="testclient", port=50000):
+        self.host = host
+        self.port = port
+
+
+class Request:
+    def __init__(self, client=None, headers=None):
+        self.client = client or Address()
+        self.headers = {k.lower(): v for k, v in (headers or {}).items()}
+
+
+class WebSocketDisconnect(Exception):  # noqa: N818
+    def __init__(self, code=1000):
+        super().__init__(code)
+        self.code = code
+
+
+class WebSocket:
+    """Server side of an in-process socket; see testclient.WebSocketTestSession."""
+
+    def __init__(self, client=None):
+        self.client = client or Address()
+        self.accepted = False
+        self.close_code = None
+        self.incoming = None  # asyncio.Queue, created on the server's event loop
+        self.outgoing = queue.Queue()  # ("text", str) or ("close", code), read by the test
+
+    async def accept(self):
+        self.accepted = True
+
+    async def receive_text(self):
+        message = await self.incoming.get()
+        if message is None:
+            raise WebSocketDisconnect(self.close_code or 1000)
+        return message
+
+    async def receive_json(self):
+        return json.loads(await self.receive_text())
+
+    async def send_text(self, data):
+        if self.close_code is not None:
+            raise RuntimeError("websocket is closed")
+        self.outgoing.put(("text", data))
+
+    async def send_json(self, data):
+        await self.send_text(json.dumps(data))
+
+    async def close(self, code=1000):
+        if self.close_code is None:
+            self.close_code = code
+            self.outgoing.put(("close", code))
+        if self.incoming is not None:
+            self.incoming.put_nowait(None)  # ends a pending receive
 
 
 class FastAPI:
-    def __init__(self, docs_url=None, redoc_url=None):
+    def __init__(self, docs_url=None, redoc_url=None, lifespan=None):
         self.docs_url = docs_url
         self.redoc_url = redoc_url
+        self.lifespan = lifespan
         self.routes = {}
 
     def get(self, path):
@@ -21,19 +83,32 @@ class FastAPI:
 
         return decorator
 
-    def _handle_get(self, raw_path: str):
+    def websocket(self, path):
+        def decorator(func):
+            self.routes[("WS", path)] = func
+            return func
+
+        return decorator
+
+    def _handle_get(self, raw_path: str, client=None, headers=None):
         parsed = urlparse(raw_path)
         handler = self.routes.get(("GET", parsed.path))
         if handler is None:
             return Response(content=b'{"msg":"not found"}', status_code=404)
 
         query_params = {k: v[-1] for k, v in parse_qs(parsed.query).items()}
+        signature = inspect.signature(handler)
+        if "request" in signature.parameters:
+            query_params["request"] = Request(client, headers)
         try:
-            result = handler(**query_params)
+            signature.bind(**query_params)
         except TypeError:
             # Missing/invalid params
             return Response(content=b'{"msg":"bad request"}', status_code=400)
 
+        result = handler(**query_params)
+        if inspect.iscoroutine(result):
+            result = asyncio.run(result)
         if isinstance(result, Response):
             return result
 
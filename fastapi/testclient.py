@@ -1,8 +1,90 @@
+import asyncio
+import json
+import queue
+import threading
+
+from fastapi import Address, WebSocket, WebSocketDisconnect
+
+
+class WebSocketTestSession:
+    """Runs a /ws endpoint on its own event loop thread; frames go through queues."""
+
+    __test__ = False
+
+    def __init__(self, app, path: str, client=None):
+        handler = app.routes.get(("WS", path))
+        if handler is None:
+            raise WebSocketDisconnect(1000)
+        self.websocket = WebSocket(client)
+        self._loop = None
+        ready = threading.Event()
+
+        async def serve():
+            self._loop = asyncio.get_running_loop()
+            self.websocket.incoming = asyncio.Queue()
+            ready.set()
+            try:
+                await handler(self.websocket)
+            finally:
+                await self.websocket.close()
+
+        self._thread = threading.Thread(target=asyncio.run, args=(serve(),), daemon=True)
+        self._thread.start()
+        ready.wait()
+
+    def send_text(self, data: str):
+        self._loop.call_soon_threadsafe(self.websocket.incoming.put_nowait, data)
+
+    def send_json(self, data):
+        self.send_text(json.dumps(data))
+
+    def receive_text(self, timeout: float = 5.0) -> str:
+        try:
+            kind, data = self.websocket.outgoing.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError("no frame received") from None
+        if kind == "close":
+            self.websocket.outgoing.put((kind, data))  # stays closed
+            raise WebSocketDisconnect(data)
+        return data
+
+    def receive_json(self, timeout: float = 5.0):
+        return json.loads(self.receive_text(timeout))
+
+    def close(self):
+        if self._thread.is_alive():
+            self._loop.call_soon_threadsafe(self.websocket.incoming.put_nowait, None)
+            self._thread.join(5)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
 class TestClient:
     __test__ = False
 
-    def __init__(self, app):
+    def __init__(self, app, client=("testclient", 50000)):
         self.app = app
+        self.client = Address(*client)
+        self._lifespan = None
+
+    def get(self, path: str, headers=None):
+        return self.app._handle_get(path, self.client, headers)
+
+    def websocket_connect(self, path: str) -> WebSocketTestSession:
+        return WebSocketTestSession(self.app, path, self.client)
+
+    # Startup and shutdown (the app's lifespan) only run inside "with TestClient(app)"
+    def __enter__(self):
+        if self.app.lifespan is not None:
+            self._lifespan = self.app.lifespan(self.app)
+            asyncio.run(self._lifespan.__aenter__())
+        return self
 
-    def get(self, path: str):
-        return self.app._handle_get(path)
+    def __exit__(self, *exc):
+        if self._lifespan is not None:
+            asyncio.run(self._lifespan.__aexit__(None, None, None))
+            self._lifespan = None
@@ -0,0 +1,217 @@
+import re
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Word characters plus the Indic blocks (Devanagari .. Malayalam), so vowel
+# signs such as "ी" do not split words the way a bare \w+ does.
+_TOKEN_RE = re.compile(r"[\w\u0900-\u0D7F]+")
+
+
+class ReferenceResolver:
+    """
+    Resolves follow-up references ("uske liye documents", "doosri yojana")
+    against the previous turn's results instead of running a new search.
+
+    The last result set of each session is kept in the session context as a
+    tuple of scheme IDs, and references are answered with direct
+    SchemeDatabase lookups. No scoring happens on a resolved turn.
+
+    "Aur koi?" asks for schemes like the one in focus; when ``scheme_db``
+    has a precomputed related graph (``Catalogue.related``) it is answered
+    from there, skipping schemes the session has already seen and, if the
+    session has an eligibility profile, schemes it does not qualify for.
+    """
+
+    # Session context key of the user's eligibility profile (age, income, ...)
+    USER_ATTRIBUTES_KEY = "user_attributes"
+
+    # Ordinal words (romanized Hindi, Devanagari, English) -> result position.
+    # -1 means "the last one shown".
+    ORDINALS = {
+        "pehli": 0, "pehla": 0, "pahli": 0, "pahla": 0, "पहली": 0, "पहला": 0,
+        "first": 0, "1st": 0,
+        "doosri": 1, "doosra": 1, "dusri": 1, "dusra": 1, "दूसरी": 1, "दूसरा": 1,
+        "second": 1, "2nd": 1,
+        "teesri": 2, "teesra": 2, "tisri": 2, "tisra": 2, "तीसरी": 2, "तीसरा": 2,
+        "third": 2, "3rd": 2,
+        "aakhri": -1, "akhri": -1, "आखिरी": -1, "last": -1,
+    }
+
+    # Pronouns and demonstratives that point at the scheme in focus
+    ANAPHORA = {
+        "uske", "uski", "uska", "iske", "iski", "iska", "usme", "isme",
+        "yeh", "ye", "woh", "wo", "उसके", "उसकी", "उसका", "इसके", "इसकी",
+        "इसका", "उसमें", "इसमें", "यह", "वह", "it", "its", "this", "that",
+    }
+
+    # Words and word pairs asking for more schemes like the one in focus
+    RELATED = {
+        ("aur", "koi"), ("koi", "aur"), ("और", "कोई"), ("कोई", "और"),
+        ("milti", "julti"), ("मिलती", "जुलती"), ("any", "other"),
+        ("similar",), ("related",),
+    }
+
+    # Words a follow-up may use around a reference ("uske liye documents kya
+    # chahiye?", "doosri yojana batao"). Any other word makes the turn a new
+    # query: "ye mahila yojana kya hai", "last date for scholarship".
+    FILLER = {
+        "yojana", "yojna", "scheme", "schemes", "one", "wala", "wali", "vala", "vali",
+        "ke", "ki", "ka", "ko", "se", "me", "mein", "liye", "bare", "baare", "kya", "hai",
+        "hain", "koi", "aur", "batao", "bataiye", "bataye", "btao", "chahiye", "lagenge",
+        "lagega", "kaun", "kaunse", "kaise", "kare", "karein", "karna", "apply", "aavedan",
+        "documents", "document", "dastavez", "kagaz", "kagzat", "labh", "fayda", "benefit",
+        "benefits", "patrata", "eligibility", "details", "detail", "jankari", "about",
+        "tell", "more", "the", "a", "an", "of", "for", "is", "what", "which", "how",
+        "to", "please", "plz", "ok", "okay", "haan", "ji",
+        "योजना", "योजनाएं", "के", "की", "का", "को", "से", "में", "लिए", "बारे", "क्या", "है",
+        "हैं", "कोई", "और", "बताओ", "बताइए", "बताएं", "चाहिए", "कौन", "कैसे", "आवेदन",
+        "दस्तावेज़", "दस्तावेज", "कागज़", "कागज", "लाभ", "फायदा", "पात्रता", "जानकारी",
+        "वाली", "वाला", "जी", "हाँ",
+    }
+
+    def __init__(self, scheme_db, session_manager, related_limit: int = 3):
+        """
+        :param scheme_db: Instance of SchemeDatabase
+        :param session_manager: Instance of SessionManager
+        :param related_limit: Schemes returned for an "aur koi?" turn
+        """
+        self.scheme_db = scheme_db
+        self.session_manager = session_manager
+        self.related_limit = related_limit
+        self.stats = {"resolved": 0, "searched": 0}
+        self._reference_words = (
+            set(self.ORDINALS) | self.ANAPHORA | self.FILLER
+            | {word for words in self.RELATED for word in words}
+        )
+
+    def resolve(self, session_id: str, query: str) -> Optional[List[Dict]]:
+        """
+        Resolve an ordinal or anaphoric reference to schemes from the
+        previous turn. Only turns made of reference and filler words
+        resolve; any other word means a new query.
+
+        Read-only: the session's frame only moves in resolve_or_search, so
+        checking a turn first (as the streamed /ws path does) changes nothing.
+
+        :param session_id: Session identifier
+        :param query: Raw user query
+        :return: List with the referenced scheme, or None if unresolved
+        """
+        found = self._resolve(session_id, query)
+        return found[0] if found is not None else None
+
+    def _resolve(self, session_id: str, query: str) -> Optional[Tuple[List[Dict], Optional[str]]]:
+        """
+        :return: (schemes, focus) where focus is the referenced scheme's ID,
+            or None for related schemes, which become the new frame
+        """
+        if not session_id or session_id not in self.session_manager.sessions:
+            return None
+        if self.session_manager.is_expired(session_id):
+            return None
+
+        context = self.session_manager.sessions[session_id]["context"]
+        last_results: Tuple[str, ...] = context.get("last_results", ())
+        if not last_results:
+            return None
+
+        tokens = self._tokenize(query)
+        if any(token not in self._reference_words for token in tokens):
+            return None  # a new query that happens to contain "ye", "first", ...
+        if self._asks_related(tokens):
+            schemes = self._related(context, last_results)
+            return (schemes, None) if schemes else None
+
+        scheme_id = None
+        for token in tokens:
+            position = self.ORDINALS.get(token)
+            if position is not None:
+                if -len(last_results) <= position < len(last_results):
+                    scheme_id = last_results[position]
+                break
+            if token in self.ANAPHORA:
+                scheme_id = context.get("focus") or last_results[0]
+                break
+
+        if scheme_id is None:
+            return None
+
+        scheme = self.scheme_db.get_by_id(scheme_id)
+        if scheme is None:
+            return None
+
+        return [scheme], scheme_id
+
+    def _asks_related(self, tokens: List[str]) -> bool:
+        return any(
+            (token,) in self.RELATED or pair in self.RELATED
+            for token, pair in zip(tokens, zip(tokens, tokens[1:] + [""]))
+        )
+
+    def _related(self, context: Dict, last_results: Tuple[str, ...]) -> List[Dict]:
+        """
+        Schemes related to the one in focus that the session has not seen
+        and qualifies for; empty (so a full search runs) without a graph.
+        """
+        find = getattr(self.scheme_db, "related", None)
+        if find is None:
+            return []
+        focus = context.get("focus") or last_results[0]
+        seen = set(context.get("mentioned_schemes", ())) | {focus}
+        attrs = context.get(self.USER_ATTRIBUTES_KEY)
+        return find(focus, self.related_limit, exclude=seen, attrs=attrs)
+
+    def remember(self, session_id: str, schemes: List[Dict]) -> None:
+        """
+        Store a searched result set as the session's reference frame. An
+        empty result set keeps the previous frame, so "doosri yojana" after
+        a miss still means the earlier results.
+
+        :param session_id: Session identifier
+        :param schemes: Schemes returned to the user, in display order
+        """
+        ids = tuple(s["id"] for s in schemes if s.get("id"))
+        if not session_id or not ids:
+            return
+
+        session = self.session_manager.get_or_create(session_id)
+        mentioned = session["context"].get("mentioned_schemes", [])
+        mentioned = [sid for sid in mentioned if sid not in ids] + list(ids)
+
+        self.session_manager.update(session_id, {
+            "last_results": ids,
+            "focus": ids[0],
+            "mentioned_schemes": mentioned[-self.session_manager.MAX_HISTORY_LENGTH:],
+        })
+
+    def resolve_or_search(
+        self,
+        session_id: str,
+        query: str,
+        search: Callable[[str], List[Dict]],
+    ) -> Tuple[List[Dict], bool]:
+        """
+        Answer a turn from the session's previous results when possible,
+        falling back to a full search otherwise.
+
+        :param session_id: Session identifier (may be empty for stateless calls)
+        :param query: Raw user query
+        :param search: Callable running the full search for a query
+        :return: (schemes, resolved) where resolved is True if no search ran
+        """
+        found = self._resolve(session_id, query)
+        if found is not None:
+            schemes, focus = found
+            if focus is None:
+                self.remember(session_id, schemes)
+            else:
+                self.session_manager.update(session_id, {"focus": focus})
+            self.stats["resolved"] += 1
+            return schemes, True
+
+        self.stats["searched"] += 1
+        results = search(query)
+        self.remember(session_id, results)
+        return results, False
+
+    def _tokenize(self, text: str) -> List[str]:
+        return _TOKEN_RE.findall(text.lower())
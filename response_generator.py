@@ -1,9 +1,175 @@
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+
 class ResponseGenerator:
     """
     Generates user-facing responses from scheme data.
     Hindi-first, plain-language, action-oriented.
+
+    Localized labels and the default step block are compiled into one
+    template per language when the generator is created. Given a
+    catalogue, it also precomputes the simplified text of every scheme,
+    so formatting is then lookups and one join. Each catalogue snapshot
+    holds a prepared generator (see ``src.catalogue``), and streamed
+    ``/ws`` turns send its ``stream()`` chunks.
+    Schemes with their own ``application_steps`` list those instead of
+    the default steps.
     """
 
+    LABELS = {
+        "hi": {
+            "header": "आपके लिए उपलब्ध योजनाएँ:",
+            "description": "विवरण",
+            "eligibility": "पात्रता",
+            "benefits": "लाभ",
+            "steps_title": "आवेदन के चरण:",
+            "default_steps": [
+                "आधिकारिक वेबसाइट पर जाएँ",
+                "आवेदन फॉर्म भरें",
+                "आवश्यक दस्तावेज़ अपलोड करें",
+            ],
+        },
+        "en": {
+            "header": "Available schemes for you:",
+            "description": "Description",
+            "eligibility": "Eligibility",
+            "benefits": "Benefits",
+            "steps_title": "Application steps:",
+            "default_steps": [
+                "Visit the official website",
+                "Fill out the application form",
+                "Upload required documents",
+            ],
+        },
+        "ta": {
+            "header": "உங்களுக்கான திட்டங்கள்:",
+            "description": "விவரம்",
+            "eligibility": "தகுதி",
+            "benefits": "நன்மைகள்",
+            "steps_title": "விண்ணப்பிக்கும் படிகள்:",
+            "default_steps": [
+                "அதிகாரப்பூர்வ இணையதளத்தைப் பார்வையிடவும்",
+                "விண்ணப்பப் படிவத்தை நிரப்பவும்",
+                "தேவையான ஆவணங்களைப் பதிவேற்றவும்",
+            ],
+        },
+        "te": {
+            "header": "మీ కోసం అందుబాటులో ఉన్న పథకాలు:",
+            "description": "వివరణ",
+            "eligibility": "అర్హత",
+            "benefits": "ప్రయోజనాలు",
+            "steps_title": "దరఖాస్తు దశలు:",
+            "default_steps": [
+                "అధికారిక వెబ్‌సైట్‌ను సందర్శించండి",
+                "దరఖాస్తు ఫారమ్‌ను పూరించండి",
+                "అవసరమైన పత్రాలను అప్‌లోడ్ చేయండి",
+            ],
+        },
+        "bn": {
+            "header": "আপনার জন্য উপলব্ধ প্রকল্পসমূহ:",
+            "description": "বিবরণ",
+            "eligibility": "যোগ্যতা",
+            "benefits": "সুবিধা",
+            "steps_title": "আবেদনের ধাপ:",
+            "default_steps": [
+                "সরকারি ওয়েবসাইটে যান",
+                "আবেদন ফর্ম পূরণ করুন",
+                "প্রয়োজনীয় নথি আপলোড করুন",
+            ],
+        },
+        "mr": {
+            "header": "तुमच्यासाठी उपलब्ध योजना:",
+            "description": "वर्णन",
+            "eligibility": "पात्रता",
+            "benefits": "लाभ",
+            "steps_title": "अर्जाचे टप्पे:",
+            "default_steps": [
+                "अधिकृत वेबसाइटला भेट द्या",
+                "अर्ज भरा",
+                "आवश्यक कागदपत्रे अपलोड करा",
+            ],
+        },
+    }
+
+    FALLBACK_LANGUAGE = "en"
+    MAX_TEXT_LENGTH = 300
+
+    def __init__(
+        self, schemes: Optional[List[Dict]] = None, languages: Optional[Iterable[str]] = None
+    ):
+        """
+        :param schemes: Optional catalogue to precompute simplified text for
+        :param languages: Languages to precompute it in (default: all)
+        """
+        self._templates = {lang: self._compile(labels) for lang, labels in self.LABELS.items()}
+        # (scheme id, lang) -> (name, description, eligibility, benefits, steps block)
+        self._prepared: Dict[Tuple[str, str], Tuple[str, str, str, str, str]] = {}
+        if schemes:
+            self.prepare(schemes, languages)
+
+    def _compile(self, labels: Dict) -> Dict[str, str]:
+        """Bake the labels and default steps of one language into templates."""
+        return {
+            "header": labels["header"] + "\n\n",
+            "steps_title": labels["steps_title"],
+            "default_steps": self.format_steps_block(
+                labels["steps_title"], labels["default_steps"]
+            ),
+            "scheme": (
+                "🔹 {0}\n"
+                + labels["description"] + ": {1}\n"
+                + labels["eligibility"] + ": {2}\n"
+                + labels["benefits"] + ": {3}{4}"
+            ),
+        }
+
+    def _template(self, lang: str) -> Dict[str, str]:
+        return self._templates.get(lang) or self._templates[self.FALLBACK_LANGUAGE]
+
+    def prepare(self, schemes: List[Dict], languages: Optional[Iterable[str]] = None) -> None:
+        """
+        Precompute simplified field text for every scheme and language,
+        replacing any earlier catalogue's. Schemes and languages not given
+        are formatted on the fly.
+        """
+        languages = [lang for lang in languages or self.LABELS if lang in self.LABELS]
+        prepared = {}
+        for scheme in schemes:
+            scheme_id = scheme.get("id")
+            if scheme_id is None:
+                continue
+            for lang in languages:
+                prepared[(scheme_id, lang)] = self._fields(scheme, lang)
+        self._prepared = prepared
+
+    def _fields(self, scheme: Dict, lang: str) -> Tuple[str, str, str, str, str]:
+        return (
+            scheme.get(f"name_{lang}") or scheme.get("name_en", ""),
+            self.simplify_text(
+                scheme.get(f"description_{lang}") or scheme.get("description_en", "")
+            ),
+            self.simplify_text(
+                scheme.get(f"eligibility_{lang}") or scheme.get("eligibility_en", "")
+            ),
+            self.simplify_text(
+                scheme.get(f"benefits_{lang}") or scheme.get("benefits_en", "")
+            ),
+            self._steps_block(scheme, lang),
+        )
+
+    def _steps_block(self, scheme: Dict, lang: str) -> str:
+        """The scheme's own application steps, or the default ones."""
+        template = self._template(lang)
+        steps = []
+        for step in scheme.get("application_steps") or []:
+            if isinstance(step, dict):
+                step = step.get(lang) or step.get(self.FALLBACK_LANGUAGE, "")
+            if step:
+                steps.append(self.simplify_text(step))
+        if not steps:
+            return template["default_steps"]
+        return self.format_steps_block(template["steps_title"], steps)
+
     def generate(self, schemes: list, lang: str = "hi") -> str:
         """
         Generate a complete response for matched schemes.
@@ -11,17 +177,21 @@ class ResponseGenerator:
         if not schemes:
             return ""
 
-        responses = []
-        for scheme in schemes:
-            responses.append(self._format_scheme(scheme, lang))
+        return "".join(self.stream(schemes, lang))
 
-        header = (
-            "आपके लिए उपलब्ध योजनाएँ:\n\n"
-            if lang == "hi"
-            else "Available schemes for you:\n\n"
-        )
+    def stream(self, schemes: list, lang: str = "hi") -> Iterator[str]:
+        """
+        Yield the response in chunks: the header, then one chunk per scheme.
+        Joining the chunks gives exactly the output of generate().
+        """
+        if not schemes:
+            return
 
-        return header + "\n\n".join(responses)
+        template = self._template(lang)
+        yield template["header"]
+        for idx, scheme in enumerate(schemes):
+            chunk = self._format_scheme(scheme, lang)
+            yield chunk if idx == 0 else "\n\n" + chunk
 
     def simplify_text(self, text: str) -> str:
         """
@@ -32,11 +202,11 @@ class ResponseGenerator:
         if not text:
             return ""
 
-        simplified = " ".join(text.strip().split())
+        simplified = " ".join(text.split())
 
         # Optional: truncate very long descriptions
-        if len(simplified) > 300:
-            simplified = simplified[:297] + "..."
+        if len(simplified) > self.MAX_TEXT_LENGTH:
+            simplified = simplified[: self.MAX_TEXT_LENGTH - 3] + "..."
 
         return simplified
 
@@ -47,51 +217,20 @@ class ResponseGenerator:
         if not steps:
             return ""
 
-        lines = []
-        for idx, step in enumerate(steps, start=1):
-            lines.append(f"{idx}. {step}")
+        return self.format_steps_block(self._template(lang)["steps_title"], steps)
 
-        title = (
-            "\nआवेदन के चरण:\n"
-            if lang == "hi"
-            else "\nApplication steps:\n"
+    @staticmethod
+    def format_steps_block(title: str, steps: list) -> str:
+        return "\n" + title + "\n" + "\n".join(
+            f"{idx}. {step}" for idx, step in enumerate(steps, start=1)
         )
 
-        return title + "\n".join(lines)
-
     def _format_scheme(self, scheme: dict, lang: str) -> str:
         """
         Format a single scheme entry.
         """
-        name = scheme.get(f"name_{lang}") or scheme.get("name_en", "")
-        description = scheme.get(f"description_{lang}") or scheme.get("description_en", "")
-        eligibility = scheme.get(f"eligibility_{lang}") or scheme.get("eligibility_en", "")
-        benefits = scheme.get(f"benefits_{lang}") or scheme.get("benefits_en", "")
-
-        description = self.simplify_text(description)
-        eligibility = self.simplify_text(eligibility)
-        benefits = self.simplify_text(benefits)
-
-        output = f"🔹 {name}\n"
-        output += f"विवरण: {description}\n" if lang == "hi" else f"Description: {description}\n"
-        output += f"पात्रता: {eligibility}\n" if lang == "hi" else f"Eligibility: {eligibility}\n"
-        output += f"लाभ: {benefits}" if lang == "hi" else f"Benefits: {benefits}"
-
-        # Optional default action steps
-        steps_hi = [
-            "आधिकारिक वेबसाइट पर जाएँ",
-            "आवेदन फॉर्म भरें",
-            "आवश्यक दस्तावेज़ अपलोड करें"
-        ]
-        steps_en = [
-            "Visit the official website",
-            "Fill out the application form",
-            "Upload required documents"
-        ]
-
-        output += self.format_action_steps(
-            steps_hi if lang == "hi" else steps_en,
-            lang
-        )
-
-        return output
+        template = self._template(lang)
+        # Templates for unsupported languages fall back to English labels,
+        # but field text is still looked up in the requested language.
+        fields = self._prepared.get((scheme.get("id"), lang)) or self._fields(scheme, lang)
+        return template["scheme"].format(*fields)
@@ -1,5 +1,5 @@
 import json
-from typing import List, Dict, Optional
+from typing import Dict, List, Optional
 
 
 class SchemeDatabase:
@@ -11,8 +11,26 @@ class SchemeDatabase:
         """
         self.filepath = filepath
         self._schemes: List[Dict] = []
+        self._by_id: Dict[str, Dict] = {}
         self._load()
 
+    @classmethod
+    def from_records(cls, records: List[Dict]) -> "SchemeDatabase":
+        """
+        Build a database over an already-loaded list of scheme records.
+
+        The records are shared, not copied, so the API layer can reuse the
+        catalogue it already holds in memory.
+
+        :param records: List of scheme dicts
+        :return: SchemeDatabase instance
+        """
+        db = cls.__new__(cls)
+        db.filepath = None
+        db._schemes = records
+        db._build_index()
+        return db
+
     def _load(self) -> None:
         """Load schemes from JSON file into memory."""
         try:
@@ -22,6 +40,16 @@ class SchemeDatabase:
             self._schemes = []
         except json.JSONDecodeError as e:
             raise ValueError(f"Invalid JSON format: {e}")
+        self._build_index()
+
+    def _build_index(self) -> None:
+        """Index schemes by ID so lookups do not scan the catalogue."""
+        self._by_id = {}
+        for scheme in self._schemes:
+            scheme_id = scheme.get("id")
+            if scheme_id is not None:
+                # Keep the first record on duplicate IDs, like the old linear scan
+                self._by_id.setdefault(scheme_id, scheme)
 
     def get_by_id(self, scheme_id: str) -> Optional[Dict]:
         """
@@ -30,10 +58,7 @@ class SchemeDatabase:
         :param scheme_id: Unique scheme identifier
         :return: Scheme dict or None if not found
         """
-        for scheme in self._schemes:
-            if scheme.get("id") == scheme_id:
-                return scheme
-        return None
+        return self._by_id.get(scheme_id)
 
     def get_all(self) -> List[Dict]:
         """
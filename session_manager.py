@@ -1,15 +1,19 @@
 from datetime import datetime, timedelta
 
+
 class SessionManager:
     """
     Manages user sessions and conversation context.
     """
 
     SESSION_TIMEOUT = timedelta(minutes=30)  # 30-minute inactivity
+    MAX_HISTORY_LENGTH = 10  # Scheme IDs kept per session
+    SWEEP_INTERVAL = timedelta(minutes=1)  # Expired sessions dropped at most this often
 
     def __init__(self):
         # In-memory session storage: {session_id: {context, last_updated}}
         self.sessions = {}
+        self._last_sweep = datetime.utcnow()
 
     def get_or_create(self, session_id: str) -> dict:
         """
@@ -23,8 +27,14 @@ class SessionManager:
             else:
                 return session
 
+        # New sessions are where memory grows, so drop abandoned ones here
+        now = datetime.utcnow()
+        if now - self._last_sweep > self.SWEEP_INTERVAL:
+            self._last_sweep = now
+            self.clear_expired_sessions()
+
         # Create new session
-        session = {"context": {}, "last_updated": datetime.utcnow()}
+        session = {"context": {}, "last_updated": now}
         self.sessions[session_id] = session
         return session
 
@@ -48,8 +58,10 @@ class SessionManager:
 
     def clear_expired_sessions(self):
         """
-        Optional: Remove all expired sessions from memory.
+        Remove all expired sessions from memory (with their stored pages).
+        Runs from get_or_create about once per SWEEP_INTERVAL.
         """
-        expired_keys = [sid for sid in self.sessions if self.is_expired(sid)]
+        # A snapshot of the keys: other threads add sessions meanwhile
+        expired_keys = [sid for sid in list(self.sessions) if self.is_expired(sid)]
         for sid in expired_keys:
-            self.sessions.pop(sid)
+            self.sessions.pop(sid, None)
@@ -0,0 +1,284 @@
+"""Asynchronous, buffered access log for traffic analysis.
+
+Request handlers call ``access_log.log(...)``, which only enqueues a
+tuple; a background thread formats records as compact JSONL, writes them
+in batches and fsyncs at most once per ``ACCESS_LOG_FSYNC_SECONDS``, but
+never leaves written records unsynced for longer than that. If the queue
+is full the record is dropped and counted, so logging never blocks the
+request path. Files rotate by size (``access.jsonl`` -> ``access.jsonl.1``
+...).
+
+One line per request (wrapped here)::
+
+    {"ts":1718000000.123,"q":"kisan yojana","lang":"hi","ids":["fin_002"],
+     "ms":1.42,"b":311,"ch":"http"}
+
+The ``q``/``lang``/``ts`` fields make the log directly replayable by
+``python -m benchmarks.loadtest --log``. Offline analysis:
+
+    python -m src.access_log logs/access.jsonl*
+"""
+
+import argparse
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Iterable, List, Optional
+
+from src.config import config
+
+
+def normalize_query(q: str) -> str:
+    """Cap to MAX_QUERY_LENGTH characters, lower-case and collapse whitespace."""
+    return " ".join(q[: config.query.MAX_QUERY_LENGTH].lower().split())
+
+
+class AccessLogger:
+    """Queue-backed JSONL writer with batched fsync and size-based rotation."""
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = config.log.ACCESS_LOG_MAX_BYTES,
+        backups: int = config.log.ACCESS_LOG_BACKUPS,
+        queue_size: int = config.log.ACCESS_LOG_QUEUE_SIZE,
+        fsync_seconds: float = config.log.ACCESS_LOG_FSYNC_SECONDS,
+        batch_size: int = 512,
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.fsync_seconds = fsync_seconds
+        self.batch_size = batch_size
+        self.dropped = 0
+        self.written = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._stopped = False
+
+    def log(self, q: str, lang: str, ids: List[str], latency_ns: int, nbytes: int, channel: str):
+        """Enqueue one request record. Never blocks; drops when the queue is full."""
+        if self._thread is None:
+            self._start()
+        try:
+            self._queue.put_nowait((time.time(), q, lang, ids, latency_ns, nbytes, channel))
+        except queue.Full:
+            self.dropped += 1
+
+    def _start(self) -> None:
+        with self._start_lock:
+            if self._thread is None and not self._stopped:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self._thread = threading.Thread(
+                    target=self._run, name="access-log-writer", daemon=True
+                )
+                self._thread.start()
+                atexit.register(self.close)
+
+    def _format(self, item) -> str:
+        ts, q, lang, ids, latency_ns, nbytes, channel = item
+        return json.dumps(
+            {
+                "ts": round(ts, 3),
+                "q": normalize_query(q),
+                "lang": lang,
+                "ids": ids,
+                "ms": round(latency_ns / 1e6, 3),
+                "b": nbytes,
+                "ch": channel,
+            },
+            separators=(",", ":"),
+            ensure_ascii=False,
+        ) + "\n"
+
+    def _run(self) -> None:
+        f = open(self.path, "a", encoding="utf-8")
+        size = f.tell()
+        last_sync = time.monotonic()
+        unsynced = False
+        try:
+            while True:
+                # Wait no longer than the next fsync is due, so a last batch
+                # before a quiet period is not left unsynced
+                timeout = None
+                if unsynced:
+                    timeout = max(last_sync + self.fsync_seconds - time.monotonic(), 0)
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    os.fsync(f.fileno())
+                    last_sync = time.monotonic()
+                    unsynced = False
+                    continue
+                stop = item is None
+                batch = [] if stop else [item]
+                # Drain whatever else is waiting, up to one batch
+                while not stop and len(batch) < self.batch_size:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is None:
+                        stop = True
+                        break
+                    batch.append(item)
+
+                if batch:
+                    data = "".join(self._format(i) for i in batch)
+                    f.write(data)
+                    size += len(data.encode("utf-8"))
+                    self.written += len(batch)
+                    f.flush()
+                    unsynced = True
+
+                now = time.monotonic()
+                if unsynced and (stop or now - last_sync >= self.fsync_seconds):
+                    os.fsync(f.fileno())
+                    last_sync = now
+                    unsynced = False
+
+                if size >= self.max_bytes:
+                    if unsynced:
+                        os.fsync(f.fileno())
+                        unsynced = False
+                    f.close()
+                    self._rotate()
+                    f = open(self.path, "a", encoding="utf-8")
+                    size = 0
+
+                if stop:
+                    break
+        finally:
+            f.close()
+
+    def _rotate(self) -> None:
+        for i in range(self.backups - 1, 0, -1):
+            src = f"{self.path}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{i + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Flush pending records and stop the writer thread."""
+        with self._start_lock:
+            self._stopped = True
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join(timeout)
+
+
+class NullAccessLogger:
+    """Stand-in used when access logging is disabled."""
+
+    dropped = 0
+    written = 0
+
+    def log(self, *args, **kwargs):
+        pass
+
+    def close(self, timeout: float = 5.0):
+        pass
+
+
+def create_access_logger():
+    if not config.log.ACCESS_LOG_ENABLED:
+        return NullAccessLogger()
+    return AccessLogger(config.log.ACCESS_LOG_PATH)
+
+
+# -----------------------------
+# Offline analysis
+# -----------------------------
+
+def read_records(paths: Iterable[str]):
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # torn last line after a crash
+
+
+def _length_bucket(q: str) -> str:
+    n = max(len(q.split()), 1)
+    return str(n) if n <= 3 else ("4-5" if n <= 5 else "6+")
+
+
+def _pct(values: List[float], p: float) -> float:
+    values = sorted(values)
+    return values[min(int(len(values) * p), len(values) - 1)] if values else 0.0
+
+
+def analyze(records: Iterable[dict], top: int = 20) -> dict:
+    queries = Counter()
+    zero = Counter()
+    by_length = defaultdict(list)
+    total = 0
+    for r in records:
+        total += 1
+        q = r.get("q", "")
+        queries[q] += 1
+        if not r.get("ids"):
+            zero[q] += 1
+        by_length[_length_bucket(q)].append(r.get("ms", 0.0))
+
+    order = {"1": 0, "2": 1, "3": 2, "4-5": 3, "6+": 4}
+    return {
+        "requests": total,
+        "distinct_queries": len(queries),
+        "zero_result_rate": sum(zero.values()) / total if total else 0.0,
+        "top_queries": queries.most_common(top),
+        "top_zero_result_queries": zero.most_common(top),
+        "latency_ms_by_query_words": {
+            k: {"n": len(v), "p50": _pct(v, 0.5), "p95": _pct(v, 0.95), "p99": _pct(v, 0.99)}
+            for k, v in sorted(by_length.items(), key=lambda kv: order[kv[0]])
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize access log files.")
+    parser.add_argument("paths", nargs="+")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    parser.add_argument(
+        "--export-top", metavar="PATH",
+        help="write the top queries, one per line, as a startup warm-up file",
+    )
+    args = parser.parse_args()
+
+    report = analyze(read_records(args.paths), args.top)
+    if args.export_top:
+        with open(args.export_top, "w", encoding="utf-8") as f:
+            f.writelines(f"{q}\n" for q, _ in report["top_queries"] if q.strip())
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return
+
+    print(f"requests: {report['requests']}  distinct queries: {report['distinct_queries']}")
+    print(f"zero-result rate: {report['zero_result_rate']:.2%}")
+    print("\ntop queries:")
+    for q, n in report["top_queries"]:
+        print(f"  {n:>8}  {q}")
+    print("\ntop zero-result queries:")
+    for q, n in report["top_zero_result_queries"]:
+        print(f"  {n:>8}  {q}")
+    print("\nlatency by query length (words):")
+    for k, s in report["latency_ms_by_query_words"].items():
+        print(f"  {k:>4}  n={s['n']:<8} p50={s['p50']:.2f}ms "
+              f"p95={s['p95']:.2f}ms p99={s['p99']:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
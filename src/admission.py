@@ -0,0 +1,141 @@
+"""Admission control: per-client rate limiting and load shedding.
+
+Two independent gates run before any matching work:
+
+* ``RateLimiter`` keeps one token bucket per client (IP address) and
+  rejects requests from clients that exceed their sustained rate.
+* ``AdmissionController`` caps concurrent requests and holds at most
+  ``max_queue`` more waiting for a slot. Anything beyond that, or any
+  request that would have to queue while the average latency is above
+  ``shed_latency_ms``, is rejected immediately.
+
+Rejected requests get a small precomputed "busy" answer, so under a
+burst the server spends its time on requests it can finish quickly
+instead of letting every request queue and time out.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from src.config import config
+
+BUSY_MESSAGES = {
+    "hi": "सर्वर अभी व्यस्त है, कृपया थोड़ी देर बाद फिर पूछें।",
+    "en": "The server is busy, please ask again in a moment.",
+    "ta": "சர்வர் தற்போது பிஸியாக உள்ளது, சிறிது நேரம் கழித்து மீண்டும் கேளுங்கள்.",
+    "te": "సర్వర్ ప్రస్తుతం బిజీగా ఉంది, కొద్దిసేపటి తర్వాత మళ్లీ అడగండి.",
+    "bn": "সার্ভার এখন ব্যস্ত, কিছুক্ষণ পরে আবার জিজ্ঞাসা করুন।",
+    "mr": "सर्व्हर सध्या व्यस्त आहे, कृपया थोड्या वेळाने पुन्हा विचारा.",
+}
+
+
+class RateLimiter:
+    """Token bucket per client key, refilled lazily on each check."""
+
+    def __init__(
+        self,
+        rate: float = config.admission.RATE_LIMIT_PER_SECOND,
+        burst: int = config.admission.RATE_LIMIT_BURST,
+        max_clients: int = config.admission.RATE_LIMIT_MAX_CLIENTS,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self.limited = 0
+        # key -> [tokens, last refill time]; oldest first
+        self._buckets: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def allow(self, key: str, now: float = None) -> bool:
+        """Take one token from ``key``'s bucket; False when it is empty."""
+        if self.rate <= 0:
+            return True
+        if now is None:
+            now = time.monotonic()
+
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                # An evicted client had at most a full bucket, so starting
+                # full again never lets anyone exceed the burst
+                bucket = self._buckets[key] = [float(self.burst), now]
+                if len(self._buckets) > self.max_clients:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+                bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+
+            if bucket[0] >= 1.0:
+                bucket[0] -= 1.0
+                return True
+            self.limited += 1
+            return False
+
+
+class AdmissionController:
+    """Concurrency limit with a bounded, latency-aware wait queue."""
+
+    def __init__(
+        self,
+        max_concurrent: int = config.admission.MAX_CONCURRENT_REQUESTS,
+        max_queue: int = config.admission.MAX_QUEUED_REQUESTS,
+        queue_timeout: float = config.admission.QUEUE_TIMEOUT_SECONDS,
+        shed_latency_ms: float = config.admission.SHED_LATENCY_MS,
+        smoothing: float = 0.1,
+    ):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.shed_latency_ms = shed_latency_ms
+        self.smoothing = smoothing
+        self.in_flight = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.shed = 0
+        # Exponentially weighted moving average of request latency
+        self.latency_ms = 0.0
+        self._cond = threading.Condition()
+
+    @property
+    def overloaded(self) -> bool:
+        return self.waiting >= self.max_queue or self.latency_ms > self.shed_latency_ms
+
+    def acquire(self, wait: bool = True) -> bool:
+        """
+        Take a slot, queueing for up to ``queue_timeout`` seconds.
+
+        :param wait: Whether the caller may block; event-loop callers pass False.
+        :return: False when the request should be shed.
+        """
+        with self._cond:
+            if self.in_flight < self.max_concurrent:
+                self.in_flight += 1
+                self.admitted += 1
+                return True
+            if not wait or self.overloaded:
+                self.shed += 1
+                return False
+
+            self.waiting += 1
+            deadline = time.monotonic() + self.queue_timeout
+            try:
+                while self.in_flight >= self.max_concurrent:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.shed += 1
+                        return False
+                    self._cond.wait(remaining)
+                self.in_flight += 1
+                self.admitted += 1
+                return True
+            finally:
+                self.waiting -= 1
+
+    def release(self, latency_ns: int) -> None:
+        """Free a slot and fold the request's total latency into the average."""
+        with self._cond:
+            self.in_flight -= 1
+            self.latency_ms += self.smoothing * (latency_ns / 1e6 - self.latency_ms)
+            self._cond.notify()
@@ -0,0 +1,183 @@
+"""Compact per-language scheme bundles for offline clients, with delta sync.
+
+A bundle holds, for one language, every scheme's id, name, benefit and
+tags, plus a token index over names and tags, so a client that has lost
+connectivity can still search. Bundles are versioned by a hash of the
+catalogue. ``BundleStore`` keeps the per-record digests of the last few
+catalogue versions, so a client that sends the version it already has
+receives only the records that changed (``upsert``) and the IDs that
+disappeared (``delete``). Anything older gets a full bundle.
+
+Full bundle::
+
+    {"v": "3f2a...", "lang": "hi", "full": true, "fields": ["id", "name", "benefit", "tags"],
+     "schemes": [["fin_001", "...", "...", ["kisan"]], ...], "index": {"kisan": [0], ...}}
+
+Delta (the client rebuilds its index from the merged records)::
+
+    {"v": "9b1c...", "from": "3f2a...", "lang": "hi", "upsert": [[...]], "delete": ["edu_004"]}
+
+Encoded bundles are gzip-compressed once per (version, language, since)
+and cached.
+"""
+
+import gzip
+import hashlib
+import json
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+FIELDS = ("id", "name", "benefit", "tags")
+
+# Word characters plus the Indic blocks, so vowel signs do not split words
+_TOKEN_RE = re.compile(r"[\w\u0900-\u0D7F]+")
+
+
+def _dumps(obj, sort_keys: bool = False) -> bytes:
+    return json.dumps(
+        obj, separators=(",", ":"), ensure_ascii=False, sort_keys=sort_keys
+    ).encode("utf-8")
+
+
+def bundle_record(scheme: Dict, lang: str) -> List:
+    """One scheme as a positional row in FIELDS order, localized with the /ask fallbacks."""
+    return [
+        scheme.get("id", ""),
+        (
+            scheme.get(f"name_{lang}") or scheme.get("name_hi") or scheme.get("name_en")
+            or scheme.get("name", "")
+        ),
+        (
+            scheme.get(f"benefits_{lang}") or scheme.get("benefits_hi") or scheme.get("benefits_en")
+            or scheme.get("benefit", "")
+        ),
+        list(scheme.get("tags", [])),
+    ]
+
+
+def build_index(records: List[List]) -> Dict[str, List[int]]:
+    """token -> positions of the records whose name or tags contain it."""
+    index: Dict[str, List[int]] = {}
+    for pos, record in enumerate(records):
+        text = f"{record[1]} {' '.join(record[3])}".lower()
+        for token in dict.fromkeys(_TOKEN_RE.findall(text)):
+            index.setdefault(token, []).append(pos)
+    return index
+
+
+def record_digests(schemes: List[Dict]) -> Dict[str, bytes]:
+    """id -> digest of the full source record."""
+    return {
+        s.get("id", ""): hashlib.blake2b(_dumps(s, sort_keys=True), digest_size=8).digest()
+        for s in schemes
+    }
+
+
+def catalogue_version(digests: Dict[str, bytes]) -> str:
+    h = hashlib.sha256()
+    for scheme_id in sorted(digests):
+        h.update(scheme_id.encode("utf-8"))
+        h.update(digests[scheme_id])
+    return h.hexdigest()[:16]
+
+
+class BundleStore:
+    """Builds, versions and caches bundles and deltas for the live catalogue."""
+
+    def __init__(self, history: int = 8, cache_size: int = 64, compresslevel: int = 9):
+        self.history = history
+        self.cache_size = cache_size
+        self.compresslevel = compresslevel
+        # version -> {id: digest}, oldest first
+        self._versions: "OrderedDict[str, Dict[str, bytes]]" = OrderedDict()
+        # (version, schemes, id -> scheme), replaced as one unit
+        self._current: Optional[Tuple[str, List[Dict], Dict[str, Dict]]] = None
+        self._cache: "OrderedDict[Tuple, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def sync(self, schemes: List[Dict]) -> str:
+        """Register ``schemes`` as the current catalogue if it is a new list; return its version."""
+        with self._lock:
+            if self._current is not None and schemes is self._current[1]:
+                return self._current[0]
+            digests = record_digests(schemes)
+            version = catalogue_version(digests)
+            self._versions.pop(version, None)
+            self._versions[version] = digests
+            while len(self._versions) > self.history:
+                self._versions.popitem(last=False)
+            self._current = (version, schemes, {s.get("id", ""): s for s in schemes})
+            return version
+
+    @property
+    def version(self) -> Optional[str]:
+        return self._current[0] if self._current is not None else None
+
+    def _state(self, since: str = "") -> Tuple:
+        """
+        The current version, schemes, id map and digests, plus ``since``
+        and its digests (``""`` and None unless it is still in history),
+        read as one unit so a concurrent sync() cannot mix two catalogues.
+        """
+        with self._lock:
+            version, schemes, by_id = self._current
+            old = self._versions.get(since) if since else None
+            if old is None:
+                since = ""
+            return version, schemes, by_id, self._versions[version], since, old
+
+    def payload(self, lang: str, since: str = "") -> Dict:
+        """Full bundle, or a delta when ``since`` is a version still in history."""
+        return self._payload(self._state(since), lang)
+
+    def _payload(self, state: Tuple, lang: str) -> Dict:
+        version, schemes, by_id, current, since, old = state
+        if old is None:
+            records = [bundle_record(s, lang) for s in schemes]
+            return {
+                "v": version, "lang": lang, "full": True, "fields": list(FIELDS),
+                "schemes": records, "index": build_index(records),
+            }
+
+        changed = [i for i, d in current.items() if old.get(i) != d]
+        return {
+            "v": version, "from": since, "lang": lang,
+            "upsert": [bundle_record(by_id[i], lang) for i in changed],
+            "delete": [i for i in old if i not in current],
+        }
+
+    def encoded(self, schemes: List[Dict], lang: str, since: str = "") -> Tuple[str, bytes]:
+        """
+        gzip-compressed bundle or delta for ``lang``.
+
+        :return: (current version, compressed JSON)
+        """
+        self.sync(schemes)
+        # The key and the payload come from the same state, even if another
+        # catalogue is synced meanwhile
+        state = self._state(since)
+        version, since = state[0], state[4]
+        key = (version, lang, since)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                return version, cached
+
+        body = gzip.compress(_dumps(self._payload(state, lang)), self.compresslevel, mtime=0)
+        with self._lock:
+            self._cache[key] = body
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return version, body
+
+
+def apply_delta(bundle: Dict, delta: Dict) -> Dict:
+    """Merge a delta into a full bundle (what clients do), rebuilding the index."""
+    deleted = set(delta["delete"])
+    upserts = {r[0]: r for r in delta["upsert"]}
+    records = [upserts.pop(r[0], r) for r in bundle["schemes"] if r[0] not in deleted]
+    records.extend(upserts.values())
+    return {**bundle, "v": delta["v"], "schemes": records, "index": build_index(records)}
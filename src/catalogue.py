@@ -0,0 +1,301 @@
+"""The loaded scheme catalogue and every index derived from it.
+
+Records and indexes are built together into one immutable snapshot and
+swapped in with a single assignment, so a request that reads
+``catalogue.snapshot`` once sees a consistent set even while a reload
+runs. Synonyms and the document registry are part of the snapshot, so
+editing ``schemes.json``, ``synonyms.json`` or ``documents.json`` and
+reloading recompiles everything.
+
+Nothing is read until the snapshot is first needed (or ``load()`` is
+called by the startup warm-up), so importing the app stays cheap.
+Complete search results are cached per snapshot; a reload starts with
+an empty cache.
+
+Structured eligibility rules are compiled into an ``EligibilityIndex``;
+``search(..., attrs=...)`` only ranks the schemes a user qualifies for.
+Required documents and application steps go into a ``DocumentIndex``,
+labelled from the document registry (``DOCUMENTS_PATH``). The simplified
+text of every scheme in each supported language is precomputed into a
+``ResponseGenerator`` for streamed ``/ws`` text.
+
+Given an ``index_path`` (the server uses ``config.INDEX_PATH``), the
+name/tag and synonym postings are read from the ``index.json`` written
+by ``src.ingest`` instead of being rebuilt, as long as its ``key`` shows
+it was built from the current ``schemes.json`` bytes and synonym groups.
+
+With ``config.semantic.ENABLED`` the snapshot also holds a
+``SemanticIndex`` (see ``src.semantic``, needs numpy), and search fuses
+its vector hits with the keyword ranking. With ``config.related.ENABLED``
+it holds a ``RelatedGraph`` (see ``src.related``, needs numpy), the
+precomputed nearest schemes of every scheme, for ``related()``.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from time import perf_counter
+from typing import Dict, List, Optional, Union
+
+from dataClasses import ProcessedQuery
+from response_generator import ResponseGenerator
+from scheme_database import SchemeDatabase
+from src.config import config
+from src.data_loader import load_schemes
+from src.documents import DocumentIndex, DocumentRegistry, load_documents
+from src.eligibility import EligibilityIndex, count, positions
+from src.matcher import NameTagIndex, SearchResults, match_schemes
+from src.synonyms import SynonymIndex, load_synonyms
+
+
+def index_key(scheme_bytes: bytes, synonym_groups: List[List[str]]) -> str:
+    """Digest of the inputs a prebuilt index is valid for."""
+    h = hashlib.blake2b(scheme_bytes, digest_size=16)
+    h.update(json.dumps(synonym_groups, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+    return h.hexdigest()
+
+
+class CatalogueSnapshot:
+    """Immutable view of one catalogue version, plus its search result cache."""
+
+    __slots__ = (
+        "schemes", "db", "name_tag_index", "synonyms", "eligibility", "documents", "semantic",
+        "related", "text", "search_cache",
+    )
+
+    def __init__(
+        self,
+        schemes: List[Dict],
+        synonym_groups: List[List[str]],
+        semantic: bool = False,
+        documents: Dict[str, Dict] = None,
+        related: bool = False,
+        prebuilt: Dict = None,
+    ):
+        """
+        :param prebuilt: Optional ``index.json`` contents from src.ingest,
+            built from these schemes and groups
+        """
+        self.schemes = schemes
+        self.db = SchemeDatabase.from_records(schemes)
+        if prebuilt is None:
+            self.name_tag_index = NameTagIndex(schemes)
+            self.synonyms = SynonymIndex(schemes, synonym_groups)
+        else:
+            self.name_tag_index = NameTagIndex.from_postings(schemes, prebuilt["name_tag"])
+            self.synonyms = SynonymIndex.from_postings(synonym_groups, prebuilt["synonyms"])
+        self.eligibility = EligibilityIndex(schemes)
+        self.documents = DocumentIndex(schemes, DocumentRegistry(documents))
+        self.text = ResponseGenerator(schemes, config.language.SUPPORTED_LANGUAGES)
+        self.semantic = None
+        if semantic:
+            from src.semantic import SemanticIndex
+
+            self.semantic = SemanticIndex(schemes, synonym_groups)
+        self.related = None
+        if related:
+            from src.related import RelatedGraph
+
+            self.related = RelatedGraph(schemes)
+        # (query tokens, max_results) -> SearchResults, least recently used first
+        self.search_cache: OrderedDict = OrderedDict()
+
+
+class Catalogue:
+    """Holds the current CatalogueSnapshot and rebuilds it on reload."""
+
+    def __init__(
+        self,
+        scheme_path: str,
+        synonyms_path: str,
+        cache_size: int = config.SEARCH_CACHE_SIZE,
+        semantic: bool = None,
+        documents_path: str = config.DOCUMENTS_PATH,
+        related: bool = None,
+        index_path: str = None,
+    ):
+        """
+        :param index_path: Optional ``index.json`` from src.ingest, used
+            when it was built from the current scheme and synonym files
+        """
+        self.scheme_path = scheme_path
+        self.synonyms_path = synonyms_path
+        self.documents_path = documents_path
+        self.index_path = index_path
+        # Whether the last load used the prebuilt index
+        self.prebuilt_index = False
+        self.cache_size = cache_size
+        self.semantic = config.semantic.ENABLED if semantic is None else semantic
+        self.related_graph = config.related.ENABLED if related is None else related
+        self.cache_stats = {"hits": 0, "misses": 0}
+        # Seconds spent reading files and building indexes in the last load
+        self.timings: Dict[str, float] = {}
+        self._snapshot: Optional[CatalogueSnapshot] = None
+        self._mtimes = None
+        self._reload_lock = threading.Lock()
+        self._cache_lock = threading.Lock()
+
+    def _file_mtimes(self):
+        return tuple(
+            os.stat(p).st_mtime_ns if os.path.exists(p) else None
+            for p in (self.scheme_path, self.synonyms_path, self.documents_path, self.index_path)
+            if p is not None
+        )
+
+    def _read_index(self, synonym_groups: List[List[str]]) -> Optional[Dict]:
+        """The prebuilt index, if there is one and it matches the current files."""
+        if not self.index_path or not os.path.exists(self.index_path):
+            return None
+        try:
+            with open(self.scheme_path, "rb") as f:
+                key = index_key(f.read(), synonym_groups)
+            with open(self.index_path, encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(index, dict) or index.get("key") != key:
+            return None
+        return index
+
+    @property
+    def snapshot(self) -> CatalogueSnapshot:
+        snapshot = self._snapshot
+        return snapshot if snapshot is not None else self.load(only_if_missing=True)
+
+    @property
+    def loaded(self) -> bool:
+        return self._snapshot is not None
+
+    def load(self, only_if_missing: bool = False) -> CatalogueSnapshot:
+        """Read the source files, build all indexes, then swap the snapshot in."""
+        with self._reload_lock:
+            if only_if_missing and self._snapshot is not None:
+                return self._snapshot
+            start = perf_counter()
+            mtimes = self._file_mtimes()
+            schemes = load_schemes(self.scheme_path)
+            groups = load_synonyms(self.synonyms_path)
+            documents = load_documents(self.documents_path)
+            prebuilt = self._read_index(groups)
+            read = perf_counter()
+            snapshot = CatalogueSnapshot(
+                schemes, groups, self.semantic, documents, self.related_graph, prebuilt
+            )
+            self.prebuilt_index = prebuilt is not None
+            self.timings = {"read": read - start, "index": perf_counter() - read}
+            self._snapshot = snapshot
+            self._mtimes = mtimes
+            return snapshot
+
+    def reload_if_changed(self) -> bool:
+        """Reload when any source file changed since the last load."""
+        if self._file_mtimes() == self._mtimes:
+            return False
+        self.load()
+        return True
+
+    @property
+    def schemes(self) -> List[Dict]:
+        return self.snapshot.schemes
+
+    def get_by_id(self, scheme_id: str) -> Optional[Dict]:
+        return self.snapshot.db.get_by_id(scheme_id)
+
+    def related(
+        self, scheme_id: str, limit: int = None, exclude=(), attrs: Dict = None
+    ) -> List[Dict]:
+        """
+        Schemes most like ``scheme_id``, most similar first.
+
+        Empty when the graph is disabled or the id is unknown.
+
+        :param exclude: Scheme ids to leave out (e.g. ones already shown)
+        :param attrs: Optional eligibility profile; only schemes it
+            qualifies for are returned
+        """
+        snap = self.snapshot
+        graph = snap.related
+        pos = graph.position.get(scheme_id) if graph is not None else None
+        if pos is None:
+            return []
+        found = [p for p, _ in graph.related(pos)]
+        if attrs and snap.eligibility.has_rules:
+            bits = snap.eligibility.evaluate(attrs)
+            found = [p for p in found if bits >> p & 1]
+        schemes = (snap.schemes[p] for p in found)
+        return [s for s in schemes if s.get("id") not in exclude][:limit]
+
+    def search(
+        self,
+        query: Union[str, ProcessedQuery],
+        max_results: int,
+        deadline: float = None,
+        attrs: Dict = None,
+        trace=None,
+    ) -> SearchResults:
+        """
+        Rank schemes for a query.
+
+        :param attrs: Parsed user attributes (see ``src.eligibility``); when
+            given, schemes whose rules exclude the user are not ranked
+        :param trace: Optional ``src.profiling.Trace`` that gets the cache
+            outcome and candidate counts
+        """
+        snap = self.snapshot
+        tokens = query.tokens if isinstance(query, ProcessedQuery) else query.lower().split()
+        eligible = None
+        if attrs and snap.eligibility.has_rules:
+            eligible = snap.eligibility.evaluate(attrs)
+        key = (tuple(tokens), max_results, tuple(sorted(attrs.items())) if attrs else ())
+        cache = snap.search_cache
+        with self._cache_lock:
+            cached = cache.get(key)
+            if cached is not None:
+                cache.move_to_end(key)
+                self.cache_stats["hits"] += 1
+                if trace is not None:
+                    trace.count("cache", "hit")
+                return cached
+            self.cache_stats["misses"] += 1
+
+        if snap.semantic is None:
+            results = match_schemes(
+                query, snap.schemes, max_results, snap.synonyms, deadline,
+                candidates=None if eligible is None else positions(eligible),
+            )
+        else:
+            results = self._hybrid_search(snap, query, tokens, max_results, deadline, eligible)
+        if trace is not None:
+            trace.count("cache", "miss")
+            trace.count("candidates", len(snap.schemes) if eligible is None else count(eligible))
+            trace.count("scored", results.scored)
+            trace.count("partial", results.partial)
+        # A partial ranking depends on timing, so it is never reused
+        if not results.partial and self.cache_size > 0:
+            with self._cache_lock:
+                cache[key] = results
+                if len(cache) > self.cache_size:
+                    cache.popitem(last=False)
+        return results
+
+    @staticmethod
+    def _hybrid_search(
+        snap, query, tokens, max_results, deadline, eligible=None
+    ) -> SearchResults:
+        from src.semantic import fuse
+
+        depth = max(max_results, config.semantic.CANDIDATES)
+        keyword = match_schemes(
+            query, snap.schemes, depth, snap.synonyms, deadline,
+            candidates=None if eligible is None else positions(eligible),
+        )
+        semantic = [
+            snap.schemes[pos] for pos, _ in snap.semantic.search_many([tokens], depth)[0]
+            if eligible is None or eligible >> pos & 1
+        ]
+        fused = SearchResults(fuse(keyword, semantic, max_results))
+        fused.partial = keyword.partial
+        fused.scored = keyword.scored
+        return fused
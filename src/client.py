@@ -0,0 +1,261 @@
+"""Client library for the /ask and /ws endpoints.
+
+``SchemeClient`` keeps a small pool of keep-alive HTTP connections, so
+a kiosk or field-agent tool pays the TCP handshake once instead of per
+query, and ``ask_many()`` pipelines a batch of queries over one
+connection. Timeouts and retries default to ``config.network``.
+
+``AsyncSchemeClient`` talks to ``/ws``. It sends a client-chosen session
+ID with every message, so after a dropped connection it reconnects and
+the server still has the conversation context and pending pages.
+Requires the ``websockets`` package.
+"""
+
+import asyncio
+import http.client
+import json
+import queue
+import socket
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import quote
+
+from src.config import config
+
+# Errors after which a request is retried on a fresh connection
+_CONNECTION_ERRORS = (OSError, http.client.HTTPException)
+
+
+def _ask_path(q: str, lang: str, sid: str) -> str:
+    path = f"/ask?q={quote(q)}&lang={quote(lang)}"
+    if sid:
+        path += f"&sid={quote(sid)}"
+    return path
+
+
+def _decode(status: int, body: bytes) -> Dict:
+    try:
+        data = json.loads(body.decode("utf-8"))
+    except ValueError:
+        data = {"error": f"invalid response (HTTP {status})"}
+    if status != 200 and "error" not in data:
+        data["error"] = data.get("msg") or f"HTTP {status}"
+    return data
+
+
+class _SharedReader:
+    """File wrapper that HTTPResponse cannot close, so pipelined responses share one buffer."""
+
+    def __init__(self, fp):
+        self._fp = fp
+
+    def __getattr__(self, name):
+        return getattr(self._fp, name)
+
+    def close(self):
+        pass
+
+
+class _PipelinedSocket:
+    """Hands every HTTPResponse the same buffered reader."""
+
+    def __init__(self, reader):
+        self._reader = reader
+
+    def makefile(self, *args, **kwargs):
+        return self._reader
+
+
+class SchemeClient:
+    """Pooled keep-alive HTTP client for ``/ask``."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = config.API_PORT,
+        timeout: float = config.network.TIMEOUT_SECONDS,
+        retries: int = config.network.MAX_RETRIES,
+        pool_size: int = 4,
+        backoff: float = 0.1,
+    ):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.connections_opened = 0
+        self._pool: queue.LifoQueue = queue.LifoQueue(maxsize=pool_size)
+
+    def _connect(self) -> http.client.HTTPConnection:
+        self.connections_opened += 1
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    @contextmanager
+    def _connection(self):
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+        try:
+            yield conn
+        except BaseException:
+            conn.close()
+            raise
+        try:
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def _get(self, path: str) -> Tuple[int, bytes]:
+        """GET with retries on connection errors and busy (503) answers."""
+        attempt = 0
+        while True:
+            try:
+                with self._connection() as conn:
+                    conn.request("GET", path)
+                    resp = conn.getresponse()
+                    status, body = resp.status, resp.read()
+                if status != 503 or attempt >= self.retries:
+                    return status, body
+            except _CONNECTION_ERRORS:
+                # Also covers a pooled connection the server has since closed
+                if attempt >= self.retries:
+                    raise
+            time.sleep(self.backoff * 2 ** attempt)
+            attempt += 1
+
+    def ask(self, q: str, lang: str = "hi", sid: str = "") -> Dict:
+        """
+        Ask one question.
+
+        :return: Decoded response; on failure a dict with an "error" key
+        """
+        try:
+            return _decode(*self._get(_ask_path(q, lang, sid)))
+        except _CONNECTION_ERRORS as e:
+            return {"error": str(e), "schemes": []}
+
+    def next_page(self, sid: str) -> Dict:
+        """Fetch the next page of a split answer."""
+        try:
+            return _decode(*self._get(f"/ask/next?sid={quote(sid)}"))
+        except _CONNECTION_ERRORS as e:
+            return {"error": str(e), "schemes": []}
+
+    def ask_many(self, queries: Iterable[str], lang: str = "hi", depth: int = 16) -> List[Dict]:
+        """
+        Ask a batch of questions with HTTP/1.1 pipelining.
+
+        Up to ``depth`` requests are written before the first response is
+        read. If the connection breaks mid-batch, the unanswered rest is
+        retried one by one through the pool.
+        """
+        queries = list(queries)
+        results: List[Optional[Dict]] = [None] * len(queries)
+        done = 0
+        try:
+            with socket.create_connection((self.host, self.port), self.timeout) as sock, \
+                    sock.makefile("rb") as fp:
+                self.connections_opened += 1
+                pipe = _PipelinedSocket(_SharedReader(fp))
+                for start in range(0, len(queries), depth):
+                    batch = queries[start:start + depth]
+                    sock.sendall(b"".join(
+                        f"GET {_ask_path(q, lang, '')} HTTP/1.1\r\n"
+                        f"Host: {self.host}:{self.port}\r\n\r\n".encode("ascii")
+                        for q in batch
+                    ))
+                    for _ in batch:
+                        resp = http.client.HTTPResponse(pipe)
+                        resp.begin()
+                        results[done] = _decode(resp.status, resp.read())
+                        done += 1
+                        if resp.will_close:
+                            raise ConnectionResetError("server closed the pipelined connection")
+        except _CONNECTION_ERRORS:
+            pass
+
+        for i in range(done, len(queries)):
+            results[i] = self.ask(queries[i], lang)
+        return results
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class AsyncSchemeClient:
+    """WebSocket client for ``/ws`` with automatic reconnect and session resumption."""
+
+    def __init__(
+        self,
+        uri: str = "ws://127.0.0.1:8001/ws",
+        timeout: float = config.network.TIMEOUT_SECONDS,
+        retries: int = config.network.MAX_RETRIES,
+        sid: str = None,
+        backoff: float = 0.2,
+    ):
+        self.uri = uri
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        # Sent with every message so a new connection resumes the same session
+        self.sid = sid or uuid.uuid4().hex
+        self.reconnects = 0
+        self._ws = None
+
+    async def connect(self) -> None:
+        import websockets
+
+        self._ws = await websockets.connect(self.uri, open_timeout=self.timeout)
+
+    async def _exchange(self, message: Dict) -> Dict:
+        message = json.dumps({**message, "sid": self.sid}, ensure_ascii=False)
+        for attempt in range(self.retries + 1):
+            try:
+                if self._ws is None:
+                    if attempt:
+                        self.reconnects += 1
+                    await self.connect()
+                await self._ws.send(message)
+                return json.loads(await asyncio.wait_for(self._ws.recv(), self.timeout))
+            except Exception as e:  # OSError, timeouts, websockets.ConnectionClosed
+                error = e
+            await self._drop()
+            if attempt < self.retries:
+                await asyncio.sleep(self.backoff * 2 ** attempt)
+        return {"error": str(error) or type(error).__name__, "schemes": []}
+
+    async def ask(self, q: str, lang: str = "hi") -> Dict:
+        return await self._exchange({"q": q, "lang": lang})
+
+    async def next_page(self) -> Dict:
+        return await self._exchange({"more": True})
+
+    async def _drop(self) -> None:
+        ws, self._ws = self._ws, None
+        if ws is not None:
+            try:
+                await ws.close()
+            except Exception:
+                pass
+
+    async def close(self) -> None:
+        await self._drop()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
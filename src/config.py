@@ -4,26 +4,29 @@ This module contains all configuration settings for the application,
 including API settings, language support, and performance constraints.
 """
 
-from typing import List
+import os
 from dataclasses import dataclass
+from typing import List
 
 
 @dataclass
 class QueryConfig:
     """Configuration for query processing."""
-    
-    MAX_QUERY_LENGTH: int = 500
+
+    MAX_QUERY_LENGTH: int = 500  # Characters
+    MAX_QUERY_BYTES: int = 2048  # UTF-8; Indic characters take 3 bytes each
+    MAX_QUERY_TOKENS: int = 32  # Distinct words passed to the ranker
     MIN_QUERY_LENGTH: int = 1
 
 
 @dataclass
 class LanguageConfig:
     """Configuration for language support."""
-    
+
     SUPPORTED_LANGUAGES: List[str] = None
     DEFAULT_LANGUAGE: str = "hi"  # Hindi
     CONFIDENCE_THRESHOLD: float = 0.7
-    
+
     def __post_init__(self):
         if self.SUPPORTED_LANGUAGES is None:
             # Hindi, Tamil, Telugu, Bengali, Marathi
@@ -33,17 +36,18 @@ class LanguageConfig:
 @dataclass
 class ResponseConfig:
     """Configuration for response generation."""
-    
+
     MAX_RESPONSE_WORDS: int = 120
     MAX_RESPONSE_BYTES: int = 10 * 1024 # 10 KB
     MAX_ACTION_STEPS: int = 5
     MAX_SCHEME_RESULTS: int = 3
+    MAX_ELIGIBLE_RESULTS: int = 20  # Schemes listed by /eligible (paged like /ask)
 
 
 @dataclass
 class SessionConfig:
     """Configuration for session management."""
-    
+
     SESSION_TIMEOUT_MINUTES: int = 30
     MAX_HISTORY_LENGTH: int = 10
 
@@ -51,36 +55,147 @@ class SessionConfig:
 @dataclass
 class NetworkConfig:
     """Configuration for network and performance."""
-    
+
     MAX_RETRIES: int = 2
     TIMEOUT_SECONDS: int = 5
     # TARGET_NETWORK_SPEED: str = "2G"  # 50 kbps minimum
 
 
+@dataclass
+class LogConfig:
+    """Configuration for the request access log."""
+
+    ACCESS_LOG_ENABLED: bool = True
+    ACCESS_LOG_PATH: str = "logs/access.jsonl"
+    ACCESS_LOG_MAX_BYTES: int = 50 * 1024 * 1024  # Rotate at 50 MB
+    ACCESS_LOG_BACKUPS: int = 5
+    ACCESS_LOG_QUEUE_SIZE: int = 10000  # Records beyond this are dropped
+    ACCESS_LOG_FSYNC_SECONDS: float = 1.0
+
+
+@dataclass
+class AdmissionConfig:
+    """Configuration for rate limiting and load shedding."""
+
+    RATE_LIMIT_PER_SECOND: float = 5.0  # Per client; 0 disables
+    RATE_LIMIT_BURST: int = 20
+    RATE_LIMIT_MAX_CLIENTS: int = 100000  # Least recently seen are evicted
+    MAX_CONCURRENT_REQUESTS: int = 8
+    MAX_QUEUED_REQUESTS: int = 24  # Keep below the server's worker thread count
+    QUEUE_TIMEOUT_SECONDS: float = 0.5
+    SHED_LATENCY_MS: float = 250.0  # Stop queueing when average latency exceeds this
+    RETRY_AFTER_SECONDS: int = 2
+
+
+@dataclass
+class SemanticConfig:
+    """Configuration for optional dense-vector retrieval (needs numpy)."""
+
+    ENABLED: bool = False
+    DIMENSIONS: int = 256  # Hashed feature vector size
+    IVF_MIN_SCHEMES: int = 4096  # Smaller catalogues are searched exhaustively
+    IVF_LISTS: int = 0  # 0 = sqrt(number of schemes)
+    IVF_PROBE: int = 8  # Lists scanned per query
+    CANDIDATES: int = 20  # Keyword and vector results fused per query
+    MIN_SIMILARITY: float = 0.12  # Cosine; weaker vector matches are ignored
+    RRF_K: int = 60  # Reciprocal rank fusion constant
+
+
+@dataclass
+class RelatedConfig:
+    """Configuration for the precomputed related-schemes graph (needs numpy)."""
+
+    ENABLED: bool = False
+    NEIGHBOURS: int = 10  # Related schemes stored per scheme
+    MAX_FEATURE_RATIO: float = 0.5  # Words in more of the catalogue than this link nothing
+    MAX_POSTINGS: int = 1000  # Words in more distinct schemes are scored per word set
+    TAG_WEIGHT: float = 2.0  # Shared tags count more than shared words
+    MAX_RESULTS: int = 3  # Related schemes shown per answer
+
+
+@dataclass
+class WebSocketConfig:
+    """Configuration for /ws connections (see src.connections)."""
+
+    MAX_CONNECTIONS: int = 20000  # Per worker; more are refused with close code 1013
+    IDLE_TIMEOUT_SECONDS: float = 600.0  # Closed after this long without a query
+    HEARTBEAT_TIMEOUT_SECONDS: float = 75.0  # Closed after this long without any frame
+    HEARTBEAT_INTERVAL_SECONDS: float = 30.0  # How often clients send {"t": "ping"}
+    SWEEP_INTERVAL_SECONDS: float = 5.0
+
+
+@dataclass
+class PartitionConfig:
+    """Configuration for per-state catalogue partitions (see src.partitions)."""
+
+    ENABLED: bool = False  # Route searches with a known state to its partition
+    PATH: str = "data/partitions"  # central.json plus one <state>.json per state
+    FIELD: str = "state"  # Scheme field naming its state; missing means central
+    MAX_LOADED: int = 4  # State partitions kept loaded; least recently used dropped
+
+
+@dataclass
+class ProfilingConfig:
+    """Configuration for on-demand profiling (see src.profiling)."""
+
+    SAMPLE_INTERVAL_MS: float = 10.0  # Stack samples per thread at 100 Hz
+    MAX_PROFILE_SECONDS: float = 60.0  # Longest /admin/profile run
+    TRACE_BUFFER_SIZE: int = 200  # Traced requests kept; 0 ignores trace=1
+
+
 @dataclass
 class AppConfig:
     """Main application configuration."""
-    
+
     query: QueryConfig
     language: LanguageConfig
     response: ResponseConfig
     session: SessionConfig
     network: NetworkConfig
-    
+    log: LogConfig
+    admission: AdmissionConfig
+    semantic: SemanticConfig
+    related: RelatedConfig
+    websocket: WebSocketConfig
+    profiling: ProfilingConfig
+    partitions: PartitionConfig
+
     # API settings
     API_HOST: str = "0.0.0.0"
     API_PORT: int = 8000
     API_RELOAD: bool = False
-    
+
     # Data paths
     SCHEME_DATA_PATH: str = "data/schemes.json"
-    
+    SYNONYMS_PATH: str = "data/synonyms.json"
+    DOCUMENTS_PATH: str = "data/documents.json"  # Document keys, labels and aliases
+    SCHEMA_PATH: str = "scheme_schema.json"  # Field template used by src.ingest
+    WARMUP_QUERIES_PATH: str = "data/top_queries.txt"  # One query per line
+    # Indexes prebuilt by src.ingest; used only if built from the current
+    # schemes.json and synonyms.json
+    INDEX_PATH: str = "data/index.json"
+
+    # Startup and caching
+    SEARCH_CACHE_SIZE: int = 1024  # Complete search results kept per catalogue version
+    STARTUP_TARGET_SECONDS: float = 2.0  # Import + load + warm-up budget
+
+    # Token required by /admin/* and /zero-results, from the ADMIN_TOKEN
+    # environment variable; empty (the default) disables them
+    ADMIN_TOKEN: str = os.environ.get("ADMIN_TOKEN", "")
+
     def __init__(self):
         self.query = QueryConfig()
         self.language = LanguageConfig()
         self.response = ResponseConfig()
         self.session = SessionConfig()
         self.network = NetworkConfig()
+        self.log = LogConfig()
+        self.admission = AdmissionConfig()
+        self.semantic = SemanticConfig()
+        self.related = RelatedConfig()
+        self.websocket = WebSocketConfig()
+        self.profiling = ProfilingConfig()
+        self.partitions = PartitionConfig()
 
 
 # Global configuration instance
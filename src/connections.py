@@ -0,0 +1,175 @@
+"""Bookkeeping for many mostly idle /ws connections.
+
+Each open socket is one slotted ``Connection``: the socket, its own
+session ID, two timestamps and the frames waiting to be written. The
+conversation itself (last results, pages, profile) stays in
+``SessionManager`` under the session ID, and outlives the socket until
+it expires by time: a client that sends the same ``sid`` after a
+reconnect continues the conversation. Clients may choose their ``sid``
+or use the connection's, which streamed answers carry in their ack.
+
+Timeouts are enforced by one sweeper task per worker, which scans the
+open connections every ``SWEEP_INTERVAL_SECONDS`` instead of arming a
+timer per socket:
+
+* heartbeat: a connection that sent nothing at all (not even a
+  ``{"t": "ping"}`` heartbeat) for ``HEARTBEAT_TIMEOUT_SECONDS`` is taken
+  for a client that went away without closing, and is closed;
+* idle: a connection whose client is alive but asked nothing for
+  ``IDLE_TIMEOUT_SECONDS`` is closed to free its slot. Clients reconnect
+  with their session ID and continue where they left off.
+
+Expired sessions are dropped by ``SessionManager`` itself.
+
+At most ``MAX_CONNECTIONS`` sockets are open per worker; more are
+refused with close code 1013 (try again later) before the handshake.
+
+Frames are queued with ``send()`` and written by ``flush()``, so all the
+frames of a turn go out together and a write to a closed socket is
+handled in one place: the connection is marked closed instead of the
+error escaping into the endpoint.
+"""
+
+import asyncio
+import time
+import uuid
+from typing import List, Optional, Tuple
+
+from src.config import config
+
+# Close codes (RFC 6455)
+GOING_AWAY = 1001
+TRY_AGAIN_LATER = 1013
+
+
+class Connection:
+    """Per-socket state, kept small: 10k idle sockets are 10k of these."""
+
+    __slots__ = (
+        "websocket", "client", "sid", "last_seen", "last_query", "outbox", "closed",
+    )
+
+    def __init__(self, websocket, client: str, now: float):
+        self.websocket = websocket
+        self.client = client
+        # Session used when the client does not send its own "sid"
+        self.sid = uuid.uuid4().hex
+        self.last_seen = self.last_query = now
+        self.outbox: Optional[List[str]] = None  # created on first send
+        self.closed = False
+
+
+class ConnectionManager:
+    """Open /ws connections of one worker, with their limits and timeouts."""
+
+    def __init__(
+        self,
+        session_manager=None,
+        max_connections: int = config.websocket.MAX_CONNECTIONS,
+        idle_timeout: float = config.websocket.IDLE_TIMEOUT_SECONDS,
+        heartbeat_timeout: float = config.websocket.HEARTBEAT_TIMEOUT_SECONDS,
+        sweep_interval: float = config.websocket.SWEEP_INTERVAL_SECONDS,
+    ):
+        self.session_manager = session_manager
+        self.max_connections = max_connections
+        self.idle_timeout = idle_timeout
+        self.heartbeat_timeout = heartbeat_timeout
+        self.sweep_interval = sweep_interval
+        self.connections = set()
+        self.stats = {"rejected": 0, "idle": 0, "heartbeat": 0, "write_errors": 0}
+        self._sweeper: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self.connections)
+
+    def open(self, websocket, client: str = "", now: float = None) -> Optional[Connection]:
+        """Register a socket; None when the worker is at its connection cap."""
+        if len(self.connections) >= self.max_connections:
+            self.stats["rejected"] += 1
+            return None
+        conn = Connection(websocket, client, time.monotonic() if now is None else now)
+        self.connections.add(conn)
+        self._start_sweeper()
+        return conn
+
+    def seen(self, conn: Connection, query: bool = True, now: float = None) -> None:
+        """Record a received frame; heartbeats (``query=False``) do not reset the idle timer."""
+        conn.last_seen = time.monotonic() if now is None else now
+        if query:
+            conn.last_query = conn.last_seen
+
+    def send(self, conn: Connection, text: str) -> None:
+        """Queue a frame; it is written by the next ``flush()``."""
+        if conn.closed:
+            return
+        if conn.outbox is None:
+            conn.outbox = [text]
+        else:
+            conn.outbox.append(text)
+
+    async def flush(self, conn: Connection) -> int:
+        """
+        Write the queued frames in order.
+
+        :return: Bytes written; a failed write closes the connection
+        """
+        frames, conn.outbox = conn.outbox, None
+        if not frames or conn.closed:
+            return 0
+        nbytes = 0
+        try:
+            for frame in frames:
+                await conn.websocket.send_text(frame)
+                nbytes += len(frame.encode("utf-8"))
+        except Exception:
+            self.stats["write_errors"] += 1
+            self.close(conn)
+        return nbytes
+
+    def close(self, conn: Connection) -> None:
+        """Forget a connection (idempotent); its session stays until it expires."""
+        conn.closed = True
+        conn.outbox = None
+        self.connections.discard(conn)
+
+    def expired(self, now: float = None) -> List[Tuple[Connection, str]]:
+        """Connections past their heartbeat or idle timeout, with the reason."""
+        now = time.monotonic() if now is None else now
+        silent = now - self.heartbeat_timeout
+        idle = now - self.idle_timeout
+        found = []
+        for conn in self.connections:
+            if conn.last_seen < silent:
+                found.append((conn, "heartbeat"))
+            elif conn.last_query < idle:
+                found.append((conn, "idle"))
+        return found
+
+    async def sweep(self, now: float = None) -> int:
+        """Close expired connections; the endpoint's pending receive then ends."""
+        found = self.expired(now)
+        for conn, reason in found:
+            self.stats[reason] += 1
+            self.close(conn)
+            try:
+                await conn.websocket.close(code=GOING_AWAY)
+            except Exception:
+                pass  # already gone
+        return len(found)
+
+    def _start_sweeper(self) -> None:
+        if self._sweeper is None or self._sweeper.done():
+            try:
+                self._sweeper = asyncio.get_running_loop().create_task(self._sweep_forever())
+            except RuntimeError:
+                pass  # no event loop (called synchronously); sweep() can be driven by hand
+
+    async def _sweep_forever(self) -> None:
+        while self.connections:
+            await asyncio.sleep(self.sweep_interval)
+            await self.sweep()
+
+    def stop(self) -> None:
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            self._sweeper = None
@@ -4,9 +4,9 @@ from pathlib import Path
 from src.config import config
 
 
-def load_schemes():
+def load_schemes(path: str = None):
     """Load scheme data from local JSON file."""
-    path = Path(config.SCHEME_DATA_PATH)
+    path = Path(path or config.SCHEME_DATA_PATH)
 
     if not path.exists():
         return []
@@ -20,6 +20,3 @@ def load_schemes():
     # Graceful fallback for malformed or legacy files.
     return []
 
-
-# Load once at startup (important for speed)
-SCHEMES = load_schemes()
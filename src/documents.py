@@ -0,0 +1,269 @@
+"""Required documents and application steps, indexed at catalogue load.
+
+A scheme lists what it needs and how to apply::
+
+    "required_documents": ["aadhaar", "bank_passbook"],
+    "application_steps": [
+        {"hi": "...", "en": "Link your bank account with Aadhaar",
+         "location": {"hi": "...", "en": "Bank branch"}, "documents": ["aadhaar"]},
+        ...
+    ]
+
+Steps may also be plain strings. Document names are interned through
+``data/documents.json`` (canonical key, localized labels, aliases), so
+"Aadhaar Card", "aadhar" and "आधार" all become the same document id;
+a name the registry does not know gets an id of its own.
+
+``DocumentIndex`` keeps, as bitsets over scheme positions (see
+``src.eligibility``), the schemes needing each document and the schemes
+needing exactly each document set. "Which schemes need only an Aadhaar
+card" is one lookup of the set ``{aadhaar}``; "what can I apply for with
+these documents" unions the sets contained in the ones the user has.
+
+Every scheme's ``ActionStep`` list is built once per language, capped at
+``MAX_ACTION_STEPS``: a "keep these documents ready" step, then the
+scheme's own steps. Along with it the plain instruction strings are
+kept, so /ask serves steps without formatting anything per request.
+"""
+
+import json
+from itertools import combinations
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from dataClasses import ActionStep
+from src.config import config
+from src.eligibility import bitset
+
+DOCUMENTS_KEY = "required_documents"
+STEPS_KEY = "application_steps"
+
+# Title of the first step, which lists the scheme's documents
+READY_LABELS = {
+    "hi": "ये दस्तावेज़ तैयार रखें",
+    "en": "Keep these documents ready",
+    "ta": "இந்த ஆவணங்களைத் தயாராக வைத்திருங்கள்",
+    "te": "ఈ పత్రాలను సిద్ధంగా ఉంచుకోండి",
+    "bn": "এই নথিগুলি প্রস্তুত রাখুন",
+    "mr": "ही कागदपत्रे तयार ठेवा",
+}
+
+_NO_STEPS = ((), ())
+
+
+def _key(name: str) -> str:
+    return " ".join(str(name).casefold().replace("_", " ").replace("-", " ").split())
+
+
+def _text(value, lang: str) -> str:
+    """A plain string, or a per-language dict with the usual hi, then en fallback."""
+    if isinstance(value, dict):
+        return value.get(lang) or value.get("hi") or value.get("en") or ""
+    return str(value or "")
+
+
+def load_documents(path: str) -> Dict[str, Dict]:
+    """Read the document registry; a missing file means an empty one."""
+    p = Path(path)
+    if not p.exists():
+        return {}
+    with open(p, "r", encoding="utf-8") as f:
+        loaded = json.load(f)
+    documents = loaded.get("documents", {}) if isinstance(loaded, dict) else {}
+    return {key: spec for key, spec in documents.items() if isinstance(spec, dict)}
+
+
+class DocumentRegistry:
+    """Interns document names into small integer ids with localized labels."""
+
+    def __init__(self, documents: Dict[str, Dict] = None):
+        self.keys: List[str] = []
+        self.labels: List[Dict[str, str]] = []
+        self._ids: Dict[str, int] = {}
+        # Names exactly as written -> id, so repeated names skip normalizing
+        self._seen: Dict[str, int] = {}
+        for key, spec in (documents or {}).items():
+            doc_id = self._add(key, {k: v for k, v in spec.items() if k != "aliases"})
+            for alias in spec.get("aliases", ()):
+                self._ids.setdefault(_key(alias), doc_id)
+            for label in spec.values():
+                if isinstance(label, str):
+                    self._ids.setdefault(_key(label), doc_id)
+
+    def _add(self, key: str, labels: Dict[str, str]) -> int:
+        doc_id = self._ids[_key(key)] = len(self.keys)
+        self.keys.append(key)
+        self.labels.append(labels)
+        return doc_id
+
+    def lookup(self, name: str) -> Optional[int]:
+        """Id of a known document name, key, label or alias."""
+        return self._ids.get(_key(name))
+
+    def intern(self, name: str) -> int:
+        """Id of ``name``, registering it (labelled as given) if it is new."""
+        doc_id = self._seen.get(name)
+        if doc_id is None:
+            doc_id = self.lookup(name)
+            if doc_id is None:
+                doc_id = self._add(_key(name).replace(" ", "_"), {"en": str(name).strip()})
+            self._seen[name] = doc_id
+        return doc_id
+
+    def label(self, doc_id: int, lang: str) -> str:
+        return _text(self.labels[doc_id], lang) or self.keys[doc_id]
+
+
+class DocumentIndex:
+    """Document postings and precomputed action steps of a whole catalogue."""
+
+    def __init__(
+        self,
+        schemes: List[Dict],
+        registry: DocumentRegistry = None,
+        languages: Iterable[str] = config.language.SUPPORTED_LANGUAGES,
+        max_steps: int = config.response.MAX_ACTION_STEPS,
+    ):
+        self.registry = registry = registry or DocumentRegistry()
+        self.size = size = len(schemes)
+        self.languages = list(languages)
+
+        # Per scheme position, its interned documents in listed order
+        self.documents: List[Tuple[int, ...]] = [
+            tuple(dict.fromkeys(registry.intern(d) for d in s.get(DOCUMENTS_KEY) or ()))
+            for s in schemes
+        ]
+        by_document: Dict[int, List[int]] = {}
+        by_set: Dict[frozenset, List[int]] = {}
+        for pos, docs in enumerate(self.documents):
+            if not docs:
+                continue
+            for doc_id in docs:
+                by_document.setdefault(doc_id, []).append(pos)
+            by_set.setdefault(frozenset(docs), []).append(pos)
+        # document id -> schemes needing it; exact document set -> schemes needing just it
+        self.by_document = {d: bitset(p, size) for d, p in by_document.items()}
+        self.by_set = {docs: bitset(p, size) for docs, p in by_set.items()}
+
+        # (scheme id, lang) -> (steps, the same steps as the strings /ask sends)
+        self.steps: Dict[Tuple[str, str], Tuple[Tuple[ActionStep, ...], Tuple[str, ...]]] = {}
+        # Identical steps (same number, text, location, documents) are one shared object
+        self._interned: Dict[Tuple, ActionStep] = {}
+        # documents -> lang -> the "keep these documents ready" step; few distinct lists
+        ready: Dict[Tuple[int, ...], Dict[str, Tuple]] = {}
+        for scheme, docs in zip(schemes, self.documents):
+            scheme_id = scheme.get("id")
+            raw_steps = scheme.get(STEPS_KEY) or []
+            if scheme_id is None or not (docs or raw_steps) or max_steps < 1:
+                continue
+            # Languages without their own step text share one fallback list,
+            # unless steps name documents, whose labels are per language
+            own = _step_languages(raw_steps)
+            shared = None
+            first = 2 if docs else 1
+            limit = max_steps - first + 1
+            heads = ready.get(docs)
+            if heads is None:
+                heads = ready[docs] = {lang: self._ready(docs, lang) for lang in self.languages}
+            for lang in self.languages:
+                if own is None or lang in own:
+                    tail = self._tail(raw_steps, lang, first, limit)
+                else:
+                    shared = shared or self._tail(raw_steps, lang, first, limit)
+                    tail = shared
+                head = heads[lang]
+                # The tail is already cut to fit after the head
+                self.steps[(scheme_id, lang)] = (
+                    (head[0] + tail[0], head[1] + tail[1]) if head[0] else tail
+                )
+
+    def ids(self, names: Iterable[str]) -> frozenset:
+        """Ids of the known document names among ``names``; no scheme needs the others."""
+        found = (self.registry.lookup(n) for n in names if str(n).strip())
+        return frozenset(d for d in found if d is not None)
+
+    def requiring(self, doc_id: int) -> int:
+        """Bitset of the schemes that need document ``doc_id``."""
+        return self.by_document.get(doc_id, 0)
+
+    def requiring_exactly(self, doc_ids: frozenset) -> int:
+        """Bitset of the schemes whose documents are exactly ``doc_ids``."""
+        return self.by_set.get(doc_ids, 0)
+
+    def requiring_only(self, doc_ids: frozenset) -> int:
+        """
+        Bitset of the schemes needing nothing beyond ``doc_ids`` (and
+        needing at least one document).
+
+        Looks up every subset of ``doc_ids`` when that is fewer lookups
+        than there are distinct document sets, and scans the sets otherwise.
+        """
+        bits = 0
+        if 2 ** len(doc_ids) <= len(self.by_set):
+            docs = sorted(doc_ids)
+            for n in range(1, len(docs) + 1):
+                for subset in combinations(docs, n):
+                    bits |= self.by_set.get(frozenset(subset), 0)
+        else:
+            for docs, scheme_bits in self.by_set.items():
+                if docs <= doc_ids:
+                    bits |= scheme_bits
+        return bits
+
+    def _lang(self, lang: str) -> str:
+        return lang if lang in self.languages else config.language.DEFAULT_LANGUAGE
+
+    def steps_for(self, scheme_id: str, lang: str) -> Tuple[ActionStep, ...]:
+        return self.steps.get((scheme_id, self._lang(lang)), _NO_STEPS)[0]
+
+    def instructions_for(self, scheme_id: str, lang: str) -> Tuple[str, ...]:
+        return self.steps.get((scheme_id, self._lang(lang)), _NO_STEPS)[1]
+
+    def _ready(self, docs: Tuple[int, ...], lang: str) -> Tuple[Tuple, Tuple]:
+        if not docs:
+            return (), ()
+        names = [self.registry.label(d, lang) for d in docs]
+        title = READY_LABELS.get(lang) or READY_LABELS["en"]
+        step = ActionStep(1, f"{title}: {', '.join(names)}", None, names)
+        return (step,), (step.instruction,)
+
+    def _tail(self, raw_steps: List, lang: str, first: int, limit: int) -> Tuple[Tuple, Tuple]:
+        """The scheme's own steps in ``lang``, numbered from ``first``, at most ``limit``."""
+        label, intern = self.registry.label, self.registry.intern
+        steps = []
+        for raw in raw_steps:
+            if len(steps) >= limit:
+                break
+            text = _text(raw, lang).strip()
+            if not text:
+                continue
+            location = None
+            step_docs = ()
+            if isinstance(raw, dict):
+                location = _text(raw.get("location"), lang) or None
+                if raw.get("documents"):
+                    step_docs = tuple(label(intern(d), lang) for d in raw["documents"])
+            key = (first + len(steps), text, location, step_docs)
+            step = self._interned.get(key)
+            if step is None:
+                instruction = f"{text} ({location})" if location else text
+                step = ActionStep(key[0], instruction, location, list(step_docs))
+                self._interned[key] = step
+            steps.append(step)
+        return tuple(steps), tuple(s.instruction for s in steps)
+
+
+def _step_languages(raw_steps: List) -> Optional[set]:
+    """
+    Languages the steps (or their locations) are written in, or None when
+    a step lists documents and so differs in every language.
+    """
+    langs = set()
+    for raw in raw_steps:
+        if isinstance(raw, dict):
+            if raw.get("documents"):
+                return None
+            langs.update(raw)  # non-language keys never match a language
+            if isinstance(raw.get("location"), dict):
+                langs.update(raw["location"])
+    return langs
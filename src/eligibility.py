@@ -0,0 +1,184 @@
+"""Structured eligibility rules, compiled into per-attribute bitsets.
+
+A scheme may carry machine-readable rules next to its free-text
+eligibility::
+
+    "eligibility_rules": {"min_age": 18, "max_age": 40, "max_income": 200000,
+                          "occupation": ["farmer"], "gender": ["female"], "state": ["mh"]}
+
+Every key is optional; a missing key means no restriction. A user is
+described by the same attributes (``age``, ``income``, ``occupation``,
+``gender``, ``state``), as stored in ``SessionContext.user_attributes``.
+An attribute the user has not given excludes nothing.
+
+At catalogue load the rules are compiled column by column into Python
+integers used as bitsets (bit ``i`` = scheme ``i``): per categorical
+value, the schemes that allow it; per numeric threshold, the schemes
+whose bound admits it (prefix unions over the sorted thresholds).
+Evaluating a user against the whole catalogue is then a handful of
+bisections and big-integer ANDs, instead of one Python rule check per
+scheme. ``rule_matches()`` is that per-scheme check, kept as the
+reference semantics.
+"""
+
+from bisect import bisect_left, bisect_right
+from itertools import compress, islice
+from typing import Dict, Iterable, List, Optional
+
+RULES_KEY = "eligibility_rules"
+
+# rule key -> (user attribute, comparison)
+NUMERIC_RULES = {
+    "min_age": ("age", "min"),
+    "max_age": ("age", "max"),
+    "max_income": ("income", "max"),
+}
+CATEGORICAL_RULES = ("occupation", "gender", "state")
+ATTRIBUTES = ("age", "income") + CATEGORICAL_RULES
+
+# "0"/"1" digits to 0/1 bytes, so a binary string can drive itertools.compress
+_BINARY_DIGITS = bytes.maketrans(b"01", b"\x00\x01")
+
+
+def parse_attributes(raw: Dict) -> Dict:
+    """
+    Keep the known attributes: ages and incomes as ints, the rest lowercased.
+
+    Unknown keys and unparsable numbers are dropped, so they restrict nothing.
+    """
+    attrs = {}
+    for key in ATTRIBUTES:
+        value = raw.get(key)
+        if value is None or str(value).strip() == "":
+            continue
+        if key in ("age", "income"):
+            try:
+                attrs[key] = int(float(value))
+            except (TypeError, ValueError):
+                continue
+        else:
+            attrs[key] = str(value).strip().lower()
+    return attrs
+
+
+def _allowed(values) -> List[str]:
+    if isinstance(values, str):
+        values = [values]
+    return [str(v).strip().lower() for v in values]
+
+
+def rule_matches(rules: Optional[Dict], attrs: Dict) -> bool:
+    """Per-scheme evaluation of one scheme's rules (the reference semantics)."""
+    if not rules:
+        return True
+    for key, (attr, op) in NUMERIC_RULES.items():
+        bound = rules.get(key)
+        value = attrs.get(attr)
+        if bound is None or value is None:
+            continue
+        if (op == "min" and value < bound) or (op == "max" and value > bound):
+            return False
+    for key in CATEGORICAL_RULES:
+        allowed = rules.get(key)
+        value = attrs.get(key)
+        if allowed and value is not None and value not in _allowed(allowed):
+            return False
+    return True
+
+
+def bitset(positions: Iterable[int], size: int) -> int:
+    """Integer with the bits at ``positions`` set."""
+    buf = bytearray((size + 7) // 8)
+    for pos in positions:
+        buf[pos >> 3] |= 1 << (pos & 7)
+    return int.from_bytes(buf, "little")
+
+
+def positions(bits: int, limit: int = None) -> List[int]:
+    """Set bit positions of ``bits`` in ascending order, at most ``limit`` of them."""
+    # Lowest bit first; compress() walks the selectors in C
+    selectors = bin(bits)[:1:-1].encode("ascii").translate(_BINARY_DIGITS)
+    return list(islice(compress(range(bits.bit_length()), selectors), limit))
+
+
+def count(bits: int) -> int:
+    return bin(bits).count("1")
+
+
+class _Threshold:
+    """Bitsets answering "which schemes' bound admits value x" for one numeric rule."""
+
+    def __init__(self, bounds: Dict[int, float], op: str, size: int):
+        self.op = op
+        self.open = bitset((p for p in range(size) if p not in bounds), size)
+        by_value: Dict[float, List[int]] = {}
+        for pos, bound in bounds.items():
+            by_value.setdefault(bound, []).append(pos)
+        # "min" bounds admit x when bound <= x: union over ascending bounds.
+        # "max" bounds admit x when bound >= x: union over descending bounds.
+        self.values = sorted(by_value)
+        ordered = self.values if op == "min" else reversed(self.values)
+        unions = []
+        running = 0
+        for value in ordered:
+            running |= bitset(by_value[value], size)
+            unions.append(running)
+        self.unions = unions if op == "min" else unions[::-1]
+
+    def admits(self, x: float) -> int:
+        if self.op == "min":
+            i = bisect_right(self.values, x) - 1
+            return self.open | (self.unions[i] if i >= 0 else 0)
+        i = bisect_left(self.values, x)
+        return self.open | (self.unions[i] if i < len(self.values) else 0)
+
+
+class EligibilityIndex:
+    """Compiled rules of a whole catalogue."""
+
+    def __init__(self, schemes: List[Dict]):
+        self.size = size = len(schemes)
+        self.all = (1 << size) - 1
+        rules = [s.get(RULES_KEY) or {} for s in schemes]
+        self.has_rules = any(rules)
+
+        self.numeric: Dict[str, tuple] = {}
+        for key, (attr, op) in NUMERIC_RULES.items():
+            bounds = {p: r[key] for p, r in enumerate(rules) if r.get(key) is not None}
+            if bounds:
+                self.numeric[key] = (attr, _Threshold(bounds, op, size))
+
+        # attribute -> (schemes without a rule for it, {value: schemes allowing it})
+        self.categorical: Dict[str, tuple] = {}
+        for key in CATEGORICAL_RULES:
+            by_value: Dict[str, List[int]] = {}
+            open_positions = []
+            for pos, r in enumerate(rules):
+                allowed = r.get(key)
+                if not allowed:
+                    open_positions.append(pos)
+                    continue
+                for value in _allowed(allowed):
+                    by_value.setdefault(value, []).append(pos)
+            if by_value:
+                self.categorical[key] = (
+                    bitset(open_positions, size),
+                    {v: bitset(p, size) for v, p in by_value.items()},
+                )
+
+    def evaluate(self, attrs: Dict) -> int:
+        """Bitset of the schemes ``attrs`` is eligible for."""
+        bits = self.all
+        for attr, threshold in self.numeric.values():
+            value = attrs.get(attr)
+            if value is not None:
+                bits &= threshold.admits(value)
+        for key, (open_bits, by_value) in self.categorical.items():
+            value = attrs.get(key)
+            if value is not None:
+                bits &= open_bits | by_value.get(value, 0)
+        return bits
+
+    def eligible(self, attrs: Dict, limit: int = None) -> List[int]:
+        """Positions of eligible schemes, in catalogue order."""
+        return positions(self.evaluate(attrs), limit)
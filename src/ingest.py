@@ -0,0 +1,412 @@
+"""Bulk ingest of state and ministry scheme feeds into one catalogue.
+
+    python -m src.ingest feeds/ --out build/ [--workers 8] [--strict] [--json]
+
+Sources are ``.json`` files (a list of records) or ``.jsonl`` files (one
+record per line), given directly or as directories. Each file is parsed,
+validated and normalized in a worker process:
+
+- the validator is compiled once per worker from ``scheme_schema.json``;
+  multilingual fields (``name``, ``description``, ...) may appear bare or
+  as ``<field>_<lang>`` for English or any supported language
+- strings are NFC-normalized with whitespace collapsed, null fields are
+  dropped, bare multilingual fields are moved to ``<field>_<lang>`` by
+  script, tags are lowercased and deduplicated
+
+The parent then deduplicates by ``id`` (a later source overrides an
+earlier one) and by content hash (the same scheme republished under
+another ID keeps its first ID), builds the indexes the server builds at
+load, and writes::
+
+    build/schemes.json           catalogue, in first-seen ID order
+    build/index.json             version, by-id, by-category, name/tag
+                                 and synonym postings
+    build/bundles/<lang>.json.gz offline bundle per language
+
+Deployed next to the catalogue as ``config.INDEX_PATH``, ``index.json``
+spares the server rebuilding the name/tag and synonym postings. Its
+``key`` ties it to the exact ``schemes.json`` and synonym groups it was
+built from; the server rebuilds them if either changed.
+
+Per-stage wall time and throughput are reported at the end.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from time import perf_counter
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from src.bundle import BundleStore
+from src.catalogue import index_key
+from src.config import config
+from src.matcher import NameTagIndex
+from src.query_processor import script_language
+from src.synonyms import SynonymIndex, load_synonyms
+
+# Fields that may be given per language as ``<field>_<lang>``
+MULTILINGUAL_FIELDS = ("name", "description", "eligibility", "benefits")
+
+# A record must have these (for multilingual fields, in at least one language)
+REQUIRED_FIELDS = ("id", "name")
+
+_TYPES = {"string": str, "number": (int, float), "boolean": bool}
+
+Validator = Callable[[Dict], List[str]]
+
+
+def load_schema(path: str = config.SCHEMA_PATH) -> Dict:
+    """
+    Read the field template from ``scheme_schema.json``.
+
+    The file holds a ``{"field": "string", "tags": ["string"]}`` template
+    followed by example records; only the template is used.
+    """
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    template, _ = json.JSONDecoder().raw_decode(text.lstrip())
+    return template
+
+
+def compile_validator(
+    template: Dict, languages: Iterable[str] = config.language.SUPPORTED_LANGUAGES
+) -> Validator:
+    """
+    Turn a field template into a validator.
+
+    Every accepted key is resolved to its expected type up front, so
+    checking a record is one dict lookup per key it has.
+
+    :param languages: Suffixes accepted on multilingual fields besides
+        ``en``, which bare Latin-script fields are normalized to
+    :return: function mapping a record to a list of error strings (empty if valid)
+    """
+    languages = list(dict.fromkeys(["en", *languages]))
+    # key -> (type, type name, is a list of that type)
+    checks: Dict[str, Tuple[type, str, bool]] = {}
+    families: Dict[str, List[str]] = {}  # required field -> keys that satisfy it
+    for field, spec in template.items():
+        is_list = isinstance(spec, list)
+        type_name = spec[0] if is_list else spec
+        keys = [field]
+        if field in MULTILINGUAL_FIELDS:
+            keys += [f"{field}_{lang}" for lang in languages]
+        for key in keys:
+            checks[key] = (_TYPES[type_name], type_name, is_list)
+        families[field] = keys
+
+    required = [(field, families.get(field, [field])) for field in REQUIRED_FIELDS]
+
+    def validate(record: Dict) -> List[str]:
+        if not isinstance(record, dict):
+            return [f"expected an object, got {type(record).__name__}"]
+        errors = [
+            f"missing {field}" for field, keys in required
+            if not any(record.get(k) for k in keys)
+        ]
+        for key, value in record.items():
+            check = checks.get(key)
+            if check is None or value is None:
+                continue  # fields outside the template are passed through
+            expected, type_name, is_list = check
+            if is_list:
+                if not isinstance(value, list) or not all(isinstance(v, expected) for v in value):
+                    errors.append(f"{key}: expected a list of {type_name}")
+            elif not isinstance(value, expected):
+                errors.append(f"{key}: expected {type_name}")
+        return errors
+
+    return validate
+
+
+def _clean(text: str) -> str:
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def normalize_record(record: Dict) -> Dict:
+    """NFC strings, language-suffixed multilingual fields, lowercase unique tags."""
+    out = {}
+    for key, value in record.items():
+        if value is None:
+            continue  # an explicit null is the same as a missing field
+        if isinstance(value, str):
+            value = _clean(value)
+            if not value:
+                continue
+        out[key] = value
+
+    for field in MULTILINGUAL_FIELDS:
+        bare = out.pop(field, None)
+        if bare is None:
+            continue
+        lang = script_language(bare) or "en"
+        # An explicit per-language value wins over the bare one
+        out.setdefault(f"{field}_{lang}", bare)
+
+    if "category" in out:
+        out["category"] = out["category"].lower()
+    if "tags" in out:
+        out["tags"] = list(dict.fromkeys(
+            t for t in (_clean(tag).lower() for tag in out["tags"]) if t
+        ))
+    return out
+
+
+def content_hash(record: Dict) -> str:
+    """Digest of everything but the ID, to find one scheme published under several IDs."""
+    body = {k: v for k, v in record.items() if k != "id"}
+    raw = json.dumps(body, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+
+# -----------------------------
+# Worker side
+# -----------------------------
+
+_validator: Optional[Validator] = None
+
+
+def _init_worker(template: Dict, languages: List[str]) -> None:
+    global _validator
+    _validator = compile_validator(template, languages)
+
+
+def _read_records(path: str) -> Tuple[List, List[str]]:
+    """
+    Records of one source file.
+
+    :return: (records, errors); a ``.jsonl`` line that is not JSON is an
+        error of its own, the other lines are still read
+    :raises ValueError: if a ``.json`` file is not JSON, or holds neither a
+        list of records nor an object with a ``schemes`` list
+    """
+    with open(path, "rb") as f:
+        raw = f.read()
+    if path.endswith(".jsonl"):
+        records, errors = [], []
+        for number, line in enumerate(raw.splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                records.append(json.loads(line))
+            except ValueError as e:
+                errors.append(f"line {number}: {e}")
+        return records, errors
+    loaded = json.loads(raw)
+    if isinstance(loaded, dict):
+        loaded = loaded.get("schemes", [])
+    if not isinstance(loaded, list):
+        raise ValueError(f"expected a list of records, got {type(loaded).__name__}")
+    return loaded, []
+
+
+def ingest_file(path: str) -> Dict:
+    """Parse, validate and normalize one source file (runs in a worker)."""
+    start = perf_counter()
+    records, errors = [], []
+    try:
+        raw, bad_lines = _read_records(path)
+    except (OSError, ValueError) as e:
+        raw, bad_lines = [], []
+        errors.append(f"{path}: {e}")
+    errors.extend(f"{path}: {e}" for e in bad_lines)
+    invalid = len(bad_lines)
+    for i, record in enumerate(raw):
+        problems = _validator(record)
+        if problems:
+            invalid += 1
+            label = record.get("id", f"#{i}") if isinstance(record, dict) else f"#{i}"
+            errors.extend(f"{path}: {label}: {p}" for p in problems)
+            continue
+        record = normalize_record(record)
+        records.append((record, content_hash(record)))
+    return {
+        "path": path,
+        "bytes": os.path.getsize(path) if os.path.exists(path) else 0,
+        "records": records,
+        "errors": errors,
+        "invalid": invalid,
+        "seconds": perf_counter() - start,
+    }
+
+
+# -----------------------------
+# Pipeline
+# -----------------------------
+
+def find_sources(paths: Iterable[str]) -> List[str]:
+    """Files as given, directories expanded to their sorted .json/.jsonl files."""
+    found = []
+    for p in map(Path, paths):
+        if p.is_dir():
+            found.extend(
+                str(f) for f in sorted(p.rglob("*")) if f.suffix in (".json", ".jsonl")
+            )
+        else:
+            found.append(str(p))
+    return found
+
+
+def merge(results: List[Dict]) -> Tuple[List[Dict], Dict[str, int]]:
+    """
+    Deduplicate records from all sources, in source order.
+
+    :return: (catalogue, counts of "duplicate_ids" and "duplicate_content")
+    """
+    by_id: Dict[str, Tuple[Dict, str]] = {}
+    duplicate_ids = 0
+    for result in results:
+        for record, digest in result["records"]:
+            if record["id"] in by_id:
+                duplicate_ids += 1
+            # Re-assigning keeps the key's first-seen position
+            by_id[record["id"]] = (record, digest)
+
+    seen = set()
+    catalogue = []
+    for record, digest in by_id.values():
+        if digest in seen:
+            continue
+        seen.add(digest)
+        catalogue.append(record)
+    return catalogue, {
+        "duplicate_ids": duplicate_ids,
+        "duplicate_content": len(by_id) - len(catalogue),
+    }
+
+
+def build_indexes(
+    schemes: List[Dict], synonym_groups: List[List[str]], version: str, key: str = ""
+) -> Dict:
+    """
+    The indexes the server builds at load, in JSON-serializable form.
+
+    :param key: ``src.catalogue.index_key`` of the encoded schemes and the
+        groups, which the server checks before using the postings
+    """
+    by_category: Dict[str, List[int]] = {}
+    for pos, s in enumerate(schemes):
+        by_category.setdefault(s.get("category", ""), []).append(pos)
+    synonyms = SynonymIndex(schemes, synonym_groups)
+    return {
+        "version": version,
+        "key": key,
+        "by_id": {s["id"]: pos for pos, s in enumerate(schemes)},
+        "by_category": by_category,
+        "name_tag": NameTagIndex(schemes).postings,
+        "synonyms": {term: sorted(p) for term, p in synonyms.postings.items() if p},
+    }
+
+
+def _dumps(obj) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def run_ingest(
+    paths: Iterable[str],
+    out_dir: str,
+    workers: int = None,
+    schema_path: str = config.SCHEMA_PATH,
+    synonyms_path: str = config.SYNONYMS_PATH,
+) -> Dict:
+    """
+    Ingest ``paths`` into ``out_dir``.
+
+    :param workers: Worker processes; 1 parses in this process
+    :return: Report with per-stage seconds, counts, throughput and errors
+    """
+    timings: Dict[str, float] = {}
+    sources = find_sources(paths)
+    workers = max(1, min(workers or os.cpu_count() or 1, len(sources) or 1))
+    languages = list(config.language.SUPPORTED_LANGUAGES)
+
+    start = perf_counter()
+    template = load_schema(schema_path)
+    if workers == 1:
+        _init_worker(template, languages)
+        results = [ingest_file(p) for p in sources]
+    else:
+        with ProcessPoolExecutor(workers, initializer=_init_worker,
+                                 initargs=(template, languages)) as pool:
+            results = list(pool.map(ingest_file, sources))
+    timings["parse"] = perf_counter() - start
+
+    start = perf_counter()
+    schemes, duplicates = merge(results)
+    timings["dedupe"] = perf_counter() - start
+
+    start = perf_counter()
+    store = BundleStore()
+    encoded = _dumps(schemes)
+    groups = load_synonyms(synonyms_path)
+    indexes = build_indexes(schemes, groups, store.sync(schemes), index_key(encoded, groups))
+    bundles = {lang: store.encoded(schemes, lang)[1] for lang in languages}
+    timings["index"] = perf_counter() - start
+
+    start = perf_counter()
+    out = Path(out_dir)
+    (out / "bundles").mkdir(parents=True, exist_ok=True)
+    (out / "schemes.json").write_bytes(encoded)
+    (out / "index.json").write_bytes(_dumps(indexes))
+    for lang, body in bundles.items():
+        (out / "bundles" / f"{lang}.json.gz").write_bytes(body)
+    timings["write"] = perf_counter() - start
+
+    read = sum(len(r["records"]) for r in results)
+    errors = [e for r in results for e in r["errors"]]
+    total_bytes = sum(r["bytes"] for r in results)
+    total = sum(timings.values())
+    return {
+        "sources": len(sources),
+        "workers": workers,
+        "records_valid": read,
+        "records_invalid": sum(r["invalid"] for r in results),
+        "schemes": len(schemes),
+        **duplicates,
+        "version": indexes["version"],
+        "seconds": {k: round(v, 4) for k, v in timings.items()},
+        "records_per_second": round(read / timings["parse"]) if timings["parse"] else 0,
+        "mb_per_second": round(total_bytes / 1e6 / timings["parse"], 1) if timings["parse"] else 0,
+        "total_seconds": round(total, 4),
+        "errors": errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge scheme feeds into one catalogue.")
+    parser.add_argument("paths", nargs="+", help="source files or directories")
+    parser.add_argument("--out", required=True, help="output directory")
+    parser.add_argument("--workers", type=int, default=None, help="default: CPU count")
+    parser.add_argument("--schema", default=config.SCHEMA_PATH)
+    parser.add_argument("--strict", action="store_true", help="exit 1 on any invalid record")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    report = run_ingest(args.paths, args.out, args.workers, args.schema)
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print(f"{report['sources']} sources, {report['workers']} workers: "
+              f"{report['records_valid']} valid records -> {report['schemes']} schemes "
+              f"({report['duplicate_ids']} overridden IDs, "
+              f"{report['duplicate_content']} duplicate contents)")
+        for stage, seconds in report["seconds"].items():
+            print(f"  {stage:<8}{seconds * 1000:>10.1f} ms")
+        print(f"  parse throughput: {report['records_per_second']:,} records/s, "
+              f"{report['mb_per_second']} MB/s")
+        print(f"catalogue version {report['version']}")
+        for error in report["errors"][:20]:
+            print(f"  invalid: {error}", file=sys.stderr)
+        if len(report["errors"]) > 20:
+            print(f"  ... {len(report['errors']) - 20} more", file=sys.stderr)
+    if args.strict and report["errors"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,216 @@
+import asyncio
+import gzip
 import json
+import sys
+import uuid
+from contextlib import asynccontextmanager
+from time import perf_counter_ns
 
-from fastapi import FastAPI, Response, WebSocket, WebSocketDisconnect
-
+from dataClasses import ProcessedQuery, QueryStatus
+from empty_result_handler import EmptyResultHandler
+from fastapi import FastAPI, Request, Response, WebSocket, WebSocketDisconnect
+from reference_resolver import ReferenceResolver
+from session_manager import SessionManager
+from src.access_log import create_access_logger
+from src.admission import BUSY_MESSAGES, AdmissionController, RateLimiter
+from src.bundle import BundleStore
+from src.catalogue import Catalogue
 from src.config import config
-from src.data_loader import SCHEMES
-from src.matcher import match_schemes
+from src.connections import TRY_AGAIN_LATER, Connection, ConnectionManager
+from src.eligibility import count, parse_attributes, positions
+from src.metrics import metrics
+from src.partitions import CENTRAL, PartitionedCatalogue, write_partitions
+from src.profiling import SamplingProfiler, TraceBuffer
+from src.query_processor import process_query
+from src.response_builder import PageCursor, ResponseBuilder
 from src.schemas import AssistantResponse
+from src.startup import Startup
+from src.zero_results import ZeroResultTracker
+
+
+@asynccontextmanager
+async def lifespan(app):
+    # Load, index and warm up in the background; /ready reports when done
+    startup.start()
+    yield
+    connections.stop()
+    access_log.close()
+
+
+app = FastAPI(docs_url=None, redoc_url=None, lifespan=lifespan)
+
+# Schemes plus derived indexes (by-id, name/tag, compiled synonyms); loaded
+# by the startup warm-up, or by the first request that needs it. Name/tag and
+# synonym postings are read from an up-to-date src.ingest index if there is one.
+catalogue = Catalogue(
+    config.SCHEME_DATA_PATH, config.SYNONYMS_PATH, index_path=config.INDEX_PATH
+)
+
+# Offline bundles and deltas, versioned by catalogue hash
+bundles = BundleStore()
+
+startup = Startup(catalogue, bundles)
+
+# With config.partitions.ENABLED, a query whose user's state is known only
+# searches the central and that state's schemes (see src.partitions).
+# Without partition files, searches use the full catalogue instead.
+partitions = PartitionedCatalogue() if config.partitions.ENABLED else None
+if partitions is not None and not partitions.available:
+    print(
+        f"partitions enabled but {partitions.directory} has no {CENTRAL}.json: searching "
+        "the full catalogue until /admin/reload writes them",
+        file=sys.stderr,
+    )
+
+# Follow-up turns ("uske documents", "doosri yojana", "aur koi?") are answered
+# from the session's previous results; only unresolved turns run a full match.
+session_manager = SessionManager()
+resolver = ReferenceResolver(catalogue, session_manager, config.related.MAX_RESULTS)
+
+# Answers over the byte/word budget are split; later pages wait in the session
+response_builder = ResponseBuilder()
+page_cursor = PageCursor(session_manager)
+
+# Open /ws sockets: per-worker cap, idle and heartbeat timeouts, queued writes
+connections = ConnectionManager(session_manager)
+
+# Admin-triggered stack sampling and opt-in per-request traces; idle otherwise
+profiler = SamplingProfiler()
+traces = TraceBuffer()
+
+# Background JSONL writer; log() only enqueues
+access_log = create_access_logger()
+metrics.gauge(
+    "access_log_dropped", lambda: access_log.dropped,
+    "Access log records dropped because the writer queue was full.",
+)
+
+
+# No-match answers are fixed per language, so they are encoded once here
+empty_result_handler = EmptyResultHandler()
+EMPTY_MESSAGES = {
+    lang: empty_result_handler.handle({}, lang)["message"]
+    for lang in config.language.SUPPORTED_LANGUAGES
+}
+EMPTY_PAGES = {
+    lang: json.dumps(
+        AssistantResponse(msg=msg, lang=lang).model_dump(),
+        separators=(",", ":"),
+        ensure_ascii=False,
+    ).encode("utf-8")
+    for lang, msg in EMPTY_MESSAGES.items()
+}
+zero_results = ZeroResultTracker()
+
+# Over-limit clients and requests beyond the queue get this instead of waiting
+rate_limiter = RateLimiter()
+admission = AdmissionController()
+BUSY_PAGES = {
+    lang: json.dumps(
+        {
+            "error": "busy",
+            "msg": BUSY_MESSAGES[lang],
+            "lang": lang,
+            "retry": config.admission.RETRY_AFTER_SECONDS,
+        },
+        separators=(",", ":"),
+        ensure_ascii=False,
+    ).encode("utf-8")
+    for lang in config.language.SUPPORTED_LANGUAGES
+}
+
+
+def _hit_ratio(stats: dict) -> float:
+    total = stats["resolved"] + stats["searched"]
+    return stats["resolved"] / total if total else 0.0
+
+
+metrics.gauge(
+    "catalogue_schemes", lambda: len(catalogue.schemes) if catalogue.loaded else 0,
+    "Schemes in the loaded catalogue.",
+)
+for _kind in ("resolved", "searched"):
+    metrics.gauge(
+        "reference_turns", lambda k=_kind: resolver.stats[k],
+        "Turns answered by reference resolution vs full search.", kind=_kind,
+    )
+metrics.gauge(
+    "zero_result_queries", lambda: zero_results.total, "Queries that matched no scheme.",
+)
+metrics.gauge(
+    "requests_rejected", lambda: rate_limiter.limited,
+    "Requests rejected before matching.", reason="rate_limited",
+)
+metrics.gauge(
+    "requests_rejected", lambda: admission.shed,
+    "Requests rejected before matching.", reason="shed",
+)
+metrics.gauge("ws_connections", lambda: len(connections), "Open /ws connections.")
+for _reason in ("rejected", "idle", "heartbeat", "write_errors"):
+    metrics.gauge(
+        "ws_closed", lambda r=_reason: connections.stats[r],
+        "/ws connections refused at the cap or closed by the server.", reason=_reason,
+    )
+metrics.gauge(
+    "catalogue_partitions_loaded", lambda: len(partitions.loaded) if partitions else 0,
+    "State catalogue partitions currently loaded.",
+)
+metrics.gauge("requests_in_flight", lambda: admission.in_flight, "Requests holding a slot.")
+metrics.gauge("requests_queued", lambda: admission.waiting, "Requests waiting for a slot.")
+metrics.gauge(
+    "cache_hit_ratio", lambda: _hit_ratio(resolver.stats),
+    "Fraction of lookups served without recomputation.", cache="reference",
+)
+metrics.gauge(
+    "cache_hit_ratio",
+    lambda: catalogue.cache_stats["hits"] / max(1, sum(catalogue.cache_stats.values())),
+    "Fraction of lookups served without recomputation.", cache="search",
+)
+
+
+# Session context key of the user's eligibility profile (age, income, ...)
+USER_ATTRIBUTES_KEY = ReferenceResolver.USER_ATTRIBUTES_KEY
+
+
+def _user_attributes(sid: str) -> dict:
+    if not sid or sid not in session_manager.sessions or session_manager.is_expired(sid):
+        return {}
+    return session_manager.sessions[sid]["context"].get(USER_ATTRIBUTES_KEY, {})
 
-app = FastAPI(docs_url=None, redoc_url=None)
+
+def _search(
+    query: ProcessedQuery, deadline: float = None, sid: str = "", trace=None, state: str = ""
+) -> list:
+    # A session with an eligibility profile only sees schemes it qualifies for
+    attrs = _user_attributes(sid)
+    state = state or attrs.get("state", "")
+    if partitions is not None and partitions.available and state:
+        return partitions.search(
+            query, config.response.MAX_SCHEME_RESULTS, state, deadline, attrs, trace
+        )
+    return catalogue.search(query, config.response.MAX_SCHEME_RESULTS, deadline, attrs, trace)
+
+
+def _deadline(start_ns: int) -> float:
+    """perf_counter() value by which a request started at ``start_ns`` must be answered."""
+    return start_ns / 1e9 + config.network.TIMEOUT_SECONDS
+
+
+def _admin_only(token: str):
+    """A 403 response unless ``token`` is the configured admin token, else None."""
+    if config.ADMIN_TOKEN and token == config.ADMIN_TOKEN:
+        return None
+    return Response(
+        content=b'{"msg":"forbidden"}',
+        media_type="application/json",
+        status_code=403,
+    )
+
+
+def _busy(lang: str, status_code: int) -> Response:
+    return Response(
+        content=BUSY_PAGES[lang], media_type="application/json", status_code=status_code
+    )
 
 
 @app.get("/ping")
@@ -25,87 +228,550 @@ def ping():
     return Response(content=raw, media_type="application/json")
 
 
+@app.get("/ready")
+def ready():
+    """Readiness: 200 once the catalogue is loaded, indexed and warmed up."""
+    raw = json.dumps(startup.status(), separators=(",", ":")).encode("utf-8")
+    return Response(
+        content=raw, media_type="application/json", status_code=200 if startup.ready else 503
+    )
+
+
+def _localize(s: dict, lang: str) -> dict:
+    return {
+        "id": s.get("id", ""),
+        "name": s.get(f"name_{lang}") or s.get("name_hi") or s.get("name_en") or s.get("name", ""),
+        "benefit": (
+            s.get(f"benefits_{lang}") or s.get("benefits_hi") or s.get("benefits_en")
+            or s.get("benefit", "")
+        ),
+    }
+
+
+def _answer(
+    query: ProcessedQuery, lang: str, sid: str, deadline: float = None, trace=None,
+    state: str = "",
+):
+    """
+    Match (or resolve) a query.
+
+    :param deadline: perf_counter() value after which the search returns
+        its best results so far, flagged as partial
+    :param trace: Optional ``src.profiling.Trace`` for the stages below
+    :param state: User's state; defaults to the session profile's
+    :return: (first encoded page, matched scheme IDs)
+    """
+    if query.status is QueryStatus.EMPTY:
+        page_cursor.clear(sid)
+        return EMPTY_PAGES[lang], []
+
+    t = perf_counter_ns()
+    matched, resolved = resolver.resolve_or_search(
+        sid, query.normalized_text, lambda _: _search(query, deadline, sid, trace, state)
+    )
+    t = metrics.observe("match", t)
+    if trace is not None:
+        trace.stage("match", t)
+        trace.count("resolved", resolved)
+        trace.count("results", len(matched))
+    if not matched:
+        zero_results.add(query.normalized_text)
+        page_cursor.clear(sid)
+        return EMPTY_PAGES[lang], []
+
+    schemes_out = [_localize(s, lang) for s in matched]
+    if trace is not None:
+        trace.stage("localize")
+    pages = response_builder.build(
+        msg=_message(schemes_out, lang),
+        schemes=schemes_out,
+        steps=_steps(schemes_out, lang),
+        lang=lang,
+        sid=sid,
+        partial=getattr(matched, "partial", False),
+    )
+    t = metrics.observe("build", t)
+    if trace is not None:
+        trace.stage("build", t)
+    raw = page_cursor.first_page(sid, pages, lambda: uuid.uuid4().hex)
+    t = metrics.observe("serialize", t)
+    if trace is not None:
+        trace.stage("serialize", t)
+        trace.count("pages", len(pages))
+    return raw, [s["id"] for s in schemes_out]
+
+
+def _frame(payload: dict) -> str:
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
+
+
+def _steps(schemes_out: list, lang: str) -> list:
+    """Precomputed documents and application steps of the top scheme."""
+    if not schemes_out:
+        return []
+    return list(catalogue.snapshot.documents.instructions_for(schemes_out[0]["id"], lang))
+
+
+def _related_page(scheme_id: str, lang: str, sid: str) -> bytes:
+    """
+    First page of the schemes most like ``scheme_id`` (default: the
+    session's scheme in focus) that the session's eligibility profile
+    qualifies for, which become the session's results.
+    """
+    if not scheme_id and sid in session_manager.sessions:
+        scheme_id = session_manager.sessions[sid]["context"].get("focus") or ""
+    matched = catalogue.related(
+        scheme_id, config.related.MAX_RESULTS, attrs=_user_attributes(sid)
+    )
+    if not matched:
+        page_cursor.clear(sid)
+        return EMPTY_PAGES[lang]
+    resolver.remember(sid, matched)
+    schemes_out = [_localize(s, lang) for s in matched]
+    pages = response_builder.build(
+        msg=_message(schemes_out, lang), schemes=schemes_out,
+        steps=_steps(schemes_out, lang), lang=lang, sid=sid,
+    )
+    return page_cursor.first_page(sid, pages, lambda: uuid.uuid4().hex)
+
+
+def _message(schemes_out: list, lang: str) -> str:
+    return "मिलान की गई योजनाएं" if schemes_out else EMPTY_MESSAGES[lang]
+
+
+async def _stream_answer(
+    conn: Connection, query: ProcessedQuery, lang: str, sid: str, deadline: float = None,
+    trace=None, state: str = "", text: bool = False,
+):
+    """
+    Streamed /ws turn: an immediate ack with the session ID to resend
+    after a reconnect, provisional results from the name/tag index, then
+    the final ranking as a delta against them. The final frame is the
+    first page of the answer, within the same budget as ``/ask``; later
+    pages wait for a ``{"more": true}`` message.
+
+    :param text: Also send the final schemes as formatted text, one
+        ``{"t": "text"}`` frame per chunk of ``ResponseGenerator.stream``
+    :return: (final scheme IDs, total bytes sent)
+    """
+    connections.send(conn, _frame({"t": "ack", "sid": sid}))
+    nbytes = await connections.flush(conn)
+    if trace is not None:
+        trace.stage("ack")
+
+    sent = {}
+    if resolver.resolve(sid, query.normalized_text) is None:
+        provisional = [
+            _localize(s, lang)
+            for s in catalogue.snapshot.name_tag_index.search(
+                query.normalized_text, config.response.MAX_SCHEME_RESULTS
+            )
+        ]
+        if provisional:
+            sent = {s["id"]: s for s in provisional}
+            connections.send(conn, _frame({"t": "partial", "add": provisional}))
+            nbytes += await connections.flush(conn)
+        if trace is not None:
+            trace.stage("provisional")
+            trace.count("provisional", len(provisional))
+
+    matched, resolved = resolver.resolve_or_search(
+        sid, query.normalized_text, lambda _: _search(query, deadline, sid, trace, state)
+    )
+    if trace is not None:
+        trace.stage("match")
+        trace.count("resolved", resolved)
+        trace.count("results", len(matched))
+    final = [_localize(s, lang) for s in matched]
+    if not final:
+        zero_results.add(query.normalized_text)
+    ids = [s["id"] for s in final]
+    # "t" and "order" replace the page's scheme list; their size is reserved
+    pages = response_builder.build(
+        msg=_message(final, lang),
+        schemes=final,
+        steps=_steps(final, lang),
+        lang=lang,
+        sid=sid,
+        partial=getattr(matched, "partial", False),
+        reserve=len(_frame({"t": "final", "order": ids})),
+    )
+    page = page_cursor.park(sid, pages, lambda: uuid.uuid4().hex)
+    shown = [s["id"] for s in page["schemes"]]
+    payload = {
+        "t": "final",
+        "msg": page["msg"],
+        "order": shown,
+        "add": [s for s in page["schemes"] if sent.get(s["id"]) != s],
+        "lang": lang,
+    }
+    if page["steps"]:
+        payload["steps"] = page["steps"]
+    if page.get("partial"):
+        payload["partial"] = True
+    if page["more"]:
+        payload["more"] = True
+        payload["sid"] = page["sid"]
+    connections.send(conn, _frame(payload))
+    nbytes += await connections.flush(conn)
+    if text:
+        on_page = set(shown)
+        schemes = [s for s in matched if s.get("id") in on_page]
+        for chunk in catalogue.snapshot.text.stream(schemes, lang):
+            connections.send(conn, _frame({"t": "text", "chunk": chunk}))
+            nbytes += await connections.flush(conn)
+    return ids, nbytes
+
+
 @app.get("/ask")
-def ask(q: str, lang: str = "hi"):
+def ask(
+    q: str, lang: str = "hi", sid: str = "", state: str = "", trace: str = "",
+    request: Request = None,
+):
+    """
+    Answer a query. ``state`` (else the session profile's) limits the search
+    to central and that state's schemes when partitions are enabled;
+    ``trace=1`` records its stage timings and candidate counts for
+    ``/admin/traces``.
+    """
+    start = perf_counter_ns()
+    tracing = traces.start("http", q, start) if trace == "1" else None
     if lang not in config.language.SUPPORTED_LANGUAGES:
         lang = config.language.DEFAULT_LANGUAGE
 
-    matched = match_schemes(q, SCHEMES, config.response.MAX_SCHEME_RESULTS)
+    client = request.client.host if request is not None and request.client else ""
+    if not rate_limiter.allow(client):
+        return _busy(lang, 429)
+    if not admission.acquire():
+        return _busy(lang, 503)
+    try:
+        query = process_query(q)
+        t = metrics.observe("parse", start)
+        if tracing is not None:
+            tracing.stage("parse", t)
+        raw, ids = _answer(query, lang, sid, _deadline(start), tracing, state)
+        end = metrics.observe("ask", start)
+    finally:
+        admission.release(perf_counter_ns() - start)
+    access_log.log(q, lang, ids, end - start, len(raw), "http")
+    if tracing is not None:
+        tracing.count("bytes", len(raw))
+        traces.add(tracing)
+    return Response(content=raw, media_type="application/json")
+
 
+@app.get("/ask/next")
+def ask_next(sid: str):
+    """Serve the next continuation page of a split answer."""
+    raw = page_cursor.next_page(sid)
+    if raw is None:
+        return Response(
+            content=b'{"msg":"no more results"}',
+            media_type="application/json",
+            status_code=404,
+        )
+    return Response(content=raw, media_type="application/json")
+
+
+@app.get("/eligible")
+def eligible(
+    sid: str = "",
+    lang: str = "hi",
+    age: str = "",
+    income: str = "",
+    occupation: str = "",
+    gender: str = "",
+    state: str = "",
+):
+    """
+    Schemes the user qualifies for under the structured eligibility rules.
+
+    Attributes given here are merged into the session's profile, which
+    then also filters /ask and /ws results for that ``sid``.
+    """
+    if lang not in config.language.SUPPORTED_LANGUAGES:
+        lang = config.language.DEFAULT_LANGUAGE
+    given = parse_attributes({
+        "age": age, "income": income, "occupation": occupation, "gender": gender, "state": state,
+    })
+    attrs = {**_user_attributes(sid), **given}
+    if sid and given:
+        session_manager.update(sid, {USER_ATTRIBUTES_KEY: attrs})
+
+    snap = catalogue.snapshot
+    bits = snap.eligibility.evaluate(attrs)
     schemes_out = [
-        {
-            "id": s.get("id", ""),
-            "name": s.get(f"name_{lang}") or s.get("name_hi") or s.get("name_en") or "",
-            "benefit": s.get(f"benefits_{lang}") or s.get("benefits_hi") or s.get("benefits_en") or "",
-        }
-        for s in matched
+        _localize(snap.schemes[pos], lang)
+        for pos in positions(bits, config.response.MAX_ELIGIBLE_RESULTS)
     ]
+    if not schemes_out:
+        page_cursor.clear(sid)
+        return Response(content=EMPTY_PAGES[lang], media_type="application/json")
+    pages = response_builder.build(
+        msg=f"पात्र योजनाएं: {count(bits)}", schemes=schemes_out, steps=[], lang=lang, sid=sid,
+    )
+    raw = page_cursor.first_page(sid, pages, lambda: uuid.uuid4().hex)
+    return Response(content=raw, media_type="application/json")
 
-    response = AssistantResponse(
-        msg="मिलान की गई योजनाएं" if schemes_out else "कोई उपयुक्त योजना नहीं मिली",
-        schemes=schemes_out,
-        steps=[],
-        lang=lang,
+
+@app.get("/documents")
+def documents(have: str = "", sid: str = "", lang: str = "hi"):
+    """
+    Schemes that need no documents beyond ``have`` (comma-separated keys,
+    names or aliases, e.g. ``have=aadhaar``), limited to the session's
+    eligibility profile if it has one.
+    """
+    if lang not in config.language.SUPPORTED_LANGUAGES:
+        lang = config.language.DEFAULT_LANGUAGE
+    snap = catalogue.snapshot
+    bits = snap.documents.requiring_only(snap.documents.ids(have.split(",")))
+    attrs = _user_attributes(sid)
+    if attrs and snap.eligibility.has_rules:
+        bits &= snap.eligibility.evaluate(attrs)
+    schemes_out = [
+        _localize(snap.schemes[pos], lang)
+        for pos in positions(bits, config.response.MAX_ELIGIBLE_RESULTS)
+    ]
+    if not schemes_out:
+        page_cursor.clear(sid)
+        return Response(content=EMPTY_PAGES[lang], media_type="application/json")
+    pages = response_builder.build(
+        msg=f"इन दस्तावेज़ों से आवेदन योग्य योजनाएं: {count(bits)}",
+        schemes=schemes_out, steps=[], lang=lang, sid=sid,
     )
+    raw = page_cursor.first_page(sid, pages, lambda: uuid.uuid4().hex)
+    return Response(content=raw, media_type="application/json")
 
-    raw = json.dumps(
-        response.model_dump(),
-        separators=(",", ":"),
-        ensure_ascii=False,
-    ).encode("utf-8")
 
-    if len(raw) > config.response.MAX_RESPONSE_BYTES:
+@app.get("/related")
+def related(id: str = "", sid: str = "", lang: str = "hi"):
+    """
+    Schemes most like scheme ``id`` (or the session's scheme in focus),
+    looked up in the precomputed related graph; empty when it is disabled.
+    """
+    if lang not in config.language.SUPPORTED_LANGUAGES:
+        lang = config.language.DEFAULT_LANGUAGE
+    return Response(content=_related_page(id, lang, sid), media_type="application/json")
+
+
+def _accepts_gzip(request: Request) -> bool:
+    """Whether the request's Accept-Encoding allows gzip (without one, it does not)."""
+    header = request.headers.get("accept-encoding", "") if request is not None else ""
+    weights = {}
+    for part in header.split(","):
+        coding, *params = [p.strip() for p in part.split(";")]
+        weight = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[coding.lower()] = weight
+    return weights.get("gzip", weights.get("x-gzip", weights.get("*", 0.0))) > 0
+
+
+@app.get("/bundle")
+def bundle(lang: str = "hi", since: str = "", request: Request = None):
+    """
+    Scheme bundle for offline search in ``lang``; only the changes when
+    ``since`` is a recent bundle version. gzip-compressed if the client
+    accepts gzip, plain JSON otherwise.
+    """
+    if lang not in config.language.SUPPORTED_LANGUAGES:
+        lang = config.language.DEFAULT_LANGUAGE
+    _, body = bundles.encoded(catalogue.schemes, lang, since)
+    headers = {"Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+    if _accepts_gzip(request):
+        headers["Content-Encoding"] = "gzip"
+    else:
+        body = gzip.decompress(body)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@app.get("/zero-results")
+def zero_results_endpoint(token: str = "", n: str = "20"):
+    """Most frequent queries that matched nothing (count-min estimates); admin only."""
+    denied = _admin_only(token)
+    if denied is not None:
+        return denied
+    try:
+        limit = max(1, min(int(n), zero_results.top_k))
+    except ValueError:
+        limit = zero_results.top_k
+    payload = {
+        "total": zero_results.total,
+        "top": [[q, c] for q, c in zero_results.top(limit)],
+    }
+    raw = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    return Response(content=raw, media_type="application/json")
+
+
+@app.get("/admin/reload")
+def admin_reload(token: str = ""):
+    """
+    Rebuild the catalogue and its indexes if schemes, synonyms or documents
+    changed, and rewrite the state partitions from it when they are enabled.
+    """
+    denied = _admin_only(token)
+    if denied is not None:
+        return denied
+
+    reloaded = catalogue.reload_if_changed()
+    if partitions is not None:
+        # Partition files are derived from the catalogue, so routed
+        # searches never answer from an older one
+        write_partitions(catalogue.schemes, partitions.directory)
+        reloaded = partitions.reload_if_changed() or reloaded
+    payload = {"reloaded": reloaded, "schemes": len(catalogue.schemes)}
+    return Response(content=json.dumps(payload).encode("utf-8"), media_type="application/json")
+
+
+@app.get("/admin/profile")
+async def admin_profile(token: str = "", seconds: str = "10"):
+    """
+    Sample every thread's stack for ``seconds`` and return the collapsed
+    stacks (flamegraph input). The sampler runs in its own thread; this
+    request waits on the event loop, so it holds no worker thread.
+    """
+    denied = _admin_only(token)
+    if denied is not None:
+        return denied
+    try:
+        duration = max(0.1, float(seconds))
+    except ValueError:
+        duration = 10.0
+    if not profiler.start(duration):
         return Response(
-            content=b'{"msg":"response too large"}',
+            content=b'{"msg":"a profile is already running"}',
             media_type="application/json",
-            status_code=500,
+            status_code=409,
         )
+    while profiler.running:
+        await asyncio.sleep(profiler.interval * 10)
+    folded = profiler.collapsed()
+    return Response(content=folded.encode("utf-8"), media_type="text/plain; charset=utf-8")
+
 
+@app.get("/admin/traces")
+def admin_traces(token: str = "", n: str = "50"):
+    """Most recent ``trace=1`` requests, newest first."""
+    denied = _admin_only(token)
+    if denied is not None:
+        return denied
+    try:
+        limit = max(1, int(n))
+    except ValueError:
+        limit = 50
+    payload = {"recorded": traces.recorded, "traces": traces.recent(limit)}
+    raw = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
     return Response(content=raw, media_type="application/json")
 
 
+@app.get("/metrics")
+def metrics_endpoint():
+    """Stage latency percentiles and gauges in Prometheus text format."""
+    return Response(
+        content=metrics.render().encode("utf-8"),
+        media_type="text/plain; version=0.0.4",
+    )
+
+
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
-    """WebSocket endpoint for real-time chat"""
-    await websocket.accept()
+    """WebSocket endpoint for real-time chat; limits and timeouts in src.connections"""
+    client = websocket.client.host if websocket.client else ""
+    # Each connection is its own session unless the client resumes one
+    conn = connections.open(websocket, client)
+    if conn is None:
+        await websocket.close(code=TRY_AGAIN_LATER)
+        return
     try:
-        while True:
+        await websocket.accept()
+        while not conn.closed:
             # Receive query from client
             data = await websocket.receive_json()
-            q = data.get("q", "").strip()
+            # {"t": "ping"} only keeps the connection alive; it is not answered
+            if data.get("t") == "ping":
+                connections.seen(conn, query=False)
+                continue
+            connections.seen(conn)
+            start = perf_counter_ns()
+            tracing = None
             lang = data.get("lang", "hi")
-            
-            if not q:
-                await websocket.send_json({"error": "Empty query"})
+            sid = data.get("sid") or conn.sid
+
+            # {"more": true} asks for the next page of the previous answer
+            if data.get("more"):
+                raw = page_cursor.next_page(sid)
+                more = _frame({"error": "No more results"}) if raw is None else raw.decode()
+                connections.send(conn, more)
+                await connections.flush(conn)
                 continue
-            
+
+            # {"related": "<scheme id>"} or {"related": true} (the scheme in focus)
+            if data.get("related"):
+                scheme_id = data["related"] if isinstance(data["related"], str) else ""
+                if lang not in config.language.SUPPORTED_LANGUAGES:
+                    lang = config.language.DEFAULT_LANGUAGE
+                connections.send(conn, _related_page(scheme_id, lang, sid).decode("utf-8"))
+                await connections.flush(conn)
+                continue
+
+            q = data.get("q", "")
+            if data.get("trace"):
+                tracing = traces.start("ws", q, start)
+            query = process_query(q)
+            if tracing is not None:
+                tracing.stage("parse")
+            if query.status is QueryStatus.EMPTY:
+                connections.send(conn, _frame({"error": "Empty query"}))
+                await connections.flush(conn)
+                continue
+
             if lang not in config.language.SUPPORTED_LANGUAGES:
                 lang = config.language.DEFAULT_LANGUAGE
-            
-            # Match schemes
-            matched = match_schemes(q, SCHEMES, config.response.MAX_SCHEME_RESULTS)
-            
-            schemes_out = []
-            for s in matched:
-                if s.get("lang") == lang or not s.get("lang"):
-                    schemes_out.append({
-                        "id": s.get("id", ""),
-                        "name": s.get(f"name_{lang}") or s.get("name_hi") or s.get("name_en") or s.get("name", ""),
-                        "benefit": s.get(f"benefit_{lang}") or s.get("benefit_hi") or s.get("benefit_en") or s.get("benefit", ""),
-                    })
-            
-            # Send response
-            response = {
-                "msg": "मिलान की गई योजनाएं" if schemes_out else "कोई उपयुक्त योजना नहीं मिली",
-                "schemes": schemes_out,
-                "steps": [],
-                "lang": lang
-            }
-            
-            await websocket.send_json(response)
-            
+
+            # Same limits as /ask; turns run on the event loop, so never queue
+            if not rate_limiter.allow(client) or not admission.acquire(wait=False):
+                connections.send(conn, BUSY_PAGES[lang].decode("utf-8"))
+                await connections.flush(conn)
+                continue
+            try:
+                if data.get("stream"):
+                    ids, nbytes = await _stream_answer(
+                        conn, query, lang, sid, _deadline(start), tracing, data.get("state", ""),
+                        bool(data.get("text")),
+                    )
+                    access_log.log(q, lang, ids, perf_counter_ns() - start, nbytes, "ws")
+                    if tracing is not None:
+                        tracing.stage("send")
+                        tracing.count("bytes", nbytes)
+                        traces.add(tracing)
+                    continue
+
+                # Send first page; overflow waits for a "more" message
+                raw, ids = _answer(
+                    query, lang, sid, _deadline(start), tracing, data.get("state", "")
+                )
+                connections.send(conn, raw.decode("utf-8"))
+                await connections.flush(conn)
+                end = metrics.observe("ws", start)
+            finally:
+                admission.release(perf_counter_ns() - start)
+            access_log.log(q, lang, ids, end - start, len(raw), "ws")
+            if tracing is not None:
+                tracing.stage("send", end)
+                tracing.count("bytes", len(raw))
+                traces.add(tracing)
+
     except WebSocketDisconnect:
-        print("Client disconnected")
+        pass
     except Exception as e:
         print(f"WebSocket error: {e}")
-        await websocket.send_json({"error": str(e)})
+        # Dropped instead when the socket itself is gone
+        connections.send(conn, _frame({"error": str(e)}))
+        await connections.flush(conn)
+    finally:
+        connections.close(conn)
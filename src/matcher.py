@@ -1,8 +1,73 @@
-def match_schemes(query: str, schemes: list, max_results: int):
-    q = query.lower().split()
+from time import perf_counter
+from typing import Optional, Sequence, Union
+
+from dataClasses import ProcessedQuery
+
+# Score for a query word that only matches through a synonym. Lower than
+# a literal name/tag hit, so exact matches still rank first.
+SYNONYM_WEIGHT = 1
+
+# Schemes scored between deadline checks
+DEADLINE_CHUNK_SIZE = 256
+
+
+class SearchResults(list):
+    """
+    Ranked schemes; ``partial`` is True if the deadline cut the scan short,
+    ``scored`` is the number of schemes scored and ``scores`` the score of
+    each ranked scheme (keyword rankings only).
+    """
+
+    partial = False
+    scored = 0
+    scores = ()
+
+
+def match_schemes(
+    query: Union[str, ProcessedQuery],
+    schemes: list,
+    max_results: int,
+    synonyms=None,
+    deadline: float = None,
+    chunk_size: int = DEADLINE_CHUNK_SIZE,
+    candidates: Optional[Sequence[int]] = None,
+) -> SearchResults:
+    """
+    Score schemes by query-word substring hits in name, eligibility,
+    description and tags.
+
+    :param query: Raw text (split on whitespace) or a ProcessedQuery,
+        whose capped, deduplicated tokens are used as they are
+
+    :param synonyms: Optional SynonymIndex compiled for ``schemes``; a word
+        with no literal hit in a scheme scores SYNONYM_WEIGHT if one of
+        its synonyms occurs there.
+    :param deadline: Optional ``time.perf_counter()`` value. The clock is
+        checked every ``chunk_size`` schemes; once it has passed, the best
+        results among the schemes scored so far are returned with
+        ``partial`` set. The first chunk is always scored.
+    :param candidates: Optional ascending positions in ``schemes`` to
+        score (e.g. the schemes a user is eligible for); others are skipped
+    """
+    q = query.tokens if isinstance(query, ProcessedQuery) else query.lower().split()
+    expanded = [synonyms.lookup(word) for word in q] if synonyms is not None else None
     results = []
+    partial = False
+
+    if candidates is None:
+        pairs = enumerate(schemes)
+    else:
+        pairs = ((pos, schemes[pos]) for pos in candidates)
+
+    scored = -1
+    for scored, (pos, scheme) in enumerate(pairs):
+        if (
+            deadline is not None and scored and not scored % chunk_size
+            and perf_counter() > deadline
+        ):
+            partial = True
+            break
 
-    for scheme in schemes:
         name = (
             scheme.get("name", "")
             or scheme.get("name_hi", "")
@@ -21,19 +86,73 @@ def match_schemes(query: str, schemes: list, max_results: int):
 
         score = 0
 
-        for word in q:
+        for i, word in enumerate(q):
+            word_score = 0
             if word in name:
-                score += 2
+                word_score += 2
             if word in elig_text:
-                score += 1
+                word_score += 1
             if word in desc_text:
-                score += 1
+                word_score += 1
             if word in tags:
-                score += 2
+                word_score += 2
+            if not word_score and expanded is not None and pos in expanded[i]:
+                word_score = SYNONYM_WEIGHT
+            score += word_score
 
         if score > 0:
             results.append((score, scheme))
 
     results.sort(reverse=True, key=lambda x: x[0])
 
-    return [s for _, s in results[:max_results]]
+    top = results[:max_results]
+    ranked = SearchResults(s for _, s in top)
+    ranked.scores = [score for score, _ in top]
+    ranked.partial = partial
+    ranked.scored = scored if partial else scored + 1
+    return ranked
+
+
+class NameTagIndex:
+    """
+    Inverted index over scheme name and tag tokens.
+
+    Used as a cheap first pass: it only matches whole tokens, so its
+    ranking is provisional and is replaced by match_schemes() afterwards.
+    """
+
+    def __init__(self, schemes: list):
+        self.schemes = schemes
+        # token -> list of (scheme position, weight)
+        self.postings = {}
+        for pos, scheme in enumerate(schemes):
+            name = (
+                scheme.get("name", "")
+                or scheme.get("name_hi", "")
+                or scheme.get("name_en", "")
+            ).lower()
+            weights = {}
+            for token in name.split():
+                weights[token] = 2
+            for tag in scheme.get("tags", []):
+                for token in tag.lower().split():
+                    weights[token] = weights.get(token, 0) + 2
+            for token, weight in weights.items():
+                self.postings.setdefault(token, []).append((pos, weight))
+
+    @classmethod
+    def from_postings(cls, schemes: list, postings: dict) -> "NameTagIndex":
+        """Reuse ``postings`` prebuilt for the same ``schemes`` (see src.ingest)."""
+        index = cls.__new__(cls)
+        index.schemes = schemes
+        index.postings = postings
+        return index
+
+    def search(self, query: str, max_results: int) -> list:
+        scores = {}
+        for word in query.lower().split():
+            for pos, weight in self.postings.get(word, ()):
+                scores[pos] = scores.get(pos, 0) + weight
+
+        ranked = sorted(scores.items(), key=lambda x: (-x[1], x[0]))
+        return [self.schemes[pos] for pos, _ in ranked[:max_results]]
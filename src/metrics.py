@@ -0,0 +1,161 @@
+"""Low-overhead request instrumentation.
+
+Stage latencies are recorded in HDR-style log-linear histograms (16
+sub-buckets per power of two, ~6% precision) kept per thread, so the
+request path never takes a lock; histograms are only merged when
+``/metrics`` is scraped. Timing uses ``time.perf_counter_ns``:
+
+    start = perf_counter_ns()
+    ...
+    metrics.observe("match", start)
+"""
+
+import threading
+from time import perf_counter_ns
+from typing import Callable, Dict, List, Optional, Tuple
+
+_SUB_BITS = 4
+_SUB_COUNT = 1 << _SUB_BITS  # 16
+# Indexes for values up to 2**40 ns (~18 minutes); larger values clamp
+_BUCKETS = (40 - _SUB_BITS) * _SUB_COUNT + 2 * _SUB_COUNT
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+def bucket_index(value: int) -> int:
+    """Map a non-negative integer to its log-linear bucket."""
+    if value < 2 * _SUB_COUNT:
+        return value
+    shift = value.bit_length() - _SUB_BITS - 1
+    return min(shift * _SUB_COUNT + (value >> shift), _BUCKETS - 1)
+
+
+def bucket_value(index: int) -> int:
+    """Representative (midpoint) value of a bucket."""
+    if index < 2 * _SUB_COUNT:
+        return index
+    shift = index // _SUB_COUNT - 1
+    low = (index - shift * _SUB_COUNT) << shift
+    return low + (1 << shift) // 2
+
+
+class Histogram:
+    """Fixed-size log-linear histogram of nanosecond durations."""
+
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self):
+        self.counts = [0] * _BUCKETS
+        self.total = 0
+        self.count = 0
+
+    def record(self, value: int) -> None:
+        # bucket_index() inlined; this is the hot path
+        if value < 2 * _SUB_COUNT:
+            index = value if value > 0 else 0
+        else:
+            shift = value.bit_length() - _SUB_BITS - 1
+            index = shift * _SUB_COUNT + (value >> shift)
+            if index >= _BUCKETS:
+                index = _BUCKETS - 1
+        self.counts[index] += 1
+        self.total += value
+        self.count += 1
+
+    def merge(self, other: "Histogram") -> None:
+        counts = self.counts
+        for i, c in enumerate(other.counts):
+            if c:
+                counts[i] += c
+        self.total += other.total
+        self.count += other.count
+
+    def quantile(self, q: float) -> int:
+        if not self.count:
+            return 0
+        rank = q * self.count
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank and c:
+                return bucket_value(i)
+        return 0
+
+
+class Metrics:
+    """Registry of per-stage histograms plus scrape-time gauges."""
+
+    def __init__(self, prefix: str = "policypal"):
+        self.prefix = prefix
+        self._local = threading.local()
+        self._shards: List[Dict[str, Histogram]] = []
+        self._shards_lock = threading.Lock()
+        # (name, labels, help, callable) evaluated only when scraped
+        self._gauges: List[Tuple[str, Dict[str, str], str, Callable[[], float]]] = []
+
+    def _histogram(self, stage: str) -> Histogram:
+        """Slow path: first observation of a stage on this thread."""
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = {}
+            with self._shards_lock:
+                self._shards.append(shard)
+        return shard.setdefault(stage, Histogram())
+
+    def observe(self, stage: str, start_ns: int, end_ns: Optional[int] = None) -> int:
+        """
+        Record the time elapsed since ``start_ns`` for ``stage``.
+
+        :return: The end timestamp, so consecutive stages can chain
+        """
+        end = perf_counter_ns() if end_ns is None else end_ns
+        try:
+            hist = self._local.shard[stage]
+        except (AttributeError, KeyError):
+            hist = self._histogram(stage)
+        hist.record(end - start_ns)
+        return end
+
+    def gauge(self, name: str, fn: Callable[[], float], help: str = "", **labels) -> None:
+        """Register a value read from ``fn`` at scrape time."""
+        self._gauges.append((name, labels, help, fn))
+
+    def merged(self) -> Dict[str, Histogram]:
+        with self._shards_lock:
+            shards = list(self._shards)
+        merged: Dict[str, Histogram] = {}
+        for shard in shards:
+            for stage, hist in list(shard.items()):
+                merged.setdefault(stage, Histogram()).merge(hist)
+        return merged
+
+    def render(self) -> str:
+        """Prometheus text exposition (format 0.0.4)."""
+        name = f"{self.prefix}_stage_latency_seconds"
+        lines = [
+            f"# HELP {name} Request stage latency.",
+            f"# TYPE {name} summary",
+        ]
+        for stage, hist in sorted(self.merged().items()):
+            for q in QUANTILES:
+                value = hist.quantile(q) / 1e9
+                lines.append(f'{name}{{stage="{stage}",quantile="{q}"}} {value:.9f}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {hist.total / 1e9:.9f}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {hist.count}')
+
+        described = set()
+        for gauge_name, labels, help_text, fn in self._gauges:
+            full = f"{self.prefix}_{gauge_name}"
+            if full not in described:
+                described.add(full)
+                if help_text:
+                    lines.append(f"# HELP {full} {help_text}")
+                lines.append(f"# TYPE {full} gauge")
+            label_text = ",".join(f'{k}="{v}"' for k, v in sorted(labels.items()))
+            label_text = f"{{{label_text}}}" if label_text else ""
+            lines.append(f"{full}{label_text} {fn()}")
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry (one per uvicorn worker)
+metrics = Metrics()
@@ -0,0 +1,229 @@
+"""Per-state catalogue partitions with routed search.
+
+Users are nearly always eligible only for central schemes plus their own
+state's, so scoring every state's schemes on every query is wasted work.
+Here the catalogue is split by each scheme's ``state`` field (see
+``config.partitions.FIELD``) into one file per jurisdiction::
+
+    data/partitions/central.json   schemes without a state
+    data/partitions/mh.json        schemes of Maharashtra
+    ...
+
+    python -m src.partitions data/schemes.json --out data/partitions
+
+Each partition is a ``Catalogue`` of its own, with its own compiled
+synonyms, eligibility bitsets and search cache. A query routed to state
+``mh`` is searched in ``central`` and ``mh`` only, and the two rankings
+are merged by score (central first on ties). Queries for a state
+without a partition file search central alone.
+
+The central partition stays loaded. State partitions are read and
+indexed on their first query and kept in least-recently-used order; past
+``config.partitions.MAX_LOADED`` the oldest is dropped, so memory is
+bounded by the largest few states rather than the whole country.
+
+The server rewrites the partition files from its own catalogue on
+``/admin/reload``; until ``central.json`` exists it does not route
+searches here at all (see ``PartitionedCatalogue.available``).
+"""
+
+import argparse
+import heapq
+import json
+import os
+import threading
+from collections import OrderedDict
+from itertools import islice
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from dataClasses import ProcessedQuery
+from src.catalogue import Catalogue
+from src.config import config
+from src.data_loader import load_schemes
+from src.matcher import SearchResults
+
+CENTRAL = "central"
+
+
+def partition_key(value) -> str:
+    """Partition of a scheme's (or user's) state value; central if none."""
+    key = str(value or "").strip().lower()
+    return key or CENTRAL
+
+
+def split_catalogue(schemes: List[Dict], field: str = config.partitions.FIELD) -> Dict[str, List]:
+    """Group schemes by partition, keeping catalogue order within each."""
+    parts: Dict[str, List[Dict]] = {CENTRAL: []}
+    for scheme in schemes:
+        parts.setdefault(partition_key(scheme.get(field)), []).append(scheme)
+    return parts
+
+
+def write_partitions(
+    schemes: List[Dict], out_dir: str, field: str = config.partitions.FIELD
+) -> Dict[str, int]:
+    """
+    Write one ``<partition>.json`` per partition into ``out_dir``, and
+    remove the files of states that no longer have schemes.
+
+    Each file is written aside and renamed into place, so a server
+    loading partitions meanwhile reads the old file or the new one.
+
+    :return: Schemes per partition
+    """
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    counts = {}
+    for key, part in split_catalogue(schemes, field).items():
+        tmp = out / f".{key}.json.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(part, f, ensure_ascii=False, indent=1)
+        os.replace(tmp, out / f"{key}.json")
+        counts[key] = len(part)
+    for stale in out.glob("*.json"):
+        if stale.stem not in counts:
+            stale.unlink()
+    return counts
+
+
+def merge_ranked(ranked: List[SearchResults], max_results: int) -> SearchResults:
+    """
+    Merge rankings of disjoint partitions by score; on equal scores the
+    earlier ranking comes first, as in one ranking of their concatenation.
+    """
+    # heapq.merge is stable: equal keys come out in the order of the inputs
+    top = list(islice(
+        heapq.merge(*(zip(r.scores, r) for r in ranked), key=lambda x: -x[0]), max_results
+    ))
+    merged = SearchResults(s for _, s in top)
+    merged.scores = [score for score, _ in top]
+    merged.partial = any(r.partial for r in ranked)
+    merged.scored = sum(r.scored for r in ranked)
+    return merged
+
+
+class PartitionedCatalogue:
+    """Central partition plus lazily loaded, least-recently-used state partitions."""
+
+    def __init__(
+        self,
+        directory: str = config.partitions.PATH,
+        synonyms_path: str = config.SYNONYMS_PATH,
+        max_loaded: int = config.partitions.MAX_LOADED,
+        cache_size: int = config.SEARCH_CACHE_SIZE,
+    ):
+        self.directory = directory
+        self.synonyms_path = synonyms_path
+        self.max_loaded = max_loaded
+        self.cache_size = cache_size
+        self.central = self._open(CENTRAL)
+        # state -> Catalogue, least recently used first
+        self._loaded: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"loads": 0, "evictions": 0}
+        self.states = self._list_states()
+        self.available = os.path.exists(self._path(CENTRAL))
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _open(self, key: str) -> Catalogue:
+        # Nothing is read until the partition's first search
+        return Catalogue(
+            self._path(key), self.synonyms_path, self.cache_size, semantic=False, related=False,
+        )
+
+    def _list_states(self) -> frozenset:
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return frozenset()
+        return frozenset(
+            name[:-len(".json")] for name in names
+            if name.endswith(".json") and name != f"{CENTRAL}.json"
+        )
+
+    @property
+    def loaded(self) -> List[str]:
+        """Loaded state partitions, least recently used first."""
+        return list(self._loaded)
+
+    def partition(self, state: str) -> Optional[Catalogue]:
+        """The partition of ``state``, opened if needed; None for central or unknown states."""
+        key = partition_key(state)
+        if key not in self.states:
+            return None
+        with self._lock:
+            part = self._loaded.get(key)
+            if part is not None:
+                self._loaded.move_to_end(key)
+                return part
+            part = self._loaded[key] = self._open(key)
+            self.stats["loads"] += 1
+            while len(self._loaded) > self.max_loaded:
+                # A request still holding the evicted partition finishes with it
+                self._loaded.popitem(last=False)
+                self.stats["evictions"] += 1
+            return part
+
+    def search(
+        self,
+        query: Union[str, ProcessedQuery],
+        max_results: int,
+        state: str = "",
+        deadline: float = None,
+        attrs: Dict = None,
+        trace=None,
+    ) -> SearchResults:
+        """
+        Rank central schemes plus those of ``state``.
+
+        :param state: User's state (e.g. ``"mh"``); empty searches central only
+        :param trace: Optional ``src.profiling.Trace`` that gets the
+            partitions searched and candidate counts
+        """
+        parts = [self.central]
+        part = self.partition(state)
+        if part is not None:
+            parts.append(part)
+        ranked = [p.search(query, max_results, deadline, attrs) for p in parts]
+        results = ranked[0] if len(ranked) == 1 else merge_ranked(ranked, max_results)
+        if trace is not None:
+            trace.count("partitions", [CENTRAL] + ([partition_key(state)] if part else []))
+            trace.count("schemes", sum(len(p.schemes) for p in parts))
+            trace.count("scored", results.scored)
+            trace.count("partial", results.partial)
+        return results
+
+    def reload_if_changed(self) -> bool:
+        """
+        Rescan the partition files and reload the loaded partitions whose
+        files changed; partitions not loaded yet read the new files anyway.
+        """
+        states, self.states = self.states, self._list_states()
+        self.available = os.path.exists(self._path(CENTRAL))
+        with self._lock:
+            for key in [k for k in self._loaded if k not in self.states]:
+                del self._loaded[key]
+            parts = [self.central] + list(self._loaded.values())
+        reloaded = [p.reload_if_changed() for p in parts if p.loaded]
+        return any(reloaded) or states != self.states
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Split a scheme catalogue into per-state partition files."
+    )
+    parser.add_argument("catalogue", nargs="?", default=config.SCHEME_DATA_PATH)
+    parser.add_argument("--out", default=config.partitions.PATH)
+    parser.add_argument("--field", default=config.partitions.FIELD)
+    args = parser.parse_args()
+
+    counts = write_partitions(load_schemes(args.catalogue), args.out, args.field)
+    for key, n in sorted(counts.items(), key=lambda x: (x[0] != CENTRAL, x[0])):
+        print(f"{key:>10}  {n:,} schemes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""On-demand profiling: a wall-clock sampling profiler and per-request traces.
+
+``SamplingProfiler`` runs only while an admin asks for it
+(``/admin/profile?seconds=N``): a daemon thread wakes every
+``SAMPLE_INTERVAL_MS``, walks the stack of every other thread via
+``sys._current_frames()`` and counts each stack once. The result is in
+collapsed-stack format, one ``root;caller;callee count`` line per
+distinct stack, as read by ``flamegraph.pl`` and speedscope::
+
+    curl "http://127.0.0.1:8001/admin/profile?token=$ADMIN_TOKEN&seconds=10" > out.folded
+    flamegraph.pl out.folded > out.svg
+
+Frames are labelled ``module:function`` (no line numbers, so a function
+is one box), and each stack starts with its thread's name. Threads that
+are waiting (idle server workers, the event loop in ``select``) are
+sampled too: this is wall-clock time, not CPU time.
+
+A ``Trace`` is created only for requests that ask for one (``trace=1``
+on /ask, ``"trace": true`` on /ws). It records the time of each stage of
+that request and counts such as candidates scored, and ends up in a
+``TraceBuffer``: the last ``TRACE_BUFFER_SIZE`` traces, read back by
+``/admin/traces``.
+
+Neither costs anything when unused: no sampler thread exists between
+profiles, and untraced requests only test ``trace is not None``.
+"""
+
+import sys
+import threading
+import time
+from collections import deque
+from time import perf_counter, perf_counter_ns
+from typing import Dict, List, Optional
+
+from src.config import config
+
+
+class Trace:
+    """Stage timings and counts of one request."""
+
+    __slots__ = ("transport", "query", "started", "last_ns", "stages", "counts")
+
+    def __init__(self, transport: str, query: str, start_ns: int = None):
+        self.transport = transport
+        self.query = query
+        self.started = time.time()
+        self.last_ns = perf_counter_ns() if start_ns is None else start_ns
+        self.stages: Dict[str, float] = {}  # stage -> milliseconds, in order
+        self.counts: Dict[str, object] = {}
+
+    def stage(self, name: str, end_ns: int = None) -> int:
+        """
+        Record the time since the previous stage ended (or the request began).
+
+        :param end_ns: End timestamp, e.g. as returned by ``metrics.observe``
+        :return: The end timestamp
+        """
+        end = perf_counter_ns() if end_ns is None else end_ns
+        self.stages[name] = self.stages.get(name, 0.0) + (end - self.last_ns) / 1e6
+        self.last_ns = end
+        return end
+
+    def count(self, name: str, value) -> None:
+        self.counts[name] = value
+
+    def as_dict(self) -> Dict:
+        return {
+            "time": round(self.started, 3),
+            "transport": self.transport,
+            "q": self.query,
+            "ms": round(sum(self.stages.values()), 3),
+            "stages": {k: round(v, 3) for k, v in self.stages.items()},
+            "counts": self.counts,
+        }
+
+
+class TraceBuffer:
+    """The most recent traces, oldest dropped first."""
+
+    def __init__(self, size: int = config.profiling.TRACE_BUFFER_SIZE):
+        self.size = size
+        self._traces: deque = deque(maxlen=max(1, size))
+        self.recorded = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.size > 0
+
+    def start(self, transport: str, query: str, start_ns: int = None) -> Optional[Trace]:
+        """A new trace, or None when tracing is disabled."""
+        return Trace(transport, query, start_ns) if self.size > 0 else None
+
+    def add(self, trace: Trace) -> None:
+        # deque.append with maxlen is atomic; no lock needed across threads
+        self._traces.append(trace)
+        self.recorded += 1
+
+    def recent(self, n: int = None) -> List[Dict]:
+        """Up to ``n`` traces, newest first."""
+        traces = list(self._traces)
+        traces.reverse()
+        return [t.as_dict() for t in traces[:n]]
+
+    def __len__(self) -> int:
+        return len(self._traces)
+
+
+class SamplingProfiler:
+    """Samples every thread's stack at a fixed interval while running."""
+
+    def __init__(
+        self,
+        interval: float = config.profiling.SAMPLE_INTERVAL_MS / 1000,
+        max_seconds: float = config.profiling.MAX_PROFILE_SECONDS,
+    ):
+        self.interval = interval
+        self.max_seconds = max_seconds
+        self.samples = 0
+        self._stacks: Dict[str, int] = {}
+        self._labels: Dict[object, str] = {}  # code object -> "module:function"
+        self._ignore: set = set()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, seconds: float, ignore=()) -> bool:
+        """
+        Start sampling for ``seconds`` (capped at ``max_seconds``).
+
+        :param ignore: Thread idents not to sample
+        :return: False if a profile is already running
+        """
+        with self._lock:
+            if self.running:
+                return False
+            self._stacks = {}
+            self.samples = 0
+            self._ignore = set(ignore)
+            self._stop.clear()
+            stop_at = perf_counter() + min(seconds, self.max_seconds)
+            self._thread = threading.Thread(
+                target=self._run, args=(stop_at,), name="sampling-profiler", daemon=True
+            )
+            self._thread.start()
+            return True
+
+    def stop(self) -> None:
+        self._stop.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join()
+
+    def profile(self, seconds: float) -> Optional[str]:
+        """
+        Sample for ``seconds``, blocking the calling thread (which is not sampled).
+
+        :return: Collapsed stacks, or None if a profile is already running
+        """
+        if not self.start(seconds, ignore=(threading.get_ident(),)):
+            return None
+        self._thread.join()
+        return self.collapsed()
+
+    def collapsed(self) -> str:
+        """Collapsed stacks of the last profile, most frequent first."""
+        stacks = sorted(self._stacks.items(), key=lambda x: x[1], reverse=True)
+        return "".join(f"{stack} {n}\n" for stack, n in stacks)
+
+    def _label(self, frame) -> str:
+        code = frame.f_code
+        label = self._labels.get(code)
+        if label is None:
+            module = frame.f_globals.get("__name__", "?")
+            label = self._labels[code] = f"{module}:{code.co_name}"
+        return label
+
+    def _run(self, stop_at: float) -> None:
+        own = threading.get_ident()
+        stacks = self._stacks
+        while not self._stop.wait(self.interval) and perf_counter() < stop_at:
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own or ident in self._ignore:
+                    continue
+                labels = []
+                while frame is not None:
+                    labels.append(self._label(frame))
+                    frame = frame.f_back
+                labels.append(names.get(ident, str(ident)))
+                labels.reverse()
+                key = ";".join(labels)
+                stacks[key] = stacks.get(key, 0) + 1
+            self.samples += 1
@@ -0,0 +1,107 @@
+"""Validation and normalization of raw queries before ranking.
+
+``process_query()`` never looks past ``MAX_QUERY_LENGTH`` characters or
+``MAX_QUERY_BYTES`` bytes of its input, so a 100 KB query costs the same
+as a 500-character one. In a single pass over the capped text it
+tokenizes (Indic-aware), drops repeated tokens, stops at
+``MAX_QUERY_TOKENS`` distinct tokens and tallies the Unicode script of
+each token to guess the query language. The ranker consumes the
+resulting ``ProcessedQuery.tokens`` directly.
+"""
+
+import re
+from typing import Optional
+
+from dataClasses import ProcessedQuery, QueryStatus
+from src.config import config
+
+# Word characters plus the Indic blocks, so vowel signs do not split words
+_TOKEN_RE = re.compile(r"[\w\u0900-\u0D7F]+")
+_TRAILING_TOKEN_RE = re.compile(r"[\w\u0900-\u0D7F]+\Z")
+
+# (first code point, last code point, language) per script
+_SCRIPTS = (
+    (0x0900, 0x097F, "hi"),  # Devanagari, also used for Marathi
+    (0x0980, 0x09FF, "bn"),
+    (0x0B80, 0x0BFF, "ta"),
+    (0x0C00, 0x0C7F, "te"),
+)
+
+# Devanagari LLA is common in Marathi and almost absent from Hindi
+_MARATHI_MARKER = "\u0933"
+
+
+def script_language(token: str) -> Optional[str]:
+    """Language implied by the script of a token's first character."""
+    c = ord(token[0])
+    if c < 0x80:
+        return "en" if token[0].isalpha() else None
+    for first, last, lang in _SCRIPTS:
+        if first <= c <= last:
+            return lang
+    return None
+
+
+def process_query(
+    text: str,
+    max_chars: int = config.query.MAX_QUERY_LENGTH,
+    max_bytes: int = config.query.MAX_QUERY_BYTES,
+    max_tokens: int = config.query.MAX_QUERY_TOKENS,
+) -> ProcessedQuery:
+    """
+    Cap, tokenize and deduplicate a raw query.
+
+    :param text: Raw query as received
+    :return: ProcessedQuery; status is EMPTY when no word survives and
+        TRUNCATED when any cap dropped part of the input
+    """
+    truncated = len(text) > max_chars
+    head = text[:max_chars]
+    encoded = head.encode("utf-8")
+    if len(encoded) > max_bytes:
+        # "ignore" drops a multi-byte character split by the cut
+        head = encoded[:max_bytes].decode("utf-8", "ignore")
+        truncated = True
+
+    # A word cut in half by the cap would match the wrong schemes
+    end = len(head)
+    if truncated and _TOKEN_RE.match(text, end):
+        trailing = _TRAILING_TOKEN_RE.search(head)
+        if trailing:
+            end = trailing.start()
+
+    tokens = []
+    seen = set()
+    votes = {}
+    for match in _TOKEN_RE.finditer(head, 0, end):
+        token = match.group().lower()
+        if token in seen:
+            continue
+        if len(tokens) == max_tokens:
+            truncated = True
+            break
+        seen.add(token)
+        tokens.append(token)
+        lang = script_language(token)
+        if lang is not None:
+            votes[lang] = votes.get(lang, 0) + 1
+
+    detected = max(votes, key=votes.get) if votes else None
+    if detected == "hi" and _MARATHI_MARKER in head:
+        detected = "mr"
+
+    if not tokens:
+        status = QueryStatus.EMPTY
+    elif truncated:
+        status = QueryStatus.TRUNCATED
+    else:
+        status = QueryStatus.VALID
+
+    return ProcessedQuery(
+        original_text=text,
+        normalized_text=" ".join(tokens),
+        status=status,
+        detected_language=detected,
+        character_count=len(text),
+        tokens=tokens,
+    )
@@ -0,0 +1,331 @@
+"""Precomputed related-schemes graph for "aur koi yojana?" follow-ups.
+
+Every scheme is a sparse vector over its tags and searchable tokens,
+weighted by inverse document frequency and L2-normalized. Features found
+in one scheme only link nothing, and features in more than
+``MAX_FEATURE_RATIO`` of the catalogue ("yojana", "scheme") link
+everything, so both are dropped.
+
+Schemes with the same remaining features are collapsed into one row
+first; they are each other's closest neighbours. Over the distinct rows
+the k best cosines are computed exactly, block by block, in two parts:
+
+* specific features (at most ``MAX_POSTINGS`` rows) as a sparse product:
+  each (row, feature) entry is joined with that feature's postings and
+  the products are summed per (row, neighbour) pair with one sort;
+* broad features, which would make that join quadratic, through the
+  few distinct sets of them rows have: one dense product per block.
+
+The result is stored as two dense arrays, neighbour positions (``-1``
+padded) and similarities, ``NEIGHBOURS`` columns per scheme, so a
+lookup is one row slice.
+
+Requires numpy; the catalogue only imports this module when
+``config.related.ENABLED`` is set.
+"""
+
+import math
+from collections import Counter
+from time import perf_counter
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from src.config import config
+from src.synonyms import searchable_tokens
+
+# (row, neighbour) products materialized per block, to bound temporary memory
+_BLOCK_PRODUCTS = 4_000_000
+
+# Products are summed as fixed-point integers with this many fractional bits
+_SCALE_BITS = 20
+_SCALE = (1 << _SCALE_BITS) - 1
+
+
+def scheme_features(scheme: Dict) -> set:
+    """Searchable tokens of a scheme plus one ``t:<tag>`` feature per tag."""
+    # Tokens never contain ":", so tag features cannot collide with them
+    return searchable_tokens(scheme) | {"t:" + str(t).lower() for t in scheme.get("tags", [])}
+
+
+def _segment_starts(values: np.ndarray) -> np.ndarray:
+    """Start index of each run of equal values in a sorted array."""
+    if not len(values):
+        return np.zeros(0, dtype=np.intp)
+    return np.flatnonzero(np.concatenate(([True], values[1:] != values[:-1])))
+
+
+class RelatedGraph:
+    """k-nearest-neighbour graph over a catalogue, as compact adjacency arrays."""
+
+    def __init__(
+        self,
+        schemes: List[Dict],
+        k: int = config.related.NEIGHBOURS,
+        max_feature_ratio: float = config.related.MAX_FEATURE_RATIO,
+        max_postings: int = config.related.MAX_POSTINGS,
+        tag_weight: float = config.related.TAG_WEIGHT,
+    ):
+        start = perf_counter()
+        n = len(schemes)
+        self.k = k
+        self.position: Dict[str, int] = {}
+        for pos, scheme in enumerate(schemes):
+            self.position.setdefault(scheme.get("id"), pos)
+
+        rows = [scheme_features(s) for s in schemes]
+        df = Counter(f for row in rows for f in row)
+        max_df = max(2, max_feature_ratio * n)
+        # Feature ids follow rarity, so sorted ids put rare features first
+        kept = sorted((c, f) for f, c in df.items() if 1 < c <= max_df)
+        feature_id = {f: i for i, (_, f) in enumerate(kept)}
+        weights = [math.log(n / c) * (tag_weight if f.startswith("t:") else 1.0) for c, f in kept]
+
+        # Schemes with identical feature sets share one row
+        groups: Dict[Tuple[int, ...], List[int]] = {}
+        for pos, row in enumerate(rows):
+            ids = tuple(sorted(i for i in map(feature_id.get, row) if i is not None))
+            groups.setdefault(ids, []).append(pos)
+        signatures = list(groups)
+        self.distinct = len(signatures)
+
+        group_neighbours, group_scores = self._distinct_neighbours(
+            signatures, weights, max_postings
+        )
+        members = list(groups.values())
+        outside, outside_scores = self._expand(group_neighbours, group_scores, members)
+        self.adjacency = np.full((n, k), -1, dtype=np.int32)
+        self.scores = np.zeros((n, k), dtype=np.float32)
+        singles = np.array([g for g, mates in enumerate(members) if len(mates) == 1], np.int64)
+        if len(singles):
+            at = np.array([members[g][0] for g in singles], dtype=np.int64)
+            self.adjacency[at] = outside[singles]
+            self.scores[at] = outside_scores[singles]
+        for g, (signature, mates) in enumerate(zip(signatures, members)):
+            if len(mates) == 1 or not signature:
+                continue  # done above, or nothing in common with anything
+            rest = [(p, s) for p, s in zip(outside[g], outside_scores[g]) if p >= 0]
+            for i, pos in enumerate(mates):
+                # Identical schemes first, starting after this one so they spread out
+                same = [(p, 1.0) for p in (mates[i + 1:] + mates[:i])[:k]]
+                picked = (same + rest)[:k]
+                self.adjacency[pos, :len(picked)] = [p for p, _ in picked]
+                self.scores[pos, :len(picked)] = [s for _, s in picked]
+        self.build_seconds = perf_counter() - start
+
+    def _expand(
+        self, group_neighbours: np.ndarray, group_scores: np.ndarray, members: List[List[int]]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Per distinct row, the first k schemes of its neighbour rows, best row
+        first, as (positions, similarities) padded with -1 and 0.
+        """
+        k = self.k
+        u = len(members)
+        counts = np.array([len(m) for m in members], dtype=np.int64)
+        member_ptr = np.concatenate(([0], np.cumsum(counts)))
+        member_pos = np.fromiter(
+            (p for m in members for p in m), dtype=np.int64, count=int(member_ptr[-1])
+        )
+        valid = group_neighbours >= 0
+        other = np.where(valid, group_neighbours, 0)
+        taken = np.where(valid, np.minimum(counts, k)[other], 0)
+        lengths = taken.ravel()
+        within = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        slot = np.repeat((np.cumsum(taken, axis=1) - taken).ravel(), lengths) + within
+        row = np.repeat(np.arange(u * k) // k, lengths)
+        keep = slot < k
+        picked = member_pos[np.repeat(member_ptr[other.ravel()], lengths) + within]
+        outside = np.full((u, k), -1, dtype=np.int32)
+        outside_scores = np.zeros((u, k), dtype=np.float32)
+        outside[row[keep], slot[keep]] = picked[keep]
+        outside_scores[row[keep], slot[keep]] = np.repeat(group_scores.ravel(), lengths)[keep]
+        return outside, outside_scores
+
+    def _distinct_neighbours(
+        self, signatures: List[Tuple[int, ...]], weights: List[float], max_postings: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Top-k other rows per distinct row, by cosine of the weighted vectors.
+
+        A row's similarity to another is its specific part (features with at
+        most ``max_postings`` postings, joined posting by posting) plus its
+        broad part, which depends only on the two rows' sets of broad
+        features. Broad sets are few, so their dot products come from one
+        dense product per block. Pairs sharing no specific feature are
+        found per broad set: there the best pairs are the set's rows with
+        the smallest norms, so the ``k + 1`` smallest of the best ``k + 1``
+        sets are enough. Together the two candidate lists give the exact top k.
+        """
+        k = self.k
+        u = len(signatures)
+        neighbours = np.full((u, k), -1, dtype=np.int64)
+        scores = np.zeros((u, k), dtype=np.float32)
+        if u < 2 or not weights:
+            return neighbours, scores
+
+        # Rows (CSR), in feature order within each row
+        weights = np.asarray(weights, dtype=np.float32)
+        lengths = np.array([len(s) for s in signatures], dtype=np.int64)
+        entry_row = np.repeat(np.arange(u), lengths)
+        entry_feat = np.fromiter(
+            (f for s in signatures for f in s), dtype=np.int64, count=int(lengths.sum())
+        )
+        entry_w = weights[entry_feat]
+        norms = np.sqrt(np.bincount(entry_row, weights=entry_w * entry_w, minlength=u))
+        inv_norm = (1.0 / np.maximum(norms, 1e-12)).astype(np.float32)
+        post_len = np.bincount(entry_feat, minlength=len(weights))
+        broad = post_len > max_postings
+
+        # Specific entries, normalized, with their postings (CSC)
+        specific = ~broad[entry_feat]
+        spec_row, spec_feat = entry_row[specific], entry_feat[specific]
+        spec_w = entry_w[specific] * inv_norm[spec_row]
+        order = np.argsort(spec_feat * u + spec_row)
+        post_row, post_w = spec_row[order], spec_w[order]
+        post_ptr = np.concatenate(([0], np.cumsum(np.where(broad, 0, post_len))))
+        spec_len = np.where(broad, 0, post_len)[spec_feat]
+        spec_ptr = np.concatenate(([0], np.cumsum(np.bincount(spec_row, minlength=u))))
+
+        # Broad feature sets: one dense row each, and their members by ascending norm
+        column = np.cumsum(broad) - 1
+        sets: Dict[Tuple[int, ...], int] = {}
+        row_set = np.fromiter(
+            (sets.setdefault(tuple(f for f in s if broad[f]), len(sets)) for s in signatures),
+            dtype=np.int64, count=u,
+        )
+        dense = np.zeros((len(sets), int(broad.sum())), dtype=np.float32)
+        for key, b in sets.items():
+            dense[b, column[list(key)]] = weights[list(key)]
+        m = k + 1
+        order = np.lexsort((norms, row_set))
+        by_set = row_set[order]
+        rank = np.arange(u) - np.searchsorted(by_set, by_set)
+        smallest = np.full((len(sets), m), -1, dtype=np.int64)
+        smallest[by_set[rank < m], rank[rank < m]] = order[rank < m]
+        best_inv = inv_norm[smallest[:, 0]]
+
+        # Blocks of rows, bounded by postings joined and broad dot products
+        row_work = np.bincount(spec_row, weights=spec_len, minlength=u) + len(sets) + m * m
+        work = np.cumsum(row_work)
+        block_start = 0
+        while block_start < u:
+            done = work[block_start - 1] if block_start else 0
+            block_end = int(np.searchsorted(work, done + _BLOCK_PRODUCTS, side="right"))
+            block_end = min(max(block_end, block_start + 1), u)
+            lo, hi = spec_ptr[block_start], spec_ptr[block_end]
+            block_dots = dense[row_set[block_start:block_end]] @ dense.T
+            left, right, products = self._specific(
+                spec_row[lo:hi] - block_start, spec_feat[lo:hi], spec_w[lo:hi],
+                spec_len[lo:hi], post_ptr, post_row, post_w, block_start, u,
+            )
+            specific_scores = products + (
+                block_dots[left, row_set[right]] * inv_norm[left + block_start] * inv_norm[right]
+            )
+
+            # Best broad sets per row, and their smallest members
+            reach = block_dots * best_inv
+            if reach.shape[1] > m:
+                top_sets = np.argpartition(-reach, m - 1, axis=1)[:, :m]
+            else:
+                top_sets = np.broadcast_to(np.arange(reach.shape[1]), reach.shape)
+            # Of those members, the k best for each row
+            here = np.arange(block_start, block_end)
+            members = smallest[top_sets]
+            set_scores = (
+                np.take_along_axis(block_dots, top_sets, axis=1)[:, :, None]
+                * inv_norm[members] * inv_norm[here][:, None, None]
+            )
+            set_scores[(members < 0) | (members == here[:, None, None])] = 0
+            set_scores = set_scores.reshape(len(here), -1)
+            members = members.reshape(len(here), -1)
+            if set_scores.shape[1] > k:
+                best = np.argpartition(-set_scores, k - 1, axis=1)[:, :k]
+                set_scores = np.take_along_axis(set_scores, best, axis=1)
+                members = np.take_along_axis(members, best, axis=1)
+            set_left = np.repeat(np.arange(len(here)), set_scores.shape[1])
+            set_right, set_scores = members.ravel(), set_scores.ravel()
+            self._keep_top(
+                np.concatenate((left, set_left)), np.concatenate((right, set_right)),
+                np.concatenate((specific_scores, set_scores)),
+                block_start, u, neighbours, scores,
+            )
+            block_start = block_end
+        return neighbours, scores
+
+    @staticmethod
+    def _specific(rows, feats, ws, lengths, post_ptr, post_row, post_w, first, u):
+        """
+        Sparse product of one block's specific entries with all rows.
+
+        :param rows: Row of each entry, relative to the block's ``first`` row
+        :return: (row in block, other row, summed product) per pair, sorted by pair
+        """
+        total = int(lengths.sum())
+        if not total:
+            return np.zeros(0, np.int64), np.zeros(0, np.int64), np.zeros(0, np.float32)
+        offsets = (
+            np.arange(total)
+            - np.repeat(np.cumsum(lengths) - lengths, lengths)
+            + np.repeat(post_ptr[feats], lengths)
+        )
+        left = np.repeat(rows, lengths)
+        right = post_row[offsets]
+        products = np.repeat(ws, lengths) * post_w[offsets]
+        other = left + first != right
+
+        # Pair in the high bits, quantized product in the low bits: one sort groups pairs
+        pairs = left[other] * u + right[other]
+        quantized = np.rint(np.minimum(products[other], 1.0) * _SCALE).astype(np.int64)
+        packed = np.sort((pairs << _SCALE_BITS) | quantized)
+        pairs = packed >> _SCALE_BITS
+        starts = _segment_starts(pairs)
+        if not len(starts):
+            return np.zeros(0, np.int64), np.zeros(0, np.int64), np.zeros(0, np.float32)
+        sums = np.add.reduceat(packed & _SCALE, starts).astype(np.float32) / _SCALE
+        pairs = pairs[starts]
+        return pairs // u, pairs % u, sums
+
+    def _keep_top(self, left, right, similarity, first, u, neighbours, scores) -> None:
+        """
+        Write each block row's k best candidates, best first, ties by position.
+
+        A pair may be listed twice (also found through its broad set, where
+        its specific part is missing); the higher score is the real one.
+        Sorting is done on packed int64 keys, which numpy sorts several
+        times faster than argsort or lexsort on separate columns.
+        """
+        keep = similarity > 0
+        if not keep.any():
+            return
+        left, right = left[keep], right[keep]
+        quantized = np.rint(np.minimum(similarity[keep], 1.0) * _SCALE).astype(np.int64)
+        packed = np.sort(((left * u + right) << _SCALE_BITS) | quantized)
+        pairs = packed >> _SCALE_BITS
+        last = np.append(_segment_starts(pairs)[1:], len(pairs)) - 1
+        pairs, quantized = pairs[last], packed[last] & _SCALE
+        left, right = pairs // u, pairs % u
+
+        right_bits = max(1, (u - 1).bit_length())
+        score_bits = min(_SCALE_BITS, 62 - right_bits - max(1, int(left[-1]).bit_length()))
+        levels = (1 << score_bits) - 1
+        inverse = levels - np.minimum(quantized >> (_SCALE_BITS - score_bits), levels)
+        ranked = np.sort((left << (score_bits + right_bits)) | (inverse << right_bits) | right)
+        left = ranked >> (score_bits + right_bits)
+        inverse = (ranked >> right_bits) & levels
+        right = ranked & ((1 << right_bits) - 1)
+        row_starts = _segment_starts(left)
+        run_lengths = np.diff(np.append(row_starts, len(left)))
+        rank = np.arange(len(left)) - np.repeat(row_starts, run_lengths)
+        top = rank < self.k
+        neighbours[left[top] + first, rank[top]] = right[top]
+        scores[left[top] + first, rank[top]] = (levels - inverse[top]) / levels
+
+    @property
+    def nbytes(self) -> int:
+        return self.adjacency.nbytes + self.scores.nbytes
+
+    def related(self, pos: int, limit: int = None) -> List[Tuple[int, float]]:
+        """(position, similarity) of the schemes most like scheme ``pos``, best first."""
+        row = self.adjacency[pos, :limit]
+        return [(int(p), float(s)) for p, s in zip(row, self.scores[pos, :limit]) if p >= 0]
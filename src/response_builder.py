@@ -0,0 +1,197 @@
+"""Byte- and word-budgeted response packing.
+
+Schemes and action steps are packed into pages that each stay under
+``MAX_RESPONSE_BYTES`` and ``MAX_RESPONSE_WORDS``. Encoded sizes are
+measured per item as the page grows, so a page is never serialized twice
+just to find out it was too big. Pages after the first are kept
+pre-serialized and served from a per-session cursor.
+"""
+
+import json
+from typing import List, Optional, Union
+
+from dataClasses import ActionStep
+from src.config import config
+from src.schemas import AssistantResponse
+
+# Size reserved for the cursor ID when the caller has none yet (uuid4().hex)
+_SID_PLACEHOLDER = "0" * 32
+
+
+def _dumps(obj) -> bytes:
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _word_count(item) -> int:
+    if isinstance(item, dict):
+        return sum(len(str(v).split()) for k, v in item.items() if k != "id")
+    return len(str(item).split())
+
+
+class ResponseBuilder:
+    """Packs a response into one or more pages within the configured budget."""
+
+    def __init__(
+        self,
+        max_bytes: int = config.response.MAX_RESPONSE_BYTES,
+        max_words: int = config.response.MAX_RESPONSE_WORDS,
+        max_steps: int = config.response.MAX_ACTION_STEPS,
+    ):
+        self.max_bytes = max_bytes
+        self.max_words = max_words
+        self.max_steps = max_steps
+
+    def build(
+        self,
+        msg: str,
+        schemes: List[dict],
+        steps: List[Union[str, ActionStep]],
+        lang: str,
+        sid: Optional[str] = None,
+        partial: bool = False,
+        reserve: int = 0,
+    ) -> List[dict]:
+        """
+        Split a response into pages.
+
+        Each page is a dict with the compact response fields
+        (msg, schemes, steps, lang, more). Items are packed in order; a
+        single item larger than an empty page has its text trimmed to fit.
+        ``sid`` only sizes the cursor field that continued pages carry;
+        ``partial`` marks every page as a best-effort answer. ``reserve``
+        bytes of each page are left for fields the caller adds (e.g. the
+        header of a streamed frame).
+        """
+        steps = [s.instruction if isinstance(s, ActionStep) else s for s in steps]
+        items = [("schemes", s) for s in schemes]
+        items += [("steps", s) for s in steps[: self.max_steps]]
+
+        envelope = {
+            "msg": msg, "schemes": [], "steps": [], "lang": lang,
+            "more": True, "sid": sid or _SID_PLACEHOLDER,
+        }
+        if partial:
+            envelope["partial"] = True
+        base_bytes = len(_dumps(envelope)) + reserve
+        base_words = len(msg.split())
+
+        pages = []
+        page = self._new_page(msg, lang, partial)
+        used_bytes, used_words = base_bytes, base_words
+
+        for field, item in items:
+            # +1 for the separating comma when the list is not empty
+            cost = len(_dumps(item)) + (1 if page[field] else 0)
+            words = _word_count(item)
+            page_empty = not page["schemes"] and not page["steps"]
+
+            if not page_empty and (
+                used_bytes + cost > self.max_bytes or used_words + words > self.max_words
+            ):
+                pages.append(page)
+                page = self._new_page(msg, lang, partial)
+                used_bytes, used_words = base_bytes, base_words
+                cost = len(_dumps(item))
+
+            if used_bytes + cost > self.max_bytes:
+                item = self._trim(item, self.max_bytes - used_bytes)
+                cost = len(_dumps(item))
+
+            page[field].append(item)
+            used_bytes += cost
+            used_words += words
+
+        pages.append(page)
+        for p in pages[:-1]:
+            p["more"] = True
+        return pages
+
+    def _new_page(self, msg: str, lang: str, partial: bool = False) -> dict:
+        return AssistantResponse(msg=msg, lang=lang, partial=partial).model_dump()
+
+    def _trim(self, item, budget: int):
+        """Shorten the longest text field of an item until it fits ``budget`` bytes."""
+        if not isinstance(item, dict):
+            return self._trim({"": item}, budget + len(b'{"":}'))[""]
+
+        item = dict(item)
+        key = max((k for k in item if k != "id"), key=lambda k: len(str(item[k])), default=None)
+        if key is None:
+            return item
+        # JSON escaping can make the encoded size exceed the raw size, so
+        # re-measure until the item fits.
+        while len(_dumps(item)) > budget and len(str(item[key])) > 1:
+            text = str(item[key])
+            overflow = len(_dumps(item)) - budget
+            item[key] = self._cut(text, len(text.encode("utf-8")) - overflow)
+        return item
+
+    def _cut(self, text: str, max_bytes: int) -> str:
+        ellipsis = "…"
+        room = max(max_bytes - len(ellipsis.encode("utf-8")), 0)
+        # Decode with "ignore" so a multi-byte character is never split
+        return text.encode("utf-8")[:room].decode("utf-8", "ignore") + ellipsis
+
+
+class PageCursor:
+    """Holds the pre-serialized continuation pages of each session."""
+
+    CONTEXT_KEY = "pages"
+
+    def __init__(self, session_manager):
+        """
+        :param session_manager: SessionManager whose session context stores the cursor
+        """
+        self.session_manager = session_manager
+
+    def first_page(self, sid: Optional[str], pages: List[dict], new_sid) -> bytes:
+        """
+        Serialize the first page and park the rest under ``sid``.
+
+        :param sid: Session ID of the caller, if any
+        :param pages: Pages from ResponseBuilder.build
+        :param new_sid: Callable returning a fresh session ID when one is needed
+        :return: Encoded first page
+        """
+        return _dumps(self.park(sid, pages, new_sid))
+
+    def park(self, sid: Optional[str], pages: List[dict], new_sid) -> dict:
+        """
+        Like first_page(), but return the first page unencoded, for callers
+        that reshape it (e.g. into a streamed /ws frame).
+        """
+        first = pages[0]
+        if len(pages) > 1:
+            sid = sid or new_sid()
+            first["sid"] = sid
+            rest = []
+            for page in pages[1:]:
+                if page["more"]:
+                    page["sid"] = sid
+                rest.append(_dumps(page))
+            rest.reverse()  # pop() from the end serves them in order
+            self.session_manager.update(sid, {self.CONTEXT_KEY: rest})
+        else:
+            # A fresh answer invalidates any older continuation
+            self.clear(sid)
+        return first
+
+    def clear(self, sid: Optional[str]) -> None:
+        """Drop any continuation pages waiting for ``sid``."""
+        if sid and sid in self.session_manager.sessions:
+            self.session_manager.sessions[sid]["context"].pop(self.CONTEXT_KEY, None)
+
+    def next_page(self, sid: str) -> Optional[bytes]:
+        """
+        Pop the next continuation page for ``sid``.
+
+        :return: Encoded page, or None if there is nothing more
+        """
+        if not sid or sid not in self.session_manager.sessions:
+            return None
+        if self.session_manager.is_expired(sid):
+            return None
+        rest = self.session_manager.sessions[sid]["context"].get(self.CONTEXT_KEY)
+        if not rest:
+            return None
+        return rest.pop()
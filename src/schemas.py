@@ -30,11 +30,17 @@ class AssistantResponse:
     schemes: List[dict] = field(default_factory=list)
     steps: List[str] = field(default_factory=list)
     lang: str = "hi"
+    more: bool = False  # True if a continuation page is waiting
+    partial: bool = False  # True if the search hit its deadline; sent only then
 
     def model_dump(self):
-        return {
+        data = {
             "msg": self.msg,
             "schemes": self.schemes,
             "steps": self.steps,
             "lang": self.lang,
+            "more": self.more,
         }
+        if self.partial:
+            data["partial"] = True
+        return data
@@ -0,0 +1,292 @@
+"""Offline dense-vector retrieval, fused with keyword ranking.
+
+Vectors are built without a model: every word, its character 3- and
+4-grams and the synonym group it belongs to (``data/synonyms.json``) are
+hashed into ``DIMENSIONS`` signed buckets, and the result is
+L2-normalized. Each feature is weighted by its inverse document
+frequency in the catalogue; query features that no scheme has are
+dropped. Character n-grams connect spelling variants ("padhai",
+"padhao"); synonym-group features connect different words for the same
+thing ("padhai" and "education", "beti" and "girl").
+
+Scheme vectors are computed at catalogue load into one float32 matrix.
+Catalogues of ``IVF_MIN_SCHEMES`` or more get an inverted-file index: a
+spherical k-means over the vectors, with each list's vectors stored
+contiguously, so a query scores the centroids and then only the
+``IVF_PROBE`` closest lists. Smaller catalogues are scored exhaustively.
+
+Vector hits are combined with ``match_schemes()`` results by reciprocal
+rank fusion, so neither score needs calibrating against the other.
+
+Requires numpy; the catalogue only imports this module when
+``config.semantic.ENABLED`` is set.
+"""
+
+import zlib
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+from src.config import config
+from src.synonyms import searchable_tokens
+
+NGRAM_SIZES = (3, 4)
+WORD_WEIGHT = 1.0
+NGRAM_WEIGHT = 0.5
+CONCEPT_WEIGHT = 2.0
+
+
+# Features of one token (or one query): feature ids and their weights
+_Features = Tuple[np.ndarray, np.ndarray]
+_NO_FEATURES: _Features = (np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.float32))
+
+# Rows turned into vectors per bincount call, to bound temporary memory
+_EMBED_CHUNK = 4096
+
+
+class HashingEmbedder:
+    """Maps token lists to L2-normalized float32 vectors by feature hashing."""
+
+    def __init__(self, dim: int = config.semantic.DIMENSIONS, synonym_groups=()):
+        self.dim = dim
+        # Single-word synonym term -> its group numbers
+        self.concepts: Dict[str, List[int]] = {}
+        for gid, group in enumerate(synonym_groups):
+            for term in group:
+                if " " not in term:
+                    self.concepts.setdefault(term, []).append(gid)
+        # feature -> id, assigned by fit(); per id, its bucket and signed IDF
+        self._ids: Dict[str, int] = {}
+        self._buckets = None
+        self._scales = None
+        # Catalogue tokens recur across schemes, so their features are built once
+        self._token_features: Dict[str, _Features] = {}
+
+    def features(self, token: str) -> List[Tuple[str, float]]:
+        """(feature, weight) for the word itself, its n-grams and its synonym groups."""
+        out = [("w:" + token, WORD_WEIGHT)]
+        padded = f"<{token}>"
+        for n in NGRAM_SIZES:
+            for i in range(len(padded) - n + 1):
+                out.append((padded[i:i + n], NGRAM_WEIGHT))
+        for gid in self.concepts.get(token, ()):
+            out.append((f"c:{gid}", CONCEPT_WEIGHT))
+        return out
+
+    def _token(self, token: str, learn: bool) -> _Features:
+        cached = self._token_features.get(token)
+        if cached is not None:
+            return cached
+        ids, weights = [], []
+        for feature, weight in self.features(token):
+            fid = self._ids.get(feature)
+            if fid is None:
+                if not learn:
+                    continue  # no scheme has it
+                fid = self._ids[feature] = len(self._ids)
+            ids.append(fid)
+            weights.append(weight)
+        result = (np.array(ids, dtype=np.intp), np.array(weights, dtype=np.float32))
+        if learn:
+            self._token_features[token] = result
+        return result
+
+    def _row(self, tokens: Iterable[str], learn: bool = False) -> _Features:
+        parts = [self._token(t, learn) for t in tokens]
+        if not parts:
+            return _NO_FEATURES
+        return np.concatenate([p[0] for p in parts]), np.concatenate([p[1] for p in parts])
+
+    def fit(self, token_lists: Sequence[Iterable[str]]) -> np.ndarray:
+        """Learn the feature vocabulary and IDF weights from the schemes; return their vectors."""
+        rows = [self._row(tokens, learn=True) for tokens in token_lists]
+        n_features = len(self._ids)
+        df = np.zeros(n_features, dtype=np.int64)
+        for start, ids, _, row_of in self._chunks(rows):
+            # Each (row, feature) pair counts once however often the row repeats it
+            pairs = np.sort(row_of * n_features + ids)
+            pairs = pairs[np.concatenate(([True], pairs[1:] != pairs[:-1]))]
+            df += np.bincount(pairs % n_features, minlength=n_features)
+        idf = np.log1p(len(rows) / np.maximum(df, 1))
+
+        # crc32 is stable across processes, unlike hash(); ids follow dict order
+        hashes = np.array([zlib.crc32(f.encode("utf-8")) for f in self._ids], dtype=np.int64)
+        self._buckets = (hashes >> 1) % self.dim
+        self._scales = np.where(hashes & 1, idf, -idf).astype(np.float32)
+        return self._matrix(rows)
+
+    def embed(self, token_lists: Sequence[Iterable[str]]) -> np.ndarray:
+        """
+        One normalized row per token list. Features no scheme has (stop
+        words, the odd n-grams of a typo) are dropped; a row with none left is zero.
+        """
+        if self._buckets is None:
+            return np.zeros((len(token_lists), self.dim), dtype=np.float32)
+        return self._matrix([self._row(tokens) for tokens in token_lists])
+
+    @staticmethod
+    def _chunks(rows: List[_Features]):
+        """(first row, feature ids, weights, row within chunk) per chunk of rows."""
+        for start in range(0, len(rows), _EMBED_CHUNK):
+            chunk = rows[start:start + _EMBED_CHUNK]
+            ids = np.concatenate([_NO_FEATURES[0]] + [r[0] for r in chunk])
+            weights = np.concatenate([_NO_FEATURES[1]] + [r[1] for r in chunk])
+            row_of = np.repeat(np.arange(len(chunk)), [len(r[0]) for r in chunk])
+            yield start, ids, weights, row_of
+
+    def _matrix(self, rows: List[_Features]) -> np.ndarray:
+        dim = self.dim
+        matrix = np.zeros((len(rows), dim), dtype=np.float32)
+        for start, ids, weights, row_of in self._chunks(rows):
+            n = min(_EMBED_CHUNK, len(rows) - start)
+            # Summing (row, bucket) cells with bincount is much faster than np.add.at
+            cells = np.bincount(
+                row_of * dim + self._buckets[ids],
+                weights=weights * self._scales[ids],
+                minlength=n * dim,
+            )
+            matrix[start:start + n] = cells.reshape(n, dim)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return matrix
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Positions of the ``k`` highest scores, best first."""
+    if k >= len(scores):
+        return np.argsort(-scores, kind="stable")
+    top = np.argpartition(-scores, k)[:k]
+    return top[np.argsort(-scores[top], kind="stable")]
+
+
+class FlatIndex:
+    """Exhaustive cosine search: one matrix-vector product per query."""
+
+    def __init__(self, vectors: np.ndarray):
+        self.vectors = vectors
+
+    def search(self, queries: np.ndarray, k: int) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        :param queries: (m, dim) normalized query vectors
+        :return: per query, (row ids, similarities), best first
+        """
+        scores = queries @ self.vectors.T
+        results = []
+        for row in scores:
+            top = _top_k(row, k)
+            results.append((top, row[top]))
+        return results
+
+
+class IVFIndex:
+    """Inverted-file approximate nearest-neighbour index over normalized vectors."""
+
+    def __init__(
+        self,
+        vectors: np.ndarray,
+        n_lists: int = 0,
+        n_probe: int = config.semantic.IVF_PROBE,
+        iterations: int = 8,
+        seed: int = 0,
+    ):
+        n = len(vectors)
+        n_lists = min(n_lists or int(np.sqrt(n)) or 1, n)
+        self.n_probe = min(n_probe, n_lists)
+        rng = np.random.default_rng(seed)
+
+        # Spherical k-means on a sample; centroids are re-normalized each round
+        sample = vectors[rng.choice(n, min(n, 64 * n_lists), replace=False)]
+        centroids = sample[rng.choice(len(sample), n_lists, replace=False)].copy()
+        for _ in range(iterations):
+            assign = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assign, sample)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            empty = norms[:, 0] == 0
+            # An empty list takes a random sample vector as its new centroid
+            sums[empty] = sample[rng.choice(len(sample), int(empty.sum()))]
+            norms[empty] = 1.0
+            centroids = (sums / norms).astype(np.float32)
+
+        assign = np.empty(n, dtype=np.intp)
+        for start in range(0, n, 16384):
+            chunk = vectors[start:start + 16384]
+            assign[start:start + 16384] = np.argmax(chunk @ centroids.T, axis=1)
+
+        # Row ids grouped by list; list i is order[offsets[i]:offsets[i + 1]]
+        self.order = np.argsort(assign, kind="stable")
+        self.offsets = np.concatenate(([0], np.cumsum(np.bincount(assign, minlength=n_lists))))
+        self.vectors = vectors[self.order]
+        self.centroids = centroids
+
+    def search(self, queries: np.ndarray, k: int) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """Same contract as FlatIndex.search, scanning only the closest lists."""
+        centroid_scores = queries @ self.centroids.T
+        results = []
+        for q, cs in zip(queries, centroid_scores):
+            probe = _top_k(cs, self.n_probe)
+            spans = [(self.offsets[i], self.offsets[i + 1]) for i in probe]
+            rows = np.concatenate([np.arange(a, b) for a, b in spans])
+            scores = self.vectors[rows] @ q
+            top = _top_k(scores, k)
+            results.append((self.order[rows[top]], scores[top]))
+        return results
+
+
+class SemanticIndex:
+    """Scheme vectors plus the ANN (or flat) index over them."""
+
+    def __init__(
+        self,
+        schemes: List[Dict],
+        synonym_groups: List[List[str]] = (),
+        dim: int = config.semantic.DIMENSIONS,
+        ivf_min_schemes: int = config.semantic.IVF_MIN_SCHEMES,
+        n_lists: int = config.semantic.IVF_LISTS,
+        n_probe: int = config.semantic.IVF_PROBE,
+    ):
+        self.schemes = schemes
+        self.embedder = HashingEmbedder(dim, synonym_groups)
+        self.vectors = self.embedder.fit([sorted(searchable_tokens(s)) for s in schemes])
+        if len(schemes) >= ivf_min_schemes:
+            self.index = IVFIndex(self.vectors, n_lists, n_probe)
+        else:
+            self.index = FlatIndex(self.vectors)
+
+    def search_many(
+        self, token_lists: Sequence[List[str]], k: int,
+        min_similarity: float = config.semantic.MIN_SIMILARITY,
+    ) -> List[List[Tuple[int, float]]]:
+        """Batched lookup: per query, (scheme position, cosine) pairs, best first."""
+        if not self.schemes:
+            return [[] for _ in token_lists]
+        queries = self.embedder.embed(token_lists)
+        return [
+            [(int(pos), float(sim)) for pos, sim in zip(ids, sims) if sim >= min_similarity]
+            for ids, sims in self.index.search(queries, k)
+        ]
+
+    def search(self, tokens: List[str], k: int) -> List[Dict]:
+        return [self.schemes[pos] for pos, _ in self.search_many([tokens], k)[0]]
+
+
+def fuse(
+    keyword: List[Dict], semantic: List[Dict], max_results: int,
+    k: int = config.semantic.RRF_K,
+) -> List[Dict]:
+    """
+    Reciprocal rank fusion of two ranked scheme lists.
+
+    A scheme scores ``1 / (k + rank)`` in each list it appears in;
+    ties keep keyword order first.
+    """
+    scores: Dict[str, float] = {}
+    by_id: Dict[str, Dict] = {}
+    for ranking in (keyword, semantic):
+        for rank, scheme in enumerate(ranking, 1):
+            key = scheme.get("id", "")
+            scores[key] = scores.get(key, 0.0) + 1.0 / (k + rank)
+            by_id.setdefault(key, scheme)
+    ranked = sorted(by_id, key=lambda key: -scores[key])
+    return [by_id[key] for key in ranked[:max_results]]
+
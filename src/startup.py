@@ -0,0 +1,182 @@
+"""Application startup phases and readiness.
+
+Importing ``src.main`` only wires objects together. The expensive work
+runs in explicit phases, in a background thread started by the app's
+lifespan hook:
+
+1. ``load``   - read ``schemes.json`` and ``synonyms.json``
+2. ``index``  - build the by-id, name/tag and synonym indexes
+3. ``warmup`` - run the top queries (``WARMUP_QUERIES_PATH``, one per
+   line) through the search cache and encode each language's bundle
+
+``/ping`` answers as soon as the server is up; ``/ready`` only once all
+phases have finished. Requests that arrive earlier still work: the
+catalogue loads itself on first use.
+
+A cold-start report (import time per module plus the phases above) is
+printed by::
+
+    python -m src.startup [--json]
+
+It exits non-zero when the total exceeds ``STARTUP_TARGET_SECONDS``.
+"""
+
+import argparse
+import json
+import re
+import subprocess
+import sys
+import threading
+from pathlib import Path
+from time import perf_counter
+from typing import Dict, List, Optional
+
+from src.config import config
+from src.query_processor import process_query
+
+
+def load_warmup_queries(path: str, limit: int = 1000) -> List[str]:
+    """Non-empty lines of the warm-up file; a missing file means no warm-up."""
+    p = Path(path)
+    if not p.exists():
+        return []
+    with open(p, encoding="utf-8") as f:
+        queries = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    return queries[:limit]
+
+
+class Startup:
+    """Runs the startup phases once and records how long each took."""
+
+    def __init__(self, catalogue, bundles, warmup_path: str = config.WARMUP_QUERIES_PATH):
+        self.catalogue = catalogue
+        self.bundles = bundles
+        self.warmup_path = warmup_path
+        self.phase = "pending"
+        self.error: Optional[str] = None
+        self.timings: Dict[str, float] = {}
+        self.warmed_queries = 0
+        self._done = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def ready(self) -> bool:
+        return self._done.is_set() and self.error is None
+
+    def start(self) -> None:
+        """Run the phases in a background thread (idempotent)."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.run, name="startup", daemon=True)
+            self._thread.start()
+
+    def wait(self, timeout: float = None) -> bool:
+        return self._done.wait(timeout)
+
+    def run(self) -> None:
+        try:
+            self.phase = "load"
+            self.catalogue.load(only_if_missing=True)
+            self.timings["load"] = self.catalogue.timings.get("read", 0.0)
+            self.timings["index"] = self.catalogue.timings.get("index", 0.0)
+
+            self.phase = "warmup"
+            start = perf_counter()
+            for q in load_warmup_queries(self.warmup_path):
+                self.catalogue.search(process_query(q), config.response.MAX_SCHEME_RESULTS)
+                self.warmed_queries += 1
+            for lang in config.language.SUPPORTED_LANGUAGES:
+                self.bundles.encoded(self.catalogue.schemes, lang)
+            self.timings["warmup"] = perf_counter() - start
+            self.phase = "ready"
+        except Exception as e:
+            self.phase = "failed"
+            self.error = f"{type(e).__name__}: {e}"
+        finally:
+            self._done.set()
+
+    def status(self) -> dict:
+        status = {
+            "ready": self.ready,
+            "phase": self.phase,
+            "ms": {k: round(v * 1000, 1) for k, v in self.timings.items()},
+            "warmed": self.warmed_queries,
+        }
+        if self.error:
+            status["error"] = self.error
+        return status
+
+
+# -----------------------------
+# Cold-start report
+# -----------------------------
+
+_IMPORTTIME_RE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+# Runs in a fresh interpreter so nothing is already imported or cached
+_PROBE = """
+import json, time
+t0 = time.perf_counter()
+import src.main as main
+t1 = time.perf_counter()
+main.startup.run()
+print(json.dumps({"import": t1 - t0, **main.startup.status()}))
+"""
+
+
+def _top_imports(stderr: str, n: int) -> List[tuple]:
+    """Slowest top-level imports (cumulative seconds) from ``-X importtime`` output."""
+    top = []
+    for line in stderr.splitlines():
+        m = _IMPORTTIME_RE.match(line)
+        # Top-level imports only; nested ones are indented further
+        if m and len(m.group(3)) == 1:
+            top.append((m.group(4), int(m.group(2)) / 1e6))
+    return sorted(top, key=lambda x: -x[1])[:n]
+
+
+def report(top: int = 10) -> dict:
+    start = perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE],
+        capture_output=True, text=True, check=False,
+    )
+    wall = perf_counter() - start
+    if proc.returncode != 0:
+        raise SystemExit(proc.stderr.strip().splitlines()[-1] if proc.stderr else "probe failed")
+
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    phases = {"import": round(result.pop("import") * 1000, 1), **result.pop("ms")}
+    total = sum(phases.values()) / 1000
+    return {
+        "total_s": round(total, 3),
+        "target_s": config.STARTUP_TARGET_SECONDS,
+        "process_wall_s": round(wall, 3),
+        "phases_ms": phases,
+        "slowest_imports_s": [[name, round(s, 4)] for name, s in _top_imports(proc.stderr, top)],
+        **result,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold start of the app.")
+    parser.add_argument("--top", type=int, default=10, help="slowest imports to list")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    rep = report(args.top)
+    if args.json:
+        print(json.dumps(rep, indent=2))
+    else:
+        print(f"cold start {rep['total_s']:.3f}s (target {rep['target_s']:.1f}s), "
+              f"process wall {rep['process_wall_s']:.3f}s")
+        for phase, ms in rep["phases_ms"].items():
+            print(f"  {phase:<8}{ms:>9.1f} ms")
+        print("slowest imports:")
+        for name, s in rep["slowest_imports_s"]:
+            print(f"  {s * 1000:>9.1f} ms  {name}")
+    if rep["total_s"] > rep["target_s"] or not rep["ready"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Multilingual synonym dictionary compiled into catalogue postings.
+
+Each group in ``data/synonyms.json`` lists interchangeable terms
+("kisan", "kheti", "krishi", "farmer", "किसान", ...). At catalogue load
+every group is resolved to the set of schemes containing any of its
+terms, and each single-word term gets a posting to that shared set. A
+query word is then checked with one dict lookup; queries are never
+expanded at request time.
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Dict, FrozenSet, List
+
+# Word characters plus the Indic blocks, so vowel signs do not split words
+_TOKEN_RE = re.compile(r"[\w\u0900-\u0D7F]+")
+
+
+def load_synonyms(path: str) -> List[List[str]]:
+    """Read synonym groups; a missing file means no synonyms."""
+    p = Path(path)
+    if not p.exists():
+        return []
+
+    with open(p, "r", encoding="utf-8") as f:
+        loaded = json.load(f)
+
+    groups = loaded.get("groups", []) if isinstance(loaded, dict) else loaded
+    return [[t.lower() for t in group if t] for group in groups if isinstance(group, list)]
+
+
+def searchable_tokens(scheme: dict) -> set:
+    """Tokens of the fields match_schemes() looks at."""
+    elig = (
+        scheme.get("elig", [])
+        or scheme.get("eligibility_hi", "")
+        or scheme.get("eligibility_en", "")
+    )
+    text = " ".join([
+        scheme.get("name", ""),
+        scheme.get("name_hi", ""),
+        scheme.get("name_en", ""),
+        " ".join(elig) if isinstance(elig, list) else str(elig),
+        scheme.get("description_hi", ""),
+        scheme.get("description_en", ""),
+        " ".join(scheme.get("tags", [])),
+    ])
+    return set(_TOKEN_RE.findall(text.lower()))
+
+
+class SynonymIndex:
+    """term -> positions of schemes matching any term of the term's group."""
+
+    EMPTY: FrozenSet[int] = frozenset()
+
+    def __init__(self, schemes: list, groups: List[List[str]]):
+        token_postings: Dict[str, set] = {}
+        for pos, scheme in enumerate(schemes):
+            for token in searchable_tokens(scheme):
+                token_postings.setdefault(token, set()).add(pos)
+
+        self.groups = groups
+        self.postings: Dict[str, FrozenSet[int]] = {}
+        for group in groups:
+            positions = set()
+            for term in group:
+                words = _TOKEN_RE.findall(term)
+                if not words:
+                    continue
+                # Multi-word terms need every word present
+                hits = set(token_postings.get(words[0], ()))
+                for word in words[1:]:
+                    hits &= token_postings.get(word, set())
+                positions |= hits
+
+            shared = frozenset(positions)
+            for term in group:
+                if " " not in term:
+                    # A term in several groups maps to the union of them
+                    self.postings[term] = self.postings.get(term, self.EMPTY) | shared
+
+    @classmethod
+    def from_postings(cls, groups: List[List[str]], postings: Dict[str, list]) -> "SynonymIndex":
+        """Reuse ``postings`` prebuilt for the same schemes and groups (see src.ingest)."""
+        index = cls.__new__(cls)
+        index.groups = groups
+        index.postings = {term: frozenset(p) for term, p in postings.items()}
+        return index
+
+    def lookup(self, word: str) -> FrozenSet[int]:
+        return self.postings.get(word, self.EMPTY)
+
+    def expand(self, word: str) -> List[str]:
+        """Query-time expansion (for comparison benchmarks only)."""
+        terms = [word]
+        for group in self.groups:
+            if word in group:
+                terms.extend(t for t in group if t != word)
+        return terms
@@ -0,0 +1,75 @@
+"""Bounded tracking of queries that returned no schemes.
+
+A count-min sketch estimates how often each zero-result query was seen
+in fixed memory, and a small candidate table keeps the heaviest ones so
+they can be listed. Estimates never undercount; with the defaults
+(2048 x 4) they overcount by at most ~0.13% of all zero-result traffic
+with 98% probability.
+"""
+
+import threading
+from typing import List, Tuple
+
+
+class CountMinSketch:
+    """Fixed-size frequency sketch over string keys."""
+
+    def __init__(self, width: int = 2048, depth: int = 4):
+        self.width = width
+        self.depth = depth
+        self.rows = [[0] * width for _ in range(depth)]
+        self.total = 0
+
+    def _cells(self, key: str):
+        width = self.width
+        return [hash((i, key)) % width for i in range(self.depth)]
+
+    def add(self, key: str, count: int = 1) -> int:
+        """Add ``count`` occurrences of ``key`` and return its new estimate."""
+        self.total += count
+        estimate = None
+        for row, cell in zip(self.rows, self._cells(key)):
+            row[cell] += count
+            if estimate is None or row[cell] < estimate:
+                estimate = row[cell]
+        return estimate
+
+    def estimate(self, key: str) -> int:
+        return min(row[cell] for row, cell in zip(self.rows, self._cells(key)))
+
+
+class ZeroResultTracker:
+    """Heavy-hitter view of zero-result queries backed by a CountMinSketch."""
+
+    def __init__(self, top_k: int = 50, width: int = 2048, depth: int = 4):
+        self.top_k = top_k
+        self.sketch = CountMinSketch(width, depth)
+        # query -> last estimate, never more than 2 * top_k entries
+        self._candidates = {}
+        # Requests add from worker threads while /zero-results reads
+        self._lock = threading.Lock()
+
+    def add(self, query: str) -> None:
+        with self._lock:
+            estimate = self.sketch.add(query)
+            candidates = self._candidates
+            if query in candidates or len(candidates) < 2 * self.top_k:
+                candidates[query] = estimate
+                return
+
+            # Replace the weakest candidate only if this query now outweighs it
+            weakest = min(candidates, key=candidates.get)
+            if estimate > candidates[weakest]:
+                del candidates[weakest]
+                candidates[query] = estimate
+
+    @property
+    def total(self) -> int:
+        return self.sketch.total
+
+    def top(self, n: int = None) -> List[Tuple[str, int]]:
+        """Heaviest zero-result queries with their estimated counts."""
+        with self._lock:
+            estimates = [(q, self.sketch.estimate(q)) for q in self._candidates]
+        ranked = sorted(estimates, key=lambda x: (-x[1], x[0]))
+        return ranked[: n or self.top_k]
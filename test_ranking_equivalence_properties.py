@@ -0,0 +1,225 @@
+import json
+import math
+import re
+import tempfile
+from pathlib import Path
+
+import pytest
+
+hypothesis = pytest.importorskip("hypothesis")
+
+from hypothesis import given  # noqa: E402
+from hypothesis import strategies as st  # noqa: E402
+
+from scheme_database import SchemeDatabase  # noqa: E402
+from scheme_retriever import SchemeRetriever  # noqa: E402
+from src.catalogue import Catalogue  # noqa: E402
+from src.eligibility import RULES_KEY, rule_matches  # noqa: E402
+from src.matcher import SYNONYM_WEIGHT, match_schemes  # noqa: E402
+from src.synonyms import SynonymIndex, searchable_tokens  # noqa: E402
+
+# Differential tests: every engine that claims to rank like the reference
+# scorer must return exactly the reference ranking (same schemes, same
+# order, ties in catalogue order) on random multilingual catalogues.
+#
+# Example counts come from the Hypothesis profile (see conftest.py):
+#   python -m pytest test_ranking_equivalence_properties.py                  # ci
+#   HYPOTHESIS_PROFILE=thorough python -m pytest test_ranking_equivalence_properties.py
+
+# Words in several scripts, with vowel signs, and pairs where one word is
+# a substring of another ("farm" / "farmer"), since matching is by substring
+WORDS = [
+    "kisan", "yojana", "farm", "farmer", "pension", "health", "bima", "scholarship",
+    "student", "loan", "किसान", "योजना", "छात्र", "पेंशन", "बीमा", "स्वास्थ्य",
+    "விவசாயி", "ஓய்வூதியம்", "రైతు", "పెన్షన్", "কৃষক", "বৃত্তি", "शेतकरी", "निवृत्तीवेतन",
+]
+# Single \w+ tokens, on which whole-token and substring matching can be compared
+PLAIN_WORDS = [w for w in WORDS if re.fullmatch(r"\w+", w)] + ["कमल", "नगर", "जल"]
+
+TOKEN_RE = re.compile(r"[\w\u0900-\u0D7F]+")
+
+OCCUPATIONS = ["farmer", "student", "labourer"]
+STATES = ["mh", "up", "tn"]
+
+
+def text(words):
+    return st.lists(st.sampled_from(words), max_size=5).map(" ".join)
+
+
+@st.composite
+def rules(draw):
+    rule = {}
+    if draw(st.booleans()):
+        rule["min_age"] = draw(st.integers(0, 60))
+    if draw(st.booleans()):
+        rule["max_age"] = draw(st.integers(18, 90))
+    if draw(st.booleans()):
+        rule["max_income"] = draw(st.sampled_from([50000, 100000, 250000]))
+    if draw(st.booleans()):
+        rule["occupation"] = draw(st.lists(st.sampled_from(OCCUPATIONS), min_size=1, unique=True))
+    if draw(st.booleans()):
+        rule["state"] = draw(st.lists(st.sampled_from(STATES), min_size=1, unique=True))
+    return rule
+
+
+@st.composite
+def catalogues(draw, words=WORDS, max_size=30, one_name=False):
+    schemes = []
+    for i in range(draw(st.integers(1, max_size))):
+        scheme = {
+            "id": f"s{i}",
+            "description_hi": draw(text(words)),
+            "description_en": draw(text(words)),
+            "tags": draw(st.lists(st.sampled_from(words), max_size=3)),
+        }
+        names = [["name_hi"], ["name_en"]] + ([] if one_name else [["name_hi", "name_en"]])
+        for field in draw(st.sampled_from(names)):
+            scheme[field] = draw(text(words))
+        if draw(st.booleans()):
+            scheme["eligibility_en"] = draw(text(words))
+        if draw(st.booleans()):
+            scheme[RULES_KEY] = draw(rules())
+        schemes.append(scheme)
+    return schemes
+
+
+def queries(words=WORDS):
+    return st.lists(st.sampled_from(words), min_size=1, max_size=4).map(" ".join)
+
+
+synonym_groups = st.lists(
+    st.lists(st.sampled_from(WORDS), min_size=2, max_size=4, unique=True), max_size=4
+)
+
+profiles = st.fixed_dictionaries({}, optional={
+    "age": st.integers(0, 90),
+    "income": st.sampled_from([10000, 80000, 300000]),
+    "occupation": st.sampled_from(OCCUPATIONS),
+    "state": st.sampled_from(STATES),
+})
+
+max_results = st.integers(1, 10)
+
+
+def reference_ranking(query, schemes, k, groups=()):
+    """
+    match_schemes() semantics written out plainly: substring hits per query
+    word, and for a word without any, SYNONYM_WEIGHT when a term of one of
+    its synonym groups occurs (all of its words) in the scheme.
+    """
+    scored = []
+    for scheme in schemes:
+        name = scheme.get("name") or scheme.get("name_hi") or scheme.get("name_en") or ""
+        name = name.lower()
+        elig = (
+            scheme.get("elig") or scheme.get("eligibility_hi") or scheme.get("eligibility_en") or ""
+        )
+        elig = " ".join(elig) if isinstance(elig, list) else str(elig).lower()
+        desc = f"{scheme.get('description_hi', '')} {scheme.get('description_en', '')}".lower()
+        tags = " ".join(scheme.get("tags", [])).lower()
+        tokens = searchable_tokens(scheme)
+        score = 0
+        for word in query.lower().split():
+            hit = 2 * (word in name) + (word in elig) + (word in desc) + 2 * (word in tags)
+            if not hit and any(
+                set(TOKEN_RE.findall(term)) <= tokens
+                for group in groups if word in group for term in group
+            ):
+                hit = SYNONYM_WEIGHT
+            score += hit
+        if score > 0:
+            scored.append((score, scheme))
+    scored.sort(key=lambda x: x[0], reverse=True)
+    return [s["id"] for _, s in scored[:k]]
+
+
+def ids(schemes):
+    return [s["id"] for s in schemes]
+
+
+def catalogue(directory, schemes, groups=()):
+    scheme_path = Path(directory) / "schemes.json"
+    synonyms_path = Path(directory) / "synonyms.json"
+    scheme_path.write_text(json.dumps(schemes, ensure_ascii=False), encoding="utf-8")
+    synonyms_path.write_text(json.dumps({"groups": list(groups)}, ensure_ascii=False), "utf-8")
+    return Catalogue(
+        str(scheme_path), str(synonyms_path), semantic=False, related=False,
+        documents_path=str(Path(directory) / "documents.json"),
+    )
+
+
+@given(catalogues(), queries(), max_results, st.integers(1, 8))
+def test_match_schemes_paths_match_the_reference(schemes, query, k, chunk_size):
+    """
+    Property: Scan Variants Rank Like the Reference Scorer
+
+    Ensures:
+    - match_schemes() returns the reference ranking
+    - Scoring an explicit candidate list of every scheme changes nothing
+    - A deadline that never passes changes nothing, whatever the chunk size
+    """
+    expected = reference_ranking(query, schemes, k)
+    assert ids(match_schemes(query, schemes, k)) == expected
+    assert ids(match_schemes(query, schemes, k, candidates=range(len(schemes)))) == expected
+
+    unhurried = match_schemes(query, schemes, k, deadline=math.inf, chunk_size=chunk_size)
+    assert ids(unhurried) == expected and not unhurried.partial
+
+
+@given(catalogues(), queries(), max_results, synonym_groups)
+def test_synonym_postings_match_query_time_expansion(schemes, query, k, groups):
+    """
+    Property: Compiled Synonyms Rank Like Query-Time Expansion
+
+    Ensures:
+    - Synonym postings compiled at load give the ranking that expanding
+      each query word through its groups at request time would give
+    """
+    index = SynonymIndex(schemes, groups)
+    assert ids(match_schemes(query, schemes, k, index)) == reference_ranking(
+        query, schemes, k, groups
+    )
+
+
+@given(catalogues(), queries(), max_results, synonym_groups, profiles)
+def test_catalogue_search_matches_the_reference(schemes, query, k, groups, attrs):
+    """
+    Property: Catalogue Search Ranks Like the Reference Scorer
+
+    Ensures:
+    - Catalogue.search() (compiled synonyms, search cache) returns the
+      reference ranking, on a cache miss and on the following hit
+    - With a user profile, the compiled eligibility bitsets give the
+      reference ranking of the schemes whose rules admit the user
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        cat = catalogue(directory, schemes, groups)
+        expected = reference_ranking(query, schemes, k, groups)
+        assert ids(cat.search(query, k)) == expected
+        assert ids(cat.search(query, k)) == expected
+        assert cat.cache_stats == {"hits": 1, "misses": 1}
+
+        eligible = [s for s in schemes if rule_matches(s.get(RULES_KEY), attrs)]
+        assert ids(cat.search(query, k, attrs=attrs)) == reference_ranking(
+            query, eligible, k, groups
+        )
+
+
+@given(catalogues(PLAIN_WORDS, one_name=True), queries(PLAIN_WORDS))
+def test_retriever_hits_are_substring_hits(schemes, query):
+    """
+    Property: Whole-Token Matches Are Substring Matches
+
+    SchemeRetriever scores whole-token overlap and match_schemes substring
+    hits, so their rankings differ, but on single-token words every scheme
+    the retriever finds also scores under match_schemes.
+
+    Ensures:
+    - SchemeRetriever.search() returns at most 3 schemes
+    - Every scheme it returns (without entity bonuses) is ranked by
+      match_schemes when all schemes are kept
+    """
+    retriever = SchemeRetriever(SchemeDatabase.from_records(schemes))
+    found = ids(retriever.search(query, {}))
+    assert len(found) <= 3
+    assert set(found) <= set(ids(match_schemes(query, schemes, len(schemes))))
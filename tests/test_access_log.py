@@ -0,0 +1,76 @@
+"""Tests for the buffered access log and its analyzer."""
+
+import json
+import time
+
+from src.access_log import AccessLogger, analyze, normalize_query, read_records
+
+
+def test_records_are_written_as_jsonl(tmp_path):
+    path = tmp_path / "access.jsonl"
+    logger = AccessLogger(str(path), fsync_seconds=0)
+    logger.log("  Kisan   YOJANA ", "hi", ["fin_002"], 1_500_000, 311, "http")
+    logger.log("xyz", "en", [], 2_000_000, 90, "ws")
+    logger.close()
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    first = json.loads(lines[0])
+    assert first["q"] == "kisan yojana"
+    assert first["ids"] == ["fin_002"]
+    assert first["ms"] == 1.5 and first["b"] == 311 and first["ch"] == "http"
+    assert logger.written == 2 and logger.dropped == 0
+
+
+def test_last_batch_is_synced_without_more_traffic(tmp_path, monkeypatch):
+    synced = []
+    monkeypatch.setattr("os.fsync", synced.append)
+    logger = AccessLogger(str(tmp_path / "a.jsonl"), fsync_seconds=0.05)
+    logger.log("kisan", "hi", [], 0, 0, "http")
+    time.sleep(0.3)  # nothing else arrives
+
+    assert synced
+    logger.close()
+
+
+def test_full_queue_drops_instead_of_blocking(tmp_path):
+    logger = AccessLogger(str(tmp_path / "a.jsonl"), queue_size=1)
+    logger._thread = object()  # pretend the writer is running but stalled
+    logger.log("a", "hi", [], 0, 0, "http")
+    logger.log("b", "hi", [], 0, 0, "http")
+    assert logger.dropped == 1
+
+
+def test_rotation_keeps_backups(tmp_path):
+    path = tmp_path / "access.jsonl"
+    logger = AccessLogger(str(path), max_bytes=200, backups=2, batch_size=1)
+    for i in range(30):
+        logger.log(f"query {i}", "hi", ["x"], 1000, 10, "http")
+    logger.close()
+
+    assert (tmp_path / "access.jsonl.1").exists()
+    assert not (tmp_path / "access.jsonl.3").exists()
+
+
+def test_analyze_reports_top_and_zero_result_queries(tmp_path):
+    records = [
+        {"q": "kisan", "ids": ["a"], "ms": 1.0},
+        {"q": "kisan", "ids": ["a"], "ms": 2.0},
+        {"q": "unknown thing here now", "ids": [], "ms": 9.0},
+    ]
+    report = analyze(records)
+
+    assert report["requests"] == 3
+    assert report["top_queries"][0] == ("kisan", 2)
+    assert report["top_zero_result_queries"] == [("unknown thing here now", 1)]
+    assert abs(report["zero_result_rate"] - 1 / 3) < 1e-9
+    assert set(report["latency_ms_by_query_words"]) == {"1", "4-5"}
+
+
+def test_read_records_skips_torn_lines(tmp_path):
+    path = tmp_path / "access.jsonl"
+    path.write_text('{"q":"a"}\n{"q":', encoding="utf-8")
+    assert list(read_records([str(path)])) == [{"q": "a"}]
+
+
+def test_normalize_query():
+    assert normalize_query("  A\tB  ") == "a b"
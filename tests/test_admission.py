@@ -0,0 +1,87 @@
+"""Tests for per-client rate limiting and concurrency admission."""
+
+import threading
+import time
+
+from src.admission import BUSY_MESSAGES, AdmissionController, RateLimiter
+from src.config import config
+
+
+def test_bucket_allows_burst_then_refills():
+    limiter = RateLimiter(rate=2.0, burst=3)
+
+    assert [limiter.allow("a", now=0.0) for _ in range(4)] == [True, True, True, False]
+    assert limiter.allow("a", now=0.4) is False
+    assert limiter.allow("a", now=0.5) is True
+    assert limiter.limited == 2
+
+
+def test_clients_have_separate_buckets():
+    limiter = RateLimiter(rate=1.0, burst=1)
+
+    assert limiter.allow("a", now=0.0)
+    assert not limiter.allow("a", now=0.0)
+    assert limiter.allow("b", now=0.0)
+
+
+def test_least_recent_client_is_evicted():
+    limiter = RateLimiter(rate=1.0, burst=1, max_clients=2)
+    for key in ("a", "b", "c"):
+        limiter.allow(key, now=0.0)
+
+    assert list(limiter._buckets) == ["b", "c"]
+
+
+def test_zero_rate_disables_limiting():
+    limiter = RateLimiter(rate=0, burst=0)
+    assert all(limiter.allow("a") for _ in range(100))
+
+
+def test_sheds_when_queue_is_full():
+    admission = AdmissionController(max_concurrent=1, max_queue=0, queue_timeout=1.0)
+
+    assert admission.acquire()
+    assert not admission.acquire()
+    admission.release(1_000_000)
+    assert admission.acquire()
+    assert (admission.admitted, admission.shed) == (2, 1)
+
+
+def test_queued_request_gets_released_slot():
+    admission = AdmissionController(max_concurrent=1, max_queue=1, queue_timeout=5.0)
+    assert admission.acquire()
+    results = []
+    waiter = threading.Thread(target=lambda: results.append(admission.acquire()))
+    waiter.start()
+    while admission.waiting == 0:
+        time.sleep(0.001)
+
+    admission.release(1_000_000)
+    waiter.join()
+    assert results == [True]
+    assert admission.in_flight == 1
+
+
+def test_queue_wait_times_out():
+    admission = AdmissionController(max_concurrent=1, max_queue=1, queue_timeout=0.01)
+    assert admission.acquire()
+    assert not admission.acquire()
+    assert admission.waiting == 0
+
+
+def test_high_latency_stops_queueing():
+    admission = AdmissionController(
+        max_concurrent=1, max_queue=10, queue_timeout=5.0, shed_latency_ms=100, smoothing=1.0
+    )
+    assert admission.acquire()
+    admission.release(500_000_000)
+    assert admission.overloaded
+
+    # A free slot is still used; only waiting is refused
+    assert admission.acquire()
+    assert not admission.acquire()
+
+
+def test_busy_message_for_every_supported_language():
+    for lang in config.language.SUPPORTED_LANGUAGES:
+        assert BUSY_MESSAGES[lang].strip()
@@ -0,0 +1,293 @@
+"""Endpoint tests for src.main over a synthetic catalogue."""
+
+import gzip
+import json
+
+import pytest
+
+import src.main as main
+from benchmarks.synthetic import (
+    add_documents,
+    add_eligibility_rules,
+    add_states,
+    generate_schemes,
+)
+from fastapi.testclient import TestClient
+from src.access_log import AccessLogger
+from src.config import config
+from src.eligibility import positions
+from src.partitions import PartitionedCatalogue, write_partitions
+from src.response_builder import ResponseBuilder
+from src.startup import Startup
+
+SCHEMES = add_documents(add_eligibility_rules(add_states(generate_schemes(300, 1), seed=1), 1), 1)
+TOKEN = "test-admin-token"
+
+client = TestClient(main.app)
+
+
+@pytest.fixture(autouse=True)
+def synthetic_catalogue(tmp_path, monkeypatch):
+    """
+    Point the app's catalogue at SCHEMES, with the related graph, lift the
+    rate limit and write the access log under tmp_path.
+    """
+    path = tmp_path / "schemes.json"
+    path.write_text(json.dumps(SCHEMES, ensure_ascii=False), encoding="utf-8")
+    monkeypatch.setattr(main.catalogue, "scheme_path", str(path))
+    monkeypatch.setattr(main.catalogue, "related_graph", True)
+    monkeypatch.setattr(main.catalogue, "_snapshot", None)
+    monkeypatch.setattr(main.catalogue, "_mtimes", None)
+    monkeypatch.setattr(main.rate_limiter, "rate", 0)
+    monkeypatch.setattr(config, "ADMIN_TOKEN", TOKEN)
+    access_log = AccessLogger(str(tmp_path / "access.jsonl"), fsync_seconds=0)
+    monkeypatch.setattr(main, "access_log", access_log)
+    yield
+    access_log.close()
+
+
+def get_json(path, status=200):
+    res = client.get(path)
+    assert res.status_code == status
+    return json.loads(res.content)
+
+
+def ids(payload):
+    return [s["id"] for s in payload.get("schemes", [])]
+
+
+def test_ask_then_reference_turns():
+    first = ids(get_json("/ask?q=kisan yojana&sid=api-ask"))
+    assert len(first) == 3
+
+    assert ids(get_json("/ask?q=doosri yojana&sid=api-ask")) == [first[1]]
+    more = ids(get_json("/ask?q=aur koi&sid=api-ask"))
+    assert more and not set(more) & set(first)
+
+
+def test_asks_are_access_logged():
+    get_json("/ask?q=Kisan  Yojana&sid=api-log")
+    main.access_log.close()
+    with open(main.access_log.path, encoding="utf-8") as f:
+        record = json.loads(f.readline())
+    assert record["q"] == "kisan yojana" and record["ch"] == "http" and record["ids"]
+
+
+def test_eligible_profile_filters_later_answers():
+    payload = get_json("/eligible?sid=api-elig&age=70&occupation=senior_citizen&lang=en")
+    snap = main.catalogue.snapshot
+    attrs = {"age": 70, "occupation": "senior_citizen"}
+    eligible = set(
+        snap.schemes[p]["id"] for p in positions(snap.eligibility.evaluate(attrs))
+    )
+    assert ids(payload) and set(ids(payload)) <= eligible
+    assert set(ids(get_json("/ask?q=pension yojana&sid=api-elig"))) <= eligible
+
+
+def test_documents_only_lists_schemes_needing_what_the_user_has():
+    have = {"aadhaar", "bank_passbook"}
+    found = ids(get_json("/documents?have=aadhaar,bank_passbook"))
+    assert found
+    by_id = {s["id"]: s for s in SCHEMES}
+    for scheme_id in found:
+        assert set(by_id[scheme_id]["required_documents"]) <= have
+
+
+def test_related_excludes_the_scheme_itself():
+    scheme_id = SCHEMES[0]["id"]
+    found = ids(get_json(f"/related?id={scheme_id}&sid=api-rel"))
+    assert found and scheme_id not in found
+    assert found == [s["id"] for s in main.catalogue.related(scheme_id, len(found))]
+    assert ids(get_json("/related?id=missing")) == []
+
+
+def test_state_routes_to_partitions(tmp_path, monkeypatch):
+    write_partitions(SCHEMES, str(tmp_path / "parts"))
+    monkeypatch.setattr(
+        main, "partitions", PartitionedCatalogue(str(tmp_path / "parts"), config.SYNONYMS_PATH)
+    )
+    by_id = {s["id"]: s for s in SCHEMES}
+    found = ids(get_json("/ask?q=kisan yojana&state=up"))
+    assert found
+    assert {by_id[i].get("state", "") for i in found} <= {"", "up"}
+    assert main.partitions.loaded == ["up"]
+
+
+def test_bundle_is_gzipped_only_when_accepted():
+    res = client.get("/bundle?lang=hi", headers={"Accept-Encoding": "gzip, deflate"})
+    assert res.headers["Content-Encoding"] == "gzip"
+    bundle = json.loads(gzip.decompress(res.content))
+    assert bundle["full"] and len(bundle["schemes"]) == len(SCHEMES)
+
+    for headers in (None, {"Accept-Encoding": "br"}, {"Accept-Encoding": "gzip;q=0, *"}):
+        res = client.get("/bundle?lang=hi", headers=headers)
+        assert "Content-Encoding" not in res.headers
+        assert json.loads(res.content) == bundle
+
+
+def test_traced_requests_are_listed_for_admins():
+    get_json("/ask?q=kisan yojana&trace=1")
+    traces = get_json(f"/admin/traces?token={TOKEN}&n=1")["traces"]
+    assert len(traces) == 1 and traces[0]["q"] == "kisan yojana"
+    assert {"parse", "match", "serialize"} <= set(traces[0]["stages"])
+
+
+@pytest.mark.parametrize(
+    "path", ["/admin/reload", "/admin/traces", "/admin/profile", "/zero-results"]
+)
+def test_admin_endpoints_need_the_token(path, monkeypatch):
+    get_json(path, 403)
+    get_json(f"{path}?token=wrong", 403)
+    monkeypatch.setattr(config, "ADMIN_TOKEN", "")
+    get_json(f"{path}?token=", 403)
+
+
+def test_admin_reload_and_profile():
+    assert get_json(f"/admin/reload?token={TOKEN}")["schemes"] == len(SCHEMES)
+    res = client.get(f"/admin/profile?token={TOKEN}&seconds=0.1")
+    assert res.status_code == 200 and res.media_type.startswith("text/plain")
+    assert "sampling-profiler" not in res.content.decode("utf-8")
+
+    assert main.profiler.start(5)
+    try:
+        get_json(f"/admin/profile?token={TOKEN}&seconds=0.1", 409)
+    finally:
+        main.profiler.stop()
+
+
+def test_zero_results_counts_unmatched_queries():
+    get_json("/ask?q=qqqzzzxx")
+    top = dict(get_json(f"/zero-results?token={TOKEN}&n=50")["top"])
+    assert top.get("qqqzzzxx", 0) >= 1
+
+
+def test_metrics_and_readiness(monkeypatch):
+    get_json("/ask?q=kisan")
+    text = client.get("/metrics").content.decode("utf-8")
+    assert 'stage="ask"' in text and "policypal_catalogue_schemes" in text
+
+    monkeypatch.setattr(main, "startup", Startup(main.catalogue, main.bundles))
+    assert get_json("/ready", 503)["ready"] is False
+    main.startup.run()
+    assert get_json("/ready")["ready"] is True
+
+
+def test_ws_answers_related_and_empty_turns():
+    with client.websocket_connect("/ws") as ws:
+        ws.send_json({"t": "ping"})
+        ws.send_json({"q": "kisan yojana", "sid": "api-ws"})
+        first = ids(json.loads(ws.receive_text()))
+        assert len(first) == 3
+
+        ws.send_json({"related": True, "sid": "api-ws"})
+        assert first[0] not in ids(json.loads(ws.receive_text()))
+
+        ws.send_json({"q": "  ", "sid": "api-ws"})
+        assert ws.receive_json() == {"error": "Empty query"}
+
+
+def test_ws_stream_sends_ack_partial_and_final():
+    with client.websocket_connect("/ws") as ws:
+        ws.send_json({"q": "kisan yojana", "sid": "api-stream", "stream": True})
+        frames = [ws.receive_json()]
+        while frames[-1].get("t") != "final":
+            frames.append(ws.receive_json())
+    assert frames[0]["t"] == "ack"
+    assert len(frames[-1]["order"]) == 3
+    shown = {s["id"] for f in frames for s in f.get("add", [])}
+    assert set(frames[-1]["order"]) <= shown
+
+
+def test_ws_stream_text_follows_the_final_frame():
+    with client.websocket_connect("/ws") as ws:
+        ws.send_json({"q": "kisan yojana", "stream": True, "text": True, "lang": "ta"})
+        frame = ws.receive_json()
+        while frame.get("t") != "final":
+            frame = ws.receive_json()
+        chunks = [ws.receive_json() for _ in range(len(frame["order"]) + 1)]
+    assert {c["t"] for c in chunks} == {"text"}
+    snap = main.catalogue.snapshot
+    schemes = [snap.db.get_by_id(i) for i in frame["order"]]
+    assert "".join(c["chunk"] for c in chunks) == snap.text.generate(schemes, "ta")
+    assert chunks[0]["chunk"].startswith("உங்களுக்கான திட்டங்கள்:")
+
+
+def test_streamed_final_frame_keeps_the_budget(monkeypatch):
+    builder = ResponseBuilder(max_bytes=600)
+    monkeypatch.setattr(main, "response_builder", builder)
+    with client.websocket_connect("/ws") as ws:
+        ws.send_json({"q": "kisan yojana", "sid": "api-budget", "stream": True})
+        raw = ws.receive_text()
+        while json.loads(raw).get("t") != "final":
+            raw = ws.receive_text()
+        ws.send_json({"more": True, "sid": "api-budget"})
+        rest = json.loads(ws.receive_text())
+    final = json.loads(raw)
+
+    assert len(raw.encode("utf-8")) <= builder.max_bytes
+    assert final["more"] and final["sid"] == "api-budget"
+    assert ids(rest) and not set(ids(rest)) & set(final["order"])
+
+
+def test_streamed_follow_up_matches_http():
+    get_json("/ask?q=kisan yojana&sid=api-more-http")
+    expected = ids(get_json("/ask?q=aur koi&sid=api-more-http"))
+    assert expected
+
+    with client.websocket_connect("/ws") as ws:
+        ws.send_json({"q": "kisan yojana", "sid": "api-more-ws"})
+        ws.receive_text()
+        ws.send_json({"q": "aur koi", "sid": "api-more-ws", "stream": True})
+        frame = ws.receive_json()
+        while frame.get("t") != "final":
+            frame = ws.receive_json()
+    assert frame["order"] == expected
+
+
+def test_related_follows_the_eligibility_profile():
+    sid = "api-rel-elig"
+    get_json(f"/eligible?sid={sid}&age=20&occupation=student")
+    bits = main.catalogue.snapshot.eligibility.evaluate({"age": 20, "occupation": "student"})
+    eligible = {main.catalogue.snapshot.schemes[p]["id"] for p in positions(bits)}
+
+    get_json(f"/ask?q=scholarship yojana&sid={sid}")
+    assert set(ids(get_json(f"/ask?q=aur koi&sid={sid}"))) <= eligible
+    # A scheme some of whose related schemes the profile does not qualify for
+    scheme_id = next(
+        s["id"] for s in SCHEMES
+        if {r["id"] for r in main.catalogue.related(s["id"], 3)} - eligible
+    )
+    found = ids(get_json(f"/related?id={scheme_id}&sid={sid}"))
+    assert found and set(found) <= eligible
+
+
+def test_ws_session_survives_a_reconnect():
+    with client.websocket_connect("/ws") as ws:
+        ws.send_json({"q": "kisan yojana", "stream": True})
+        ack = ws.receive_json()
+        final = ws.receive_json()
+        while final.get("t") != "final":
+            final = ws.receive_json()
+    assert ack["t"] == "ack" and ack["sid"]
+
+    # e.g. closed by the idle timeout; the client resumes with the acked sid
+    with client.websocket_connect("/ws") as ws:
+        ws.send_json({"q": "doosri yojana", "sid": ack["sid"]})
+        assert ids(json.loads(ws.receive_text())) == [final["order"][1]]
+
+
+def test_partitions_fall_back_until_reload_writes_them(tmp_path, monkeypatch):
+    parts = tmp_path / "parts"
+    monkeypatch.setattr(
+        main, "partitions", PartitionedCatalogue(str(parts), config.SYNONYMS_PATH)
+    )
+    # No partition files: the full catalogue answers instead of nothing
+    assert ids(get_json("/ask?q=kisan yojana&state=up"))
+    assert main.partitions.loaded == []
+
+    get_json(f"/admin/reload?token={TOKEN}")
+    assert (parts / "central.json").exists() and main.partitions.available
+    by_id = {s["id"]: s for s in SCHEMES}
+    found = ids(get_json("/ask?q=kisan yojana&state=up"))
+    assert found and {by_id[i].get("state", "") for i in found} <= {"", "up"}
+    assert main.partitions.loaded == ["up"]
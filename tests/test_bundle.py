@@ -0,0 +1,93 @@
+"""Tests for offline bundles, versioning and delta sync."""
+
+import copy
+import gzip
+import json
+
+from src.bundle import FIELDS, BundleStore, apply_delta, build_index, bundle_record
+
+with open("data/schemes.json", encoding="utf-8") as f:
+    SCHEMES = json.load(f)
+
+
+def decode(body):
+    return json.loads(gzip.decompress(body))
+
+
+def test_full_bundle_rows_and_index():
+    version, body = BundleStore().encoded(SCHEMES, "hi")
+    bundle = decode(body)
+
+    assert bundle["v"] == version and bundle["full"]
+    assert bundle["fields"] == list(FIELDS)
+    assert [r[0] for r in bundle["schemes"]] == [s["id"] for s in SCHEMES]
+    kisan = bundle["index"]["kisan"]
+    assert [bundle["schemes"][i][0] for i in kisan] == ["fin_001"]
+
+
+def test_version_depends_only_on_content():
+    a, b = BundleStore(), BundleStore()
+    assert a.sync(SCHEMES) == b.sync(copy.deepcopy(SCHEMES))
+
+    edited = copy.deepcopy(SCHEMES)
+    edited[0]["benefits_hi"] = "नई राशि"
+    assert a.sync(edited) != b.version
+
+
+def test_delta_reproduces_new_bundle():
+    store = BundleStore()
+    old_version, old_body = store.encoded(SCHEMES, "ta")
+
+    edited = copy.deepcopy(SCHEMES)
+    edited[0]["name_hi"] = "नया नाम"
+    removed = edited.pop(1)
+    added = {"id": "new_001", "name_en": "New Scheme", "benefits_en": "₹1", "tags": ["new"]}
+    edited.append(added)
+
+    _, delta_body = store.encoded(edited, "ta", since=old_version)
+    delta = decode(delta_body)
+    assert delta["from"] == old_version
+    assert sorted(r[0] for r in delta["upsert"]) == [edited[0]["id"], "new_001"]
+    assert delta["delete"] == [removed["id"]]
+
+    merged = apply_delta(decode(old_body), delta)
+    full = decode(store.encoded(edited, "ta")[1])
+    assert merged["v"] == full["v"]
+    assert sorted(merged["schemes"]) == sorted(full["schemes"])
+    assert merged["index"] == build_index(merged["schemes"])
+
+
+def test_unknown_or_expired_version_gets_full_bundle():
+    store = BundleStore(history=1)
+    first = store.sync(SCHEMES)
+    store.sync(SCHEMES[1:])
+
+    assert decode(store.encoded(SCHEMES[1:], "hi", since=first)[1])["full"]
+    assert decode(store.encoded(SCHEMES[1:], "hi", since="bogus")[1])["full"]
+
+
+def test_same_version_delta_is_empty():
+    store = BundleStore()
+    version = store.sync(SCHEMES)
+    delta = decode(store.encoded(SCHEMES, "hi", since=version)[1])
+    assert delta["upsert"] == [] and delta["delete"] == []
+
+
+def test_record_falls_back_to_hindi():
+    record = bundle_record(SCHEMES[0], "bn")
+    assert record[1] == SCHEMES[0]["name_hi"]
+
+
+def test_body_matches_its_version_across_a_concurrent_reload():
+    store = BundleStore()
+    sync = store.sync
+
+    def sync_then_reload(schemes):
+        version = sync(schemes)
+        sync(SCHEMES[1:])  # /admin/reload on another thread, right here
+        return version
+
+    store.sync = sync_then_reload
+    version, body = store.encoded(SCHEMES, "hi")
+    assert decode(body)["v"] == version
+    assert all(decode(b)["v"] == key[0] for key, b in store._cache.items())
@@ -0,0 +1,85 @@
+"""Tests for the pooled HTTP client against a local keep-alive server."""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from src.client import SchemeClient
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        server = self.server
+        server.requests += 1
+        params = {k: v[-1] for k, v in parse_qs(urlparse(self.path).query).items()}
+        if server.busy_left:
+            server.busy_left -= 1
+            status, payload = 503, {"error": "busy", "msg": "busy"}
+        else:
+            status, payload = 200, {"msg": params.get("q", ""), "schemes": []}
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    httpd.requests = 0
+    httpd.busy_left = 0
+    thread = threading.Thread(target=httpd.serve_forever, args=(0.01,), daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def make_client(server, **kwargs):
+    return SchemeClient("127.0.0.1", server.server_address[1], backoff=0, **kwargs)
+
+
+def test_connection_is_reused(server):
+    with make_client(server) as client:
+        answers = [client.ask(f"q{i}")["msg"] for i in range(5)]
+
+    assert answers == [f"q{i}" for i in range(5)]
+    assert client.connections_opened == 1
+
+
+def test_busy_answer_is_retried(server):
+    server.busy_left = 2
+    with make_client(server, retries=2) as client:
+        assert client.ask("kisan")["msg"] == "kisan"
+    assert server.requests == 3
+
+
+def test_retries_exhausted_returns_error(server):
+    server.busy_left = 5
+    with make_client(server, retries=1) as client:
+        assert client.ask("kisan")["error"] == "busy"
+
+
+def test_unreachable_server_returns_error():
+    client = SchemeClient("127.0.0.1", 1, timeout=0.5, retries=0)
+    assert "error" in client.ask("kisan")
+
+
+def test_pipelined_batch_keeps_order(server):
+    queries = [f"किसान {i}" for i in range(40)]
+    with make_client(server) as client:
+        answers = client.ask_many(queries, depth=16)
+
+    assert [a["msg"] for a in answers] == queries
+    assert client.connections_opened == 1
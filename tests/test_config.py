@@ -1,20 +1,26 @@
 """Tests for the configuration module."""
 
+import os
+import subprocess
+import sys
+from functools import partial
+
 import pytest
+
 from src.config import (
     AppConfig,
-    QueryConfig,
     LanguageConfig,
+    NetworkConfig,
+    QueryConfig,
     ResponseConfig,
     SessionConfig,
-    NetworkConfig,
     config,
 )
 
 
 class TestQueryConfig:
     """Tests for QueryConfig."""
-    
+
     def test_default_values(self):
         """Test that QueryConfig has correct default values."""
         query_config = QueryConfig()
@@ -24,7 +30,7 @@ class TestQueryConfig:
 
 class TestLanguageConfig:
     """Tests for LanguageConfig."""
-    
+
     def test_default_values(self):
         """Test that LanguageConfig has correct default values."""
         lang_config = LanguageConfig()
@@ -40,7 +46,7 @@ class TestLanguageConfig:
 
 class TestResponseConfig:
     """Tests for ResponseConfig."""
-    
+
     def test_default_values(self):
         """Test that ResponseConfig has correct default values."""
         response_config = ResponseConfig()
@@ -52,7 +58,7 @@ class TestResponseConfig:
 
 class TestSessionConfig:
     """Tests for SessionConfig."""
-    
+
     def test_default_values(self):
         """Test that SessionConfig has correct default values."""
         session_config = SessionConfig()
@@ -62,7 +68,7 @@ class TestSessionConfig:
 
 class TestNetworkConfig:
     """Tests for NetworkConfig."""
-    
+
     def test_default_values(self):
         """Test that NetworkConfig has correct default values."""
         network_config = NetworkConfig()
@@ -73,7 +79,7 @@ class TestNetworkConfig:
 
 class TestAppConfig:
     """Tests for AppConfig."""
-    
+
     def test_initialization(self):
         """Test that AppConfig initializes all sub-configs."""
         app_config = AppConfig()
@@ -82,14 +88,24 @@ class TestAppConfig:
         assert isinstance(app_config.response, ResponseConfig)
         assert isinstance(app_config.session, SessionConfig)
         assert isinstance(app_config.network, NetworkConfig)
-    
+
     def test_api_defaults(self):
         """Test that API settings have correct defaults."""
         app_config = AppConfig()
         assert app_config.API_HOST == "0.0.0.0"
         assert app_config.API_PORT == 8000
         assert app_config.API_RELOAD is False
-    
+
+    def test_admin_token_comes_from_the_environment(self):
+        """Test that ADMIN_TOKEN is read from the environment, not hard-coded."""
+        code = "from src.config import config; print(repr(config.ADMIN_TOKEN))"
+        env = {k: v for k, v in os.environ.items() if k != "ADMIN_TOKEN"}
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        run = partial(subprocess.run, [sys.executable, "-c", code], cwd=root,
+                      capture_output=True, text=True, check=True)
+        assert run(env={**env, "ADMIN_TOKEN": "s3cret"}).stdout.strip() == "'s3cret'"
+        assert run(env=env).stdout.strip() == "''"
+
     def test_data_path_defaults(self):
         """Test that data paths have correct defaults."""
         app_config = AppConfig()
@@ -98,12 +114,12 @@ class TestAppConfig:
 
 class TestGlobalConfig:
     """Tests for the global config instance."""
-    
+
     def test_global_config_exists(self):
         """Test that global config instance is available."""
         assert config is not None
         assert isinstance(config, AppConfig)
-    
+
     def test_global_config_accessible(self):
         """Test that global config values are accessible."""
         assert config.query.MAX_QUERY_LENGTH == 500
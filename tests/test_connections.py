@@ -0,0 +1,108 @@
+"""Tests for the /ws connection manager."""
+
+import asyncio
+import sys
+
+from session_manager import SessionManager
+from src.connections import GOING_AWAY, Connection, ConnectionManager
+
+
+class FakeSocket:
+    def __init__(self, fail=False):
+        self.sent = []
+        self.closed_with = None
+        self.fail = fail
+
+    async def send_text(self, text):
+        if self.fail:
+            raise RuntimeError("socket is closed")
+        self.sent.append(text)
+
+    async def close(self, code=1000):
+        self.closed_with = code
+
+
+def manager(**kwargs):
+    kwargs.setdefault("max_connections", 3)
+    kwargs.setdefault("idle_timeout", 600)
+    kwargs.setdefault("heartbeat_timeout", 60)
+    return ConnectionManager(SessionManager(), **kwargs)
+
+
+def test_cap_refuses_connections_until_one_closes():
+    connections = manager()
+    opened = [connections.open(FakeSocket(), now=0) for _ in range(3)]
+    assert all(opened) and len(connections) == 3
+    assert connections.open(FakeSocket(), now=0) is None
+    assert connections.stats["rejected"] == 1
+
+    connections.close(opened[0])
+    connections.close(opened[0])  # idempotent
+    assert connections.open(FakeSocket(), now=0) is not None
+
+
+def test_connection_state_is_slotted_and_small():
+    conn = Connection(FakeSocket(), "127.0.0.1", 0.0)
+    assert not hasattr(conn, "__dict__")
+    assert sys.getsizeof(conn) < 120
+
+
+def test_queued_frames_are_written_together():
+    connections = manager()
+    socket = FakeSocket()
+    conn = connections.open(socket, now=0)
+    connections.send(conn, '{"t":"ack"}')
+    connections.send(conn, '{"msg":"योजना"}')
+    assert socket.sent == []
+
+    nbytes = asyncio.run(connections.flush(conn))
+    assert socket.sent == ['{"t":"ack"}', '{"msg":"योजना"}']
+    assert nbytes == len('{"t":"ack"}') + len('{"msg":"योजना"}'.encode("utf-8"))
+    assert asyncio.run(connections.flush(conn)) == 0
+
+
+def test_failed_write_closes_the_connection():
+    connections = manager()
+    conn = connections.open(FakeSocket(fail=True), now=0)
+    connections.send(conn, "x")
+    assert asyncio.run(connections.flush(conn)) == 0
+    assert conn.closed and len(connections) == 0
+    assert connections.stats["write_errors"] == 1
+    connections.send(conn, "y")  # dropped, not raised
+    assert conn.outbox is None
+
+
+def test_heartbeat_and_idle_timeouts():
+    connections = manager(idle_timeout=100, heartbeat_timeout=30)
+    silent, pinging, asking = (connections.open(FakeSocket(), now=0) for _ in range(3))
+    for t in range(10, 110, 10):
+        connections.seen(pinging, query=False, now=t)
+        connections.seen(asking, now=t)
+
+    expired = dict((conn, reason) for conn, reason in connections.expired(now=110))
+    assert expired == {silent: "heartbeat", pinging: "idle"}
+
+    assert asyncio.run(connections.sweep(now=110)) == 2
+    assert silent.websocket.closed_with == GOING_AWAY and silent.closed
+    assert list(connections.connections) == [asking]
+    assert connections.stats["heartbeat"] == 1 and connections.stats["idle"] == 1
+
+
+def test_closing_keeps_the_session_for_a_reconnect():
+    connections = manager()
+    conn = connections.open(FakeSocket(), now=0)
+    sessions = connections.session_manager
+    sessions.update(conn.sid, {"last_results": ("edu_001",)})
+    connections.close(conn)
+    assert sessions.sessions[conn.sid]["context"]["last_results"] == ("edu_001",)
+
+
+def test_sweeper_runs_while_connections_are_open():
+    async def scenario():
+        connections = manager(heartbeat_timeout=0.01, sweep_interval=0.01)
+        conn = connections.open(FakeSocket())
+        await asyncio.sleep(0.1)
+        return conn, connections
+
+    conn, connections = asyncio.run(scenario())
+    assert conn.closed and len(connections) == 0
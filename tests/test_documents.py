@@ -0,0 +1,123 @@
+"""Tests for the required-documents index and precomputed action steps."""
+
+import json
+import random
+
+from src.catalogue import Catalogue
+from src.config import config
+from src.documents import DocumentIndex, DocumentRegistry, load_documents
+from src.eligibility import positions
+
+with open("data/schemes.json", encoding="utf-8") as f:
+    SCHEMES = json.load(f)
+
+REGISTRY = load_documents(config.DOCUMENTS_PATH)
+
+
+def index(schemes=SCHEMES, **kwargs):
+    return DocumentIndex(schemes, DocumentRegistry(REGISTRY), **kwargs)
+
+
+def ids(bits):
+    return [SCHEMES[p]["id"] for p in positions(bits)]
+
+
+def test_names_intern_to_shared_ids():
+    registry = DocumentRegistry(REGISTRY)
+    aadhaar = registry.lookup("aadhaar")
+    assert aadhaar is not None
+    for name in ("Aadhaar Card", "aadhar", " AADHAR  card ", "आधार", "आधार कार्ड"):
+        assert registry.intern(name) == aadhaar
+    assert registry.label(aadhaar, "hi") == "आधार कार्ड"
+    assert registry.label(aadhaar, "xx") == "आधार कार्ड"
+
+    new = registry.intern("Caste Certificate")
+    assert registry.intern("caste-certificate") == new
+    assert registry.keys[new] == "caste_certificate"
+    assert registry.label(new, "hi") == "Caste Certificate"
+
+
+def test_document_postings():
+    idx = index()
+    registry = idx.registry
+    aadhaar, ration = registry.lookup("aadhaar"), registry.lookup("ration_card")
+
+    assert ids(idx.requiring(aadhaar)) == ["edu_001", "fin_001", "health_001"]
+    assert ids(idx.requiring(registry.lookup("land records"))) == ["fin_001"]
+    assert ids(idx.requiring_exactly(frozenset([aadhaar, ration]))) == ["health_001"]
+    assert idx.requiring_exactly(frozenset([aadhaar])) == 0
+
+
+def test_requiring_only_is_a_subset_query():
+    idx = index()
+    have = idx.ids(["aadhaar", "Ration Card", "voter id"])  # the unknown one is ignored
+    assert ids(idx.requiring_only(have)) == ["health_001"]
+    assert idx.requiring_only(idx.ids(["aadhaar"])) == 0
+    assert idx.requiring_only(frozenset()) == 0
+
+    everything = idx.ids(REGISTRY)
+    assert ids(idx.requiring_only(everything)) == ["edu_001", "fin_001", "health_001"]
+
+
+def test_requiring_only_matches_brute_force():
+    rng = random.Random(3)
+    keys = list(REGISTRY)
+    schemes = [
+        {"id": f"s{i}", "required_documents": rng.sample(keys, rng.randint(0, 4))}
+        for i in range(300)
+    ]
+    idx = index(schemes)
+    for _ in range(100):
+        have = rng.sample(keys, rng.randint(0, len(keys)))
+        expected = [
+            i for i, s in enumerate(schemes)
+            if s["required_documents"] and set(s["required_documents"]) <= set(have)
+        ]
+        assert positions(idx.requiring_only(idx.ids(have))) == expected
+
+
+def test_steps_are_precomputed_per_language_and_capped():
+    idx = index(max_steps=3)
+    steps = idx.steps_for("fin_001", "hi")
+    assert [s.step_number for s in steps] == [1, 2, 3]
+    assert steps[0].instruction.startswith("ये दस्तावेज़ तैयार रखें: आधार कार्ड, ")
+    assert steps[1].location == "ग्राम पंचायत / कृषि कार्यालय"
+    assert steps[1].instruction.endswith(f"({steps[1].location})")
+    assert steps[2].documents == ["आधार कार्ड", "बैंक पासबुक"]
+
+    # Served as stored, not rebuilt per call
+    assert idx.instructions_for("fin_001", "hi") is idx.instructions_for("fin_001", "hi")
+    assert list(idx.instructions_for("fin_001", "hi")) == [s.instruction for s in steps]
+
+    # No Tamil step text: Hindi steps under a Tamil document label
+    ta = idx.steps_for("fin_001", "ta")
+    assert ta[0].instruction.startswith("இந்த ஆவணங்களைத்")
+    assert ta[1].instruction.startswith("पटवारी")
+
+    # Unsupported languages get the default language's steps
+    assert idx.steps_for("fin_001", "xx") == idx.steps_for("fin_001", "hi")
+    assert idx.steps_for("missing", "hi") == ()
+
+
+def test_default_cap_and_plain_string_steps():
+    scheme = {
+        "id": "x", "required_documents": ["aadhaar"],
+        "application_steps": [f"step {i}" for i in range(10)],
+    }
+    steps = index([scheme]).steps_for("x", "hi")
+    assert len(steps) == config.response.MAX_ACTION_STEPS
+    assert steps[1].instruction == "step 0" and steps[1].location is None
+
+
+def test_catalogue_snapshot_carries_the_index(tmp_path):
+    catalogue = Catalogue(config.SCHEME_DATA_PATH, config.SYNONYMS_PATH)
+    docs = catalogue.snapshot.documents
+    assert docs.instructions_for("health_001", "hi")
+
+    # Without a registry, names are still interned, labelled as written
+    bare = Catalogue(
+        config.SCHEME_DATA_PATH, config.SYNONYMS_PATH,
+        documents_path=str(tmp_path / "missing.json"),
+    )
+    steps = bare.snapshot.documents.steps_for("health_001", "hi")
+    assert steps[0].documents == ["aadhaar", "ration_card"]
@@ -0,0 +1,86 @@
+"""Tests for compiled eligibility rules."""
+
+import json
+import random
+
+from benchmarks.synthetic import add_eligibility_rules, generate_schemes, random_profile
+from src.catalogue import Catalogue
+from src.config import config
+from src.eligibility import (
+    RULES_KEY,
+    EligibilityIndex,
+    bitset,
+    count,
+    parse_attributes,
+    positions,
+    rule_matches,
+)
+from src.query_processor import process_query
+
+with open("data/schemes.json", encoding="utf-8") as f:
+    SCHEMES = json.load(f)
+
+
+def ids(index_positions):
+    return [SCHEMES[p]["id"] for p in index_positions]
+
+
+def test_bitset_round_trip():
+    picked = [0, 3, 8, 63, 64, 999]
+    bits = bitset(picked, 1000)
+    assert positions(bits) == picked
+    assert positions(bits, limit=2) == [0, 3]
+    assert count(bits) == len(picked)
+    assert positions(0) == []
+
+
+def test_parse_attributes():
+    assert parse_attributes({
+        "age": "34", "income": "120000.0", "occupation": " Farmer ", "state": "", "caste": "x",
+    }) == {"age": 34, "income": 120000, "occupation": "farmer"}
+    assert parse_attributes({"age": "old"}) == {}
+
+
+def test_catalogue_rules():
+    index = EligibilityIndex(SCHEMES)
+    assert index.has_rules
+
+    assert ids(index.eligible({})) == ["edu_001", "fin_001", "health_001"]
+    assert ids(index.eligible({"occupation": "farmer", "age": 45})) == ["fin_001", "health_001"]
+    assert ids(index.eligible({"occupation": "student", "age": 20})) == ["edu_001", "health_001"]
+    assert ids(index.eligible({"income": 900000, "age": 12})) == []
+
+
+def test_bounds_are_inclusive():
+    schemes = [{RULES_KEY: {"min_age": 18, "max_age": 40, "max_income": 100}}]
+    index = EligibilityIndex(schemes)
+    for age, ok in ((17, False), (18, True), (40, True), (41, False)):
+        assert bool(index.evaluate({"age": age})) is ok
+    assert index.evaluate({"income": 100}) and not index.evaluate({"income": 101})
+
+
+def test_compiled_matches_per_scheme_rules():
+    schemes = add_eligibility_rules(generate_schemes(2000, seed=3), seed=3)
+    index = EligibilityIndex(schemes)
+    rng = random.Random(3)
+    for _ in range(200):
+        user = random_profile(rng)
+        expected = [p for p, s in enumerate(schemes) if rule_matches(s.get(RULES_KEY), user)]
+        assert index.eligible(user) == expected, user
+
+
+def test_catalogue_without_rules_allows_everyone():
+    index = EligibilityIndex(generate_schemes(10))
+    assert not index.has_rules
+    assert index.eligible({"age": 5, "occupation": "farmer"}) == list(range(10))
+
+
+def test_search_filters_by_profile():
+    catalogue = Catalogue(config.SCHEME_DATA_PATH, config.SYNONYMS_PATH)
+    query = process_query("kisan scholarship")
+
+    everyone = [s["id"] for s in catalogue.search(query, 3)]
+    student = [s["id"] for s in catalogue.search(query, 3, attrs={"occupation": "student"})]
+
+    assert "fin_001" in everyone and "edu_001" in everyone
+    assert student == ["edu_001"]
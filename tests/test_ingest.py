@@ -0,0 +1,178 @@
+"""Tests for the bulk ingest pipeline."""
+
+import gzip
+import json
+
+from src.catalogue import Catalogue
+from src.config import config
+from src.ingest import (
+    compile_validator,
+    content_hash,
+    load_schema,
+    merge,
+    normalize_record,
+    run_ingest,
+)
+from src.matcher import NameTagIndex
+
+with open("data/schemes.json", encoding="utf-8") as f:
+    SCHEMES = json.load(f)
+
+VALIDATE = compile_validator(load_schema())
+
+
+def test_schema_template_is_read_from_repo_file():
+    template = load_schema()
+    assert template["id"] == "string" and template["tags"] == ["string"]
+
+
+def test_validator_accepts_catalogue_and_reports_problems():
+    assert all(VALIDATE(s) == [] for s in SCHEMES)
+
+    assert VALIDATE({"id": "x_1"}) == ["missing name"]
+    assert VALIDATE({"id": "x_1", "name_ta": "திட்டம்", "tags": "farmers"}) == [
+        "tags: expected a list of string"
+    ]
+    assert VALIDATE({"id": 7, "name": "Scheme"}) == ["id: expected string"]
+    assert VALIDATE(["not", "a", "record"]) == ["expected an object, got list"]
+
+    # English is always accepted, whatever the supported languages are
+    assert VALIDATE({"id": "x_1", "name_en": "Kisan Scheme"}) == []
+    assert VALIDATE({"id": "x_1", "name_en": 5, "category": ["a"]}) == [
+        "name_en: expected string", "category: expected string",
+    ]
+
+
+def test_null_fields_are_dropped():
+    record = {"id": "x_1", "name_en": "Kisan Scheme", "category": None, "tags": None}
+    assert VALIDATE(record) == []
+    assert normalize_record(record) == {"id": "x_1", "name_en": "Kisan Scheme"}
+
+
+def test_normalize_moves_bare_fields_by_script():
+    record = normalize_record({
+        "id": "st_001",
+        "name": "  किसान   सहायता ",
+        "benefits": "Rs 5000",
+        "benefits_en": "₹5000 per year",
+        "description_hi": "",
+        "category": "Financial_Aid",
+        "tags": ["Farmers", "farmers ", "loan"],
+    })
+    assert record == {
+        "id": "st_001",
+        "name_hi": "किसान सहायता",
+        "benefits_en": "₹5000 per year",
+        "category": "financial_aid",
+        "tags": ["farmers", "loan"],
+    }
+
+
+def test_normalize_composes_unicode():
+    decomposed = "Yojana\u0301"
+    assert normalize_record({"id": "a", "name": decomposed})["name_en"] == "Yojan\u00e1"
+
+
+def test_merge_dedupes_by_id_and_content():
+    def result(*records):
+        return {"records": [(r, content_hash(r)) for r in records]}
+
+    a = {"id": "a", "name_en": "A"}
+    b = {"id": "b", "name_en": "B"}
+    a_new = {"id": "a", "name_en": "A v2"}
+    b_copy = {"id": "state_b", "name_en": "B"}
+
+    schemes, counts = merge([result(a, b), result(a_new, b_copy)])
+    assert schemes == [a_new, b]
+    assert counts == {"duplicate_ids": 1, "duplicate_content": 1}
+
+
+def write_feeds(tmp_path):
+    feeds = tmp_path / "feeds"
+    feeds.mkdir()
+    (feeds / "central.json").write_text(json.dumps(SCHEMES, ensure_ascii=False), "utf-8")
+    state = [
+        {"id": "mh_001", "name": "शेतकरी सन्मान", "tags": ["farmers"]},
+        {"id": "bad_001", "tags": ["farmers"]},
+        {**SCHEMES[0], "benefits_en": "Updated support"},
+    ]
+    (feeds / "state.jsonl").write_text(
+        "\n".join(json.dumps(r, ensure_ascii=False) for r in state), "utf-8"
+    )
+    return feeds
+
+
+def test_run_ingest_writes_loadable_catalogue(tmp_path):
+    out = tmp_path / "build"
+    report = run_ingest([str(write_feeds(tmp_path))], str(out), workers=1)
+
+    assert report["sources"] == 2
+    assert report["records_invalid"] == 1
+    assert report["duplicate_ids"] == 1
+    assert report["schemes"] == len(SCHEMES) + 1
+    assert set(report["seconds"]) == {"parse", "dedupe", "index", "write"}
+
+    catalogue = Catalogue(str(out / "schemes.json"), config.SYNONYMS_PATH)
+    assert catalogue.get_by_id(SCHEMES[0]["id"])["benefits_en"] == "Updated support"
+    assert catalogue.get_by_id("mh_001")["name_hi"] == "शेतकरी सन्मान"
+
+    index = json.loads((out / "index.json").read_text("utf-8"))
+    assert index["version"] == report["version"]
+    assert index["by_id"]["mh_001"] == len(SCHEMES)
+    bundle = json.loads(gzip.decompress((out / "bundles" / "hi.json.gz").read_bytes()))
+    assert bundle["v"] == report["version"]
+
+
+def test_bad_lines_and_files_are_skipped_one_by_one(tmp_path):
+    feeds = tmp_path / "feeds"
+    feeds.mkdir()
+    (feeds / "a.jsonl").write_text(
+        '{"id": "a_1", "name_en": "Kisan Scheme"}\n{"id": "a_2", "name_en": \n42\n'
+        '{"id": "a_3", "name_en": "Pension Scheme"}\n', "utf-8"
+    )
+    (feeds / "b.json").write_text("42", "utf-8")
+    (feeds / "c.json").write_text('{"schemes": [{"id": "c_1", "name_en": "Loan"}]}', "utf-8")
+    report = run_ingest([str(feeds)], str(tmp_path / "build"), workers=2)
+
+    assert report["schemes"] == 3  # a_1, a_3, c_1
+    assert report["records_invalid"] == 2  # the torn line and 42
+    assert len(report["errors"]) == 3
+    assert any("a.jsonl: line 2:" in e for e in report["errors"])
+    assert any("b.json: expected a list of records, got int" in e for e in report["errors"])
+
+
+def test_catalogue_uses_the_index_only_while_it_matches(tmp_path):
+    out = tmp_path / "build"
+    run_ingest([str(write_feeds(tmp_path))], str(out), workers=1)
+
+    def load():
+        catalogue = Catalogue(
+            str(out / "schemes.json"), config.SYNONYMS_PATH, index_path=str(out / "index.json")
+        )
+        return catalogue, catalogue.snapshot
+
+    catalogue, snap = load()
+    rebuilt = Catalogue(str(out / "schemes.json"), config.SYNONYMS_PATH)
+    built = rebuilt.snapshot
+    assert catalogue.prebuilt_index and not rebuilt.prebuilt_index
+    assert snap.synonyms.postings == {t: p for t, p in built.synonyms.postings.items() if p}
+    for q in ("kisan yojana", "shetkari", "kheti loan"):
+        assert snap.name_tag_index.search(q, 5) == built.name_tag_index.search(q, 5)
+        assert catalogue.search(q, 5) == rebuilt.search(q, 5)
+
+    # Edited after the ingest: the stale postings are not used
+    schemes = json.loads((out / "schemes.json").read_text("utf-8"))
+    (out / "schemes.json").write_text(json.dumps(schemes[1:], ensure_ascii=False), "utf-8")
+    catalogue, snap = load()
+    assert not catalogue.prebuilt_index
+    assert snap.name_tag_index.postings == NameTagIndex(schemes[1:]).postings
+
+
+def test_process_pool_matches_serial(tmp_path):
+    feeds = write_feeds(tmp_path)
+    serial = run_ingest([str(feeds)], str(tmp_path / "serial"), workers=1)
+    pooled = run_ingest([str(feeds)], str(tmp_path / "pooled"), workers=2)
+
+    assert pooled["workers"] == 2
+    assert pooled["version"] == serial["version"]
+    assert pooled["errors"] == serial["errors"]
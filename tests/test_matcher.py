@@ -0,0 +1,60 @@
+"""Tests for the matcher and the name/tag first-pass index."""
+
+import json
+import time
+
+from src.matcher import NameTagIndex, match_schemes
+
+with open("data/schemes.json", encoding="utf-8") as f:
+    SCHEMES = json.load(f)
+
+
+def test_index_finds_tag_match():
+    results = NameTagIndex(SCHEMES).search("kisan", 3)
+    assert [s["id"] for s in results] == ["fin_001"]
+
+
+def test_index_results_are_subset_of_full_match():
+    index = NameTagIndex(SCHEMES)
+    for query in ["education scholarship", "insurance", "healthcare kisan"]:
+        provisional = {s["id"] for s in index.search(query, 3)}
+        full = {s["id"] for s in match_schemes(query, SCHEMES, len(SCHEMES))}
+        assert provisional <= full
+
+
+def test_index_unknown_query_is_empty():
+    assert NameTagIndex(SCHEMES).search("xyzabc", 3) == []
+
+
+class SlowScheme(dict):
+    """Scheme whose field lookups are slow, to stretch scoring time."""
+
+    def get(self, key, default=None):
+        time.sleep(0.0002)
+        return super().get(key, default)
+
+
+def test_no_deadline_scans_everything():
+    results = match_schemes("kisan", SCHEMES, 3)
+    assert not results.partial
+    assert [s["id"] for s in results] == ["fin_001"]
+
+
+def test_deadline_returns_partial_best_effort():
+    schemes = [SlowScheme(SCHEMES[i % len(SCHEMES)], id=f"s{i}") for i in range(2000)]
+    budget = 0.05
+    start = time.perf_counter()
+    results = match_schemes("kisan", schemes, 3, deadline=start + budget, chunk_size=16)
+    elapsed = time.perf_counter() - start
+
+    assert results.partial
+    assert results and all("kisan" in s["tags"] for s in results)
+    # Overshoot is bounded by one chunk (16 schemes x ~7 slow lookups)
+    assert elapsed < budget + 0.1
+
+
+def test_first_chunk_is_scored_even_past_deadline():
+    # fin_001 would match "kisan" but sits in the second one-scheme chunk
+    results = match_schemes("scholarship kisan", SCHEMES, 3, deadline=0.0, chunk_size=1)
+    assert results.partial
+    assert [s["id"] for s in results] == ["edu_001"]
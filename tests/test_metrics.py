@@ -0,0 +1,49 @@
+"""Tests for the instrumentation layer."""
+
+import threading
+
+from src.metrics import Histogram, Metrics, bucket_index, bucket_value
+
+
+def test_bucket_value_within_precision():
+    for value in [0, 7, 31, 32, 1000, 123_456, 5_000_000_000]:
+        approx = bucket_value(bucket_index(value))
+        assert abs(approx - value) <= max(1, value * 0.07)
+
+
+def test_histogram_quantiles():
+    hist = Histogram()
+    for value in range(1, 1001):
+        hist.record(value * 1000)
+
+    assert abs(hist.quantile(0.5) - 500_000) <= 500_000 * 0.07
+    assert abs(hist.quantile(0.99) - 990_000) <= 990_000 * 0.07
+    assert hist.count == 1000
+
+
+def test_per_thread_shards_are_merged():
+    m = Metrics()
+
+    def work():
+        for _ in range(100):
+            m.observe("match", 0, 1000)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert m.merged()["match"].count == 400
+
+
+def test_render_prometheus_text():
+    m = Metrics(prefix="test")
+    m.observe("match", 0, 2_000_000)
+    m.gauge("catalogue_schemes", lambda: 3, "Schemes loaded.")
+
+    text = m.render()
+    assert 'test_stage_latency_seconds{stage="match",quantile="0.5"}' in text
+    assert 'test_stage_latency_seconds_count{stage="match"} 1' in text
+    assert "# TYPE test_catalogue_schemes gauge" in text
+    assert "test_catalogue_schemes 3" in text
@@ -0,0 +1,115 @@
+"""Tests for per-state catalogue partitions."""
+
+import json
+
+from benchmarks.synthetic import add_eligibility_rules, add_states, generate_schemes, query_pool
+from src.catalogue import Catalogue
+from src.config import config
+from src.matcher import SearchResults
+from src.partitions import (
+    CENTRAL,
+    PartitionedCatalogue,
+    merge_ranked,
+    split_catalogue,
+    write_partitions,
+)
+
+SCHEMES = add_eligibility_rules(add_states(generate_schemes(400, seed=3), seed=3), seed=3)
+
+
+def partitioned(tmp_path, **kwargs):
+    write_partitions(SCHEMES, str(tmp_path / "parts"))
+    return PartitionedCatalogue(str(tmp_path / "parts"), config.SYNONYMS_PATH, **kwargs)
+
+
+def monolithic(tmp_path, schemes):
+    path = tmp_path / "mono.json"
+    path.write_text(json.dumps(schemes, ensure_ascii=False), encoding="utf-8")
+    return Catalogue(str(path), config.SYNONYMS_PATH, semantic=False, related=False)
+
+
+def ids(results):
+    return [s["id"] for s in results]
+
+
+def test_split_by_state():
+    parts = split_catalogue([
+        {"id": "a"}, {"id": "b", "state": " MH "}, {"id": "c", "state": ""},
+        {"id": "d", "state": "mh"},
+    ])
+    assert {k: ids(v) for k, v in parts.items()} == {CENTRAL: ["a", "c"], "mh": ["b", "d"]}
+    assert list(split_catalogue([])) == [CENTRAL]
+
+
+def test_routed_search_matches_the_monolithic_ranking(tmp_path):
+    cat = partitioned(tmp_path)
+    parts = split_catalogue(SCHEMES)
+    for state in ("up", "tn"):
+        mono = monolithic(tmp_path, parts[CENTRAL] + parts[state])
+        for query in query_pool(seed=1, size=40):
+            expected = mono.search(query, 10)
+            got = cat.search(query, 10, state=state)
+            assert ids(got) == ids(expected)
+            assert got.scores == expected.scores
+            assert got.scored == len(parts[CENTRAL]) + len(parts[state])
+
+    attrs = {"age": 30, "occupation": "farmer", "state": "up"}
+    mono = monolithic(tmp_path, parts[CENTRAL] + parts["up"])
+    for query in query_pool(seed=2, size=20):
+        expected = mono.search(query, 10, attrs=attrs)
+        assert ids(cat.search(query, 10, "up", attrs=attrs)) == ids(expected)
+
+
+def test_unknown_or_missing_state_searches_central(tmp_path):
+    cat = partitioned(tmp_path)
+    central = monolithic(tmp_path, split_catalogue(SCHEMES)[CENTRAL])
+    for state in ("", "xx", CENTRAL):
+        assert ids(cat.search("kisan", 10, state=state)) == ids(central.search("kisan", 10))
+    assert cat.loaded == []
+
+
+def test_least_recently_used_partitions_are_evicted(tmp_path):
+    cat = partitioned(tmp_path, max_loaded=2)
+    for state in ("up", "mh", "up", "tn"):
+        cat.search("pension", 3, state=state)
+    assert cat.loaded == ["up", "tn"]
+    assert cat.stats == {"loads": 3, "evictions": 1}
+    # Evicted partitions are reopened on their next query
+    cat.search("pension", 3, state="MH")
+    assert cat.loaded == ["tn", "mh"] and cat.stats["loads"] == 4
+
+
+def test_merge_keeps_earlier_partition_first_on_ties():
+    central, state = SearchResults([{"id": "c1"}, {"id": "c2"}]), SearchResults([{"id": "s1"}])
+    central.scores, state.scores = [3, 1], [3]
+    state.partial = True
+    merged = merge_ranked([central, state], 2)
+    assert ids(merged) == ["c1", "s1"] and merged.scores == [3, 3] and merged.partial
+
+
+def test_reload_picks_up_new_state_files(tmp_path):
+    cat = partitioned(tmp_path)
+    assert "ka" in cat.states
+    assert not cat.reload_if_changed()
+    (tmp_path / "parts" / "new.json").write_text(
+        json.dumps([{"id": "n1", "name_en": "zebra yojana", "state": "new"}]), encoding="utf-8"
+    )
+    assert cat.reload_if_changed()
+    assert ids(cat.search("zebra", 3, state="new")) == ["n1"]
+
+
+def test_rewrite_removes_states_without_schemes(tmp_path):
+    cat = partitioned(tmp_path)
+    assert "ka" in cat.states
+    write_partitions([s for s in SCHEMES if s.get("state") != "ka"], str(tmp_path / "parts"))
+    assert cat.reload_if_changed()
+    assert "ka" not in cat.states
+    assert not list((tmp_path / "parts").glob(".*"))  # no temporary files left
+
+
+def test_missing_directory_is_not_available(tmp_path):
+    cat = PartitionedCatalogue(str(tmp_path / "missing"), config.SYNONYMS_PATH)
+    assert not cat.available
+    write_partitions(SCHEMES, str(tmp_path / "missing"))
+    cat.reload_if_changed()
+    assert cat.available
@@ -0,0 +1,91 @@
+"""Tests for the sampling profiler and per-request traces."""
+
+import threading
+import time
+
+from src.catalogue import Catalogue
+from src.config import config
+from src.matcher import match_schemes
+from src.profiling import SamplingProfiler, Trace, TraceBuffer
+
+
+def busy_loop(stop):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_profile_collapses_stacks_of_other_threads():
+    stop = threading.Event()
+    worker = threading.Thread(target=busy_loop, args=(stop,), name="worker")
+    worker.start()
+    try:
+        folded = SamplingProfiler(interval=0.001).profile(0.2)
+    finally:
+        stop.set()
+        worker.join()
+
+    lines = folded.splitlines()
+    assert lines and all(int(line.rsplit(" ", 1)[1]) > 0 for line in lines)
+    assert any(
+        line.startswith("worker;") and "test_profiling:busy_loop" in line for line in lines
+    )
+    # Neither the sampler nor the thread waiting for the result is sampled
+    assert not any(line.startswith(("sampling-profiler;", "MainThread;")) for line in lines)
+
+
+def test_one_profile_at_a_time():
+    profiler = SamplingProfiler(interval=0.001)
+    assert profiler.start(5)
+    try:
+        assert profiler.profile(0.1) is None
+    finally:
+        profiler.stop()
+    assert not profiler.running
+    assert profiler.profile(0.05) is not None
+
+
+def test_profile_length_is_capped():
+    profiler = SamplingProfiler(interval=0.001, max_seconds=0.05)
+    started = time.perf_counter()
+    profiler.profile(30)
+    assert time.perf_counter() - started < 5
+
+
+def test_trace_stages_chain():
+    trace = Trace("http", "kisan yojana", start_ns=0)
+    assert trace.stage("parse", 1_000_000) == 1_000_000
+    trace.stage("match", 4_000_000)
+    trace.count("scored", 12)
+    record = trace.as_dict()
+    assert record["stages"] == {"parse": 1.0, "match": 3.0}
+    assert record["ms"] == 4.0 and record["counts"] == {"scored": 12}
+    assert list(record["stages"]) == ["parse", "match"]
+
+
+def test_trace_buffer_keeps_the_most_recent():
+    traces = TraceBuffer(size=3)
+    for i in range(5):
+        traces.add(traces.start("http", f"q{i}"))
+    assert len(traces) == 3 and traces.recorded == 5
+    assert [t["q"] for t in traces.recent()] == ["q4", "q3", "q2"]
+    assert [t["q"] for t in traces.recent(1)] == ["q4"]
+
+    assert TraceBuffer(size=0).start("http", "q") is None
+
+
+def test_search_reports_candidate_counts():
+    schemes = [{"id": f"s{i}", "name": "kisan" if i % 2 else "x"} for i in range(10)]
+    results = match_schemes("kisan", schemes, 3)
+    assert results.scored == 10
+    assert match_schemes("kisan", schemes, 3, candidates=[1, 2]).scored == 2
+    assert match_schemes("kisan", [], 3).scored == 0
+    # Cut short after the first chunk
+    assert match_schemes("kisan", schemes, 3, deadline=0, chunk_size=4).scored == 4
+
+    cat = Catalogue(config.SCHEME_DATA_PATH, config.SYNONYMS_PATH)
+    first, second = Trace("http", "scholarship"), Trace("http", "scholarship")
+    cat.search("scholarship", 3, trace=first)
+    cat.search("scholarship", 3, trace=second)
+    assert first.counts["cache"] == "miss" and second.counts == {"cache": "hit"}
+    assert first.counts["candidates"] == first.counts["scored"] == len(cat.schemes)
+    assert first.counts["partial"] is False
@@ -1,9 +1,18 @@
+import pytest
+
+import src.main
 from fastapi.testclient import TestClient
+from src.access_log import NullAccessLogger
 from src.main import app
 
 client = TestClient(app)
 
 
+@pytest.fixture(autouse=True)
+def no_access_log(monkeypatch):
+    monkeypatch.setattr(src.main, "access_log", NullAccessLogger())
+
+
 def test_response_size_under_limit():
     res = client.get("/ask?q=test")
     payload = res.content
@@ -0,0 +1,70 @@
+"""Tests for query validation, truncation and script-based language detection."""
+
+import pytest
+
+from dataClasses import QueryStatus
+from src.matcher import match_schemes
+from src.query_processor import process_query
+
+
+def test_valid_query_is_tokenized_and_deduplicated():
+    query = process_query("Kisan kisan  yojana, KISAN!")
+
+    assert query.status is QueryStatus.VALID
+    assert query.tokens == ["kisan", "yojana"]
+    assert query.normalized_text == "kisan yojana"
+    assert query.character_count == 27
+
+
+@pytest.mark.parametrize("text", ["", "   ", "?!,. -"])
+def test_no_words_is_empty(text):
+    query = process_query(text)
+    assert query.status is QueryStatus.EMPTY
+    assert query.tokens == []
+
+
+def test_long_input_is_capped_without_splitting_words():
+    text = "abc " * 124 + "abcdefgh" + " tail" * 20_000
+    query = process_query(text)
+
+    assert query.status is QueryStatus.TRUNCATED
+    assert query.tokens == ["abc"]
+    assert query.character_count == len(text)
+
+
+def test_byte_cap_keeps_whole_characters():
+    query = process_query("किसान " * 200, max_chars=500, max_bytes=100)
+
+    assert query.status is QueryStatus.TRUNCATED
+    assert query.tokens == ["किसान"]
+
+
+def test_token_cap_counts_distinct_tokens():
+    query = process_query(" ".join(f"w{i}" for i in range(10)) + " w0", max_tokens=4)
+
+    assert query.tokens == ["w0", "w1", "w2", "w3"]
+    assert query.status is QueryStatus.TRUNCATED
+
+
+def test_indic_words_are_not_split_at_vowel_signs():
+    assert process_query("छात्रवृत्ति योजना").tokens == ["छात्रवृत्ति", "योजना"]
+
+
+@pytest.mark.parametrize("text, lang", [
+    ("health insurance", "en"),
+    ("किसान योजना", "hi"),
+    ("शेतकरी योजना माहिती मिळेल", "mr"),
+    ("কৃষক প্রকল্প", "bn"),
+    ("விவசாயி திட்டம்", "ta"),
+    ("రైతు పథకం", "te"),
+    ("किसान yojana योजना", "hi"),
+    ("12345", None),
+])
+def test_language_detected_from_script(text, lang):
+    assert process_query(text).detected_language == lang
+
+
+def test_ranker_consumes_processed_query():
+    schemes = [{"id": "a", "name": "kisan yojana"}, {"id": "b", "name": "yojana"}]
+    results = match_schemes(process_query("yojana yojana yojana kisan"), schemes, 3)
+    assert [s["id"] for s in results] == ["a", "b"]
@@ -0,0 +1,104 @@
+"""Tests for session-aware reference resolution."""
+
+from reference_resolver import ReferenceResolver
+from scheme_database import SchemeDatabase
+from session_manager import SessionManager
+
+SCHEMES = [
+    {"id": "edu_001", "name_en": "Scholarship", "tags": ["education"]},
+    {"id": "fin_002", "name_en": "Kisan Samman Nidhi", "tags": ["farmers"]},
+    {"id": "health_001", "name_en": "Ayushman Bharat", "tags": ["healthcare"]},
+]
+
+
+def make_resolver():
+    return ReferenceResolver(SchemeDatabase.from_records(SCHEMES), SessionManager())
+
+
+def search_all(query):
+    return list(SCHEMES)
+
+
+def fail_search(query):
+    raise AssertionError("search should not run for a resolved reference")
+
+
+def test_first_turn_searches_and_remembers_ids():
+    resolver = make_resolver()
+    results, resolved = resolver.resolve_or_search("s1", "yojana", search_all)
+
+    assert not resolved
+    assert [s["id"] for s in results] == ["edu_001", "fin_002", "health_001"]
+    context = resolver.session_manager.sessions["s1"]["context"]
+    assert context["last_results"] == ("edu_001", "fin_002", "health_001")
+    assert resolver.stats == {"resolved": 0, "searched": 1}
+
+
+def test_ordinal_reference_skips_search():
+    resolver = make_resolver()
+    resolver.resolve_or_search("s1", "yojana", search_all)
+
+    results, resolved = resolver.resolve_or_search("s1", "doosri yojana", fail_search)
+    assert resolved
+    assert results[0]["id"] == "fin_002"
+
+    results, _ = resolver.resolve_or_search("s1", "तीसरी योजना", fail_search)
+    assert results[0]["id"] == "health_001"
+    assert resolver.stats == {"resolved": 2, "searched": 1}
+
+
+def test_anaphora_follows_focus():
+    resolver = make_resolver()
+    resolver.resolve_or_search("s1", "yojana", search_all)
+    resolver.resolve_or_search("s1", "second one", fail_search)
+
+    results, resolved = resolver.resolve_or_search(
+        "s1", "uske liye documents kya chahiye?", fail_search
+    )
+    assert resolved
+    assert results[0]["id"] == "fin_002"
+
+
+def test_unresolvable_reference_falls_back_to_search():
+    resolver = make_resolver()
+    resolver.resolve_or_search("s1", "yojana", lambda q: SCHEMES[:1])
+
+    # Only one result was shown, so "second" cannot be resolved
+    results, resolved = resolver.resolve_or_search("s1", "second", search_all)
+    assert not resolved
+    assert len(results) == 3
+
+
+def test_stateless_requests_never_resolve():
+    resolver = make_resolver()
+    resolver.resolve_or_search("", "yojana", search_all)
+
+    _, resolved = resolver.resolve_or_search("", "uske documents", search_all)
+    assert not resolved
+    assert resolver.session_manager.sessions == {}
+
+
+def test_new_queries_with_reference_words_search():
+    resolver = make_resolver()
+    resolver.resolve_or_search("s1", "yojana", search_all)
+
+    for query in (
+        "ye mahila yojana kya hai", "first time pregnant women scheme",
+        "is there a scheme for this student", "last date for scholarship",
+        "similar to kisan", "related farmers yojana",
+    ):
+        _, resolved = resolver.resolve_or_search("s1", query, search_all)
+        assert not resolved, query
+
+    _, resolved = resolver.resolve_or_search("s1", "iske liye kaise apply kare?", fail_search)
+    assert resolved
+
+
+def test_empty_search_keeps_the_previous_frame():
+    resolver = make_resolver()
+    resolver.resolve_or_search("s1", "yojana", search_all)
+    resolver.resolve_or_search("s1", "fifth yojana", lambda _: [])
+
+    results, resolved = resolver.resolve_or_search("s1", "doosri yojana", fail_search)
+    assert resolved
+    assert results[0]["id"] == "fin_002"
@@ -0,0 +1,115 @@
+"""Tests for the precomputed related-schemes graph."""
+
+import json
+import math
+import random
+from collections import Counter
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from benchmarks.synthetic import generate_schemes  # noqa: E402
+from reference_resolver import ReferenceResolver  # noqa: E402
+from session_manager import SessionManager  # noqa: E402
+from src.catalogue import Catalogue  # noqa: E402
+from src.config import config  # noqa: E402
+from src.related import RelatedGraph, scheme_features  # noqa: E402
+
+with open("data/schemes.json", encoding="utf-8") as f:
+    SCHEMES = json.load(f)
+
+
+def varied_schemes(n, seed=0):
+    schemes = generate_schemes(n, seed)
+    rng = random.Random(seed)
+    words = [f"w{i}" for i in range(n // 5)]
+    for s in schemes:
+        s["description_en"] += " " + " ".join(rng.choices(words, k=6))
+    return schemes
+
+
+def brute_force(schemes, k, tag_weight=config.related.TAG_WEIGHT):
+    n = len(schemes)
+    rows = [scheme_features(s) for s in schemes]
+    df = Counter(f for row in rows for f in row)
+    kept = [f for f, c in df.items() if 1 < c <= max(2, n * config.related.MAX_FEATURE_RATIO)]
+    column = {f: i for i, f in enumerate(kept)}
+    x = np.zeros((n, len(kept)))
+    for pos, row in enumerate(rows):
+        for f in row & column.keys():
+            x[pos, column[f]] = math.log(n / df[f]) * (tag_weight if f.startswith("t:") else 1)
+    x /= np.maximum(np.linalg.norm(x, axis=1), 1e-12)[:, None]
+    sims = x @ x.T
+    np.fill_diagonal(sims, 0)
+    return -np.sort(-sims, axis=1)[:, :k]
+
+
+def catalogue(related=True):
+    return Catalogue(config.SCHEME_DATA_PATH, config.SYNONYMS_PATH, related=related)
+
+
+def test_sample_catalogue_neighbours():
+    graph = RelatedGraph(SCHEMES)
+    for pos in range(len(SCHEMES)):
+        related = graph.related(pos)
+        assert related and pos not in [p for p, _ in related]
+        sims = [s for _, s in related]
+        assert sims == sorted(sims, reverse=True) and 0 < sims[-1] <= 1
+    assert graph.adjacency.dtype == np.int32 and graph.adjacency.shape == (len(SCHEMES), graph.k)
+    assert len(graph.related(0, limit=1)) == 1
+
+
+@pytest.mark.parametrize("max_postings", [5, 10**9])
+def test_matches_brute_force(max_postings):
+    # A small posting limit scores most words through the broad feature sets
+    schemes = varied_schemes(600)
+    graph = RelatedGraph(schemes, k=5, max_postings=max_postings)
+    assert np.allclose(graph.scores, brute_force(schemes, 5), atol=1e-4)
+    for pos in range(0, 600, 37):
+        for other, sim in graph.related(pos):
+            assert other != pos and sim > 0
+
+
+def test_identical_schemes_come_first():
+    schemes = varied_schemes(200)
+    schemes += [dict(schemes[0], id=f"copy{i}") for i in range(3)]
+    graph = RelatedGraph(schemes, k=4)
+    copies = {0, 200, 201, 202}
+    for pos in copies:
+        first = graph.related(pos)[:3]
+        assert {p for p, _ in first} == copies - {pos}
+        assert all(sim == 1.0 for _, sim in first)
+
+
+def test_catalogue_related():
+    assert catalogue(related=False).related("edu_001") == []
+
+    cat = catalogue()
+    related = [s["id"] for s in cat.related("edu_001")]
+    assert "edu_001" not in related and related
+    assert [s["id"] for s in cat.related("edu_001", exclude={related[0]})] == related[1:]
+    assert cat.related("missing") == []
+
+
+def test_aur_koi_is_answered_from_the_graph():
+    cat = catalogue()
+    resolver = ReferenceResolver(cat, SessionManager(), related_limit=1)
+    resolver.resolve_or_search("s1", "scholarship", lambda _: [cat.get_by_id("edu_001")])
+
+    def fail_search(query):
+        raise AssertionError("search should not run for a related follow-up")
+
+    first, resolved = resolver.resolve_or_search("s1", "aur koi yojana?", fail_search)
+    assert resolved and first[0]["id"] != "edu_001"
+    # Schemes already shown are skipped
+    second, _ = resolver.resolve_or_search("s1", "कोई और?", fail_search)
+    assert second[0]["id"] not in ("edu_001", first[0]["id"])
+
+
+def test_aur_koi_searches_without_a_graph():
+    cat = catalogue(related=False)
+    resolver = ReferenceResolver(cat, SessionManager())
+    resolver.resolve_or_search("s1", "scholarship", lambda _: [cat.get_by_id("edu_001")])
+    _, resolved = resolver.resolve_or_search("s1", "aur koi yojana", lambda _: [])
+    assert not resolved
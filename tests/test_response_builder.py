@@ -0,0 +1,89 @@
+"""Tests for budgeted response packing and continuation pages."""
+
+import json
+
+from dataClasses import ActionStep
+from session_manager import SessionManager
+from src.response_builder import PageCursor, ResponseBuilder
+
+
+def make_schemes(n, benefit="₹6000 वार्षिक सहायता"):
+    return [{"id": f"s_{i}", "name": f"योजना {i}", "benefit": benefit} for i in range(n)]
+
+
+def test_small_answer_is_single_page():
+    pages = ResponseBuilder().build("ok", make_schemes(3), ["Visit office"], "hi")
+
+    assert len(pages) == 1
+    assert pages[0]["more"] is False
+    assert len(pages[0]["schemes"]) == 3
+    assert pages[0]["steps"] == ["Visit office"]
+
+
+def test_pages_respect_byte_budget():
+    builder = ResponseBuilder(max_bytes=400, max_words=1000)
+    pages = builder.build("मिलान की गई योजनाएं", make_schemes(20), [], "hi", sid="abc")
+
+    assert len(pages) > 1
+    assert all(p["more"] for p in pages[:-1])
+    assert not pages[-1]["more"]
+    assert sum(len(p["schemes"]) for p in pages) == 20
+    for page in pages:
+        page["sid"] = "abc"
+        raw = json.dumps(page, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        assert len(raw) <= 400
+
+
+def test_reserved_bytes_are_left_free():
+    builder = ResponseBuilder(max_bytes=400, max_words=1000)
+    pages = builder.build("m", make_schemes(20), [], "hi", sid="abc", reserve=150)
+
+    for page in pages:
+        page["sid"] = "abc"
+        raw = json.dumps(page, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        assert len(raw) <= 400 - 150
+
+
+def test_pages_respect_word_budget_and_step_cap():
+    builder = ResponseBuilder(max_bytes=10_000, max_words=10, max_steps=2)
+    steps = [ActionStep(i, f"step {i}", None, []) for i in range(5)]
+    pages = builder.build("msg", make_schemes(4), steps, "en")
+
+    assert sum(len(p["steps"]) for p in pages) == 2
+    assert pages[-1]["steps"][-1] == "step 1"
+    for page in pages:
+        words = sum(len(s["name"].split()) + len(s["benefit"].split()) for s in page["schemes"])
+        assert words + 1 <= 10 or len(page["schemes"]) == 1
+
+
+def test_oversized_item_is_trimmed_to_fit():
+    builder = ResponseBuilder(max_bytes=200, max_words=1000)
+    pages = builder.build("msg", make_schemes(1, benefit="लाभ " * 200), [], "hi")
+
+    raw = json.dumps(pages[0], separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    assert len(raw) <= 200
+    assert pages[0]["schemes"][0]["benefit"].endswith("…")
+
+
+def test_cursor_serves_continuation_pages_in_order():
+    cursor = PageCursor(SessionManager())
+    pages = ResponseBuilder(max_bytes=300, max_words=1000).build("m", make_schemes(10), [], "hi")
+
+    first = json.loads(cursor.first_page(None, pages, lambda: "new-sid"))
+    assert first["more"] and first["sid"] == "new-sid"
+
+    seen = [s["id"] for s in first["schemes"]]
+    while True:
+        raw = cursor.next_page("new-sid")
+        if raw is None:
+            break
+        seen += [s["id"] for s in json.loads(raw)["schemes"]]
+
+    assert seen == [f"s_{i}" for i in range(10)]
+
+
+def test_partial_flag_only_when_set():
+    builder = ResponseBuilder()
+    assert "partial" not in builder.build("m", [], [], "hi")[0]
+    pages = builder.build("m", [{"id": "a", "name": "x"}], [], "hi", partial=True)
+    assert all(p["partial"] is True for p in pages)
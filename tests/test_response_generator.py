@@ -0,0 +1,56 @@
+"""Tests for template-compiled response formatting."""
+
+import json
+
+import pytest
+
+from response_generator import ResponseGenerator
+
+with open("data/schemes.json", encoding="utf-8") as f:
+    SCHEMES = json.load(f)
+
+
+@pytest.mark.parametrize("lang", ["hi", "en", "ta", "te", "bn", "mr", "xx"])
+def test_prepared_output_matches_on_the_fly(lang):
+    cold = ResponseGenerator()
+    warm = ResponseGenerator(SCHEMES)
+
+    assert warm.generate(SCHEMES[:3], lang) == cold.generate(SCHEMES[:3], lang)
+
+
+def test_stream_chunks_join_to_generate():
+    generator = ResponseGenerator(SCHEMES)
+    chunks = list(generator.stream(SCHEMES[:3], "hi"))
+
+    assert len(chunks) == 4  # header + one per scheme
+    assert "".join(chunks) == generator.generate(SCHEMES[:3], "hi")
+
+
+def test_prepare_only_given_languages():
+    generator = ResponseGenerator(SCHEMES, ["hi", "xx"])
+
+    assert {lang for _, lang in generator._prepared} == {"hi"}
+    assert generator.generate(SCHEMES[:3], "ta") == ResponseGenerator().generate(SCHEMES[:3], "ta")
+
+
+def test_hindi_labels_and_default_steps():
+    scheme = {k: v for k, v in SCHEMES[0].items() if k != "application_steps"}
+    text = ResponseGenerator().generate([scheme], "hi")
+
+    assert text.startswith("आपके लिए उपलब्ध योजनाएँ:\n\n🔹 ")
+    assert "\nपात्रता: " in text
+    assert text.endswith("\n3. आवश्यक दस्तावेज़ अपलोड करें")
+
+
+def test_scheme_steps_replace_default_steps():
+    text = ResponseGenerator(SCHEMES).generate(SCHEMES[1:2], "en")
+
+    assert "\nApplication steps:\n1. Register with the patwari or agriculture office\n" in text
+    assert "official website" not in text
+    # No Tamil step text: English
+    assert "1. Register with the patwari" in ResponseGenerator().generate(SCHEMES[1:2], "ta")
+
+
+def test_empty_schemes_give_empty_output():
+    assert ResponseGenerator().generate([], "hi") == ""
+    assert list(ResponseGenerator().stream([], "hi")) == []
@@ -0,0 +1,74 @@
+"""Tests for dense-vector retrieval and its fusion with keyword search."""
+
+import json
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from benchmarks.synthetic import generate_schemes  # noqa: E402
+from src.catalogue import Catalogue  # noqa: E402
+from src.config import config  # noqa: E402
+from src.query_processor import process_query  # noqa: E402
+from src.semantic import FlatIndex, HashingEmbedder, IVFIndex, SemanticIndex, fuse  # noqa: E402
+from src.synonyms import load_synonyms  # noqa: E402
+
+with open("data/schemes.json", encoding="utf-8") as f:
+    SCHEMES = json.load(f)
+
+GROUPS = load_synonyms(config.SYNONYMS_PATH)
+
+
+def test_vectors_are_normalized_float32():
+    index = SemanticIndex(SCHEMES, GROUPS)
+    assert index.vectors.dtype == np.float32
+    assert np.allclose(np.linalg.norm(index.vectors, axis=1), 1.0, atol=1e-5)
+    assert isinstance(index.index, FlatIndex)
+
+
+def test_unknown_words_embed_to_zero():
+    embedder = HashingEmbedder(64, GROUPS)
+    embedder.fit([["kisan", "yojana"]])
+    assert not embedder.embed([["zzzzqq"]]).any()
+    assert embedder.embed([["kisan"]]).any()
+
+
+def test_colloquial_query_finds_scholarship():
+    index = SemanticIndex(SCHEMES, GROUPS)
+    tokens = process_query("beti ki padhai ke liye paisa").tokens
+    assert index.search(tokens, 3)[0]["id"] == "edu_001"
+
+
+def test_unrelated_query_returns_nothing():
+    index = SemanticIndex(SCHEMES, GROUPS)
+    assert index.search(process_query("xyzzy qwerty").tokens, 3) == []
+
+
+def test_ivf_agrees_with_brute_force():
+    index = SemanticIndex(generate_schemes(3000), GROUPS, ivf_min_schemes=10**9)
+    ivf = IVFIndex(index.vectors, n_lists=30, n_probe=30)
+    queries = index.embedder.embed([["kisan", "loan"], ["chhatravritti"], ["pension"]])
+
+    # Probing every list is exhaustive
+    for (_, exact), (_, approx) in zip(FlatIndex(index.vectors).search(queries, 3),
+                                       ivf.search(queries, 3)):
+        assert np.allclose(exact, approx)
+
+
+def test_large_catalogue_uses_ivf():
+    index = SemanticIndex(generate_schemes(500), GROUPS, ivf_min_schemes=100)
+    assert isinstance(index.index, IVFIndex)
+    assert len(index.index.order) == 500
+
+
+def test_fuse_rewards_agreement():
+    a, b, c = ({"id": x} for x in "abc")
+    assert fuse([a, b], [b, c], 3) == [b, a, c]
+    assert fuse([a], [], 3) == [a]
+
+
+def test_catalogue_hybrid_search():
+    catalogue = Catalogue(config.SCHEME_DATA_PATH, config.SYNONYMS_PATH, semantic=True)
+    results = catalogue.search(process_query("bimari ka ilaj"), 3)
+    assert [s["id"] for s in results][:1] == ["health_001"]
+    assert catalogue.snapshot.semantic is not None
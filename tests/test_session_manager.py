@@ -0,0 +1,19 @@
+"""Tests for session expiry."""
+
+from datetime import datetime, timedelta
+
+from session_manager import SessionManager
+
+
+def test_new_sessions_sweep_expired_ones():
+    manager = SessionManager()
+    manager.update("old", {"focus": "edu_001"})
+    manager.update("fresh", {"focus": "fin_002"})
+    manager.sessions["old"]["last_updated"] -= manager.SESSION_TIMEOUT + timedelta(seconds=1)
+
+    manager.get_or_create("new")  # within SWEEP_INTERVAL of the last sweep
+    assert "old" in manager.sessions
+
+    manager._last_sweep = datetime.utcnow() - manager.SWEEP_INTERVAL * 2
+    manager.get_or_create("newer")
+    assert set(manager.sessions) == {"fresh", "new", "newer"}
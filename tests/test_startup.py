@@ -0,0 +1,92 @@
+"""Tests for lazy catalogue loading, the search cache and startup warm-up."""
+
+import json
+
+from benchmarks.synthetic import generate_schemes
+from src.bundle import BundleStore
+from src.catalogue import Catalogue
+from src.config import config
+from src.query_processor import process_query
+from src.startup import Startup, load_warmup_queries
+
+
+def make_catalogue(**kwargs):
+    return Catalogue(config.SCHEME_DATA_PATH, config.SYNONYMS_PATH, **kwargs)
+
+
+def test_catalogue_loads_on_first_use():
+    catalogue = make_catalogue()
+    assert not catalogue.loaded
+
+    assert catalogue.get_by_id("fin_001") is not None
+    assert catalogue.loaded
+    assert set(catalogue.timings) == {"read", "index"}
+
+
+def test_search_cache_counts_hits():
+    catalogue = make_catalogue()
+    first = catalogue.search(process_query("kisan"), 5)
+    second = catalogue.search(process_query("Kisan kisan"), 5)
+
+    assert second is first
+    assert catalogue.cache_stats == {"hits": 1, "misses": 1}
+
+
+def test_partial_results_are_not_cached(tmp_path):
+    # Larger than one deadline chunk, so an expired deadline cuts the scan
+    path = tmp_path / "schemes.json"
+    path.write_text(json.dumps(generate_schemes(1000)), encoding="utf-8")
+    catalogue = Catalogue(str(path), config.SYNONYMS_PATH)
+    catalogue.load()
+    catalogue.search(process_query("kisan"), 5, deadline=0.0)
+    catalogue.search(process_query("kisan"), 5, deadline=0.0)
+
+    assert catalogue.cache_stats == {"hits": 0, "misses": 2}
+
+
+def test_search_cache_is_bounded():
+    catalogue = make_catalogue(cache_size=2)
+    for q in ("kisan", "scholarship", "pension"):
+        catalogue.search(process_query(q), 5)
+
+    assert len(catalogue.snapshot.search_cache) == 2
+
+
+def test_warmup_queries_skip_blanks_and_comments(tmp_path):
+    path = tmp_path / "top.txt"
+    path.write_text("# header\nkisan\n\n  scholarship  \n", encoding="utf-8")
+
+    assert load_warmup_queries(str(path)) == ["kisan", "scholarship"]
+    assert load_warmup_queries(str(tmp_path / "missing.txt")) == []
+
+
+def test_startup_runs_phases_and_warms_cache(tmp_path):
+    path = tmp_path / "top.txt"
+    path.write_text("kisan\nscholarship\n", encoding="utf-8")
+    catalogue = make_catalogue()
+    bundles = BundleStore()
+    startup = Startup(catalogue, bundles, str(path))
+    assert not startup.ready and startup.status()["phase"] == "pending"
+
+    startup.start()
+    assert startup.wait(10)
+
+    status = startup.status()
+    assert startup.ready and status["phase"] == "ready"
+    assert set(status["ms"]) == {"load", "index", "warmup"}
+    assert status["warmed"] == 2
+    assert bundles.version is not None
+
+    catalogue.search(process_query("kisan"), config.response.MAX_SCHEME_RESULTS)
+    assert catalogue.cache_stats["hits"] == 1
+
+
+def test_startup_failure_is_not_ready(tmp_path):
+    broken = tmp_path / "schemes.json"
+    broken.write_text("[{", encoding="utf-8")
+    catalogue = Catalogue(str(broken), config.SYNONYMS_PATH)
+    startup = Startup(catalogue, BundleStore(), str(tmp_path / "top.txt"))
+    startup.run()
+
+    assert not startup.ready
+    assert startup.status()["phase"] == "failed" and "error" in startup.status()
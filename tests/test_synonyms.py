@@ -0,0 +1,61 @@
+"""Tests for compiled synonym postings and catalogue reload."""
+
+import json
+import os
+
+from src.catalogue import Catalogue
+from src.matcher import match_schemes
+from src.synonyms import SynonymIndex, load_synonyms
+
+with open("data/schemes.json", encoding="utf-8") as f:
+    SCHEMES = json.load(f)
+
+GROUPS = load_synonyms("data/synonyms.json")
+
+
+def test_synonym_matches_only_with_index():
+    index = SynonymIndex(SCHEMES, GROUPS)
+    assert match_schemes("kheti", SCHEMES, 3) == []
+    assert [s["id"] for s in match_schemes("kheti", SCHEMES, 3, index)] == ["fin_001"]
+
+
+def test_literal_hit_outranks_synonym_hit():
+    index = SynonymIndex(SCHEMES, [["kisan", "scholarship"]])
+    results = match_schemes("kisan", SCHEMES, 3, index)
+    assert [s["id"] for s in results] == ["fin_001", "edu_001"]
+
+
+def test_literal_results_unchanged_by_index():
+    index = SynonymIndex(SCHEMES, GROUPS)
+    for query in ["kisan", "health insurance", "scholarship student"]:
+        assert match_schemes(query, SCHEMES, 3) == match_schemes(query, SCHEMES, 3, index)
+
+
+def test_multi_word_term_needs_all_words():
+    index = SynonymIndex(SCHEMES, [["ilaj", "ayushman bharat"], ["zzz", "ayushman nowhere"]])
+    health = [s["id"] for s in SCHEMES].index("health_001")
+    assert index.lookup("ilaj") == {health}
+    assert index.lookup("zzz") == SynonymIndex.EMPTY
+
+
+def test_missing_synonyms_file_is_empty(tmp_path):
+    assert load_synonyms(str(tmp_path / "missing.json")) == []
+
+
+def test_reload_picks_up_edited_synonyms(tmp_path):
+    schemes_path = tmp_path / "schemes.json"
+    synonyms_path = tmp_path / "synonyms.json"
+    schemes_path.write_text(json.dumps(SCHEMES), encoding="utf-8")
+    synonyms_path.write_text(json.dumps({"groups": []}), encoding="utf-8")
+
+    catalogue = Catalogue(str(schemes_path), str(synonyms_path))
+    catalogue.load()
+    assert catalogue.search("kheti", 3) == []
+    assert not catalogue.reload_if_changed()
+
+    synonyms_path.write_text(json.dumps({"groups": [["kisan", "kheti"]]}), encoding="utf-8")
+    stat = os.stat(synonyms_path)
+    os.utime(synonyms_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert catalogue.reload_if_changed()
+    assert [s["id"] for s in catalogue.search("kheti", 3)] == ["fin_001"]
@@ -0,0 +1,32 @@
+"""Tests for the seeded benchmark data generators."""
+
+from collections import Counter
+
+from benchmarks.synthetic import LANGUAGES, generate_queries, generate_schemes
+
+
+def test_catalogue_is_reproducible():
+    assert generate_schemes(50, seed=7) == generate_schemes(50, seed=7)
+    assert generate_schemes(50, seed=7) != generate_schemes(50, seed=8)
+
+
+def test_records_match_catalogue_layout():
+    schemes = generate_schemes(200, seed=1)
+
+    assert len({s["id"] for s in schemes}) == 200
+    for scheme in schemes:
+        assert scheme["category"] and scheme["source"] and scheme["tags"]
+        for lang in LANGUAGES:
+            for field in ("name", "description", "eligibility", "benefits"):
+                assert isinstance(scheme[f"{field}_{lang}"], str)
+                assert scheme[f"{field}_{lang}"]
+
+
+def test_queries_have_zipfian_repetition():
+    queries = generate_queries(5000, seed=3)
+    counts = Counter(queries).most_common()
+
+    assert generate_queries(5000, seed=3) == queries
+    # The head of the distribution dominates the tail
+    assert counts[0][1] > 10 * counts[-1][1]
+    assert counts[0][1] > counts[9][1] > counts[99][1]
@@ -0,0 +1,76 @@
+"""Tests for zero-result tracking and precomputed fallbacks."""
+
+import threading
+
+import pytest
+
+from empty_result_handler import EmptyResultHandler
+from src.zero_results import CountMinSketch, ZeroResultTracker
+
+
+@pytest.mark.parametrize("lang", ["hi", "en", "ta", "te", "bn", "mr"])
+def test_fallback_exists_for_every_supported_language(lang):
+    fallback = EmptyResultHandler().handle({}, lang)
+
+    assert fallback["message"].strip()
+    assert len(fallback["clarifying_questions"]) == 2
+    assert fallback["suggested_categories"] == ["education", "healthcare", "financial_aid"]
+
+
+def test_known_entities_drop_their_question():
+    handler = EmptyResultHandler()
+    fallback = handler.handle({"category": "education", "demographic": "student"}, "ta")
+    assert fallback["clarifying_questions"] == []
+
+
+def test_unknown_language_falls_back_to_hindi():
+    handler = EmptyResultHandler()
+    assert handler.handle({}, "xx") == handler.handle({}, "hi")
+
+
+def test_returned_fallback_is_not_shared():
+    handler = EmptyResultHandler()
+    handler.handle({}, "hi")["clarifying_questions"].clear()
+    assert handler.handle({}, "hi")["clarifying_questions"]
+
+
+def test_sketch_never_undercounts():
+    sketch = CountMinSketch(width=64, depth=3)
+    counts = {f"q{i}": i % 7 + 1 for i in range(200)}
+    for key, count in counts.items():
+        sketch.add(key, count)
+
+    for key, count in counts.items():
+        assert sketch.estimate(key) >= count
+    assert sketch.total == sum(counts.values())
+
+
+def test_tracker_surfaces_heavy_hitters():
+    tracker = ZeroResultTracker(top_k=3)
+    for i in range(500):
+        tracker.add(f"rare {i}")
+    for _ in range(50):
+        tracker.add("beti padhai paisa")
+    for _ in range(30):
+        tracker.add("kheti loan")
+
+    top = [q for q, _ in tracker.top(2)]
+    assert top == ["beti padhai paisa", "kheti loan"]
+    assert len(tracker._candidates) <= 6
+
+
+def test_concurrent_adds_are_all_counted():
+    tracker = ZeroResultTracker(top_k=5)
+
+    def add_many(i):
+        for n in range(2000):
+            tracker.add(f"q{(i * 7 + n) % 40}")
+
+    threads = [threading.Thread(target=add_many, args=(i,)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        tracker.top()  # reading while others add must not raise
+        t.join()
+    assert tracker.total == 8000
+    assert len(tracker._candidates) <= 10
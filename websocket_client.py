@@ -2,88 +2,90 @@
 """WebSocket-based Real-Time Chat Client for AI Assistant"""
 
 import asyncio
-import json
 import sys
 
 try:
-    import websockets
+    import websockets  # noqa: F401
 except ImportError:
     print("❌ websockets library not found!")
     print("Install it with: pip install websockets")
     sys.exit(1)
 
+from src.client import AsyncSchemeClient
+
+
+async def prompt(text):
+    """Read a line without blocking the event loop (keeps the connection alive)"""
+    return (await asyncio.to_thread(input, text)).strip()
+
 
 async def chat_live():
     """Connect to WebSocket and chat in real-time"""
     uri = "ws://127.0.0.1:8001/ws"
-    
+
     print("=" * 70)
     print("🤖 AI ASSISTANT - REAL-TIME WEBSOCKET CHAT")
     print("=" * 70)
     print("\nConnecting to WebSocket server...\n")
-    
+
+    # Reconnects on its own and resumes the same session after a drop
+    client = AsyncSchemeClient(uri)
     try:
-        async with websockets.connect(uri) as websocket:
-            print("✅ Connected! You can now chat with the AI.\n")
-            print("Type 'quit' or 'exit' to stop\n")
-            
-            while True:
-                try:
-                    # Get user input
-                    query = input("💬 Your query: ").strip()
-                    
-                    if not query:
-                        continue
-                    
-                    if query.lower() in ['quit', 'exit']:
-                        print("\n👋 Goodbye!")
-                        break
-                    
-                    # Get language preference
-                    lang = input("   Language (hi/ta/te/bn/mr) [default: hi]: ").strip() or "hi"
-                    
-                    # Send to WebSocket server
-                    print("\n⏳ Searching schemes...\n")
-                    await websocket.send(json.dumps({
-                        "q": query,
-                        "lang": lang
-                    }))
-                    
-                    # Receive response
-                    response = await websocket.recv()
-                    data = json.loads(response)
-                    
-                    # Display results
-                    if "error" in data:
-                        print(f"❌ Error: {data['error']}\n")
-                        continue
-                    
-                    schemes = data.get('schemes', [])
-                    
-                    if not schemes:
-                        print("❌ No schemes found. Try a different query.\n")
-                        continue
-                    
-                    print(f"✅ Found {len(schemes)} scheme(s):\n")
-                    for i, scheme in enumerate(schemes, 1):
-                        print(f"{i}. {scheme['name']}")
-                        print(f"   💰 {scheme['benefit']}\n")
-                    
-                except KeyboardInterrupt:
-                    print("\n\n👋 Goodbye!")
-                    break
-                except Exception as e:
-                    print(f"❌ Error: {e}\n")
-                    
-    except ConnectionRefusedError:
+        await client.connect()
+    except (OSError, asyncio.TimeoutError):
         print("❌ Connection failed!")
         print("Make sure the server is running:")
-        print("  python -m uvicorn src.main:app --host 127.0.0.1 --port 8000")
-        sys.exit(1)
-    except Exception as e:
-        print(f"❌ Error: {e}")
+        print("  python -m uvicorn src.main:app --host 127.0.0.1 --port 8001")
         sys.exit(1)
 
+    print("✅ Connected! You can now chat with the AI.\n")
+    print("Type 'quit' or 'exit' to stop, 'more' for the next page\n")
+
+    async with client:
+        while True:
+            try:
+                # Get user input
+                query = await prompt("💬 Your query: ")
+
+                if not query:
+                    continue
+
+                if query.lower() in ['quit', 'exit']:
+                    print("\n👋 Goodbye!")
+                    break
+
+                if query.lower() == 'more':
+                    data = await client.next_page()
+                else:
+                    # Get language preference
+                    lang = await prompt("   Language (hi/ta/te/bn/mr) [default: hi]: ") or "hi"
+                    print("\n⏳ Searching schemes...\n")
+                    data = await client.ask(query, lang)
+
+                # Display results
+                if "error" in data:
+                    print(f"❌ Error: {data.get('msg') or data['error']}\n")
+                    continue
+
+                schemes = data.get('schemes', [])
+
+                if not schemes:
+                    print("❌ No schemes found. Try a different query.\n")
+                    continue
+
+                print(f"✅ Found {len(schemes)} scheme(s):\n")
+                for i, scheme in enumerate(schemes, 1):
+                    print(f"{i}. {scheme['name']}")
+                    print(f"   💰 {scheme['benefit']}\n")
+                if data.get('more'):
+                    print("   (type 'more' for further results)\n")
+
+            except (KeyboardInterrupt, EOFError):
+                print("\n\n👋 Goodbye!")
+                break
+            except Exception as e:
+                print(f"❌ Error: {e}\n")
+
 
 if __name__ == "__main__":
     asyncio.run(chat_live())